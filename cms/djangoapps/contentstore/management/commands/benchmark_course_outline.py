@@ -0,0 +1,112 @@
+"""
+Command to benchmark building the Studio course outline for generated courses of increasing size.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys.edx.keys import CourseKey
+
+from contentstore.views.item import create_course_outline_info
+from request_cache.middleware import RequestCache
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+
+BENCHMARK_COURSE_KEY = 'course-v1:edX+OutlineBenchmark{units}+2016'
+UNITS_PER_SUBSECTION = 10
+SUBSECTIONS_PER_SECTION = 10
+
+
+class Command(BaseCommand):
+    """
+    For each of the given numbers of units, creates a course with that many
+    units, each containing an HTML block, grouped into sections of
+    subsections.  The course is published and then every tenth unit is
+    edited so that the outline has a mix of published and changed blocks.
+    Times building the course outline, each as a fresh request with an
+    empty request cache.
+
+    The courses are deleted from the modulestore afterwards.
+
+    Example usage:
+        $ ./manage.py cms benchmark_course_outline --settings=devstack
+        $ ./manage.py cms benchmark_course_outline --units 100 1000 3000 --builds 3 --settings=devstack
+    """
+    help = 'Benchmarks building the Studio course outline for generated courses of increasing size.'
+
+    def add_arguments(self, parser):
+        """
+        Entry point for subclassed commands to add custom arguments.
+        """
+        parser.add_argument(
+            '--units',
+            help='Numbers of units in the generated courses.',
+            type=int,
+            nargs='+',
+            default=[100, 500, 1000],
+        )
+        parser.add_argument(
+            '--builds',
+            help='Number of times to build the outline of each course.',
+            type=int,
+            default=5,
+        )
+
+    def handle(self, *args, **options):
+        if options['builds'] < 1:
+            raise CommandError('The number of builds must be at least 1.')
+
+        self.stdout.write('{:>8} {:>8} {:>14} {:>14}'.format('units', 'blocks', 'first ms', 'median ms'))
+        for units in sorted(options['units']):
+            store = modulestore()
+            user_id = ModuleStoreEnum.UserID.mgmt_command
+            course_key = CourseKey.from_string(BENCHMARK_COURSE_KEY.format(units=units))
+            with store.default_store(ModuleStoreEnum.Type.split):
+                course = store.create_course(course_key.org, course_key.course, course_key.run, user_id)
+            try:
+                blocks = _generate_course(store, course, units, user_id)
+                latencies = [_time_outline(store, course.id) for __ in xrange(options['builds'])]
+                self.stdout.write('{:>8} {:>8} {:>14.1f} {:>14.1f}'.format(
+                    units, blocks, latencies[0] * 1000, sorted(latencies)[len(latencies) // 2] * 1000,
+                ))
+            finally:
+                store.delete_course(course.id, user_id)
+
+
+def _generate_course(store, course, units, user_id):
+    """
+    Fills the given course with the given number of units, publishes it and then
+    edits every tenth unit.  Returns the number of blocks in the course.
+    """
+    blocks = 1
+    unit_locations = []
+    with store.bulk_operations(course.id):
+        for index in xrange(units):
+            if index % (UNITS_PER_SUBSECTION * SUBSECTIONS_PER_SECTION) == 0:
+                section = store.create_child(user_id, course.location, 'chapter')
+                blocks += 1
+            if index % UNITS_PER_SUBSECTION == 0:
+                subsection = store.create_child(user_id, section.location, 'sequential')
+                blocks += 1
+            unit = store.create_child(user_id, subsection.location, 'vertical')
+            store.create_child(user_id, unit.location, 'html', fields={'data': u'<p>Unit {}</p>'.format(index)})
+            unit_locations.append(unit.location)
+            blocks += 2
+        store.publish(course.location, user_id)
+
+    with store.bulk_operations(course.id):
+        for unit_location in unit_locations[::10]:
+            unit = store.get_item(unit_location)
+            unit.display_name = u'Edited unit'
+            store.update_item(unit, user_id)
+    return blocks
+
+
+def _time_outline(store, course_key):
+    """
+    Returns the time taken to load the course and build its outline, as a single request.
+    """
+    RequestCache.clear_request_cache()
+    start = time.time()
+    with store.bulk_operations(course_key):
+        create_course_outline_info(store.get_course(course_key, depth=None))
+    return time.time() - start
@@ -25,7 +25,7 @@ from opaque_keys.edx.locations import Location
 from .component import (
     ADVANCED_COMPONENT_TYPES,
 )
-from .item import create_xblock_info
+from .item import create_course_outline_info
 from .library import LIBRARIES_ENABLED
 from ccx_keys.locator import CCXLocator
 from contentstore import utils
@@ -337,13 +337,7 @@ def _course_outline_json(request, course_module):
     """
     Returns a JSON representation of the course module and recursively all of its children.
     """
-    return create_xblock_info(
-        course_module,
-        include_child_info=True,
-        course_outline=True,
-        include_children_predicate=lambda xblock: not xblock.category == 'vertical',
-        user=request.user
-    )
+    return create_course_outline_info(course_module, user=request.user)
 
 
 def get_in_process_course_actions(request):
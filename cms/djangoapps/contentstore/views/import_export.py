@@ -8,6 +8,7 @@ import os
 import re
 import shutil
 import tarfile
+import time
 from path import Path as path
 from tempfile import mkdtemp
 
@@ -213,12 +214,17 @@ def _import_handler(request, courselike_key, root_name, successful_url, context_
                     status=400
                 )
 
+            # Seconds spent in each stage of the import, reported by import_status_handler.
+            stage_timings = {}
+
             # try-finally block for proper clean up after receiving last chunk.
             try:
                 # This was the last chunk.
                 log.info("Course import %s: Upload complete", courselike_key)
+                _clear_request_stage_timings(request, courselike_string)
                 _save_request_status(request, courselike_string, 1)
 
+                start = time.time()
                 tar_file = tarfile.open(temp_filepath)
                 try:
                     safetar_extractall(tar_file, (course_dir + '/').encode('utf-8'))
@@ -235,8 +241,10 @@ def _import_handler(request, courselike_key, root_name, successful_url, context_
                 finally:
                     tar_file.close()
 
+                stage_timings['extract'] = time.time() - start
                 log.info("Course import %s: Uploaded file extracted", courselike_key)
                 _save_request_status(request, courselike_string, 2)
+                start = time.time()
 
                 # find the 'course.xml' file
                 def get_all_files(directory):
@@ -273,6 +281,7 @@ def _import_handler(request, courselike_key, root_name, successful_url, context_
                 dirpath = os.path.relpath(dirpath, data_root)
                 logging.debug('found %s at %s', root_name, dirpath)
 
+                stage_timings['validate'] = time.time() - start
                 log.info("Course import %s: Extracted file verified", courselike_key)
                 _save_request_status(request, courselike_string, 3)
 
@@ -285,7 +294,8 @@ def _import_handler(request, courselike_key, root_name, successful_url, context_
                         settings.GITHUB_REPO_ROOT, [dirpath],
                         load_error_modules=False,
                         static_content_store=contentstore(),
-                        target_id=courselike_key
+                        target_id=courselike_key,
+                        stage_timings=stage_timings,
                     )
 
                 new_location = courselike_items[0].location
@@ -308,6 +318,8 @@ def _import_handler(request, courselike_key, root_name, successful_url, context_
                 )
 
             finally:
+                log.info("Course import %s: Stage timings %s", courselike_key, stage_timings)
+                _save_request_stage_timings(request, courselike_string, stage_timings)
                 if course_dir.isdir():
                     shutil.rmtree(course_dir)
                     log.info("Course import %s: Temp data cleared", courselike_key)
@@ -358,6 +370,22 @@ def _save_request_status(request, key, status):
     request.session.save()
 
 
+def _save_request_stage_timings(request, key, stage_timings):
+    """
+    Save the seconds spent in each stage of an import for a course in request session
+    """
+    request.session.setdefault("import_stage_timings", {})[key] = stage_timings
+    request.session.save()
+
+
+def _clear_request_stage_timings(request, key):
+    """
+    Remove the stage timings of a previous import for a course from request session.
+    The session is saved along with the next import status.
+    """
+    request.session.get("import_stage_timings", {}).pop(key, None)
+
+
 @require_GET
 @ensure_csrf_cookie
 @login_required
@@ -373,6 +401,8 @@ def import_status_handler(request, course_key_string, filename=None):
         3 : Importing to mongo
         4 : Import successful
 
+    Once the import has ended, the number of seconds spent in each stage of
+    it is also returned, keyed by stage name.
     """
     course_key = CourseKey.from_string(course_key_string)
     if not has_course_author_access(request.user, course_key):
@@ -384,7 +414,11 @@ def import_status_handler(request, course_key_string, filename=None):
     except KeyError:
         status = 0
 
-    return JsonResponse({"ImportStatus": status})
+    response = {"ImportStatus": status}
+    stage_timings = request.session.get("import_stage_timings", {}).get(course_key_string + filename)
+    if stage_timings is not None:
+        response["StageTimings"] = stage_timings
+    return JsonResponse(response)
 
 
 def create_export_tarball(course_module, course_key, context):
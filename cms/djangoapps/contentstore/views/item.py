@@ -382,12 +382,7 @@ def xblock_outline_handler(request, usage_key_string):
         store = modulestore()
         with store.bulk_operations(usage_key.course_key):
             root_xblock = store.get_item(usage_key, depth=None)
-            return JsonResponse(create_xblock_info(
-                root_xblock,
-                include_child_info=True,
-                course_outline=True,
-                include_children_predicate=lambda xblock: not xblock.category == 'vertical'
-            ))
+            return JsonResponse(create_course_outline_info(root_xblock))
     else:
         return Http404
 
@@ -1033,6 +1028,27 @@ def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=F
     return xblock_info
 
 
+def create_course_outline_info(xblock, user=None):
+    """
+    Creates the information needed for the course outline rooted at the specified xblock,
+    which should have been loaded with all of its descendants.
+
+    The info is created within a bulk operation so that the draft and published versions of the
+    course are only loaded once. The has_changes check of the root block walks the whole outline
+    and the modulestore keeps the result for each block, so the checks for the blocks below it
+    don't walk their descendants again.
+    """
+    store = modulestore()
+    with store.bulk_operations(xblock.location.course_key):
+        return create_xblock_info(
+            xblock,
+            include_child_info=True,
+            course_outline=True,
+            include_children_predicate=lambda xblock: not xblock.category == 'vertical',
+            user=user,
+        )
+
+
 def add_container_page_publishing_info(xblock, xblock_info):  # pylint: disable=invalid-name
     """
     Adds information about the xblock's publish state to the supplied
@@ -10,6 +10,7 @@ import os
 import shutil
 import tarfile
 import tempfile
+from mock import patch
 from path import Path as path
 from uuid import uuid4
 
@@ -18,7 +19,7 @@ from django.conf import settings
 from xmodule.contentstore.django import contentstore
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.xml_exporter import export_library_to_xml
-from xmodule.modulestore.xml_importer import import_library_from_xml
+from xmodule.modulestore.xml_importer import import_course_from_xml, import_library_from_xml
 from xmodule.modulestore import LIBRARY_ROOT, ModuleStoreEnum
 from contentstore.utils import reverse_course_url
 from contentstore.tests.utils import CourseTestCase
@@ -206,6 +207,59 @@ class ImportTestCase(CourseTestCase):
 
         self.assertEquals(resp.status_code, 200)
 
+    def test_import_status_stage_timings(self):
+        """
+        Check that `import_status` reports the time spent in each stage of a
+        finished import.
+        """
+        with open(self.good_tar) as gtar:
+            args = {"name": self.good_tar, "course-data": [gtar]}
+            resp = self.client.post(self.url, args)
+        self.assertEquals(resp.status_code, 200)
+
+        resp_status = self.client.get(
+            reverse_course_url(
+                'import_status_handler',
+                self.course.id,
+                kwargs={'filename': os.path.split(self.good_tar)[1]}
+            )
+        )
+        status = json.loads(resp_status.content)
+        self.assertEquals(status["ImportStatus"], 4)
+        self.assertTrue(
+            {'extract', 'validate', 'parse', 'courselike', 'static', 'children', 'drafts', 'write'}.issubset(
+                status["StageTimings"]
+            )
+        )
+
+    def test_import_status_stage_timings_cleared(self):
+        """
+        Check that the stage timings of a previous import of the same file
+        are not reported while it is imported again.
+        """
+        filename = os.path.split(self.good_tar)[1]
+        with open(self.good_tar) as gtar:
+            resp = self.client.post(self.url, {"name": self.good_tar, "course-data": [gtar]})
+        self.assertEquals(resp.status_code, 200)
+        self.assertIn(
+            unicode(self.course.id) + filename, self.client.session.get("import_stage_timings", {})
+        )
+
+        timings_during_import = []
+
+        def import_course(*args, **kwargs):
+            """
+            Records the stage timings in the session while the course is imported.
+            """
+            timings_during_import.append(dict(self.client.session.get("import_stage_timings", {})))
+            return import_course_from_xml(*args, **kwargs)
+
+        with patch('contentstore.views.import_export.import_course_from_xml', side_effect=import_course):
+            with open(self.good_tar) as gtar:
+                resp = self.client.post(self.url, {"name": self.good_tar, "course-data": [gtar]})
+        self.assertEquals(resp.status_code, 200)
+        self.assertEqual(timings_during_import, [{}])
+
     def test_import_in_existing_course(self):
         """
         Check that course is imported successfully in existing course and users have their access roles
@@ -193,6 +193,11 @@ FEATURES = {
 
     # Show Language selector
     'SHOW_LANGUAGE_SELECTOR': False,
+
+    # Upon course publish, update the collected course block structures
+    # incrementally, re-collecting only the changed blocks, instead of
+    # clearing and fully re-collecting them.
+    'ENABLE_INCREMENTAL_BLOCK_STRUCTURE_COLLECT': False,
 }
 
 ENABLE_JASMINE = False
@@ -0,0 +1,138 @@
+"""
+Command to benchmark the memory used to serve large assets concurrently.
+"""
+from threading import Event, Thread
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+from opaque_keys.edx.keys import CourseKey
+import psutil
+
+from contentserver.middleware import StaticContentServer
+from xmodule.contentstore.content import StaticContent
+from xmodule.contentstore.django import contentstore
+
+BENCHMARK_COURSE_KEY = CourseKey.from_string('course-v1:edX+ContentServerBenchmark+2016')
+WRITE_CHUNK_SIZE = 1024 * 1024
+MEMORY_SAMPLING_INTERVAL = 0.01
+
+
+class BufferingStaticContentServer(StaticContentServer):
+    """
+    StaticContentServer that reads the data of assets into memory before
+    responding, for comparison.
+    """
+    def make_response(self, content, data):
+        return HttpResponse(data)
+
+
+class Command(BaseCommand):
+    """
+    Saves a large asset to the contentstore, and serves it to a number
+    of concurrent requests, first buffering each response in memory and
+    then streaming it.  Reports the time taken and the peak increase of
+    the resident memory of the process for each.
+
+    The asset is deleted from the contentstore afterwards.
+
+    Example usage:
+        $ ./manage.py lms benchmark_asset_streaming --settings=devstack
+        $ ./manage.py lms benchmark_asset_streaming --size 200 --concurrency 8 --settings=devstack
+    """
+    help = 'Benchmarks the memory used to serve large assets concurrently.'
+
+    def add_arguments(self, parser):
+        """
+        Entry point for subclassed commands to add custom arguments.
+        """
+        parser.add_argument(
+            '--size',
+            help='Size of the asset, in megabytes.',
+            type=int,
+            default=100,
+        )
+        parser.add_argument(
+            '--concurrency',
+            help='Number of concurrent requests for the asset.',
+            type=int,
+            default=4,
+        )
+
+    def handle(self, *args, **options):
+        asset_key = BENCHMARK_COURSE_KEY.make_asset_key('asset', 'benchmark.bin')
+        size = options['size'] * 1024 * 1024
+        contentstore().save(StaticContent(
+            asset_key, 'benchmark.bin', 'application/octet-stream', _generate_data(size),
+        ))
+        try:
+            self.stdout.write('Asset size: {} MB, concurrent requests: {}'.format(
+                options['size'], options['concurrency']
+            ))
+            self.stdout.write('{:<12} {:>12} {:>14} {:>16}'.format('mode', 'seconds', 'MB/sec', 'peak RSS (MB)'))
+            for mode, server in [('buffered', BufferingStaticContentServer()), ('streamed', StaticContentServer())]:
+                duration, peak_memory = _serve_concurrently(server, unicode(asset_key), options['concurrency'])
+                self.stdout.write('{:<12} {:>12.2f} {:>14.1f} {:>16.1f}'.format(
+                    mode,
+                    duration,
+                    options['size'] * options['concurrency'] / duration if duration else 0,
+                    peak_memory / 1024.0 / 1024.0,
+                ))
+        finally:
+            contentstore().delete(asset_key)
+
+
+def _generate_data(size):
+    """
+    Yields chunks of data of the given total size.
+    """
+    chunk = '0123456789abcdef' * (WRITE_CHUNK_SIZE / 16)
+    for offset in xrange(0, size, WRITE_CHUNK_SIZE):
+        yield chunk[:size - offset]
+
+
+def _serve_concurrently(server, asset_path, concurrency):
+    """
+    Serves the asset at the given path with the given server to the
+    given number of concurrent requests.
+
+    Returns the time taken, and the peak increase of the resident memory
+    of the process while serving, in bytes.
+    """
+    process = psutil.Process()
+    baseline_memory = process.get_memory_info().rss
+    peak_memory = [baseline_memory]
+    done = Event()
+
+    def sample_memory():
+        """
+        Records the peak resident memory until done.
+        """
+        while not done.wait(MEMORY_SAMPLING_INTERVAL):
+            peak_memory[0] = max(peak_memory[0], process.get_memory_info().rss)
+
+    def serve():
+        """
+        Serves the asset, consuming the response as a client would.
+        """
+        request = RequestFactory().get(asset_path)
+        request.user = AnonymousUser()
+        response = server.process_request(request)
+        for __ in (response.streaming_content if response.streaming else [response.content]):
+            pass
+
+    sampler = Thread(target=sample_memory)
+    sampler.start()
+    threads = [Thread(target=serve) for __ in xrange(concurrency)]
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.time() - start
+    done.set()
+    sampler.join()
+
+    return duration, peak_memory[0] - baseline_memory
@@ -0,0 +1,120 @@
+"""
+Command to benchmark the latency of range requests at the tail of a large asset.
+"""
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from contentserver.management.commands.benchmark_asset_streaming import BENCHMARK_COURSE_KEY, _generate_data
+from contentserver.middleware import StaticContentServer
+from xmodule.contentstore.content import StaticContent, StaticContentStream, STREAM_DATA_CHUNK_SIZE
+from xmodule.contentstore.django import contentstore
+
+
+class ByteAtATimeStaticContentStream(StaticContentStream):
+    """
+    StaticContentStream that reads ranges STREAM_DATA_CHUNK_SIZE bytes at a time, regardless of
+    GridFS chunk boundaries, for comparison.
+    """
+    def stream_data_in_range(self, first_byte, last_byte):
+        self._stream.seek(first_byte)
+        position = first_byte
+        while position <= last_byte:
+            chunk = self._stream.read(min(STREAM_DATA_CHUNK_SIZE, last_byte - position + 1))
+            position += STREAM_DATA_CHUNK_SIZE
+            yield chunk
+
+
+class UnalignedStaticContentServer(StaticContentServer):
+    """
+    StaticContentServer that serves ranges with ByteAtATimeStaticContentStream.
+    """
+    def load_asset_from_location(self, location):
+        content = super(UnalignedStaticContentServer, self).load_asset_from_location(location)
+        if isinstance(content, StaticContentStream):
+            content.__class__ = ByteAtATimeStaticContentStream
+        return content
+
+
+class Command(BaseCommand):
+    """
+    Saves a large asset to the contentstore, and times range requests for
+    the last bytes of the asset, as a video player seeking to the end of a
+    video would make, along with multiple range requests for the tail of
+    the asset.  Ranges are served reading the asset a kilobyte at a time,
+    and then reading it a GridFS chunk at a time.
+
+    The asset is deleted from the contentstore afterwards.
+
+    Example usage:
+        $ ./manage.py lms benchmark_range_requests --settings=devstack
+        $ ./manage.py lms benchmark_range_requests --size 500 --range-size 1024 --settings=devstack
+    """
+    help = 'Benchmarks the latency of range requests at the tail of a large asset.'
+
+    def add_arguments(self, parser):
+        """
+        Entry point for subclassed commands to add custom arguments.
+        """
+        parser.add_argument(
+            '--size',
+            help='Size of the asset, in megabytes.',
+            type=int,
+            default=200,
+        )
+        parser.add_argument(
+            '--range-size',
+            help='Size of each requested range, in kilobytes.',
+            type=int,
+            default=512,
+        )
+        parser.add_argument(
+            '--requests',
+            help='Number of requests of each kind.',
+            type=int,
+            default=20,
+        )
+
+    def handle(self, *args, **options):
+        asset_key = BENCHMARK_COURSE_KEY.make_asset_key('asset', 'benchmark.bin')
+        size = options['size'] * 1024 * 1024
+        range_size = options['range_size'] * 1024
+        contentstore().save(StaticContent(
+            asset_key, 'benchmark.bin', 'application/octet-stream', _generate_data(size),
+        ))
+        try:
+            range_headers = [
+                ('tail', 'bytes={}-'.format(size - range_size)),
+                ('multipart', 'bytes={}-{},{}-'.format(
+                    size - 3 * range_size, size - 2 * range_size - 1, size - range_size
+                )),
+            ]
+            self.stdout.write('Asset size: {} MB, range size: {} KB'.format(options['size'], options['range_size']))
+            self.stdout.write('{:<12} {:<12} {:>12} {:>12}'.format('reads', 'range', 'median ms', 'max ms'))
+            for mode, server in [('kilobyte', UnalignedStaticContentServer()), ('gridfs chunk', StaticContentServer())]:
+                for range_name, range_header in range_headers:
+                    latencies = sorted(
+                        _time_range_request(server, unicode(asset_key), range_header)
+                        for __ in xrange(options['requests'])
+                    )
+                    self.stdout.write('{:<12} {:<12} {:>12.1f} {:>12.1f}'.format(
+                        mode, range_name, latencies[len(latencies) // 2] * 1000, latencies[-1] * 1000,
+                    ))
+        finally:
+            contentstore().delete(asset_key)
+
+
+def _time_range_request(server, asset_path, range_header):
+    """
+    Returns the time taken to serve the given range of the asset at the
+    given path with the given server.
+    """
+    request = RequestFactory().get(asset_path, HTTP_RANGE=range_header)
+    request.user = AnonymousUser()
+    start = time.time()
+    response = server.process_request(request)
+    for __ in response.streaming_content:
+        pass
+    return time.time() - start
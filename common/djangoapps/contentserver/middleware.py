@@ -4,16 +4,18 @@ Middleware to serve assets.
 
 import logging
 import datetime
+from uuid import uuid4
 import newrelic.agent
 from django.http import (
     HttpResponse, HttpResponseNotModified, HttpResponseForbidden,
-    HttpResponseBadRequest, HttpResponseNotFound, HttpResponsePermanentRedirect)
+    HttpResponseBadRequest, HttpResponseNotFound, HttpResponsePermanentRedirect,
+    StreamingHttpResponse)
 from student.models import CourseEnrollment
 from contentserver.models import CourseAssetCacheTtlConfig, CdnUserAgentsConfig
 
 from header_control import force_header_for_response
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import StaticContent, XASSET_LOCATION_TAG
+from xmodule.contentstore.content import StaticContent, StaticContentStream, XASSET_LOCATION_TAG
 from xmodule.modulestore import InvalidLocationError
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locator import AssetLocator
@@ -62,12 +64,13 @@ class StaticContentServer(object):
             except (InvalidLocationError, InvalidKeyError):
                 return HttpResponseBadRequest()
 
-            # Attempt to load the asset to make sure it exists, and grab the asset digest
-            # if we're able to load it.
+            # Attempt to load the asset's metadata to make sure it exists, and grab the asset
+            # digest if we're able to load it.  The asset's data is only loaded once we know
+            # that it has to be sent.
             actual_digest = None
             try:
-                content = self.load_asset_from_location(loc)
-                actual_digest = content.content_digest
+                metadata = AssetManager.find_metadata(loc)
+                actual_digest = metadata.content_digest
             except (ItemNotFoundError, NotFoundError):
                 return HttpResponseNotFound()
 
@@ -93,27 +96,42 @@ class StaticContentServer(object):
             newrelic.agent.add_custom_parameter('contentserver.from_cdn', is_from_cdn)
 
             # Check if this content is locked or not.
-            locked = self.is_content_locked(content)
+            locked = self.is_content_locked(metadata)
             newrelic.agent.add_custom_parameter('contentserver.locked', locked)
 
             # Check that user has access to the content.
-            if not self.is_user_authorized(request, content, loc):
+            if not self.is_user_authorized(request, metadata, loc):
                 return HttpResponseForbidden('Unauthorized')
 
             # Figure out if the client sent us a conditional request, and let them know
-            # if this asset has changed since then.
-            last_modified_at_str = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
-            if 'HTTP_IF_MODIFIED_SINCE' in request.META:
+            # if this asset has changed since then.  If-None-Match takes precedence over
+            # If-Modified-Since.
+            # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.26
+            etag = get_etag(metadata)
+            if 'HTTP_IF_NONE_MATCH' in request.META:
+                if etag is not None and etag_matches(request.META['HTTP_IF_NONE_MATCH'], etag):
+                    response = HttpResponseNotModified()
+                    response['ETag'] = etag
+                    return response
+            elif 'HTTP_IF_MODIFIED_SINCE' in request.META:
+                last_modified_at_str = metadata.last_modified_at.strftime(HTTP_DATE_FORMAT)
                 if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
                 if if_modified_since == last_modified_at_str:
                     return HttpResponseNotModified()
 
+            try:
+                content = self.load_asset_from_location(loc)
+            except (ItemNotFoundError, NotFoundError):
+                return HttpResponseNotFound()
+
             # *** File streaming within a byte range ***
             # If a Range is provided, parse Range attribute of the request
             # Add Content-Range in the response if Range is structurally correct
             # Request -> Range attribute structure: "Range: bytes=first-[last]"
             # Response -> Content-Range attribute structure: "Content-Range: bytes first-last/totalLength"
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
+            # Multiple ranges are sent as a multipart/byteranges message.
+            # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
             response = None
             if request.META.get('HTTP_RANGE'):
                 # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
@@ -129,46 +147,51 @@ class StaticContentServer(object):
                         u"%s in Range header: %s for content: %s", exception.message, header_value, unicode(loc)
                     )
                 else:
+                    # Only the satisfiable byte ranges are sent.
+                    satisfiable_ranges = [
+                        (first, last) for first, last in ranges if 0 <= first <= last < content.length
+                    ]
                     if unit != 'bytes':
                         # Only accept ranges in bytes
                         log.warning(u"Unknown unit in Range header: %s for content: %s", header_value, unicode(loc))
-                    elif len(ranges) > 1:
-                        # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
-                        # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
-                        # But we send back the full content.
+                    elif not satisfiable_ranges:
                         log.warning(
-                            u"More than 1 ranges in Range header: %s for content: %s", header_value, unicode(loc)
+                            u"Cannot satisfy ranges in Range header: %s for content: %s", header_value, unicode(loc)
                         )
+                        return HttpResponse(status=416)  # Requested Range Not Satisfiable
+                    elif len(satisfiable_ranges) == 1:
+                        first, last = satisfiable_ranges[0]
+                        response = self.make_response(content, content.stream_data_in_range(first, last))
+                        response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(
+                            first=first, last=last, length=content.length
+                        )
+                        response['Content-Length'] = str(last - first + 1)
+                        response['Content-Type'] = content.content_type
+                        response.status_code = 206  # Partial Content
+
+                        newrelic.agent.add_custom_parameter('contentserver.ranged', True)
                     else:
-                        first, last = ranges[0]
-
-                        if 0 <= first <= last < content.length:
-                            # If the byte range is satisfiable
-                            response = HttpResponse(content.stream_data_in_range(first, last))
-                            response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(
-                                first=first, last=last, length=content.length
-                            )
-                            response['Content-Length'] = str(last - first + 1)
-                            response.status_code = 206  # Partial Content
-
-                            newrelic.agent.add_custom_parameter('contentserver.ranged', True)
-                        else:
-                            log.warning(
-                                u"Cannot satisfy ranges in Range header: %s for content: %s", header_value, unicode(loc)
-                            )
-                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
+                        boundary = uuid4().hex
+                        data, length = multipart_byteranges(content, satisfiable_ranges, boundary)
+                        response = self.make_response(content, data)
+                        response['Content-Length'] = str(length)
+                        response['Content-Type'] = 'multipart/byteranges; boundary={}'.format(boundary)
+                        response.status_code = 206  # Partial Content
+
+                        newrelic.agent.add_custom_parameter('contentserver.ranged', True)
+                        newrelic.agent.add_custom_parameter('contentserver.multiple_ranges', True)
 
             # If Range header is absent or syntactically invalid return a full content response.
             if response is None:
-                response = HttpResponse(content.stream_data())
+                response = self.make_response(content, content.stream_data())
                 response['Content-Length'] = content.length
+                response['Content-Type'] = content.content_type
 
             newrelic.agent.add_custom_parameter('contentserver.content_len', content.length)
             newrelic.agent.add_custom_parameter('contentserver.content_type', content.content_type)
 
             # "Accept-Ranges: bytes" tells the user that only "bytes" ranges are allowed
             response['Accept-Ranges'] = 'bytes'
-            response['Content-Type'] = content.content_type
 
             # Set any caching headers, and do any response cleanup needed.  Based on how much
             # middleware we have in place, there's no easy way to use the built-in Django
@@ -178,6 +201,17 @@ class StaticContentServer(object):
 
             return response
 
+    def make_response(self, content, data):
+        """
+        Returns a response with the given data of the given content.
+
+        The data of a StaticContentStream is streamed to the client, one
+        chunk at a time, rather than being read into memory first.
+        """
+        if isinstance(content, StaticContentStream):
+            return StreamingHttpResponse(data)
+        return HttpResponse(data)
+
     def set_caching_headers(self, content, response):
         """
         Sets caching headers based on whether or not the asset is locked.
@@ -202,6 +236,9 @@ class StaticContentServer(object):
             response['Cache-Control'] = "private, no-cache, no-store"
 
         response['Last-Modified'] = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
+        etag = get_etag(content)
+        if etag is not None:
+            response['ETag'] = etag
 
         # Force the Vary header to only vary responses on Origin, so that XHR and browser requests get cached
         # separately and don't screw over one another. i.e. a browser request that doesn't send Origin, and
@@ -264,7 +301,9 @@ class StaticContentServer(object):
         # See if we can load this item from cache.
         content = get_cached_content(location)
         if content is None:
-            # Not in cache, so just try and load it from the asset manager.
+            # Not in cache, so just try and load it from the asset manager.  As a stream,
+            # only the asset's metadata is loaded here; its data is only read from the
+            # contentstore as it is streamed to the client.
             try:
                 content = AssetManager.find(location, as_stream=True)
             except (ItemNotFoundError, NotFoundError):
@@ -280,6 +319,70 @@ class StaticContentServer(object):
         return content
 
 
+def get_etag(content):
+    """
+    Returns the entity tag of the given content, based on its digest, or None if it has no digest.
+    """
+    if not content.content_digest:
+        return None
+    return '"{}"'.format(content.content_digest)
+
+
+def etag_matches(header_value, etag):
+    """
+    Returns whether the given If-None-Match header value matches the given entity tag.
+
+    See spec for details: http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.26
+    """
+    for tag in header_value.split(','):
+        tag = tag.strip()
+        # For GET requests, weak entity tags match as well.
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == '*' or tag == etag:
+            return True
+    return False
+
+
+def multipart_byteranges(content, ranges, boundary):
+    """
+    Returns an iterator over the multipart/byteranges message with the given byte ranges of the
+    given content, separated by the given boundary, along with the length of the message.
+
+    See spec for details: http://www.w3.org/Protocols/rfc2616/rfc2616-sec19.html#sec19.2
+    """
+    part_header_format = (
+        u'\r\n--{boundary}\r\n'
+        u'Content-Type: {content_type}\r\n'
+        u'Content-Range: bytes {first}-{last}/{length}\r\n'
+        u'\r\n'
+    )
+    part_headers = [
+        part_header_format.format(
+            boundary=boundary, content_type=content.content_type, first=first, last=last, length=content.length
+        ).encode('utf-8')
+        for first, last in ranges
+    ]
+    closing_boundary = '\r\n--{boundary}--\r\n'.format(boundary=boundary)
+
+    def iterate_parts():
+        """
+        Yields the parts of the message, streaming the data of each range.
+        """
+        for part_header, (first, last) in zip(part_headers, ranges):
+            yield part_header
+            for chunk in content.stream_data_in_range(first, last):
+                yield chunk
+        yield closing_boundary
+
+    length = (
+        sum(len(part_header) for part_header in part_headers) +
+        sum(last - first + 1 for first, last in ranges) +
+        len(closing_boundary)
+    )
+    return iterate_parts(), length
+
+
 def parse_range_header(header_value, content_length):
     """
     Returns the unit and a list of (start, end) tuples of ranges.
@@ -24,7 +24,7 @@ from xmodule.assetstore.assetmgr import AssetManager
 from opaque_keys import InvalidKeyError
 from xmodule.modulestore.exceptions import ItemNotFoundError
 
-from contentserver.middleware import parse_range_header, HTTP_DATE_FORMAT, StaticContentServer
+from contentserver.middleware import etag_matches, parse_range_header, HTTP_DATE_FORMAT, StaticContentServer
 from student.models import CourseEnrollment
 from student.tests.factories import UserFactory, AdminFactory
 
@@ -84,6 +84,14 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
         cls.url_unlocked_versioned = get_versioned_asset_url(cls.url_unlocked)
         cls.length_unlocked = cls.contentstore.get_attr(cls.unlocked_asset, 'length')
 
+        # A large asset, which is too large to be cached and is streamed
+        cls.large_asset = cls.course_key.make_asset_key('asset', 'large_static.bin')
+        cls.url_large = unicode(cls.large_asset)
+        cls.large_data = '0123456789abcdef' * 128 * 1024
+        cls.contentstore.save(
+            StaticContent(cls.large_asset, 'large_static.bin', 'application/octet-stream', cls.large_data)
+        )
+
     def setUp(self):
         """
         Create user and login.
@@ -204,18 +212,76 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
             first=first_byte, last=last_byte, length=self.length_unlocked))
         self.assertEqual(resp['Content-Length'], str(last_byte - first_byte + 1))
 
+    def test_large_asset_streamed(self):
+        """
+        Test that large assets are streamed rather than read into memory.
+        """
+        resp = self.client.get(self.url_large)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        self.assertEqual(resp['Content-Length'], str(len(self.large_data)))
+        self.assertEqual(''.join(resp.streaming_content), self.large_data)
+
+    def test_range_request_large_asset_streamed(self):
+        """
+        Test that a range request for a large asset is streamed.
+        """
+        first_byte = 100
+        last_byte = 1024 * 1024 + 100
+        resp = self.client.get(self.url_large, HTTP_RANGE='bytes={first}-{last}'.format(
+            first=first_byte, last=last_byte))
+
+        self.assertEqual(resp.status_code, 206)  # HTTP_206_PARTIAL_CONTENT
+        self.assertTrue(resp.streaming)
+        self.assertEqual(''.join(resp.streaming_content), self.large_data[first_byte:last_byte + 1])
+
     def test_range_request_multiple_ranges(self):
         """
-        Test that multiple ranges in request outputs the full content.
+        Test that multiple ranges in request output a multipart/byteranges message with each range.
         """
         first_byte = self.length_unlocked / 4
         last_byte = self.length_unlocked / 2
         resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-{last}, -100'.format(
             first=first_byte, last=last_byte))
 
-        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.status_code, 206)  # HTTP_206_PARTIAL_CONTENT
         self.assertNotIn('Content-Range', resp)
-        self.assertEqual(resp['Content-Length'], str(self.length_unlocked))
+        content_type, boundary = resp['Content-Type'].split('; boundary=')
+        self.assertEqual(content_type, 'multipart/byteranges')
+
+        body = ''.join(resp.streaming_content)
+        self.assertEqual(resp['Content-Length'], str(len(body)))
+        data = self.contentstore.find(self.unlocked_asset).data
+        expected_ranges = [(first_byte, last_byte), (self.length_unlocked - 100, self.length_unlocked - 1)]
+        parts = body.split('\r\n--{}'.format(boundary))
+        self.assertEqual(parts[0], '')
+        self.assertEqual(parts[-1], '--\r\n')
+        self.assertEqual(len(parts), len(expected_ranges) + 2)
+        for part, (first, last) in zip(parts[1:-1], expected_ranges):
+            headers, part_data = part.split('\r\n\r\n', 1)
+            self.assertIn('Content-Type: text/plain', headers)
+            self.assertIn(
+                'Content-Range: bytes {first}-{last}/{length}'.format(
+                    first=first, last=last, length=self.length_unlocked
+                ),
+                headers
+            )
+            self.assertEqual(part_data, data[first:last + 1])
+
+    def test_range_request_multiple_ranges_unsatisfiable(self):
+        """
+        Test that unsatisfiable ranges are left out of a multiple range response, and that
+        a request with only unsatisfiable ranges outputs 416 Requested Range Not Satisfiable.
+        """
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-9, {first}-'.format(
+            first=self.length_unlocked))
+        self.assertEqual(resp.status_code, 206)  # HTTP_206_PARTIAL_CONTENT
+        self.assertEqual(resp['Content-Range'], 'bytes 0-9/{length}'.format(length=self.length_unlocked))
+
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-, {first}-'.format(
+            first=self.length_unlocked))
+        self.assertEqual(resp.status_code, 416)
 
     @ddt.data(
         'bytes 0-',
@@ -249,6 +315,58 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
             first=(self.length_unlocked), last=(self.length_unlocked)))
         self.assertEqual(resp.status_code, 416)
 
+    def test_etag_header_sent(self):
+        """
+        Tests that the ETag header is set from the digest of the asset.
+        """
+        resp = self.client.get(self.url_unlocked)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp['ETag'], '"{}"'.format(self.contentstore.get_attr(self.unlocked_asset, 'md5')))
+
+    @ddt.data('"{etag}"', 'W/"{etag}"', '"other", "{etag}"', '*')
+    def test_if_none_match(self, header_value):
+        """
+        Tests that a conditional request with a matching ETag gets a 304 without loading the asset's data.
+        """
+        etag = self.contentstore.get_attr(self.unlocked_asset, 'md5')
+        with patch.object(StaticContentServer, 'load_asset_from_location') as mock_load_asset:
+            resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=header_value.format(etag=etag))
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp['ETag'], '"{}"'.format(etag))
+        self.assertFalse(mock_load_asset.called)
+
+    def test_if_none_match_changed(self):
+        """
+        Tests that a conditional request with a different ETag gets the asset, even if it was not modified
+        since the If-Modified-Since date.
+        """
+        last_modified_at = self.contentstore.get_attr(self.unlocked_asset, 'uploadDate')
+        resp = self.client.get(
+            self.url_unlocked,
+            HTTP_IF_NONE_MATCH='"{}"'.format(FAKE_MD5_HASH),
+            HTTP_IF_MODIFIED_SINCE=last_modified_at.strftime(HTTP_DATE_FORMAT),
+        )
+        self.assertEqual(resp.status_code, 200)
+
+    def test_if_modified_since(self):
+        """
+        Tests that a conditional request for an asset that was not modified gets a 304.
+        """
+        last_modified_at = self.contentstore.get_attr(self.unlocked_asset, 'uploadDate')
+        resp = self.client.get(self.url_unlocked, HTTP_IF_MODIFIED_SINCE=last_modified_at.strftime(HTTP_DATE_FORMAT))
+        self.assertEqual(resp.status_code, 304)
+
+    def test_checks_without_asset_data(self):
+        """
+        Tests that redirects to the versioned URL and lock checks do not load the asset's data.
+        """
+        url_unlocked_versioned_old = StaticContent.add_version_to_asset_path(self.url_unlocked, FAKE_MD5_HASH)
+        self.client.logout()
+        with patch.object(StaticContentServer, 'load_asset_from_location') as mock_load_asset:
+            self.assertEqual(self.client.get(url_unlocked_versioned_old).status_code, 301)
+            self.assertEqual(self.client.get(self.url_locked).status_code, 403)
+        self.assertFalse(mock_load_asset.called)
+
     def test_vary_header_sent(self):
         """
         Tests that we're properly setting the Vary header to ensure browser requests don't get
@@ -411,3 +529,22 @@ class ParseRangeHeaderTestCase(unittest.TestCase):
         self.assertRaisesRegexp(
             exception_class, exception_message_regex, parse_range_header, header_value, self.content_length
         )
+
+
+@ddt.ddt
+class EtagMatchesTestCase(unittest.TestCase):
+    """
+    Tests for the etag_matches function.
+    """
+    @ddt.data(
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"xyz", "abc"', True),
+        ('*', True),
+        ('"xyz"', False),
+        ('abc', False),
+        ('', False),
+    )
+    @ddt.unpack
+    def test_etag_matches(self, header_value, expected):
+        self.assertEqual(etag_matches(header_value, '"abc"'), expected)
@@ -14,7 +14,7 @@ DISPLAY_AUDIT = "audit"
 DISPLAY_PROFESSIONAL = "professional"
 
 
-def enrollment_mode_display(mode, verification_status, course_id):
+def enrollment_mode_display(mode, verification_status, course_id, modes=None):
     """ Select appropriate display strings and CSS classes.
 
         Uses mode and verification status to select appropriate display strings and CSS classes
@@ -23,6 +23,8 @@ def enrollment_mode_display(mode, verification_status, course_id):
         Args:
             mode (str): enrollment mode.
             verification_status (str) : verification status of student
+            modes (list of `Mode`): If provided, the non-expired modes of the course,
+                to avoid a database query.
 
         Returns:
             dictionary:
@@ -31,7 +33,7 @@ def enrollment_mode_display(mode, verification_status, course_id):
     image_alt = ''
     enrollment_title = ''
     enrollment_value = ''
-    display_mode = _enrollment_mode_display(mode, verification_status, course_id)
+    display_mode = _enrollment_mode_display(mode, verification_status, course_id, modes)
 
     if display_mode == DISPLAY_VERIFIED:
         if verification_status in [VERIFY_STATUS_NEED_TO_VERIFY, VERIFY_STATUS_SUBMITTED]:
@@ -56,20 +58,23 @@ def enrollment_mode_display(mode, verification_status, course_id):
         'enrollment_value': unicode(enrollment_value),
         'show_image': show_image,
         'image_alt': unicode(image_alt),
-        'display_mode': _enrollment_mode_display(mode, verification_status, course_id)
+        'display_mode': display_mode
     }
 
 
-def _enrollment_mode_display(enrollment_mode, verification_status, course_id):
+def _enrollment_mode_display(enrollment_mode, verification_status, course_id, modes=None):
     """Checking enrollment mode and status and returns the display mode
      Args:
         enrollment_mode (str): enrollment mode.
         verification_status (str) : verification status of student
+        modes (list of `Mode`): If provided, the non-expired modes of the course.
 
     Returns:
         display_mode (str) : display mode for certs
     """
-    course_mode_slugs = [mode.slug for mode in CourseMode.modes_for_course(course_id)]
+    if modes is None:
+        modes = CourseMode.modes_for_course(course_id)
+    course_mode_slugs = [mode.slug for mode in modes]
 
     if enrollment_mode == CourseMode.VERIFIED:
         if verification_status in [VERIFY_STATUS_NEED_TO_VERIFY, VERIFY_STATUS_SUBMITTED, VERIFY_STATUS_APPROVED]:
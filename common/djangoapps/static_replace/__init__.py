@@ -5,6 +5,7 @@ from django.contrib.staticfiles.storage import staticfiles_storage
 from django.contrib.staticfiles import finders
 from django.conf import settings
 
+import request_cache
 from static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore import ModuleStoreEnum
@@ -14,6 +15,15 @@ from opaque_keys.edx.locator import AssetLocator
 
 log = logging.getLogger(__name__)
 
+# Name of the request cache holding the asset url configuration
+ASSET_URL_CONFIG_CACHE_NAME = 'static_replace.asset_url_config'
+
+# Maximum number of staticfiles_storage lookups remembered by the process
+STATICFILES_LOOKUP_CACHE_SIZE = 10000
+
+# Compiled patterns of _all_urls_replace_regex, by STATIC_URL and arguments
+_all_urls_replace_regexes = {}
+
 
 def _url_replace_regex(prefix):
     """
@@ -31,13 +41,122 @@ def _url_replace_regex(prefix):
         """.format(prefix=prefix)
 
 
+def _all_urls_replace_regex(data_dir, course_urls, jump_to_id_urls):
+    """
+    Match the static urls that process_static_urls would match along with,
+    if asked for, the /course/ and /jump_to_id/ urls, all in one pattern.
+
+    The matched prefix is also captured by one of the 'course', 'jump_to_id'
+    or 'static' groups, according to the kind of url.
+    """
+    key = (settings.STATIC_URL, data_dir, course_urls, jump_to_id_urls)
+    regex = _all_urls_replace_regexes.get(key)
+    if regex is None:
+        prefixes = [u'(?P<static>(?:{static_url}|/static/)(?!{data_dir}))'.format(
+            static_url=settings.STATIC_URL,
+            data_dir=data_dir
+        )]
+        if course_urls:
+            prefixes.append(u'(?P<course>/course/)')
+        if jump_to_id_urls:
+            prefixes.append(u'(?P<jump_to_id>/jump_to_id/)')
+        regex = re.compile(_url_replace_regex(u'|'.join(prefixes)))
+        _all_urls_replace_regexes[key] = regex
+    return regex
+
+
+class _StaticfilesLookupCache(object):
+    """
+    Remembers the results of staticfiles_storage existence checks and url
+    lookups, which touch the filesystem or the collectstatic manifest.
+
+    Collected static files don't change while a process runs, so results are
+    kept until the cache fills up or a different staticfiles_storage is in use
+    (as when tests patch it).  Nothing is remembered in DEBUG mode, where
+    static files are served from the source tree and may be edited at any time.
+    Lookups that raise are not remembered.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._storage = None
+        self._results = {}
+
+    def clear(self):
+        """
+        Forget all remembered lookups.
+        """
+        self._results = {}
+
+    def lookup(self, method_name, path):
+        """
+        Return the result of calling the named method of staticfiles_storage with path.
+        """
+        storage = staticfiles_storage
+        if settings.DEBUG:
+            return getattr(storage, method_name)(path)
+
+        if storage is not self._storage:
+            self._storage = storage
+            self._results = {}
+
+        key = (method_name, path)
+        try:
+            return self._results[key]
+        except KeyError:
+            pass
+
+        result = getattr(storage, method_name)(path)
+        if len(self._results) >= self.max_size:
+            self._results = {}
+        self._results[key] = result
+        return result
+
+
+_staticfiles_lookups = _StaticfilesLookupCache(STATICFILES_LOOKUP_CACHE_SIZE)
+
+
+def clear_staticfiles_lookup_cache():
+    """
+    Forget the staticfiles_storage lookups remembered by this process.
+    """
+    _staticfiles_lookups.clear()
+
+
+def _staticfiles_exists(path):
+    """
+    Return whether path exists in staticfiles_storage.
+    """
+    return _staticfiles_lookups.lookup('exists', path)
+
+
+def _staticfiles_url(path):
+    """
+    Return the url of path in staticfiles_storage.
+    """
+    return _staticfiles_lookups.lookup('url', path)
+
+
+def _get_asset_url_config():
+    """
+    Return the base url and the excluded extensions used to canonicalize
+    course asset paths, reading their configuration at most once per request.
+    """
+    cache = request_cache.get_cache(ASSET_URL_CONFIG_CACHE_NAME)
+    if 'config' not in cache:
+        cache['config'] = (
+            AssetBaseUrlConfig.get_base_url(),
+            AssetExcludedExtensionsConfig.get_excluded_extensions(),
+        )
+    return cache['config']
+
+
 def try_staticfiles_lookup(path):
     """
     Try to lookup a path in staticfiles_storage.  If it fails, return
     a dead link instead of raising an exception.
     """
     try:
-        url = staticfiles_storage.url(path)
+        url = _staticfiles_url(path)
     except Exception as err:
         log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
             path, str(err)))
@@ -138,6 +257,59 @@ def make_static_urls_absolute(request, html):
     )
 
 
+def _replace_static_url(original, prefix, quote, rest, data_directory, course_id, static_asset_path):
+    """
+    Replace a single static url matched by process_static_urls, as
+    described by replace_static_urls.
+    """
+    # Don't mess with things that end in '?raw'
+    if rest.endswith('?raw'):
+        return original
+
+    # In debug mode, if we can find the url as is,
+    if settings.DEBUG and finders.find(rest, True):
+        return original
+    # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
+    elif (not static_asset_path) and course_id:
+        # first look in the static file pipeline and see if we are trying to reference
+        # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
+
+        exists_in_staticfiles_storage = False
+        try:
+            exists_in_staticfiles_storage = _staticfiles_exists(rest)
+        except Exception as err:
+            log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
+                rest, str(err)))
+
+        if exists_in_staticfiles_storage:
+            url = _staticfiles_url(rest)
+        else:
+            # if not, then assume it's courseware specific content and then look in the
+            # Mongo-backed database
+            base_url, excluded_exts = _get_asset_url_config()
+            url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
+
+            if AssetLocator.CANONICAL_NAMESPACE in url:
+                url = url.replace('block@', 'block/', 1)
+
+    # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
+    else:
+        course_path = "/".join((static_asset_path or data_directory, rest))
+
+        try:
+            if _staticfiles_exists(rest):
+                url = _staticfiles_url(rest)
+            else:
+                url = _staticfiles_url(course_path)
+        # And if that fails, assume that it's course content, and add manually data directory
+        except Exception as err:
+            log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
+                rest, str(err)))
+            url = "".join([prefix, course_path])
+
+    return "".join([quote, url, quote])
+
+
 def replace_static_urls(text, data_directory=None, course_id=None, static_asset_path=''):
     """
     Replace /static/$stuff urls either with their correct url as generated by collectstatic,
@@ -155,52 +327,40 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
         """
         Replace a single matched url.
         """
-        # Don't mess with things that end in '?raw'
-        if rest.endswith('?raw'):
-            return original
-
-        # In debug mode, if we can find the url as is,
-        if settings.DEBUG and finders.find(rest, True):
-            return original
-        # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
-        elif (not static_asset_path) and course_id:
-            # first look in the static file pipeline and see if we are trying to reference
-            # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
-
-            exists_in_staticfiles_storage = False
-            try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
-            except Exception as err:
-                log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
-                    rest, str(err)))
-
-            if exists_in_staticfiles_storage:
-                url = staticfiles_storage.url(rest)
-            else:
-                # if not, then assume it's courseware specific content and then look in the
-                # Mongo-backed database
-                base_url = AssetBaseUrlConfig.get_base_url()
-                excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
-                url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
+        return _replace_static_url(original, prefix, quote, rest, data_directory, course_id, static_asset_path)
 
-                if AssetLocator.CANONICAL_NAMESPACE in url:
-                    url = url.replace('block@', 'block/', 1)
+    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
 
-        # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
-        else:
-            course_path = "/".join((static_asset_path or data_directory, rest))
 
-            try:
-                if staticfiles_storage.exists(rest):
-                    url = staticfiles_storage.url(rest)
-                else:
-                    url = staticfiles_storage.url(course_path)
-            # And if that fails, assume that it's course content, and add manually data directory
-            except Exception as err:
-                log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
-                    rest, str(err)))
-                url = "".join([prefix, course_path])
+def replace_all_urls(text, data_directory=None, course_id=None, static_asset_path='', jump_to_id_base_url=None):
+    """
+    Replace /static/, /course/ and /jump_to_id/ urls in a single scan of the text,
+    giving the same result as replace_static_urls, replace_course_urls and
+    replace_jump_to_id_urls run one after the other.
 
-        return "".join([quote, url, quote])
+    text: The source text to do the substitution in
+    data_directory, course_id, static_asset_path: As for replace_static_urls
+    jump_to_id_base_url: As for replace_jump_to_id_urls
 
-    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+    /course/ urls are left alone if course_id is None, and /jump_to_id/ urls
+    are left alone if jump_to_id_base_url is None.
+    """
+    data_dir = static_asset_path or data_directory
+    course_url_base = '/courses/' + course_id.to_deprecated_string() + '/' if course_id else None
+
+    def replace_url(match):
+        """
+        Replace a single matched url, according to its kind.
+        """
+        quote = match.group('quote')
+        rest = match.group('rest')
+        if match.group('static') is None:
+            if course_url_base is not None and match.group('course') is not None:
+                return "".join([quote, course_url_base, rest, quote])
+            return "".join([quote, jump_to_id_base_url + rest, quote])
+        return _replace_static_url(
+            match.group(0), match.group('prefix'), quote, rest, data_directory, course_id, static_asset_path
+        )
+
+    regex = _all_urls_replace_regex(data_dir, course_url_base is not None, jump_to_id_base_url is not None)
+    return regex.sub(replace_url, text)
@@ -10,14 +10,17 @@ from PIL import Image
 from cStringIO import StringIO
 from nose.tools import assert_equals, assert_true, assert_false  # pylint: disable=no-name-in-module
 from static_replace import (
+    replace_all_urls,
     replace_static_urls,
     replace_course_urls,
+    replace_jump_to_id_urls,
     _url_replace_regex,
     process_static_urls,
     make_static_urls_absolute
 )
 from mock import patch, Mock
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from request_cache.middleware import RequestCache
 from xmodule.contentstore.content import StaticContent
 from xmodule.contentstore.django import contentstore
 from xmodule.modulestore import ModuleStoreEnum
@@ -122,6 +125,7 @@ def test_mongo_filestore(mock_get_excluded_extensions, mock_get_base_url, mock_m
     mock_static_content.get_canonicalized_asset_path.return_value = "c4x://mock_url"
     mock_get_base_url.return_value = u''
     mock_get_excluded_extensions.return_value = ['foobar']
+    RequestCache.clear_request_cache()
 
     # No namespace => no change to path
     assert_equals('"/static/data_dir/file.png"', replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY))
@@ -176,6 +180,82 @@ def test_static_url_with_query(mock_modulestore, mock_storage):
     assert_equals(post_text, replace_static_urls(pre_text, DATA_DIRECTORY, COURSE_KEY))
 
 
+@patch('static_replace.staticfiles_storage', autospec=True)
+def test_storage_lookups_remembered(mock_storage):
+    mock_storage.exists.return_value = True
+    mock_storage.url.return_value = '/static/file.abc123.png'
+
+    for __ in range(3):
+        assert_equals('"/static/file.abc123.png"', replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY))
+    mock_storage.exists.assert_called_once_with('file.png')
+    mock_storage.url.assert_called_once_with('file.png')
+
+
+@patch('static_replace.StaticContent', autospec=True)
+@patch('static_replace.staticfiles_storage', autospec=True)
+@patch('static_replace.AssetBaseUrlConfig.get_base_url')
+@patch('static_replace.AssetExcludedExtensionsConfig.get_excluded_extensions')
+def test_asset_url_config_read_once_per_request(
+        mock_get_excluded_extensions, mock_get_base_url, mock_storage, mock_static_content
+):
+    mock_storage.exists.return_value = False
+    mock_static_content.get_canonicalized_asset_path.return_value = "c4x://mock_url"
+    mock_get_base_url.return_value = u'cdn'
+    mock_get_excluded_extensions.return_value = ['.html']
+    RequestCache.clear_request_cache()
+
+    text = '"/static/one.png" "/static/two.png"'
+    replace_static_urls(text, DATA_DIRECTORY, course_id=COURSE_KEY)
+    replace_static_urls(text, DATA_DIRECTORY, course_id=COURSE_KEY)
+    assert_equals(mock_get_base_url.call_count, 1)
+    assert_equals(mock_get_excluded_extensions.call_count, 1)
+    mock_static_content.get_canonicalized_asset_path.assert_called_with(COURSE_KEY, 'two.png', u'cdn', ['.html'])
+
+    RequestCache.clear_request_cache()
+    replace_static_urls(text, DATA_DIRECTORY, course_id=COURSE_KEY)
+    assert_equals(mock_get_base_url.call_count, 2)
+    assert_equals(mock_get_excluded_extensions.call_count, 2)
+
+
+@patch('static_replace.StaticContent', autospec=True)
+@patch('static_replace.staticfiles_storage', autospec=True)
+@patch('static_replace.AssetBaseUrlConfig.get_base_url', Mock(return_value=u''))
+@patch('static_replace.AssetExcludedExtensionsConfig.get_excluded_extensions', Mock(return_value=[]))
+def test_replace_all_urls(mock_storage, mock_static_content):
+    mock_storage.exists.side_effect = lambda path: path == 'common.js'
+    mock_storage.url.side_effect = lambda path: '/static/hashed/' + path
+    mock_static_content.get_canonicalized_asset_path.side_effect = (
+        lambda course_id, path, base_url, excluded_exts: '/c4x/org/course/asset/' + path
+    )
+    jump_to_id_base_url = '/courses/org/course/run/jump_to_id/'
+    text = (
+        '<script src="/static/common.js"></script>'
+        '<img src=\'/static/file.png\'/>'
+        '<a href="/static/file.png?raw">raw</a>'
+        '<a href="/static/data_dir/file.png">data dir</a>'
+        '<a href=\'/course/info\'>info</a>'
+        '<a href="/jump_to_id/abc123">jump</a>'
+        '<a href="/not-static/file.png">elsewhere</a>'
+    )
+
+    expected = replace_jump_to_id_urls(
+        replace_course_urls(replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY), COURSE_KEY),
+        COURSE_KEY,
+        jump_to_id_base_url,
+    )
+    assert_true('"/static/hashed/common.js"' in expected)
+    assert_true("'/c4x/org/course/asset/file.png'" in expected)
+    assert_true("'/courses/org/course/run/info'" in expected)
+    assert_true('"/courses/org/course/run/jump_to_id/abc123"' in expected)
+    assert_equals(
+        expected,
+        replace_all_urls(text, DATA_DIRECTORY, COURSE_KEY, jump_to_id_base_url=jump_to_id_base_url)
+    )
+
+    # Without a course or a jump_to_id base url, only static urls are replaced
+    assert_equals(replace_static_urls(text, DATA_DIRECTORY), replace_all_urls(text, DATA_DIRECTORY))
+
+
 def test_regex():
     yes = ('"/static/foo.png"',
            '"/static/foo.png"',
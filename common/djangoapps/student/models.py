@@ -1422,11 +1422,35 @@ class CourseEnrollment(models.Model):
     def enrollments_for_user(cls, user):
         return cls.objects.filter(user=user, is_active=1)
 
-    def is_paid_course(self):
+    @classmethod
+    def enrollments_for_user_with_overviews_preload(cls, user):  # pylint: disable=invalid-name
+        """
+        Returns a list of the active CourseEnrollments of the given user,
+        with their CourseOverviews and attributes loaded in bulk.
+
+        CourseOverviews are otherwise loaded one at a time by the
+        `course_overview` property, which makes an extra query for every
+        enrollment on pages such as the student dashboard.  Enrollments
+        whose CourseOverview could not be preloaded fall back to that
+        property.
+        """
+        enrollments = list(cls.enrollments_for_user(user).prefetch_related('attributes'))
+        course_overviews = CourseOverview.get_from_ids_if_exists(
+            enrollment.course_id for enrollment in enrollments
+        )
+        for enrollment in enrollments:
+            enrollment._course_overview = course_overviews.get(enrollment.course_id)  # pylint: disable=protected-access
+        return enrollments
+
+    def is_paid_course(self, modes_dict=None):
         """
         Returns True, if course is paid
+
+        Keyword Arguments:
+            modes_dict (dict): If provided, use these course modes.
+                Useful for avoiding unnecessary database queries.
         """
-        paid_course = CourseMode.is_white_label(self.course_id)
+        paid_course = CourseMode.is_white_label(self.course_id, modes_dict=modes_dict)
         if paid_course or CourseMode.is_professional_slug(self.mode):
             return True
 
@@ -1446,10 +1470,18 @@ class CourseEnrollment(models.Model):
         """Changes this `CourseEnrollment` record's mode to `mode`.  Saves immediately."""
         self.update_enrollment(mode=mode)
 
-    def refundable(self):
+    def refundable(self, user_already_has_certs_for=None, modes=None):
         """
         For paid/verified certificates, students may receive a refund if they have
         a verified certificate and the deadline for refunds has not yet passed.
+
+        Keyword Arguments:
+            user_already_has_certs_for (set of `CourseKey`): If provided, the
+                courses the user has a certificate for.  This can be used to
+                avoid a database query per enrollment if you have already
+                loaded the user's certificates.
+            modes (list of `Mode`): If provided, the non-expired modes of
+                the course, to avoid an additional database query.
         """
         # In order to support manual refunds past the deadline, set can_refund on this object.
         # On unenrolling, the "UNENROLL_DONE" signal calls CertificateItem.refund_cert_callback(),
@@ -1460,7 +1492,10 @@ class CourseEnrollment(models.Model):
             return True
 
         # If the student has already been given a certificate they should not be refunded
-        if GeneratedCertificate.certificate_for_student(self.user, self.course_id) is not None:
+        if user_already_has_certs_for is not None:
+            if self.course_id in user_already_has_certs_for:
+                return False
+        elif GeneratedCertificate.certificate_for_student(self.user, self.course_id) is not None:
             return False
 
         # If it is after the refundable cutoff date they should not be refunded.
@@ -1468,7 +1503,7 @@ class CourseEnrollment(models.Model):
         if refund_cutoff_date and datetime.now(UTC) > refund_cutoff_date:
             return False
 
-        course_mode = CourseMode.mode_for_course(self.course_id, 'verified')
+        course_mode = CourseMode.mode_for_course(self.course_id, 'verified', modes=modes)
         if course_mode is None:
             return False
         else:
@@ -1476,12 +1511,18 @@ class CourseEnrollment(models.Model):
 
     def refund_cutoff_date(self):
         """ Calculate and return the refund window end date. """
-        try:
-            attribute = self.attributes.get(namespace='order', name='order_number')
-        except ObjectDoesNotExist:
+        # Look through all the attributes rather than querying for the order number,
+        # so that attributes prefetched along with the enrollment are used.
+        order_number = next(
+            (
+                attribute.value for attribute in self.attributes.all()
+                if attribute.namespace == 'order' and attribute.name == 'order_number'
+            ),
+            None
+        )
+        if order_number is None:
             return None
 
-        order_number = attribute.value
         order = ecommerce_api_client(self.user).orders(order_number).get()
         refund_window_start_date = max(
             datetime.strptime(order['date_placed'], ECOMMERCE_DATE_FORMAT),
@@ -14,6 +14,7 @@ from django.test.client import Client
 from django.test.utils import override_settings
 from mock import patch
 
+from course_modes.models import CourseMode
 from student.models import CourseEnrollment, CourseEnrollmentAttribute
 from student.tests.factories import UserFactory, CourseModeFactory
 from xmodule.modulestore.tests.factories import CourseFactory
@@ -112,6 +113,17 @@ class RefundableTest(SharedModuleStoreTestCase):
         self.enrollment.can_refund = True
         self.assertTrue(self.enrollment.refundable())
 
+    def test_refundable_with_preloaded_data(self):
+        """ Assert that preloaded certificates and course modes are used instead of querying for them."""
+        modes = CourseMode.modes_for_course(self.course.id)
+        # Only the enrollment attributes are queried, for the refund cutoff date.
+        with self.assertNumQueries(1):
+            self.assertTrue(self.enrollment.refundable(user_already_has_certs_for=set(), modes=modes))
+        with self.assertNumQueries(1):
+            self.assertFalse(self.enrollment.refundable(user_already_has_certs_for=set(), modes=[]))
+        with self.assertNumQueries(0):
+            self.assertFalse(self.enrollment.refundable(user_already_has_certs_for={self.course.id}, modes=modes))
+
     def test_refundable_with_cutoff_date(self):
         """ Assert enrollment is refundable before cutoff and not refundable after."""
         self.assertTrue(self.enrollment.refundable())
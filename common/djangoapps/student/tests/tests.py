@@ -18,8 +18,10 @@ from pyquery import PyQuery as pq
 from django.conf import settings
 from django.contrib.auth.models import User, AnonymousUser
 from django.core.urlresolvers import reverse
+from django.db import connections
 from django.test import TestCase
 from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
 
 from course_modes.models import CourseMode
 from student.models import (
@@ -483,6 +485,61 @@ class DashboardTest(ModuleStoreTestCase):
             response_2 = self.client.get(reverse('dashboard'))
             self.assertEquals(response_2.status_code, 200)
 
+    @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+    def test_dashboard_queries_do_not_grow_with_enrollments(self):
+        """
+        Check that the student dashboard loads the data of all the user's
+        enrollments in bulk, so that its number of SQL queries does not grow
+        with the number of courses the user is enrolled in.
+        """
+        self.client.login(username="jack", password="test")
+
+        def enroll(mode, certificate_status=None):
+            """
+            Enrolls the user in a new course with the given mode, with a
+            certificate of the given status.
+            """
+            course = CourseFactory.create(emit_signals=True)
+            CourseModeFactory.create(mode_slug=mode, course_id=course.id)
+            CourseEnrollment.enroll(self.user, course.id, mode=mode)
+            if certificate_status is not None:
+                GeneratedCertificateFactory.create(
+                    user=self.user,
+                    course_id=course.id,
+                    status=certificate_status,
+                    mode=mode,
+                    grade='0.67',
+                    download_url='www.edx.org',
+                )
+
+        def count_dashboard_queries():
+            """
+            Returns the number of SQL queries made to render the dashboard.
+            """
+            with CaptureQueriesContext(connections['default']) as queries:
+                response = self.client.get(reverse('dashboard'))
+            self.assertEquals(response.status_code, 200)
+            return len(queries)
+
+        def enroll_in_courses():
+            """
+            Enrolls the user in a course of each kind shown on the dashboard.
+            """
+            enroll('honor')
+            enroll('verified')
+            enroll('verified', CertificateStatuses.downloadable)
+            enroll('honor', CertificateStatuses.notpassing)
+
+        enroll_in_courses()
+        # Load the configuration models into the cache first.
+        count_dashboard_queries()
+        queries_before = count_dashboard_queries()
+
+        enroll_in_courses()
+        enroll_in_courses()
+        self.assertEqual(len(CourseEnrollment.enrollments_for_user(self.user)), 12)
+        self.assertEqual(count_dashboard_queries(), queries_before)
+
     @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
     @with_is_edx_domain(True)
     def test_dashboard_header_nav_has_find_courses(self):
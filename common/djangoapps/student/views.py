@@ -59,7 +59,12 @@ from student.forms import AccountCreationForm, PasswordResetFormNoActive, get_re
 from lms.djangoapps.commerce.utils import EcommerceService  # pylint: disable=import-error
 from lms.djangoapps.verify_student.models import SoftwareSecurePhotoVerification  # pylint: disable=import-error
 from bulk_email.models import Optout, BulkEmailFlag  # pylint: disable=import-error
-from certificates.models import CertificateStatuses, certificate_status_for_student
+from certificates.models import (
+    CertificateStatuses,
+    GeneratedCertificate,
+    certificate_status,
+    certificate_status_for_student,
+)
 from certificates.api import (  # pylint: disable=import-error
     get_certificate_url,
     has_html_certificates_enabled,
@@ -208,7 +213,7 @@ def process_survey_link(survey_link, user):
     return survey_link.format(UNIQUE_ID=unique_id_for_user(user))
 
 
-def cert_info(user, course_overview, course_mode):
+def cert_info(user, course_overview, course_mode, cert_status=None):
     """
     Get the certificate info needed to render the dashboard section for the given
     student and course.
@@ -217,6 +222,9 @@ def cert_info(user, course_overview, course_mode):
         user (User): A user.
         course_overview (CourseOverview): A course.
         course_mode (str): The enrollment mode (honor, verified, audit, etc.)
+        cert_status (dict): If provided, the certificate status of the user in the
+            course, as returned by certificate_status_for_student.  This can be used
+            to avoid a database query if you have already loaded the user's certificates.
 
     Returns:
         dict: Empty dict if certificates are disabled or hidden, or a dictionary with keys:
@@ -231,12 +239,9 @@ def cert_info(user, course_overview, course_mode):
     """
     if not course_overview.may_certify():
         return {}
-    return _cert_info(
-        user,
-        course_overview,
-        certificate_status_for_student(user, course_overview.id),
-        course_mode
-    )
+    if cert_status is None:
+        cert_status = certificate_status_for_student(user, course_overview.id)
+    return _cert_info(user, course_overview, cert_status, course_mode)
 
 
 def reverification_info(statuses):
@@ -277,7 +282,7 @@ def get_course_enrollments(user, org_to_include, orgs_to_exclude):
         generator[CourseEnrollment]: a sequence of enrollments to be displayed
         on the user's dashboard.
     """
-    for enrollment in CourseEnrollment.enrollments_for_user(user):
+    for enrollment in CourseEnrollment.enrollments_for_user_with_overviews_preload(user):
 
         # If the course is missing or broken, log an error and skip it.
         course_overview = enrollment.course_overview
@@ -585,6 +590,19 @@ def dashboard(request):
         for course_id, modes in unexpired_course_modes.iteritems()
     }
 
+    # Retrieve the user's certificates and redeemed registration codes for all
+    # the courses at once, rather than for each enrollment.
+    certificates_by_course = {
+        certificate.course_id: certificate
+        for certificate in GeneratedCertificate.objects.filter(user=user, course_id__in=enrolled_course_ids)
+    }
+    redeemed_registration_codes_by_course = defaultdict(list)
+    for registration_code in CourseRegistrationCode.objects.filter(
+            course_id__in=enrolled_course_ids,
+            registrationcoderedemption__redeemed_by=user
+    ).select_related('invoice_item__invoice'):
+        redeemed_registration_codes_by_course[registration_code.course_id].append(registration_code)
+
     # Check to see if the student has recently enrolled in a course.
     # If so, display a notification message confirming the enrollment.
     enrollment_message = _create_recent_enrollment_message(
@@ -646,7 +664,13 @@ def dashboard(request):
     # there is no verification messaging to display.
     verify_status_by_course = check_verify_status_by_course(user, course_enrollments)
     cert_statuses = {
-        enrollment.course_id: cert_info(request.user, enrollment.course_overview, enrollment.mode)
+        enrollment.course_id: cert_info(
+            request.user, enrollment.course_overview, enrollment.mode,
+            cert_status=certificate_status(
+                certificates_by_course.get(enrollment.course_id),
+                modes=unexpired_course_modes[enrollment.course_id]
+            )
+        )
         for enrollment in course_enrollments
     }
 
@@ -667,24 +691,29 @@ def dashboard(request):
 
     show_refund_option_for = frozenset(
         enrollment.course_id for enrollment in course_enrollments
-        if enrollment.refundable()
+        if enrollment.refundable(
+            user_already_has_certs_for=certificates_by_course.viewkeys(),
+            modes=unexpired_course_modes[enrollment.course_id]
+        )
     )
 
     block_courses = frozenset(
         enrollment.course_id for enrollment in course_enrollments
         if is_course_blocked(
             request,
-            CourseRegistrationCode.objects.filter(
-                course_id=enrollment.course_id,
-                registrationcoderedemption__redeemed_by=request.user
-            ),
+            redeemed_registration_codes_by_course[enrollment.course_id],
             enrollment.course_id
         )
     )
 
+    # Credit modes are not considered when checking whether a course is paid.
     enrolled_courses_either_paid = frozenset(
         enrollment.course_id for enrollment in course_enrollments
-        if enrollment.is_paid_course()
+        if enrollment.is_paid_course(modes_dict={
+            slug: mode
+            for slug, mode in course_modes_by_course[enrollment.course_id].iteritems()
+            if slug not in CourseMode.CREDIT_MODES
+        })
     )
 
     # If there are *any* denied reverifications that have not been toggled off,
@@ -722,6 +751,7 @@ def dashboard(request):
         'errored_courses': errored_courses,
         'show_courseware_links_for': show_courseware_links_for,
         'all_course_modes': course_mode_info,
+        'course_modes_by_course': unexpired_course_modes,
         'cert_statuses': cert_statuses,
         'credit_statuses': _credit_statuses(user, course_enrollments),
         'show_email_settings_for': show_email_settings_for,
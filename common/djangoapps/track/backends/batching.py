@@ -0,0 +1,233 @@
+"""
+Event tracker backend that sends events to another backend in batches,
+from a background thread.
+
+Events are put on a bounded in-process queue, so that sending an event
+does not block the request on the wrapped backend.  A background thread
+takes the queued events off the queue and sends them in batches of up
+to `batch_size` events, using the wrapped backend's `send_batch` method
+if it has one, or its `send` method for each event otherwise.
+
+The backend can be configured in the Django settings as shown below::
+
+  TRACKING_BACKENDS = {
+      'mongo': {
+          'ENGINE': 'track.backends.batching.AsyncBatchingBackend',
+          'OPTIONS': {
+              'backend': {
+                  'ENGINE': 'track.backends.mongodb.MongoBackend',
+                  'OPTIONS': {
+                      'database': 'track',
+                  }
+              },
+              'max_queue_size': 10000,
+              'batch_size': 100,
+              'overflow_policy': 'drop',
+          }
+      }
+  }
+
+The wrapped backend is only ever called from the background thread.
+
+"""
+
+from __future__ import absolute_import
+
+import atexit
+from importlib import import_module
+import logging
+import os
+from Queue import Queue, Empty, Full
+from threading import Lock, Thread
+
+from dogapi import dog_stats_api
+
+from track.backends import BaseBackend
+
+
+log = logging.getLogger(__name__)
+
+# Policies for when an event is sent while the queue is full.
+# Drop the event.
+OVERFLOW_DROP = 'drop'
+# Wait up to `block_timeout` seconds for the queue to have room for the
+# event, then drop it.
+OVERFLOW_BLOCK = 'block'
+
+# Queued to stop the background thread once the events queued before it
+# are sent.
+_STOP = object()
+
+
+class AsyncBatchingBackend(BaseBackend):
+    """
+    Event tracker backend that queues events to be sent to another
+    backend in batches, by a background thread.
+
+    The number of events dropped because the queue was full, sent to
+    the wrapped backend, and lost because of an error in the wrapped
+    backend are counted in `dropped`, `sent` and `failed`.
+    """
+
+    def __init__(self, backend, max_queue_size=10000, batch_size=100, overflow_policy=OVERFLOW_DROP,
+                 block_timeout=0.1, **kwargs):
+        """
+        :Parameters:
+
+          - `backend`: configuration of the wrapped backend, as a dict
+            with its 'ENGINE' and optional 'OPTIONS'
+          - `max_queue_size`: maximum number of events waiting to be
+            sent
+          - `batch_size`: maximum number of events sent to the wrapped
+            backend at once
+          - `overflow_policy`: either 'drop' to drop events sent while
+            the queue is full, or 'block' to wait up to `block_timeout`
+            seconds for room on the queue first
+          - `block_timeout`: seconds to wait for room on the queue with
+            the 'block' overflow policy
+
+        """
+        super(AsyncBatchingBackend, self).__init__(**kwargs)
+
+        if overflow_policy not in (OVERFLOW_DROP, OVERFLOW_BLOCK):
+            raise ValueError('Invalid overflow policy {}'.format(overflow_policy))
+
+        self.backend = _instantiate_backend(backend)
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+
+        self.dropped = 0
+        self.sent = 0
+        self.failed = 0
+
+        self._lock = Lock()
+        self._queue = None
+        self._thread = None
+        self._pid = None
+
+        atexit.register(self.close)
+
+    @property
+    def queue_depth(self):
+        """
+        Returns the number of events waiting to be sent.
+        """
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def send(self, event):
+        """
+        Queue the event to be sent to the wrapped backend.
+        """
+        queue = self._get_queue()
+        try:
+            if self.overflow_policy == OVERFLOW_BLOCK:
+                queue.put(event, timeout=self.block_timeout)
+            else:
+                queue.put_nowait(event)
+        except Full:
+            with self._lock:
+                self.dropped += 1
+            dog_stats_api.increment('track.backends.batching.dropped')
+
+    def flush(self):
+        """
+        Block until all the events queued so far have been sent.
+        """
+        if self._is_running():
+            self._queue.join()
+
+    def close(self, timeout=None):
+        """
+        Send all the queued events and stop the background thread.
+
+        Waits up to `timeout` seconds for the events to be sent, or
+        until they are all sent if `timeout` is None.
+        """
+        with self._lock:
+            if not self._is_running():
+                return
+            thread = self._thread
+            self._queue.put(_STOP)
+            self._thread = None
+        thread.join(timeout)
+
+    def _is_running(self):
+        """
+        Returns whether the background thread was started by this
+        process and not yet stopped.
+        """
+        return self._thread is not None and self._pid == os.getpid()
+
+    def _get_queue(self):
+        """
+        Returns the queue of events, starting the background thread
+        that sends them if needed.
+
+        A forked process starts its own thread with a new queue, since
+        threads do not survive a fork.
+        """
+        if not self._is_running():
+            with self._lock:
+                if not self._is_running():
+                    self._queue = Queue(self.max_queue_size)
+                    self._pid = os.getpid()
+                    self._thread = Thread(target=self._run, args=(self._queue,), name='track-backends-batching')
+                    self._thread.daemon = True
+                    self._thread.start()
+        return self._queue
+
+    def _run(self, queue):
+        """
+        Send the events on the given queue in batches, until stopped.
+        """
+        stopped = False
+        while not stopped:
+            batch = [queue.get()]
+            while batch[-1] is not _STOP and len(batch) < self.batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                except Empty:
+                    break
+
+            if batch[-1] is _STOP:
+                batch.pop()
+                stopped = True
+            if batch:
+                self._send_batch(batch)
+
+            for _ in xrange(len(batch) + stopped):
+                queue.task_done()
+
+    def _send_batch(self, events):
+        """
+        Send the given events to the wrapped backend.
+        """
+        try:
+            with dog_stats_api.timer('track.backends.batching.send_batch'):
+                if hasattr(self.backend, 'send_batch'):
+                    self.backend.send_batch(events)
+                else:
+                    for event in events:
+                        self.backend.send(event)
+        except Exception:  # pylint: disable=broad-except
+            # Keep the thread running for the following events.
+            log.exception('Error sending a batch of %d events to the wrapped tracking backend', len(events))
+            self.failed += len(events)
+        else:
+            self.sent += len(events)
+
+
+def _instantiate_backend(config):
+    """
+    Instantiate the backend with the given configuration, a dict with
+    the full module path to the backend class as 'ENGINE', and its
+    keyword arguments as 'OPTIONS'.
+    """
+    try:
+        module_name, class_name = config['ENGINE'].rsplit('.', 1)
+        cls = getattr(import_module(module_name), class_name)
+    except (KeyError, ValueError, AttributeError, ImportError):
+        raise ValueError('Cannot find event track backend {}'.format(config.get('ENGINE')))
+    return cls(**config.get('OPTIONS', {}))
@@ -34,6 +34,25 @@ class LoggerBackend(BaseBackend):
         self.event_logger = logging.getLogger(name)
 
     def send(self, event):
+        self.event_logger.info(self._serialize(event))
+
+    def send_batch(self, events):
+        """
+        Log the events, skipping the ones that cannot be serialized so
+        they do not prevent the others from being logged.
+        """
+        event_strs = []
+        for event in events:
+            try:
+                event_strs.append(self._serialize(event))
+            except UnicodeDecodeError:
+                pass
+
+        for event_str in event_strs:
+            self.event_logger.info(event_str)
+
+    def _serialize(self, event):
+        """Returns the event serialized to a JSON string."""
         try:
             event_str = json.dumps(event, cls=DateTimeJSONEncoder)
         except UnicodeDecodeError:
@@ -45,6 +64,4 @@ class LoggerBackend(BaseBackend):
         # TODO: remove trucation of the serialized event, either at a
         # higher level during the emittion of the event, or by
         # providing warnings when the events exceed certain size.
-        event_str = event_str[:settings.TRACK_MAX_EVENT]
-
-        self.event_logger.info(event_str)
+        return event_str[:settings.TRACK_MAX_EVENT]
@@ -97,3 +97,16 @@ class MongoBackend(BaseBackend):
             # during the next event.
             msg = 'Error inserting to MongoDB event tracker backend'
             log.exception(msg)
+
+    def send_batch(self, events):
+        """Insert the events in to the Mongo collection at once"""
+        try:
+            self.collection.insert(events, manipulate=False, continue_on_error=True)
+        except BSONError:
+            # An event that cannot be encoded fails the whole insert, so
+            # insert the events one by one to only lose that event.
+            for event in events:
+                self.send(event)
+        except PyMongoError:
+            msg = 'Error inserting a batch of {} events to MongoDB event tracker backend'.format(len(events))
+            log.exception(msg)
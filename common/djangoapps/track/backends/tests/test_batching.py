@@ -0,0 +1,147 @@
+"""Tests for the asynchronous batching event tracker backend."""
+from __future__ import absolute_import
+
+from threading import Event
+
+from django.test import TestCase
+
+from track.backends import BaseBackend
+from track.backends.batching import AsyncBatchingBackend
+
+
+class InMemoryBackend(BaseBackend):
+    """Backend that keeps the batches of events it is sent."""
+
+    def __init__(self, **kwargs):
+        super(InMemoryBackend, self).__init__(**kwargs)
+        self.batches = []
+        self.proceed = Event()
+        self.proceed.set()
+
+    def send(self, event):
+        self.send_batch([event])
+
+    def send_batch(self, events):
+        self.proceed.wait()
+        if 'fail' in events:
+            raise ValueError('Cannot send the events')
+        self.batches.append(list(events))
+
+
+class SingleEventBackend(BaseBackend):
+    """Backend that can only be sent events one at a time."""
+
+    def __init__(self, **kwargs):
+        super(SingleEventBackend, self).__init__(**kwargs)
+        self.events = []
+
+    def send(self, event):
+        self.events.append(event)
+
+
+def create_backend(engine='InMemoryBackend', **kwargs):
+    """Returns a batching backend wrapping a backend of this module."""
+    backend = AsyncBatchingBackend(
+        backend={'ENGINE': 'track.backends.tests.test_batching.' + engine},
+        **kwargs
+    )
+    return backend
+
+
+class TestAsyncBatchingBackend(TestCase):
+    """Tests for AsyncBatchingBackend."""
+
+    def setUp(self):
+        super(TestAsyncBatchingBackend, self).setUp()
+        self.backend = create_backend(batch_size=3)
+        self.addCleanup(self.backend.close)
+
+    def test_events_sent_in_batches(self):
+        # Hold the first batch so the following events queue up.
+        self.backend.backend.proceed.clear()
+        self.backend.send(0)
+        while self.backend.queue_depth:
+            pass
+        for event in range(1, 8):
+            self.backend.send(event)
+        self.assertEqual(self.backend.queue_depth, 7)
+
+        self.backend.backend.proceed.set()
+        self.backend.flush()
+        self.assertEqual(self.backend.backend.batches, [[0], [1, 2, 3], [4, 5, 6], [7]])
+        self.assertEqual(self.backend.queue_depth, 0)
+        self.assertEqual(self.backend.sent, 8)
+
+    def test_drop_when_full(self):
+        backend = create_backend(max_queue_size=2)
+        self.addCleanup(backend.close)
+        backend.backend.proceed.clear()
+        backend.send(0)
+        while backend.queue_depth:
+            pass
+        for event in range(1, 5):
+            backend.send(event)
+        self.assertEqual(backend.queue_depth, 2)
+        self.assertEqual(backend.dropped, 2)
+
+        backend.backend.proceed.set()
+        backend.flush()
+        self.assertEqual(backend.backend.batches, [[0], [1, 2]])
+
+    def test_block_when_full(self):
+        backend = create_backend(max_queue_size=1, overflow_policy='block', block_timeout=0.01)
+        self.addCleanup(backend.close)
+        backend.backend.proceed.clear()
+        backend.send(0)
+        while backend.queue_depth:
+            pass
+        backend.send(1)
+        backend.send(2)
+        self.assertEqual(backend.dropped, 1)
+
+        backend.backend.proceed.set()
+        backend.flush()
+        self.assertEqual(backend.backend.batches, [[0], [1]])
+
+    def test_invalid_overflow_policy(self):
+        with self.assertRaises(ValueError):
+            create_backend(overflow_policy='wait')
+
+    def test_close_sends_queued_events(self):
+        self.backend.backend.proceed.clear()
+        for event in range(5):
+            self.backend.send(event)
+        self.backend.backend.proceed.set()
+        self.backend.close()
+
+        self.assertEqual(sum(self.backend.backend.batches, []), range(5))
+        self.assertEqual(self.backend.queue_depth, 0)
+
+    def test_send_after_close(self):
+        self.backend.send(0)
+        self.backend.close()
+        self.backend.send(1)
+        self.backend.flush()
+        self.assertEqual(self.backend.backend.batches, [[0], [1]])
+
+    def test_failed_batch(self):
+        self.backend.send('fail')
+        self.backend.flush()
+        self.backend.send('event')
+        self.backend.flush()
+
+        self.assertEqual(self.backend.backend.batches, [['event']])
+        self.assertEqual(self.backend.failed, 1)
+        self.assertEqual(self.backend.sent, 1)
+
+    def test_backend_without_send_batch(self):
+        backend = create_backend('SingleEventBackend')
+        self.addCleanup(backend.close)
+        for event in range(3):
+            backend.send(event)
+        backend.flush()
+        self.assertEqual(backend.backend.events, range(3))
+
+    def test_invalid_engine(self):
+        with self.assertRaises(ValueError):
+            create_backend('UnknownBackend')
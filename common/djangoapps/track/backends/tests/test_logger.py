@@ -49,6 +49,16 @@ class TestLoggerBackend(TestCase):
         self.assertEqual(saved_events[0], unpacked_event)
         self.assertEqual(saved_events[1], unpacked_event)
 
+    def test_logger_backend_batch(self):
+        self.handler.reset()
+
+        # An event that cannot be serialized does not prevent the
+        # other events of the batch from being logged.
+        self.backend.send_batch([{'test': 1}, {'test': '\xe9'}, {'test': 2}])
+
+        saved_events = [json.loads(e) for e in self.handler.messages['info']]
+        self.assertEqual(saved_events, [{'test': 1}, {'test': 2}])
+
 
 class MockLoggingHandler(logging.Handler):
     """
@@ -0,0 +1,72 @@
+"""
+Microbenchmark of the throughput of the evaluator and of the LaTeX preview.
+
+Each expression is run through `evaluator` and `latex_preview`, first with an
+empty parse cache for every call (as for expressions that have not been seen
+before), then with the parse cache warm (as for repeated submissions and
+previews of the same input).
+
+Usage:
+    python -m calc.benchmark [--iterations 1000]
+"""
+import argparse
+import time
+
+from calc import PARSE_CACHE, evaluator
+from preview import latex_preview
+
+
+VARIABLES = {'x': 1.5, 'y': 2.5, 'R_1': 10.0, 'R_2': 20.0}
+
+EXPRESSIONS = [
+    '3.14',
+    'x^2 + 2*x*y + y^2',
+    'sin(x)*cos(y) - tan(x/y)',
+    'R_1 || R_2 + 5k',
+    '(1 + sqrt(x))^(1/3) / (e^y - pi*i)',
+    '-x/(y*(x+y)^2) + arctan(x) - 2.5e-3*y',
+]
+
+
+def run(function, expressions, iterations, warm):
+    """
+    Call `function` on each expression `iterations` times and return the
+    number of calls per second.
+    """
+    for math_expr in expressions:
+        function(math_expr)
+
+    total_time = 0.0
+    for _ in xrange(iterations):
+        for math_expr in expressions:
+            if not warm:
+                PARSE_CACHE.clear()
+            start = time.time()
+            function(math_expr)
+            total_time += time.time() - start
+    return iterations * len(expressions) / total_time
+
+
+def main():
+    """
+    Run the benchmark and print its results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=1000, help='Number of times to run each expression.')
+    args = parser.parse_args()
+
+    functions = [
+        ('evaluator', lambda math_expr: evaluator(VARIABLES, {}, math_expr)),
+        ('latex_preview', lambda math_expr: latex_preview(math_expr, variables=VARIABLES.keys())),
+    ]
+    print '{:<16} {:>14} {:>14}'.format('function', 'cold calls/s', 'warm calls/s')
+    for name, function in functions:
+        print '{:<16} {:>14.1f} {:>14.1f}'.format(
+            name,
+            run(function, EXPRESSIONS, args.iterations, warm=False),
+            run(function, EXPRESSIONS, args.iterations, warm=True),
+        )
+
+
+if __name__ == '__main__':
+    main()
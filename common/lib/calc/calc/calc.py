@@ -1,12 +1,17 @@
 """
 Parser and evaluator for FormulaResponse and NumericalResponse
 
-Uses pyparsing to parse. Main function as of now is evaluator().
+Uses pyparsing to parse. Main function as of now is evaluator(). Expressions
+that are evaluated repeatedly, e.g. over sampled variables, can be parsed once
+into a CompiledExpression instead.
 """
 
+from collections import OrderedDict
 import math
 import operator
 import numbers
+from threading import Lock
+
 import numpy
 import scipy.constants
 import functions
@@ -73,6 +78,10 @@ SUFFIXES = {
 }
 
 
+# Maximum number of parsed expressions to keep in PARSE_CACHE.
+PARSE_CACHE_SIZE = 1024
+
+
 class UndefinedVariable(Exception):
     """
     Indicate when a student inputs a variable which was not expected.
@@ -93,7 +102,15 @@ def lower_dict(input_dict):
 
 # The following few functions define evaluation actions, which are run on lists
 # of results from each parse component. They convert the strings and (previously
-# calculated) numbers into the number that component represents.
+# calculated) numbers into the number that component represents. The numbers may
+# also be numpy arrays, when evaluating over arrays of sampled variables.
+
+def is_number(value):
+    """
+    Return whether `value` is a number, or an array of numbers.
+    """
+    return isinstance(value, (numbers.Number, numpy.ndarray))
+
 
 def super_float(text):
     """
@@ -122,7 +139,7 @@ def eval_atom(parse_result):
     In the case of parenthesis, ignore them.
     """
     # Find first number in the list
-    result = next(k for k in parse_result if isinstance(k, numbers.Number))
+    result = next(k for k in parse_result if is_number(k))
     return result
 
 
@@ -136,7 +153,7 @@ def eval_power(parse_result):
     # `reduce` will go from left to right; reverse the list.
     parse_result = reversed(
         [k for k in parse_result
-         if isinstance(k, numbers.Number)]  # Ignore the '^' marks.
+         if is_number(k)]  # Ignore the '^' marks.
     )
     # Having reversed it, raise `b` to the power of `a`.
     power = reduce(lambda a, b: b ** a, parse_result)
@@ -155,10 +172,15 @@ def eval_parallel(parse_result):
     """
     if len(parse_result) == 1:
         return parse_result[0]
+    inputs = [e for e in parse_result if is_number(e)]
+    if any(isinstance(e, numpy.ndarray) for e in inputs):
+        # Return NaN for the samples with a zero among their inputs.
+        has_zero = reduce(numpy.logical_or, [numpy.equal(e, 0) for e in inputs])
+        reciprocals = [1. / numpy.where(has_zero, 1., e) for e in inputs]
+        return numpy.where(has_zero, float('nan'), 1. / sum(reciprocals))
     if 0 in parse_result:
         return float('nan')
-    reciprocals = [1. / e for e in parse_result
-                   if isinstance(e, numbers.Number)]
+    reciprocals = [1. / e for e in inputs]
     return 1. / sum(reciprocals)
 
 
@@ -173,12 +195,12 @@ def eval_sum(parse_result):
     total = 0.0
     current_op = operator.add
     for token in parse_result:
-        if token == '+':
+        if is_number(token):
+            total = current_op(total, token)
+        elif token == '+':
             current_op = operator.add
         elif token == '-':
             current_op = operator.sub
-        else:
-            total = current_op(total, token)
     return total
 
 
@@ -191,12 +213,12 @@ def eval_product(parse_result):
     prod = 1.0
     current_op = operator.mul
     for token in parse_result:
-        if token == '*':
+        if is_number(token):
+            prod = current_op(prod, token)
+        elif token == '*':
             current_op = operator.mul
         elif token == '/':
             current_op = operator.truediv
-        else:
-            prod = current_op(prod, token)
     return prod
 
 
@@ -224,38 +246,270 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
      python numbers.
     -Unary functions are passed as a dictionary from string to function.
     """
-    # No need to go further.
-    if math_expr.strip() == "":
-        return float('nan')
+    return CompiledExpression(math_expr, case_sensitive).evaluate(variables, functions)
 
-    # Parse the tree.
-    math_interpreter = ParseAugmenter(math_expr, case_sensitive)
-    math_interpreter.parse_algebra()
 
-    # Get our variables together.
-    all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
+class CompiledExpression(object):
+    """
+    A math expression that is parsed once, to be evaluated repeatedly.
 
-    # ...and check them
-    math_interpreter.check_variables(all_variables, all_functions)
+    `evaluate()` has the same results and raises the same errors as
+    `evaluator()`. `evaluate_samples()` evaluates the expression for many
+    sets of variables at once.
+    """
+    def __init__(self, math_expr, case_sensitive=False):
+        """
+        Parse the given math expression string.
 
-    # Create a recursion to evaluate the tree.
-    if case_sensitive:
-        casify = lambda x: x
-    else:
-        casify = lambda x: x.lower()  # Lowercase for case insens.
+        Raise a `pyparsing.ParseException` if it is not valid.
+        """
+        self.math_expr = math_expr
+        self.case_sensitive = case_sensitive
+        self.math_interpreter = None
+
+        # Empty expressions evaluate to NaN, without parsing.
+        if math_expr.strip() != "":
+            self.math_interpreter = ParseAugmenter(math_expr, case_sensitive)
+            self.math_interpreter.parse_algebra()
+
+    def evaluate(self, variables, functions):
+        """
+        Evaluate the expression; that is, return a float.
+
+        -Variables are passed as a dictionary from string to value. They must be
+         python numbers.
+        -Unary functions are passed as a dictionary from string to function.
+        """
+        # No need to go further.
+        if self.math_interpreter is None:
+            return float('nan')
+
+        # Get our variables together.
+        all_variables, all_functions = add_defaults(variables, functions, self.case_sensitive)
+
+        # ...and check them
+        self.math_interpreter.check_variables(all_variables, all_functions)
+
+        return self.reduce_tree(all_variables, all_functions)
+
+    def evaluate_samples(self, variables_list, functions):
+        """
+        Evaluate the expression for each dictionary of variables in
+        `variables_list`, and return the list of results.
+
+        When all dictionaries define the same variables, the values of each
+        variable are gathered into a numpy array and the tree is evaluated
+        once, for all samples. numpy signals errors differently than Python
+        numbers do (e.g. dividing by zero yields inf instead of raising a
+        ZeroDivisionError), so if that evaluation fails for any reason, the
+        samples are evaluated one by one instead. This keeps the results and
+        the errors raised the same as those of `evaluate()`.
+        """
+        if self.math_interpreter is None:
+            return [float('nan')] * len(variables_list)
+
+        names = set(variables_list[0]) if variables_list else set()
+        if len(variables_list) < 2 or any(set(variables) != names for variables in variables_list):
+            return [self.evaluate(variables, functions) for variables in variables_list]
+
+        sampled_variables = {
+            name: numpy.array([variables[name] for variables in variables_list])
+            for name in names
+        }
+        all_variables, all_functions = add_defaults(sampled_variables, functions, self.case_sensitive)
+        self.math_interpreter.check_variables(all_variables, all_functions)
+
+        try:
+            # Underflows are left alone, since they silently yield zero either way.
+            with numpy.errstate(divide='raise', over='raise', invalid='raise'):
+                result = self.reduce_tree(all_variables, all_functions)
+        except Exception:  # pylint: disable=broad-except
+            return [self.evaluate(variables, functions) for variables in variables_list]
+
+        if not isinstance(result, numpy.ndarray):
+            # The expression does not depend on the sampled variables.
+            return [result] * len(variables_list)
+        if result.shape != (len(variables_list),):
+            return [self.evaluate(variables, functions) for variables in variables_list]
+        return result.tolist()
+
+    def reduce_tree(self, all_variables, all_functions):
+        """
+        Evaluate the parse tree with the given variables and functions,
+        including the defaults, which have been checked already.
+        """
+        # Create a recursion to evaluate the tree.
+        if self.case_sensitive:
+            casify = lambda x: x
+        else:
+            casify = lambda x: x.lower()  # Lowercase for case insens.
+
+        evaluate_actions = {
+            'number': eval_number,
+            'variable': lambda x: all_variables[casify(x[0])],
+            'function': lambda x: all_functions[casify(x[0])](x[1]),
+            'atom': eval_atom,
+            'power': eval_power,
+            'parallel': eval_parallel,
+            'product': eval_product,
+            'sum': eval_sum
+        }
+
+        return self.math_interpreter.reduce_tree(evaluate_actions)
+
+
+class ParseCache(object):
+    """
+    Bounded least-recently-used cache of parsed math expressions.
 
-    evaluate_actions = {
-        'number': eval_number,
-        'variable': lambda x: all_variables[casify(x[0])],
-        'function': lambda x: all_functions[casify(x[0])](x[1]),
-        'atom': eval_atom,
-        'power': eval_power,
-        'parallel': eval_parallel,
-        'product': eval_product,
-        'sum': eval_sum
-    }
+    Math input fields re-submit the same expressions over and over, e.g. for
+    previews on every keystroke, so keeping their parse trees saves parsing
+    them again.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, math_expr):
+        """
+        Return the value cached for `math_expr`, or None if not found.
+        """
+        with self._lock:
+            value = self._entries.pop(math_expr, None)
+            if value is not None:
+                # Mark the entry as most recently used.
+                self._entries[math_expr] = value
+            return value
+
+    def set(self, math_expr, value):
+        """
+        Cache `value` for `math_expr`, evicting the least recently used
+        entry if the cache is full.
+        """
+        with self._lock:
+            self._entries.pop(math_expr, None)
+            if len(self._entries) >= self.max_size:
+                self._entries.popitem(last=False)
+            self._entries[math_expr] = value
+
+    def clear(self):
+        """
+        Remove all cached values.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+# Parse trees, along with the variables and functions they use, by expression.
+# Parsing does not depend on case sensitivity, so entries are shared by both
+# modes.
+PARSE_CACHE = ParseCache(PARSE_CACHE_SIZE)
+
+
+def build_grammar():
+    """
+    Build the pyparsing grammar of algebraic expressions.
+
+    The parse results of the grammar have proper groupings to reflect
+    parenthesis and order of operations. All operators are left in the
+    results and no strings of numbers are parsed into their float versions.
+    """
+    # 0.33 or 7 or .34 or 16.
+    number_part = Word(nums)
+    inner_number = (number_part + Optional("." + Optional(number_part))) | ("." + number_part)
+    # pyparsing allows spaces between tokens--`Combine` prevents that.
+    inner_number = Combine(inner_number)
+
+    # SI suffixes and percent.
+    number_suffix = MatchFirst(Literal(k) for k in SUFFIXES.keys())
+
+    # 0.33k or 17
+    plus_minus = Literal('+') | Literal('-')
+    number = Group(
+        Optional(plus_minus) +
+        inner_number +
+        Optional(CaselessLiteral("E") + Optional(plus_minus) + number_part) +
+        Optional(number_suffix)
+    )
+    number = number("number")
+
+    # Predefine recursive variables.
+    expr = Forward()
+
+    # Handle variables passed in. They must start with letters/underscores
+    # and may contain numbers afterward.
+    inner_varname = Word(alphas + "_", alphanums + "_")
+    varname = Group(inner_varname)("variable")
+
+    # Same thing for functions.
+    function = Group(inner_varname + Suppress("(") + expr + Suppress(")"))("function")
+
+    atom = number | function | varname | "(" + expr + ")"
+    atom = Group(atom)("atom")
 
-    return math_interpreter.reduce_tree(evaluate_actions)
+    # Do the following in the correct order to preserve order of operation.
+    pow_term = atom + ZeroOrMore("^" + atom)
+    pow_term = Group(pow_term)("power")
+
+    par_term = pow_term + ZeroOrMore('||' + pow_term)  # 5k || 4k
+    par_term = Group(par_term)("parallel")
+
+    prod_term = par_term + ZeroOrMore((Literal('*') | Literal('/')) + par_term)  # 7 * 5 / 4
+    prod_term = Group(prod_term)("product")
+
+    sum_term = Optional(plus_minus) + prod_term + ZeroOrMore(plus_minus + prod_term)  # -5 + 4 - 3
+    sum_term = Group(sum_term)("sum")
+
+    # Finish the recursion.
+    expr << sum_term  # pylint: disable=pointless-statement
+    grammar = expr + stringEnd
+    # Streamline now, since pyparsing would otherwise do so on first use,
+    # possibly from several threads at once.
+    grammar.streamline()
+    return grammar
+
+
+# The grammar is the same for every expression, and holds no state of its
+# own, so it is built once, on first use.
+_GRAMMAR = None
+_GRAMMAR_LOCK = Lock()
+
+
+def get_grammar():
+    """
+    Return the grammar built by `build_grammar`, building it if needed.
+    """
+    global _GRAMMAR  # pylint: disable=global-statement
+    if _GRAMMAR is None:
+        with _GRAMMAR_LOCK:
+            if _GRAMMAR is None:
+                _GRAMMAR = build_grammar()
+    return _GRAMMAR
+
+
+def names_used(tree):
+    """
+    Return the sets of the variable names and of the function names used in
+    the given parse tree.
+    """
+    variables_used = set()
+    functions_used = set()
+    nodes = [tree]
+    while nodes:
+        node = nodes.pop()
+        if not isinstance(node, ParseResults):
+            continue
+        node_name = node.getName()
+        if node_name == 'variable':
+            variables_used.add(node[0])
+        elif node_name == 'function':
+            functions_used.add(node[0])
+        nodes.extend(node)
+    return variables_used, functions_used
 
 
 class ParseAugmenter(object):
@@ -278,23 +532,6 @@ class ParseAugmenter(object):
         self.variables_used = set()
         self.functions_used = set()
 
-        def vpa(tokens):
-            """
-            When a variable is recognized, store it in `variables_used`.
-            """
-            varname = tokens[0][0]
-            self.variables_used.add(varname)
-
-        def fpa(tokens):
-            """
-            When a function is recognized, store it in `functions_used`.
-            """
-            varname = tokens[0][0]
-            self.functions_used.add(varname)
-
-        self.variable_parse_action = vpa
-        self.function_parse_action = fpa
-
     def parse_algebra(self):
         """
         Parse an algebraic expression into a tree.
@@ -302,62 +539,24 @@ class ParseAugmenter(object):
         Store a `pyparsing.ParseResult` in `self.tree` with proper groupings to
         reflect parenthesis and order of operations. Leave all operators in the
         tree and do not parse any strings of numbers into their float versions.
+        Also store the names of the variables and functions used in the tree.
+
+        Trees are shared through `PARSE_CACHE`, so they must not be modified.
 
         Adding the groups and result names makes the `repr()` of the result
         really gross. For debugging, use something like
           print OBJ.tree.asXML()
         """
-        # 0.33 or 7 or .34 or 16.
-        number_part = Word(nums)
-        inner_number = (number_part + Optional("." + Optional(number_part))) | ("." + number_part)
-        # pyparsing allows spaces between tokens--`Combine` prevents that.
-        inner_number = Combine(inner_number)
-
-        # SI suffixes and percent.
-        number_suffix = MatchFirst(Literal(k) for k in SUFFIXES.keys())
-
-        # 0.33k or 17
-        plus_minus = Literal('+') | Literal('-')
-        number = Group(
-            Optional(plus_minus) +
-            inner_number +
-            Optional(CaselessLiteral("E") + Optional(plus_minus) + number_part) +
-            Optional(number_suffix)
-        )
-        number = number("number")
-
-        # Predefine recursive variables.
-        expr = Forward()
-
-        # Handle variables passed in. They must start with letters/underscores
-        # and may contain numbers afterward.
-        inner_varname = Word(alphas + "_", alphanums + "_")
-        varname = Group(inner_varname)("variable")
-        varname.setParseAction(self.variable_parse_action)
-
-        # Same thing for functions.
-        function = Group(inner_varname + Suppress("(") + expr + Suppress(")"))("function")
-        function.setParseAction(self.function_parse_action)
-
-        atom = number | function | varname | "(" + expr + ")"
-        atom = Group(atom)("atom")
-
-        # Do the following in the correct order to preserve order of operation.
-        pow_term = atom + ZeroOrMore("^" + atom)
-        pow_term = Group(pow_term)("power")
-
-        par_term = pow_term + ZeroOrMore('||' + pow_term)  # 5k || 4k
-        par_term = Group(par_term)("parallel")
-
-        prod_term = par_term + ZeroOrMore((Literal('*') | Literal('/')) + par_term)  # 7 * 5 / 4
-        prod_term = Group(prod_term)("product")
-
-        sum_term = Optional(plus_minus) + prod_term + ZeroOrMore(plus_minus + prod_term)  # -5 + 4 - 3
-        sum_term = Group(sum_term)("sum")
-
-        # Finish the recursion.
-        expr << sum_term  # pylint: disable=pointless-statement
-        self.tree = (expr + stringEnd).parseString(self.math_expr)[0]
+        parsed = PARSE_CACHE.get(self.math_expr)
+        if parsed is None:
+            tree = get_grammar().parseString(self.math_expr)[0]
+            variables_used, functions_used = names_used(tree)
+            parsed = (tree, frozenset(variables_used), frozenset(functions_used))
+            PARSE_CACHE.set(self.math_expr, parsed)
+
+        self.tree = parsed[0]
+        self.variables_used = set(parsed[1])
+        self.functions_used = set(parsed[2])
 
     def reduce_tree(self, handle_actions, terminal_converter=None):
         """
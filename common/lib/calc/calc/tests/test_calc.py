@@ -3,6 +3,7 @@ Unit tests for calc.py
 """
 
 import unittest
+from mock import patch
 import numpy
 import calc
 from pyparsing import ParseException
@@ -559,3 +560,99 @@ class EvaluatorTest(unittest.TestCase):
             calc.evaluator({'r1': 5}, {}, "r1+r2")
         with self.assertRaisesRegexp(calc.UndefinedVariable, 'r1 r3'):
             calc.evaluator(variables, {}, "r1*r3", case_sensitive=True)
+
+
+class CompiledExpressionTest(unittest.TestCase):
+    """
+    Run tests for calc.CompiledExpression, in particular that evaluating
+    over samples gives the same results and errors as `calc.evaluator`.
+    """
+    SAMPLES = [{'x': 1.5, 'y': 4.0}, {'x': -2.0, 'y': 0.5}, {'x': 3.0, 'y': 3.0}]
+
+    def assert_same_as_evaluator(self, math_expr, samples=None):
+        """
+        Assert that evaluating `math_expr` over `samples` gives the same
+        results as calling `calc.evaluator` on each sample.
+        """
+        samples = samples if samples is not None else self.SAMPLES
+        expected = [calc.evaluator(variables, {}, math_expr) for variables in samples]
+        actual = calc.CompiledExpression(math_expr).evaluate_samples(samples, {})
+        self.assertEqual(len(actual), len(expected))
+        for actual_value, expected_value in zip(actual, expected):
+            if numpy.isnan(expected_value):
+                self.assertTrue(numpy.isnan(actual_value))
+            else:
+                self.assertAlmostEqual(actual_value, expected_value)
+
+    def test_evaluate(self):
+        expression = calc.CompiledExpression('x^2 + 2*X', case_sensitive=False)
+        self.assertEqual(expression.evaluate({'x': 3.0}, {}), 15.0)
+        self.assertEqual(expression.evaluate({'x': 1.0}, {}), 3.0)
+
+    def test_evaluate_samples(self):
+        for math_expr in ['x^2 + y', 'sin(x)*cos(y)/y', '-y^x^2', 'x || y', 'x*i - e^y', '5k*y + 3%', '4']:
+            self.assert_same_as_evaluator(math_expr)
+
+    def test_samples_with_zero(self):
+        # Parallel resistors with a zero give NaN.
+        self.assert_same_as_evaluator('x || y', [{'x': 1.0, 'y': 0.0}, {'x': 1.0, 'y': 2.0}])
+        # Invalid values in some samples.
+        self.assert_same_as_evaluator('sqrt(x)', [{'x': -1.0}, {'x': 4.0}])
+
+    def test_samples_errors(self):
+        # Errors are the same as those of the evaluator, for the first failing sample.
+        with self.assertRaises(ZeroDivisionError):
+            calc.CompiledExpression('1/(x-y)').evaluate_samples([{'x': 2.0, 'y': 1.0}, {'x': 1.0, 'y': 1.0}], {})
+        with self.assertRaisesRegexp(ValueError, 'factorial'):
+            calc.CompiledExpression('fact(x)').evaluate_samples([{'x': 3.0}, {'x': 1.5}], {})
+        with self.assertRaisesRegexp(calc.UndefinedVariable, 'z'):
+            calc.CompiledExpression('x+z').evaluate_samples(self.SAMPLES, {})
+
+    def test_parse_once(self):
+        with self.assertRaises(ParseException):
+            calc.CompiledExpression('x+*y')
+        self.assertTrue(numpy.isnan(calc.CompiledExpression(' ').evaluate_samples(self.SAMPLES, {})).all())
+
+
+class ParseCacheTest(unittest.TestCase):
+    """
+    Run tests for the caching of parsed expressions.
+    """
+    def setUp(self):
+        super(ParseCacheTest, self).setUp()
+        calc.PARSE_CACHE.clear()
+        self.addCleanup(calc.PARSE_CACHE.clear)
+
+    def test_names_used(self):
+        parser = calc.ParseAugmenter('f(x) + g(y^Z) - x*pi')
+        parser.parse_algebra()
+        self.assertEqual(parser.variables_used, {'x', 'y', 'Z', 'pi'})
+        self.assertEqual(parser.functions_used, {'f', 'g'})
+
+    def test_cached_tree(self):
+        first_parser = calc.ParseAugmenter('x^2 + sin(y)')
+        first_parser.parse_algebra()
+        self.assertEqual(len(calc.PARSE_CACHE), 1)
+
+        # The tree is shared by case-insensitive parses too.
+        second_parser = calc.ParseAugmenter('x^2 + sin(y)', case_sensitive=True)
+        with patch('calc.calc.build_grammar') as mock_build_grammar:
+            with patch.object(calc.calc.get_grammar(), 'parseString') as mock_parse_string:
+                second_parser.parse_algebra()
+        self.assertFalse(mock_build_grammar.called)
+        self.assertFalse(mock_parse_string.called)
+        self.assertIs(second_parser.tree, first_parser.tree)
+        self.assertEqual(second_parser.variables_used, {'x', 'y'})
+        self.assertEqual(second_parser.functions_used, {'sin'})
+        self.assertEqual(calc.evaluator({'x': 2.0, 'y': 0.0}, {}, 'x^2 + sin(y)'), 4.0)
+
+    def test_cache_is_bounded(self):
+        cache = calc.ParseCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(len(cache), 2)
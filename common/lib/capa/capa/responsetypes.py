@@ -37,7 +37,7 @@ from shapely.geometry import Point, MultiPoint
 import dogstats_wrapper as dog_stats_api
 
 # specific library imports
-from calc import evaluator, UndefinedVariable
+from calc import CompiledExpression, evaluator, UndefinedVariable
 from . import correctmap
 from .registry import TagRegistry
 from datetime import datetime
@@ -3203,18 +3203,18 @@ class FormulaResponse(LoncapaResponse):
         Takes in an answer and a list of dictionaries mapping variables to values.
         Each dictionary represents a test case for the answer.
         Returns a tuple of formula evaluation results.
+
+        The answer is parsed once, and evaluated for all test cases together.
         """
         _ = self.capa_system.i18n.ugettext
 
         out = []
-        for var_dict in var_dict_list:
+        if var_dict_list:
             try:
-                out.append(evaluator(
-                    var_dict,
-                    dict(),
+                out = CompiledExpression(
                     answer,
                     case_sensitive=self.case_sensitive,
-                ))
+                ).evaluate_samples(var_dict_list, dict())
             except UndefinedVariable as err:
                 log.debug(
                     'formularesponse: undefined variable in formula=%s',
@@ -472,6 +472,22 @@ class FormulaResponseTest(ResponseTest):
         input_formula = "x + y"
         self.assert_grade(problem, input_formula, "incorrect")
 
+    def test_answers_parsed_once(self):
+        """
+        Test that the student's and the instructor's answers are each parsed
+        once, rather than once per sample.
+        """
+        sample_dict = {'x': (-10, 10), 'y': (-10, 10)}
+        problem = self.build_problem(sample_dict=sample_dict,
+                                     num_samples=50,
+                                     tolerance=0.01,
+                                     answer="x+2*y")
+
+        with mock.patch('calc.calc.ParseAugmenter.parse_algebra', autospec=True,
+                        side_effect=calc.calc.ParseAugmenter.parse_algebra) as mock_parse_algebra:
+            self.assert_grade(problem, "2*x - x + y + y", "correct")
+        self.assertEqual(mock_parse_algebra.call_count, 2)
+
     def test_hint(self):
         """
         Test the hint-giving functionality of FormulaResponse
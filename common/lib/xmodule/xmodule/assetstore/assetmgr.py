@@ -58,3 +58,11 @@ class AssetManager(object):
         compressed course structure from the structure cache.
         """
         return contentstore().find(asset_key, throw_on_not_found, as_stream)
+
+    @staticmethod
+    @contract(asset_key='AssetKey', throw_on_not_found='bool')
+    def find_metadata(asset_key, throw_on_not_found=True):
+        """
+        Finds the metadata of a course asset in the deprecated contentstore, without its data.
+        """
+        return contentstore().find_metadata(asset_key, throw_on_not_found)
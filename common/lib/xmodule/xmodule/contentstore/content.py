@@ -309,8 +309,10 @@ class StaticContentStream(StaticContent):
         self._stream = stream
 
     def stream_data(self):
+        # Read GridFS files one GridFS chunk at a time.
+        chunk_size = getattr(self._stream, 'chunk_size', STREAM_DATA_CHUNK_SIZE)
         while True:
-            chunk = self._stream.read(STREAM_DATA_CHUNK_SIZE)
+            chunk = self._stream.read(chunk_size)
             if len(chunk) == 0:
                 break
             yield chunk
@@ -318,16 +320,24 @@ class StaticContentStream(StaticContent):
     def stream_data_in_range(self, first_byte, last_byte):
         """
         Stream the data between first_byte and last_byte (included)
+
+        The stream is positioned at first_byte directly, and is then read up to each following
+        chunk boundary.  GridFS files are read with readchunk, which fetches only the GridFS
+        chunk holding the current position and returns the rest of it without buffering.
         """
+        chunk_size = getattr(self._stream, 'chunk_size', STREAM_DATA_CHUNK_SIZE)
+        readchunk = getattr(self._stream, 'readchunk', None)
         self._stream.seek(first_byte)
         position = first_byte
-        while True:
-            if last_byte < position + STREAM_DATA_CHUNK_SIZE - 1:
-                chunk = self._stream.read(last_byte - position + 1)
-                yield chunk
+        while position <= last_byte:
+            size = min((position // chunk_size + 1) * chunk_size, last_byte + 1) - position
+            if readchunk is not None:
+                chunk = readchunk()[:size]
+            else:
+                chunk = self._stream.read(size)
+            if len(chunk) == 0:
                 break
-            chunk = self._stream.read(STREAM_DATA_CHUNK_SIZE)
-            position += STREAM_DATA_CHUNK_SIZE
+            position += len(chunk)
             yield chunk
 
     def close(self):
@@ -352,6 +362,13 @@ class ContentStore(object):
     def find(self, filename):
         raise NotImplementedError
 
+    def find_metadata(self, location, throw_on_not_found=True):
+        '''
+        Returns a StaticContent with the metadata of the asset at the given location, without reading its data.
+        By default, the asset is found as a stream, which only reads its data when streamed.
+        '''
+        return self.find(location, throw_on_not_found, as_stream=True)
+
     def get_all_content_for_course(self, course_key, start=0, maxresults=-1, sort=None, filter_params=None):
         '''
         Returns a list of static assets for a course, followed by the total number of assets.
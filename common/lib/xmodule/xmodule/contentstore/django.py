@@ -2,6 +2,7 @@ from __future__ import absolute_import
 from importlib import import_module
 
 from django.conf import settings
+from django.core.cache import caches, InvalidCacheBackendError
 
 _CONTENTSTORE = {}
 
@@ -25,6 +26,10 @@ def contentstore(name='default'):
         if 'ADDITIONAL_OPTIONS' in settings.CONTENTSTORE:
             if name in settings.CONTENTSTORE['ADDITIONAL_OPTIONS']:
                 options.update(settings.CONTENTSTORE['ADDITIONAL_OPTIONS'][name])
+        try:
+            options['metadata_cache'] = caches['contentstore_metadata']
+        except InvalidCacheBackendError:
+            options['metadata_cache'] = caches['default']
         _CONTENTSTORE[name] = class_(**options)
 
     return _CONTENTSTORE[name]
@@ -1,6 +1,7 @@
 """
 MongoDB/GridFS-level code for the contentstore.
 """
+from hashlib import md5
 import os
 import json
 import pymongo
@@ -18,6 +19,10 @@ from xmodule.util.misc import escape_invalid_characters
 from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
 from .content import StaticContent, ContentStore, StaticContentStream
 
+# Seconds the metadata of an asset is cached for.  Kept short, so that metadata
+# re-cached by a reader racing with a write doesn't stay stale for long.
+METADATA_CACHE_TIMEOUT = 60
+
 
 class MongoContentStore(ContentStore):
     """
@@ -26,12 +31,15 @@ class MongoContentStore(ContentStore):
     # pylint: disable=unused-argument, bad-continuation
     def __init__(
         self, host, db,
-        port=27017, tz_aware=True, user=None, password=None, bucket='fs', collection=None, **kwargs
+        port=27017, tz_aware=True, user=None, password=None, bucket='fs', collection=None, metadata_cache=None,
+        **kwargs
     ):
         """
         Establish the connection with the mongo backend and connect to the collections
 
         :param collection: ignores but provided for consistency w/ other doc_store_config patterns
+        :param metadata_cache: optional cache (e.g. a django cache) in which the metadata of assets
+            is kept, so find_metadata does not need to query mongo
         """
         # GridFS will throw an exception if the Database is wrapped in a MongoProxy. So don't wrap it.
         # The appropriate methods below are marked as autoretry_read - those methods will handle
@@ -47,6 +55,8 @@ class MongoContentStore(ContentStore):
         self.fs_files = mongo_db[bucket + ".files"]  # the underlying collection GridFS uses
         self.chunks = mongo_db[bucket + ".chunks"]
 
+        self.metadata_cache = metadata_cache
+
     def close_connections(self):
         """
         Closes any open connections to the underlying databases
@@ -100,6 +110,15 @@ class MongoContentStore(ContentStore):
             else:
                 fp.write(content.data)
 
+        self._set_cached_metadata(content_id, {
+            'name': content.name,
+            'content_type': content.content_type,
+            'length': fp.length,
+            'content_digest': fp.md5,
+            'locked': getattr(content, 'locked', False),
+            'last_modified_at': fp.upload_date,
+        })
+
         return content
 
     def delete(self, location_or_id):
@@ -110,6 +129,44 @@ class MongoContentStore(ContentStore):
             location_or_id, _ = self.asset_db_key(location_or_id)
         # Deletes of non-existent files are considered successful
         self.fs.delete(location_or_id)
+        self._delete_cached_metadata(location_or_id)
+
+    @autoretry_read()
+    def find_metadata(self, location, throw_on_not_found=True):
+        """
+        Returns a StaticContent with the metadata of the asset at the given location, and no data.
+
+        The metadata is read from the metadata cache if there is one, so this usually needs no
+        round-trip to mongo.  The thumbnail location and import path of the asset are not included.
+
+        Raises NotFoundError if no such item exists and throw_on_not_found is True.
+        """
+        content_id, __ = self.asset_db_key(location)
+
+        metadata = self._get_cached_metadata(content_id)
+        if metadata is None:
+            item = self.fs_files.find_one(
+                {'_id': content_id}, ['displayname', 'contentType', 'length', 'md5', 'locked', 'uploadDate']
+            )
+            if item is None:
+                if throw_on_not_found:
+                    raise NotFoundError(content_id)
+                return None
+            metadata = {
+                'name': item.get('displayname'),
+                'content_type': item.get('contentType'),
+                'length': item.get('length'),
+                'content_digest': item.get('md5'),
+                'locked': item.get('locked', False),
+                'last_modified_at': item.get('uploadDate'),
+            }
+            self._set_cached_metadata(content_id, metadata)
+
+        return StaticContent(
+            location, metadata['name'], metadata['content_type'], None,
+            last_modified_at=metadata['last_modified_at'], length=metadata['length'],
+            locked=metadata['locked'], content_digest=metadata['content_digest'],
+        )
 
     @autoretry_read()
     def find(self, location, throw_on_not_found=True, as_stream=False):
@@ -225,6 +282,7 @@ class MongoContentStore(ContentStore):
             assets_to_delete = assets_to_delete + items.count()
             for asset in items:
                 self.fs.delete(asset[prefix])
+                self._delete_cached_metadata(asset[prefix])
 
             self.fs_files.remove(query)
         return assets_to_delete
@@ -307,8 +365,11 @@ class MongoContentStore(ContentStore):
             if attr in ['_id', 'md5', 'uploadDate', 'length']:
                 raise AttributeError("{} is a protected attribute.".format(attr))
         asset_db_key, __ = self.asset_db_key(location)
+        self._delete_cached_metadata(asset_db_key)
         # catch upsert error and raise NotFoundError if asset doesn't exist
         result = self.fs_files.update({'_id': asset_db_key}, {"$set": attr_dict}, upsert=False)
+        # A concurrent find_metadata may have cached the metadata read before the update.
+        self._delete_cached_metadata(asset_db_key)
         if not result.get('updatedExisting', True):
             raise NotFoundError(asset_db_key)
 
@@ -367,6 +428,7 @@ class MongoContentStore(ContentStore):
                 # getattr b/c caching may mean some pickled instances don't have attr
                 locked=asset.get('locked', False)
             )
+            self._delete_cached_metadata(asset_id)
 
     def delete_all_course_assets(self, course_key):
         """
@@ -379,6 +441,40 @@ class MongoContentStore(ContentStore):
         for asset in matching_assets:
             asset_key = self.make_id_son(asset)
             self.fs.delete(asset_key)
+            self._delete_cached_metadata(asset_key)
+
+    def _metadata_cache_key(self, content_id):
+        """
+        Returns the key of the metadata cache for the asset with the given database _id.
+        """
+        if not isinstance(content_id, basestring):
+            # Deprecated assets have a SON _id, which is not necessarily in the ordered_key_fields order.
+            content_id = u'/'.join(
+                unicode(content_id.get(field_name)) for field_name in self.ordered_key_fields + ['run']
+            )
+        return 'contentstore.metadata.{}'.format(md5(content_id.encode('utf-8')).hexdigest())
+
+    def _get_cached_metadata(self, content_id):
+        """
+        Returns the cached metadata of the asset with the given database _id, or None.
+        """
+        if self.metadata_cache is None:
+            return None
+        return self.metadata_cache.get(self._metadata_cache_key(content_id))
+
+    def _set_cached_metadata(self, content_id, metadata):
+        """
+        Caches the metadata of the asset with the given database _id.
+        """
+        if self.metadata_cache is not None:
+            self.metadata_cache.set(self._metadata_cache_key(content_id), metadata, timeout=METADATA_CACHE_TIMEOUT)
+
+    def _delete_cached_metadata(self, content_id):
+        """
+        Removes the cached metadata of the asset with the given database _id.
+        """
+        if self.metadata_cache is not None:
+            self.metadata_cache.delete(self._metadata_cache_key(content_id))
 
     # codifying the original order which pymongo used for the dicts coming out of location_to_dict
     # stability of order is more important than sanity of order as any changes to order make things
@@ -12,6 +12,7 @@ structure:
 }
 """
 
+from collections import OrderedDict, defaultdict
 import copy
 from datetime import datetime
 from importlib import import_module
@@ -19,6 +20,7 @@ import logging
 import pymongo
 import re
 import sys
+from threading import Lock
 from uuid import uuid4
 
 from bson.son import SON
@@ -76,6 +78,9 @@ BLOCK_TYPES_WITH_CHILDREN = list(set(
 # at module level, cache one instance of OSFS per filesystem root.
 _OSFS_INSTANCE = {}
 
+# maximum number of course metadata inheritance trees kept in memory by each modulestore
+INHERITANCE_TREE_LOCAL_CACHE_SIZE = 50
+
 
 class MongoRevisionKey(object):
     """
@@ -531,6 +536,53 @@ class ParentLocationCache(dict):
             del self[key]
 
 
+class InheritanceTreeLocalCache(object):
+    """
+    In-process least-recently-used cache of course metadata inheritance trees,
+    which sits in front of the metadata_inheritance_cache_subsystem.
+
+    Entries are keyed by course key and are associated with the version of the
+    tree they hold.  A lookup with any other version is a miss, so an entry is
+    never used once another process stores a newer tree for the course.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        # OrderedDict {CourseKey: (version, value)}, from least to most recently used
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, course_key, version):
+        """
+        Return the value cached for the given course key and version, or None.
+        """
+        with self._lock:
+            entry = self._entries.pop(course_key, None)
+            if entry is None:
+                return None
+            self._entries[course_key] = entry
+            return entry[1] if entry[0] == version else None
+
+    def set(self, course_key, version, value):
+        """
+        Cache the value of the given version of the course's tree, replacing any other version.
+        """
+        with self._lock:
+            self._entries.pop(course_key, None)
+            self._entries[course_key] = (version, value)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Forget all cached trees.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
 class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, MongoBulkOpsMixin):
     """
     A Mongodb backed ModuleStore
@@ -596,6 +648,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         self.user_service = user_service
 
         self._course_run_cache = {}
+        self._inheritance_tree_local_cache = InheritanceTreeLocalCache(INHERITANCE_TREE_LOCAL_CACHE_SIZE)
         self.signal_handler = signal_handler
 
     def close_connections(self):
@@ -684,18 +737,21 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         else:
             return ParentLocationCache()
 
-    def _compute_metadata_inheritance_tree(self, course_id):
+    def _find_inheritance_records(self, course_id, names=None):
         '''
-        Find all inheritable fields from all xblocks in the course which may define inheritable data
+        Find the location, children and inheritable metadata of the containers in the course,
+        optionally limited to those with the given names, keyed by their location url. The draft
+        and published children of a container are merged.
         '''
-        # get all collections in the course, this query should not return any leaf nodes
-        course_id = self.fill_in_run(course_id)
+        # this query should not return any leaf nodes
         query = SON([
             ('_id.tag', 'i4x'),
             ('_id.org', course_id.org),
             ('_id.course', course_id.course),
             ('_id.category', {'$in': BLOCK_TYPES_WITH_CHILDREN})
         ])
+        if names is not None:
+            query['_id.name'] = {'$in': list(names)}
         # if we're only dealing in the published branch, then only get published containers
         if self.get_branch_setting() == ModuleStoreEnum.Branch.published_only:
             query['_id.revision'] = None
@@ -713,7 +769,6 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         # it's ok to keep these as deprecated strings b/c the overall cache is indexed by course_key and this
         # is a dictionary relative to that course
         results_by_url = {}
-        root = None
 
         # now go through the results and order them by the location url
         for result in resultset:
@@ -732,47 +787,188 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
                 results_by_url[location_url].setdefault('definition', {})['children'] = set(total_children)
             else:
                 results_by_url[location_url] = result
-            if location.category == 'course':
-                root = location_url
+        return results_by_url
 
-        # now traverse the tree and compute down the inherited metadata
-        metadata_to_inherit = {}
+    @staticmethod
+    def _inherit_metadata_down(results_by_url, url, merged_metadata, parents):
+        """
+        Compute down the metadata inherited by the descendants of the container at url, whose
+        own merged metadata must already be in merged_metadata. Records the merged metadata of
+        each descendant container in merged_metadata and the parent of each descendant in parents.
+        """
+        my_metadata = merged_metadata[url]
 
-        def _compute_inherited_metadata(url):
-            """
-            Helper method for computing inherited metadata for a specific location url
-            """
-            my_metadata = results_by_url[url].get('metadata', {})
-
-            # go through all the children and recurse, but only if we have
-            # in the result set. Remember results will not contain leaf nodes
-            for child in results_by_url[url].get('definition', {}).get('children', []):
-                if child in results_by_url:
-                    new_child_metadata = copy.deepcopy(my_metadata)
-                    new_child_metadata.update(results_by_url[child].get('metadata', {}))
-                    results_by_url[child]['metadata'] = new_child_metadata
-                    metadata_to_inherit[child] = new_child_metadata
-                    _compute_inherited_metadata(child)
-                else:
-                    # this is likely a leaf node, so let's record what metadata we need to inherit
-                    metadata_to_inherit[child] = my_metadata.copy()
-                # WARNING: 'parent' is not part of inherited metadata, but
-                # we're piggybacking on this recursive traversal to grab
-                # and cache the child's parent, as a performance optimization.
-                # The 'parent' key will be popped out of the dictionary during
-                # CachingDescriptorSystem.load_item
-                metadata_to_inherit[child].setdefault('parent', {})[self.get_branch_setting()] = url
+        # go through all the children and recurse, but only if we have
+        # in the result set. Remember results will not contain leaf nodes
+        for child in results_by_url[url].get('definition', {}).get('children', []):
+            parents[child] = url
+            if child in results_by_url:
+                new_child_metadata = copy.deepcopy(my_metadata)
+                new_child_metadata.update(results_by_url[child].get('metadata', {}))
+                merged_metadata[child] = new_child_metadata
+                MongoModuleStore._inherit_metadata_down(results_by_url, child, merged_metadata, parents)
+
+    def _compute_metadata_inheritance_tree(self, course_id):
+        '''
+        Find all inheritable fields from all xblocks in the course which may define inheritable data
 
+        Returns the compact form of the tree: a dict with the merged inheritable metadata of each
+        container reachable from the course ('metadata'), the parent url of each of their children
+        ('parents') and the branch the parents were found in ('branch').
+        '''
+        course_id = self.fill_in_run(course_id)
+        results_by_url = self._find_inheritance_records(course_id)
+
+        merged_metadata = {}
+        parents = {}
+        root = next(
+            (url for url, result in results_by_url.iteritems() if result['_id']['category'] == 'course'), None
+        )
         if root is not None:
-            _compute_inherited_metadata(root)
+            merged_metadata[root] = results_by_url[root].get('metadata', {})
+            self._inherit_metadata_down(results_by_url, root, merged_metadata, parents)
 
-        return metadata_to_inherit
+        return {'metadata': merged_metadata, 'parents': parents, 'branch': self.get_branch_setting()}
+
+    def _update_metadata_inheritance_tree(self, course_id, compact_tree, location):
+        '''
+        Return the compact metadata inheritance tree updated for an edit of the block at location,
+        recomputing only the subtree of that block. Returns compact_tree itself if the edit doesn't
+        change the tree, or None if the whole tree must be recomputed.
+        '''
+        if compact_tree['branch'] != self.get_branch_setting() or location.block_type == 'course':
+            return None
+        url = unicode(as_published(location))
+        if url not in compact_tree['metadata']:
+            # leaf nodes don't contribute to the tree, and containers that aren't reachable from the
+            # course are only added to it when their parent is updated
+            return compact_tree
+        parent_url = compact_tree['parents'].get(url)
+        if parent_url not in compact_tree['metadata']:
+            return None
+
+        # find the containers currently in the subtree of the block, a level at a time
+        results_by_url = {}
+        level = [url]
+        while level:
+            found = self._find_inheritance_records(course_id, names=set(
+                UsageKey.from_string(level_url).block_id for level_url in level
+            ))
+            next_level = []
+            for level_url in level:
+                if level_url in found and level_url not in results_by_url:
+                    results_by_url[level_url] = found[level_url]
+                    next_level.extend(
+                        child for child in found[level_url].get('definition', {}).get('children', [])
+                        if UsageKey.from_string(child).block_type in BLOCK_TYPES_WITH_CHILDREN
+                    )
+            level = next_level
+        if url not in results_by_url:
+            return None
+
+        # drop the previous descendants of the block, then compute its subtree again
+        merged_metadata = dict(compact_tree['metadata'])
+        parents = dict(compact_tree['parents'])
+        children_by_parent = defaultdict(list)
+        for child, parent in parents.iteritems():
+            children_by_parent[parent].append(child)
+        stack = [url]
+        while stack:
+            for child in children_by_parent.pop(stack.pop(), []):
+                del parents[child]
+                merged_metadata.pop(child, None)
+                stack.append(child)
+
+        block_metadata = copy.deepcopy(merged_metadata[parent_url])
+        block_metadata.update(results_by_url[url].get('metadata', {}))
+        merged_metadata[url] = block_metadata
+        self._inherit_metadata_down(results_by_url, url, merged_metadata, parents)
+
+        return {'metadata': merged_metadata, 'parents': parents, 'branch': compact_tree['branch']}
+
+    @staticmethod
+    def _expand_metadata_inheritance_tree(compact_tree):
+        '''
+        Return the metadata inheritance tree used by CachingDescriptorSystems from its compact form:
+        a dict of the inherited metadata of each block in the course, keyed by location url.
+        '''
+        merged_metadata = compact_tree['metadata']
+        tree = {}
+        for child, parent in compact_tree['parents'].iteritems():
+            # a container's entry holds its own metadata merged over what it inherits, as its
+            # descendants see it; a leaf's entry is what it inherits from its parent.
+            metadata_to_inherit = dict(merged_metadata[child] if child in merged_metadata else merged_metadata[parent])
+            # WARNING: 'parent' is not part of inherited metadata, but
+            # we're piggybacking on the tree to cache the child's parent,
+            # as a performance optimization.
+            metadata_to_inherit['parent'] = {compact_tree['branch']: parent}
+            tree[child] = metadata_to_inherit
+        return tree
+
+    def _get_stored_metadata_inheritance_tree(self, course_id):
+        '''
+        Return the compact and expanded forms of the course's metadata inheritance tree from the
+        in-process cache or the caching subsystem (e.g. memcached), or None if it isn't stored.
+
+        Each stored tree has a version, which is also stored under its own key in the caching
+        subsystem, so the in-process copy can be validated without fetching the whole tree.
+        '''
+        if self.metadata_inheritance_cache_subsystem is None:
+            logging.warning(
+                'Running MongoModuleStore without a metadata_inheritance_cache_subsystem. This is \
+                OK in localdev and testing environment. Not OK in production.'
+            )
+            return None
+
+        version_key = u'inheritance_tree_version.{}'.format(course_id)
+        version = self.metadata_inheritance_cache_subsystem.get(version_key)
+        if version is not None:
+            cached = self._inheritance_tree_local_cache.get(course_id, version)
+            if cached is not None:
+                return cached
+
+        compact_tree = self.metadata_inheritance_cache_subsystem.get(u'inheritance_tree.{}'.format(course_id))
+        if not compact_tree:
+            return None
+        if version is None:
+            # the version was evicted separately from the tree
+            self.metadata_inheritance_cache_subsystem.set(version_key, compact_tree['version'])
+        cached = (compact_tree, self._expand_metadata_inheritance_tree(compact_tree))
+        self._inheritance_tree_local_cache.set(course_id, compact_tree['version'], cached)
+        return cached
+
+    def _store_metadata_inheritance_tree(self, course_id, compact_tree):
+        '''
+        Store a new version of the course's metadata inheritance tree in the caching subsystem
+        (e.g. memcached), if available, and in the in-process cache. Returns the expanded tree.
+        '''
+        compact_tree = dict(compact_tree, version=uuid4().hex)
+        tree = self._expand_metadata_inheritance_tree(compact_tree)
+        if self.metadata_inheritance_cache_subsystem is not None:
+            # write the tree before its version, so the version never refers to a tree that isn't stored
+            self.metadata_inheritance_cache_subsystem.set(u'inheritance_tree.{}'.format(course_id), compact_tree)
+            self.metadata_inheritance_cache_subsystem.set(
+                u'inheritance_tree_version.{}'.format(course_id), compact_tree['version']
+            )
+            self._inheritance_tree_local_cache.set(course_id, compact_tree['version'], (compact_tree, tree))
+        return tree
+
+    def _set_request_cached_metadata_inheritance_tree(self, course_id, tree):
+        '''
+        Populate the request_cache, if available, with the course's metadata inheritance tree.
+        '''
+        if self.request_cache is not None:
+            # we can't assume the 'metadatat_inheritance' part of the request cache dict has been
+            # defined
+            if 'metadata_inheritance' not in self.request_cache.data:
+                self.request_cache.data['metadata_inheritance'] = {}
+            self.request_cache.data['metadata_inheritance'][unicode(course_id)] = tree
 
     def _get_cached_metadata_inheritance_tree(self, course_id, force_refresh=False):
         '''
         Compute the metadata inheritance for the course.
         '''
-        tree = {}
+        tree = None
 
         course_id = self.fill_in_run(course_id)
         if not force_refresh:
@@ -780,47 +976,60 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             if self.request_cache is not None and unicode(course_id) in self.request_cache.data.get('metadata_inheritance', {}):
                 return self.request_cache.data['metadata_inheritance'][unicode(course_id)]
 
-            # then look in any caching subsystem (e.g. memcached)
-            if self.metadata_inheritance_cache_subsystem is not None:
-                tree = self.metadata_inheritance_cache_subsystem.get(unicode(course_id), {})
-            else:
-                logging.warning(
-                    'Running MongoModuleStore without a metadata_inheritance_cache_subsystem. This is \
-                    OK in localdev and testing environment. Not OK in production.'
-                )
+            # then look in the in-process cache and any caching subsystem (e.g. memcached)
+            stored = self._get_stored_metadata_inheritance_tree(course_id)
+            if stored is not None:
+                tree = stored[1]
 
-        if not tree:
+        if tree is None:
             # if not in subsystem, or we are on force refresh, then we have to compute
-            tree = self._compute_metadata_inheritance_tree(course_id)
-
-            # now write out computed tree to caching subsystem (e.g. memcached), if available
-            if self.metadata_inheritance_cache_subsystem is not None:
-                self.metadata_inheritance_cache_subsystem.set(unicode(course_id), tree)
+            # and write out the computed tree
+            tree = self._store_metadata_inheritance_tree(course_id, self._compute_metadata_inheritance_tree(course_id))
 
         # now populate a request_cache, if available. NOTE, we are outside of the
         # scope of the above if: statement so that after a memcache hit, it'll get
         # put into the request_cache
-        if self.request_cache is not None:
-            # we can't assume the 'metadatat_inheritance' part of the request cache dict has been
-            # defined
-            if 'metadata_inheritance' not in self.request_cache.data:
-                self.request_cache.data['metadata_inheritance'] = {}
-            self.request_cache.data['metadata_inheritance'][unicode(course_id)] = tree
+        self._set_request_cached_metadata_inheritance_tree(course_id, tree)
 
         return tree
 
-    def refresh_cached_metadata_inheritance_tree(self, course_id, runtime=None):
+    def _update_cached_metadata_inheritance_tree(self, course_id, location):
+        '''
+        Update the stored metadata inheritance tree for an edit of the block at location. Returns
+        the updated tree, or None if no tree is stored or the whole tree must be recomputed.
+        '''
+        course_id = self.fill_in_run(course_id)
+        stored = self._get_stored_metadata_inheritance_tree(course_id)
+        if stored is None:
+            return None
+        compact_tree, tree = stored
+        updated_compact_tree = self._update_metadata_inheritance_tree(course_id, compact_tree, location)
+        if updated_compact_tree is None:
+            return None
+        if updated_compact_tree is not compact_tree:
+            tree = self._store_metadata_inheritance_tree(course_id, updated_compact_tree)
+        self._set_request_cached_metadata_inheritance_tree(course_id, tree)
+        return tree
+
+    def refresh_cached_metadata_inheritance_tree(self, course_id, runtime=None, location=None):
         """
         Refresh the cached metadata inheritance tree for the org/course combination
         for location
 
         If given a runtime, it replaces the cached_metadata in that runtime. NOTE: failure to provide
         a runtime may mean that some objects report old values for inherited data.
+
+        If given the location of the only block which was edited, and the tree is stored, only the
+        subtree of that block is recomputed.
         """
         course_id = course_id.for_branch(None)
         if not self._is_in_bulk_operation(course_id):
             # below is done for side effects when runtime is None
-            cached_metadata = self._get_cached_metadata_inheritance_tree(course_id, force_refresh=True)
+            cached_metadata = None
+            if location is not None:
+                cached_metadata = self._update_cached_metadata_inheritance_tree(course_id, location)
+            if cached_metadata is None:
+                cached_metadata = self._get_cached_metadata_inheritance_tree(course_id, force_refresh=True)
             if runtime:
                 runtime.cached_metadata = cached_metadata
 
@@ -951,7 +1160,11 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         else:
             system = using_descriptor_system
             system.module_data.update(data_cache)
-            system.cached_metadata.update(cached_metadata)
+            if cached_metadata is not system.cached_metadata:
+                # the cached tree may be shared with other requests, so don't update it in place
+                merged_metadata = dict(system.cached_metadata)
+                merged_metadata.update(cached_metadata)
+                system.cached_metadata = merged_metadata
 
         return system.load_item(location, for_parent=for_parent)
 
@@ -1528,7 +1741,9 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             xblock._edit_info = payload['edit_info']
 
             # recompute (and update) the metadata inheritance tree which is cached
-            self.refresh_cached_metadata_inheritance_tree(xblock.scope_ids.usage_id.course_key, xblock.runtime)
+            self.refresh_cached_metadata_inheritance_tree(
+                xblock.scope_ids.usage_id.course_key, xblock.runtime, location=xblock.location
+            )
             # fire signal that we've written to DB
         except ItemNotFoundError:
             if not allow_not_found:
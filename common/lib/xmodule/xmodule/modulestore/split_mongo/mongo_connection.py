@@ -538,6 +538,19 @@ class MongoConnection(object):
             tagger.tag(block_type=definition['block_type'])
             self.definitions.insert(definition)
 
+    def insert_definitions(self, definitions, course_context=None):
+        """
+        Create the definitions in the db with a single bulk insert.
+
+        All of the definitions which aren't already in the db are inserted even if some are.
+        Raises DuplicateKeyError afterwards in that case.
+        """
+        with TIMER.timer("insert_definitions", course_context) as tagger:
+            tagger.measure('definitions', len(definitions))
+            for block_type in sorted(set(definition['block_type'] for definition in definitions)):
+                tagger.tag(block_type=block_type)
+            self.definitions.insert(definitions, continue_on_error=True)
+
     def ensure_indexes(self):
         """
         Ensure that all appropriate indexes are created that are needed by this modulestore, or raise
@@ -254,16 +254,21 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
                 # append only, so if it's already been written, we can just keep going.
                 log.debug("Attempted to insert duplicate structure %s", _id)
 
-        for _id in bulk_write_record.definitions.viewkeys() - bulk_write_record.definitions_in_db:
+        # Definitions are inserted in bulk, as there is one for nearly every block of an imported course.
+        new_definitions = [
+            bulk_write_record.definitions[_id]
+            for _id in bulk_write_record.definitions.viewkeys() - bulk_write_record.definitions_in_db
+        ]
+        if new_definitions:
             dirty = True
 
             try:
-                self.db_connection.insert_definition(bulk_write_record.definitions[_id], bulk_write_record.course_key)
+                self.db_connection.insert_definitions(new_definitions, bulk_write_record.course_key)
             except DuplicateKeyError:
-                # We may not have looked up this definition inside this bulk operation, and thus
-                # didn't realize that it was already in the database. That's OK, the store is
-                # append only, so if it's already been written, we can just keep going.
-                log.debug("Attempted to insert duplicate definition %s", _id)
+                # We may not have looked up some of these definitions inside this bulk operation, and thus
+                # didn't realize that they were already in the database. That's OK, the store is
+                # append only, so if they've already been written, we can just keep going.
+                log.debug("Attempted to insert duplicate definitions for %s", bulk_write_record.course_key)
 
         if bulk_write_record.index is not None and bulk_write_record.index != bulk_write_record.initial_index:
             dirty = True
@@ -341,8 +341,16 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
 
         draft_course = get_course(ModuleStoreEnum.BranchName.draft)
         published_course = get_course(ModuleStoreEnum.BranchName.published)
+        # the result for every block visited is kept so that checking each block of
+        # an outline only walks the course once rather than once per ancestor
+        subtree_changes = self._get_has_changes_cache(draft_course, published_course)
 
         def has_changes_subtree(block_key):
+            if block_key not in subtree_changes:
+                subtree_changes[block_key] = compute_has_changes_subtree(block_key)
+            return subtree_changes[block_key]
+
+        def compute_has_changes_subtree(block_key):
             draft_block = get_block(draft_course, block_key)
             if draft_block is None:  # temporary fix for bad pointers TNL-1141
                 return True
@@ -364,6 +372,33 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
 
         return has_changes_subtree(BlockKey.from_usage_key(xblock.location))
 
+    def _get_has_changes_cache(self, draft_structure, published_structure):
+        """
+        Returns the dict of has_changes results by block key for the given pair of draft and
+        published structures, kept in the request cache if there is one. Structures only change
+        through update_structure, which clears the results for them via _clear_cache.
+        """
+        if self.request_cache is None:
+            return {}
+        return self.request_cache.data.setdefault('has_changes_cache', {}).setdefault(
+            (draft_structure['_id'], published_structure['_id']), {}
+        )
+
+    def _clear_cache(self, course_version_guid=None):
+        """
+        Clears the has_changes results for the given structure along with its descriptor cache.
+        """
+        super(DraftVersioningModuleStore, self)._clear_cache(course_version_guid)
+        if self.request_cache is None:
+            return
+
+        if course_version_guid:
+            has_changes_cache = self.request_cache.data.setdefault('has_changes_cache', {})
+            for structure_ids in [key for key in has_changes_cache if course_version_guid in key]:
+                del has_changes_cache[structure_ids]
+        else:
+            self.request_cache.data['has_changes_cache'] = {}
+
     def publish(self, location, user_id, blacklist=None, **kwargs):
         """
         Publishes the subtree under location from the draft branch to the published branch
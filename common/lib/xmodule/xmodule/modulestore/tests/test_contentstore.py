@@ -9,10 +9,12 @@ from tempfile import mkdtemp
 import path
 import shutil
 
+from mock import patch
+
 from opaque_keys.edx.locator import CourseLocator, AssetLocator
 from opaque_keys.edx.keys import AssetKey
 from xmodule.tests import DATA_DIR
-from xmodule.contentstore.mongo import MongoContentStore
+from xmodule.contentstore.mongo import METADATA_CACHE_TIMEOUT, MongoContentStore
 from xmodule.contentstore.content import StaticContent
 from xmodule.exceptions import NotFoundError
 import ddt
@@ -25,6 +27,22 @@ PORT = MONGO_PORT_NUM
 DB = 'test_mongo_%s' % uuid4().hex[:5]
 
 
+class DictCache(dict):
+    """
+    Dict with the interface of a django cache used by the contentstore.
+    """
+    def __init__(self):
+        super(DictCache, self).__init__()
+        self.timeouts = {}
+
+    def set(self, key, value, timeout=None):
+        self[key] = value
+        self.timeouts[key] = timeout
+
+    def delete(self, key):
+        self.pop(key, None)
+
+
 @ddt.ddt
 class TestContentstore(unittest.TestCase):
     """
@@ -123,6 +141,65 @@ class TestContentstore(unittest.TestCase):
             "Found unknown asset {}".format(unknown_asset)
         )
 
+    @ddt.data(True, False)
+    def test_find_metadata(self, deprecated):
+        """
+        Test that find_metadata returns the asset's metadata without its data
+        """
+        self.set_up_assets(deprecated)
+        asset_key = self.course1_key.make_asset_key('asset', self.course1_files[1])
+        metadata = self.contentstore.find_metadata(asset_key)
+        content = self.contentstore.find(asset_key)
+
+        self.assertIsNone(metadata.data)
+        for attr in ['location', 'name', 'content_type', 'length', 'content_digest', 'locked']:
+            self.assertEqual(getattr(metadata, attr), getattr(content, attr))
+
+        unknown_asset = self.course1_key.make_asset_key('asset', 'no_such_file.gif')
+        with self.assertRaises(NotFoundError):
+            self.contentstore.find_metadata(unknown_asset)
+        self.assertIsNone(self.contentstore.find_metadata(unknown_asset, throw_on_not_found=False))
+
+    @ddt.data(True, False)
+    def test_metadata_cache(self, deprecated):
+        """
+        Test that the metadata cache is populated on save and invalidated on set_attr and delete
+        """
+        self.set_up_assets(deprecated)
+        self.contentstore.metadata_cache = DictCache()
+        asset_key = self.course1_key.make_asset_key('asset', self.course1_files[0])
+        self.save_asset(self.course1_files[0], asset_key, self.course1_files[0], False)
+
+        with patch.object(self.contentstore.fs_files, 'find_one') as mock_find_one:
+            metadata = self.contentstore.find_metadata(asset_key)
+        self.assertFalse(mock_find_one.called)
+        self.assertEqual(metadata.content_digest, self.contentstore.get_attr(asset_key, 'md5'))
+        self.assertEqual(metadata.length, self.contentstore.get_attr(asset_key, 'length'))
+        self.assertFalse(metadata.locked)
+
+        self.assertEqual(self.contentstore.metadata_cache.timeouts.values(), [METADATA_CACHE_TIMEOUT])
+
+        self.contentstore.set_attr(asset_key, 'locked', True)
+        self.assertTrue(self.contentstore.find_metadata(asset_key).locked)
+
+        # Metadata cached by a reader while the attrs are being written is invalidated.
+        update = self.contentstore.fs_files.update
+
+        def read_then_update(*args, **kwargs):
+            """
+            Reads the metadata before running the update.
+            """
+            self.contentstore.find_metadata(asset_key)
+            return update(*args, **kwargs)
+
+        with patch.object(self.contentstore.fs_files, 'update', side_effect=read_then_update):
+            self.contentstore.set_attr(asset_key, 'locked', False)
+        self.assertFalse(self.contentstore.find_metadata(asset_key).locked)
+
+        self.contentstore.delete(asset_key)
+        with self.assertRaises(NotFoundError):
+            self.contentstore.find_metadata(asset_key)
+
     @ddt.data(True, False)
     def test_export_for_course(self, deprecated):
         """
@@ -749,6 +749,34 @@ class TestMixedModuleStore(CommonMixedModuleStoreSetup):
         for key in locations:
             self.assertFalse(self._has_changes(locations[key]))
 
+    def test_has_changes_subtree_results_kept(self):
+        """
+        Tests that split keeps the has_changes() result of each block in the subtree it checks,
+        so that checking the descendants afterwards doesn't walk them again, and that the
+        results are dropped once the course changes.
+        """
+        locations = self.setup_has_changes(ModuleStoreEnum.Type.split)
+        child = self.store.get_item(locations['child'])
+        child.display_name = 'Changed Display Name'
+        self.store.update_item(child, self.user_id)
+
+        blocks = {key: self.store.get_item(location) for key, location in locations.iteritems()}
+        self.assertTrue(self.store.has_changes(blocks['grandparent']))
+
+        split_store = self.store._get_modulestore_by_type(ModuleStoreEnum.Type.split)  # pylint: disable=protected-access
+        with patch.object(
+            split_store, '_get_block_from_structure', wraps=split_store._get_block_from_structure
+        ) as mock_get_block:
+            self.assertTrue(self.store.has_changes(blocks['parent']))
+            self.assertTrue(self.store.has_changes(blocks['child']))
+            self.assertFalse(self.store.has_changes(blocks['parent_sibling']))
+            self.assertFalse(self.store.has_changes(blocks['child_sibling']))
+            self.assertFalse(mock_get_block.called)
+
+        self.store.publish(locations['parent'], self.user_id)
+        for key in locations:
+            self.assertFalse(self._has_changes(locations[key]))
+
     @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
     def test_has_changes_publish_ancestors(self, default_ms):
         """
@@ -39,9 +39,9 @@ from nose.tools import assert_in
 from xmodule.exceptions import NotFoundError
 from git.test.lib.asserts import assert_not_none
 from xmodule.x_module import XModuleMixin
-from xmodule.modulestore.mongo.base import as_draft
+from xmodule.modulestore.mongo.base import as_draft, as_published, InheritanceTreeLocalCache
 from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
-from xmodule.modulestore.tests.utils import LocationMixin, mock_tab_from_json
+from xmodule.modulestore.tests.utils import LocationMixin, MemoryCache, mock_tab_from_json
 from xmodule.modulestore.edit_info import EditInfoMixin
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.modulestore.inheritance import InheritanceMixin
@@ -696,6 +696,78 @@ class TestMongoModuleStore(TestMongoModuleStoreBase):
         self.assertEqual(root_block_key.block_type, "course")
         self.assertEqual(root_block_key.name, "2015")
 
+    def test_metadata_inheritance_tree_delta_update(self):
+        """
+        Test that editing a container updates the stored inheritance tree for its subtree only,
+        and that the result is the same as recomputing the whole tree.
+        """
+        course = self.draft_store.create_course("TestX", "InheritanceTree", "2016_T1", self.dummy_user)
+        chapter = self.draft_store.create_child(self.dummy_user, course.location, "chapter")
+        sequential = self.draft_store.create_child(self.dummy_user, chapter.location, "sequential")
+        vertical = self.draft_store.create_child(self.dummy_user, sequential.location, "vertical")
+        problem = self.draft_store.create_child(self.dummy_user, vertical.location, "problem")
+
+        with patch.object(self.draft_store, 'metadata_inheritance_cache_subsystem', MemoryCache()):
+            self.draft_store.refresh_cached_metadata_inheritance_tree(course.id)
+            sequential = self.draft_store.get_item(sequential.location)
+            sequential.due = datetime(2016, 5, 1, tzinfo=UTC)
+            with patch.object(
+                self.draft_store, '_compute_metadata_inheritance_tree',
+                wraps=self.draft_store._compute_metadata_inheritance_tree,
+            ) as mock_compute:
+                self.draft_store.update_item(sequential, self.dummy_user)
+            self.assertFalse(mock_compute.called)
+
+            tree = self.draft_store._get_cached_metadata_inheritance_tree(course.id)
+            self.assertEqual(
+                tree,
+                self.draft_store._expand_metadata_inheritance_tree(
+                    self.draft_store._compute_metadata_inheritance_tree(course.id)
+                ),
+            )
+            self.assertEqual(
+                tree[unicode(as_published(problem.location))]['parent'].values(),
+                [unicode(as_published(vertical.location))],
+            )
+            self.assertEqual(self.draft_store.get_item(problem.location).due, sequential.due)
+
+        self.draft_store.delete_course(course.id, self.dummy_user)
+
+    def test_metadata_inheritance_tree_local_cache(self):
+        """
+        Test that a stored inheritance tree is served from the in-process cache until
+        another version is stored.
+        """
+        cache = MemoryCache()
+        course_key = self.draft_store.make_course_key('edX', 'toy', '2012_Fall')
+        with patch.object(self.draft_store, 'metadata_inheritance_cache_subsystem', cache):
+            tree = self.draft_store._get_cached_metadata_inheritance_tree(course_key, force_refresh=True)
+            self.assertIs(self.draft_store._get_cached_metadata_inheritance_tree(course_key), tree)
+
+            # another process stores a new version of the tree
+            version_key = u'inheritance_tree_version.{}'.format(course_key)
+            tree_key = u'inheritance_tree.{}'.format(course_key)
+            cache.set(tree_key, dict(cache.get(tree_key), version='other'))
+            cache.set(version_key, 'other')
+            new_tree = self.draft_store._get_cached_metadata_inheritance_tree(course_key)
+            self.assertIsNot(new_tree, tree)
+            self.assertEqual(new_tree, tree)
+
+    def test_inheritance_tree_local_cache_eviction(self):
+        """
+        Test that the in-process cache of inheritance trees evicts the least recently used course
+        and doesn't serve other versions of a tree.
+        """
+        cache = InheritanceTreeLocalCache(2)
+        cache.set('course_a', 'v1', 'tree_a')
+        cache.set('course_b', 'v1', 'tree_b')
+        self.assertEqual(cache.get('course_a', 'v1'), 'tree_a')
+        cache.set('course_c', 'v1', 'tree_c')
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('course_b', 'v1'))
+        self.assertEqual(cache.get('course_a', 'v1'), 'tree_a')
+        self.assertIsNone(cache.get('course_a', 'v2'))
+
 
 class TestMongoModuleStoreWithNoAssetCollection(TestMongoModuleStore):
     '''
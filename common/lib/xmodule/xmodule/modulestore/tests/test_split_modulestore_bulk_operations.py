@@ -168,7 +168,7 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
         self.assertConnCalls()
         self.bulk._end_bulk_operation(self.course_key)
         self.assertConnCalls(
-            call.insert_definition(self.definition, self.course_key),
+            call.insert_definitions([self.definition], self.course_key),
             call.update_course_index(
                 {'versions': {self.course_key.branch: self.definition['_id']}},
                 from_index=original_index,
@@ -186,17 +186,14 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
         self.bulk.update_definition(self.course_key.replace(branch='b'), other_definition)
         self.bulk.insert_course_index(self.course_key, {'versions': {'a': self.definition['_id'], 'b': other_definition['_id']}})
         self.bulk._end_bulk_operation(self.course_key)
-        self.assertItemsEqual(
-            [
-                call.insert_definition(self.definition, self.course_key),
-                call.insert_definition(other_definition, self.course_key),
-                call.update_course_index(
-                    {'versions': {'a': self.definition['_id'], 'b': other_definition['_id']}},
-                    from_index=original_index,
-                    course_context=self.course_key,
-                )
-            ],
-            self.conn.mock_calls
+        self.assertEqual(self.conn.insert_definitions.call_count, 1)
+        inserted_definitions, course_key = self.conn.insert_definitions.call_args[0]
+        self.assertItemsEqual(inserted_definitions, [self.definition, other_definition])
+        self.assertEqual(course_key, self.course_key)
+        self.conn.update_course_index.assert_called_once_with(
+            {'versions': {'a': self.definition['_id'], 'b': other_definition['_id']}},
+            from_index=original_index,
+            course_context=self.course_key,
         )
 
     def test_write_definition_on_close(self):
@@ -206,7 +203,7 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
         self.bulk.update_definition(self.course_key, self.definition)
         self.assertConnCalls()
         self.bulk._end_bulk_operation(self.course_key)
-        self.assertConnCalls(call.insert_definition(self.definition, self.course_key))
+        self.assertConnCalls(call.insert_definitions([self.definition], self.course_key))
 
     def test_write_multiple_definitions_on_close(self):
         self.conn.get_course_index.return_value = None
@@ -217,13 +214,10 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
         self.bulk.update_definition(self.course_key.replace(branch='b'), other_definition)
         self.assertConnCalls()
         self.bulk._end_bulk_operation(self.course_key)
-        self.assertItemsEqual(
-            [
-                call.insert_definition(self.definition, self.course_key),
-                call.insert_definition(other_definition, self.course_key)
-            ],
-            self.conn.mock_calls
-        )
+        self.assertEqual(len(self.conn.mock_calls), 1)
+        inserted_definitions, course_key = self.conn.insert_definitions.call_args[0]
+        self.assertItemsEqual(inserted_definitions, [self.definition, other_definition])
+        self.assertEqual(course_key, self.course_key)
 
     def test_write_index_and_structure_on_close(self):
         original_index = {'versions': {}}
@@ -9,13 +9,20 @@ from xmodule.x_module import XModuleMixin
 from opaque_keys.edx.locations import Location
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.inheritance import InheritanceMixin
-from xmodule.modulestore.xml_importer import _update_and_import_module, _update_module_location
+from xmodule.modulestore.xml_importer import (
+    _update_and_import_module, _update_module_location, import_static_content
+)
 from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from xmodule.tests import DATA_DIR
 from uuid import uuid4
 import unittest
 import importlib
+import ddt
+import os
+import shutil
+import tempfile
+from path import Path as path
 
 
 class ModuleStoreNoSettings(unittest.TestCase):
@@ -333,3 +340,36 @@ class UpdateLocationTest(ModuleStoreNoSettings):
         # Expect these fields pass "is_set_on" test
         for field in self.CONTENT_FIELDS + self.SETTINGS_FIELDS + self.CHILDREN_FIELDS:
             self.assertTrue(new_version.fields[field].is_set_on(new_version))
+
+
+@ddt.ddt
+class ImportStaticContentTest(unittest.TestCase):
+    """
+    Tests for importing static assets into a content store.
+    """
+    def setUp(self):
+        super(ImportStaticContentTest, self).setUp()
+        self.course_data_path = path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.course_data_path)
+        os.makedirs(self.course_data_path / 'static' / 'images')
+        self.asset_paths = ['handout.pdf', 'images/figure_1.png', 'images/figure_2.png']
+        for asset_path in self.asset_paths + ['.DS_Store']:
+            with open(self.course_data_path / 'static' / asset_path, 'w') as asset_file:
+                asset_file.write(asset_path)
+        self.course_key = SlashSeparatedCourseKey('org', 'course', 'run')
+
+    @ddt.data(1, 4)
+    def test_import_static_content(self, num_threads):
+        content_store = mock.Mock()
+        content_store.generate_thumbnail.return_value = (None, None)
+
+        remap_dict = import_static_content(
+            self.course_data_path, content_store, self.course_key, num_threads=num_threads
+        )
+
+        self.assertItemsEqual(remap_dict.keys(), self.asset_paths)
+        saved = {
+            content.import_path: content.data
+            for (content,), __ in content_store.save.call_args_list
+        }
+        self.assertEqual(saved, {asset_path: asset_path for asset_path in self.asset_paths})
@@ -22,9 +22,11 @@ Modulestore virtual   |          XML physical (draft, published)
 """
 import logging
 from abc import abstractmethod
+from multiprocessing.pool import ThreadPool
 from opaque_keys.edx.locator import LibraryLocator
 import os
 import mimetypes
+import time
 from path import Path as path
 import json
 import re
@@ -54,9 +56,13 @@ from xmodule.util.misc import escape_invalid_characters
 log = logging.getLogger(__name__)
 
 
+# Number of threads which save static assets to the content store concurrently during import
+STATIC_CONTENT_IMPORT_THREADS = 4
+
+
 def import_static_content(
         course_data_path, static_content_store,
-        target_id, subpath='static', verbose=False):
+        target_id, subpath='static', verbose=False, num_threads=STATIC_CONTENT_IMPORT_THREADS):
 
     remap_dict = {}
 
@@ -76,70 +82,99 @@ def import_static_content(
     mimetypes.add_type('application/octet-stream', '.srt')
     mimetypes_list = mimetypes.types_map.values()
 
-    for dirname, _, filenames in os.walk(static_dir):
-        for filename in filenames:
-
-            content_path = os.path.join(dirname, filename)
-
-            if re.match(ASSET_IGNORE_REGEX, filename):
-                if verbose:
-                    log.debug('skipping static content %s...', content_path)
-                continue
+    def content_paths():
+        """
+        Yield the path of each static asset to import.
+        """
+        for dirname, _, filenames in os.walk(static_dir):
+            for filename in filenames:
 
-            if verbose:
-                log.debug('importing static content %s...', content_path)
+                content_path = os.path.join(dirname, filename)
 
-            try:
-                with open(content_path, 'rb') as f:
-                    data = f.read()
-            except IOError:
-                if filename.startswith('._'):
-                    # OS X "companion files". See
-                    # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
+                if re.match(ASSET_IGNORE_REGEX, filename):
+                    if verbose:
+                        log.debug('skipping static content %s...', content_path)
                     continue
-                # Not a 'hidden file', then re-raise exception
-                raise
 
-            # strip away leading path from the name
-            fullname_with_subpath = content_path.replace(static_dir, '')
-            if fullname_with_subpath.startswith('/'):
-                fullname_with_subpath = fullname_with_subpath[1:]
-            asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
+                yield content_path
 
-            policy_ele = policy.get(asset_key.path, {})
+    def import_content(content_path):
+        """
+        Save the static asset at content_path, with its thumbnail, to the content store.
+        Returns its path relative to the static directory and its asset key, or None if
+        it was skipped.
+        """
+        filename = os.path.basename(content_path)
+        if verbose:
+            log.debug('importing static content %s...', content_path)
 
-            # During export display name is used to create files, strip away slashes from name
-            displayname = escape_invalid_characters(
-                name=policy_ele.get('displayname', filename),
-                invalid_char_list=['/', '\\']
-            )
-            locked = policy_ele.get('locked', False)
-            mime_type = policy_ele.get('contentType')
-
-            # Check extracted contentType in list of all valid mimetypes
-            if not mime_type or mime_type not in mimetypes_list:
-                mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
-            content = StaticContent(
-                asset_key, displayname, mime_type, data,
-                import_path=fullname_with_subpath, locked=locked
-            )
+        try:
+            with open(content_path, 'rb') as f:
+                data = f.read()
+        except IOError:
+            if filename.startswith('._'):
+                # OS X "companion files". See
+                # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
+                return None
+            # Not a 'hidden file', then re-raise exception
+            raise
+
+        # strip away leading path from the name
+        fullname_with_subpath = content_path.replace(static_dir, '')
+        if fullname_with_subpath.startswith('/'):
+            fullname_with_subpath = fullname_with_subpath[1:]
+        asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
+
+        policy_ele = policy.get(asset_key.path, {})
+
+        # During export display name is used to create files, strip away slashes from name
+        displayname = escape_invalid_characters(
+            name=policy_ele.get('displayname', filename),
+            invalid_char_list=['/', '\\']
+        )
+        locked = policy_ele.get('locked', False)
+        mime_type = policy_ele.get('contentType')
+
+        # Check extracted contentType in list of all valid mimetypes
+        if not mime_type or mime_type not in mimetypes_list:
+            mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
+        content = StaticContent(
+            asset_key, displayname, mime_type, data,
+            import_path=fullname_with_subpath, locked=locked
+        )
 
-            # first let's save a thumbnail so we can get back a thumbnail location
-            thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
+        # first let's save a thumbnail so we can get back a thumbnail location
+        thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
 
-            if thumbnail_content is not None:
-                content.thumbnail_location = thumbnail_location
+        if thumbnail_content is not None:
+            content.thumbnail_location = thumbnail_location
 
-            # then commit the content
-            try:
-                static_content_store.save(content)
-            except Exception as err:
-                log.exception(u'Error importing {0}, error={1}'.format(
-                    fullname_with_subpath, err
-                ))
+        # then commit the content
+        try:
+            static_content_store.save(content)
+        except Exception as err:
+            log.exception(u'Error importing {0}, error={1}'.format(
+                fullname_with_subpath, err
+            ))
+
+        return fullname_with_subpath, asset_key
+
+    # Assets are saved by a bounded pool of threads, as saving them is mostly waiting on the
+    # content store.  Each thread reads its own files, so at most num_threads of them are in memory.
+    if num_threads > 1:
+        pool = ThreadPool(num_threads)
+        try:
+            imported = list(pool.imap_unordered(import_content, content_paths()))
+        finally:
+            pool.terminate()
+    else:
+        imported = [import_content(content_path) for content_path in content_paths()]
 
+    for result in imported:
+        if result is not None:
             # store the remapping information which will be needed
             # to subsitute in the module data
+            fullname_with_subpath, asset_key = result
             remap_dict[fullname_with_subpath] = asset_key
 
     return remap_dict
@@ -177,6 +212,10 @@ class ImportManager(object):
             Otherwise, it throws an InvalidLocationError if the courselike does not exist.
 
         default_class, load_error_modules: are arguments for constructing the XMLModuleStore (see its doc)
+
+        stage_timings: If specified, a dict to which the number of seconds spent in each stage of the
+            import is added, keyed by stage name: 'parse', 'courselike', 'static', 'asset_metadata',
+            'children', 'drafts' and 'write' (saving the bulk operations to the modulestore).
     """
     store_class = XMLModuleStore
 
@@ -186,7 +225,7 @@ class ImportManager(object):
             load_error_modules=True, static_content_store=None,
             target_id=None, verbose=False,
             do_import_static=True, create_if_not_present=False,
-            raise_on_failure=False
+            raise_on_failure=False, stage_timings=None
     ):
         self.store = store
         self.user_id = user_id
@@ -199,6 +238,8 @@ class ImportManager(object):
         self.do_import_static = do_import_static
         self.create_if_not_present = create_if_not_present
         self.raise_on_failure = raise_on_failure
+        self.stage_timings = stage_timings
+        start = time.time()
         self.xml_module_store = self.store_class(
             data_dir,
             default_class=default_class,
@@ -208,8 +249,16 @@ class ImportManager(object):
             xblock_select=store.xblock_select,
             target_course_id=target_id,
         )
+        self.record_stage_time('parse', start)
         self.logger, self.errors = make_error_tracker()
 
+    def record_stage_time(self, stage, start):
+        """
+        Add the time since start to the time spent in the given stage of the import.
+        """
+        if self.stage_timings is not None:
+            self.stage_timings[stage] = self.stage_timings.get(stage, 0) + time.time() - start
+
     def preflight(self):
         """
         Perform any pre-import sanity checks.
@@ -436,16 +485,28 @@ class ImportManager(object):
             # This bulk operation wraps all the operations to populate the published branch.
             with self.store.bulk_operations(dest_id):
                 # Retrieve the course itself.
+                start = time.time()
                 source_courselike, courselike, data_path = self.get_courselike(courselike_key, runtime, dest_id)
+                self.record_stage_time('courselike', start)
 
                 # Import all static pieces.
+                start = time.time()
                 self.import_static(data_path, dest_id)
+                self.record_stage_time('static', start)
 
                 # Import asset metadata stored in XML.
+                start = time.time()
                 self.import_asset_metadata(data_path, dest_id)
+                self.record_stage_time('asset_metadata', start)
 
                 # Import all children
+                start = time.time()
                 self.import_children(source_courselike, courselike, courselike_key, dest_id)
+                self.record_stage_time('children', start)
+
+                # The blocks are written to the modulestore when the bulk operation ends.
+                start = time.time()
+            self.record_stage_time('write', start)
 
             # This bulk operation wraps all the operations to populate the draft branch with any items
             # from the /drafts subdirectory.
@@ -454,7 +515,12 @@ class ImportManager(object):
             # and then publishing it.
             with self.store.bulk_operations(dest_id):
                 # Import all draft items into the courselike.
+                start = time.time()
                 courselike = self.import_drafts(courselike, courselike_key, data_path, dest_id)
+                self.record_stage_time('drafts', start)
+
+                start = time.time()
+            self.record_stage_time('write', start)
 
             yield courselike
 
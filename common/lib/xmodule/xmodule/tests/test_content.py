@@ -86,6 +86,28 @@ class FakeGridFsItem(object):
         return chunk
 
 
+class FakeChunkedGridFsItem(FakeGridFsItem):
+    """
+    This class provides the methods to get data from a GridFS item one GridFS chunk at a time
+    """
+    def __init__(self, string_data, chunk_size):
+        super(FakeChunkedGridFsItem, self).__init__(string_data)
+        self.chunk_size = chunk_size
+        self.chunks_read = []
+
+    def readchunk(self):
+        """
+        Read the rest of the chunk at position cursor and move the cursor
+        """
+        if self.cursor >= self.length:
+            return ''
+        chunk_number = self.cursor // self.chunk_size
+        self.chunks_read.append(chunk_number)
+        chunk = self.data[self.cursor:(chunk_number + 1) * self.chunk_size]
+        self.cursor += len(chunk)
+        return chunk
+
+
 class MockImage(Mock):
     """
     This class pretends to be PIL.Image for purposes of thumbnails testing.
@@ -187,6 +209,19 @@ class ContentTest(unittest.TestCase):
 
         self.assertEqual(total_length, static_content_stream.length)
 
+    def test_static_content_stream_stream_data_by_gridfs_chunk(self):
+        """
+        Test StaticContentStream stream_data function, asserts that the
+        data of GridFS items is read one GridFS chunk at a time
+        """
+        item = FakeGridFsItem(SAMPLE_STRING)
+        item.chunk_size = 400
+        static_content_stream = StaticContentStream('loc', 'name', 'type', item, length=item.length)
+
+        chunks = list(static_content_stream.stream_data())
+        self.assertTrue(all(len(chunk) == 400 for chunk in chunks[:-1]))
+        self.assertEqual(''.join(chunks), SAMPLE_STRING)
+
     def test_static_content_stream_stream_data_in_range(self):
         """
         Test StaticContentStream stream_data_in_range function,
@@ -208,6 +243,20 @@ class ContentTest(unittest.TestCase):
 
         self.assertEqual(total_length, last_byte - first_byte + 1)
 
+    @ddt.data((0, 0), (0, 99), (100, 1500), (150, 199), (1000, 1099), (1500, 1500))
+    @ddt.unpack
+    def test_static_content_stream_stream_data_in_range_by_gridfs_chunk(self, first_byte, last_byte):
+        """
+        Test StaticContentStream stream_data_in_range function, asserts that the range of GridFS items
+        is read by seeking to its first chunk and reading one chunk at a time
+        """
+        item = FakeChunkedGridFsItem(SAMPLE_STRING, 100)
+        static_content_stream = StaticContentStream('loc', 'name', 'type', item, length=item.length)
+
+        chunks = list(static_content_stream.stream_data_in_range(first_byte, last_byte))
+        self.assertEqual(''.join(chunks), SAMPLE_STRING[first_byte:last_byte + 1])
+        self.assertEqual(item.chunks_read, range(first_byte // 100, last_byte // 100 + 1))
+
     def test_static_content_write_js(self):
         """
         Test that only one filename starts with 000.
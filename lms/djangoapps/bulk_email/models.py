@@ -3,6 +3,8 @@ Models for bulk email
 """
 import logging
 import markupsafe
+import re
+from string import Formatter
 
 from django.conf import settings
 from django.contrib.auth.models import User
@@ -247,6 +249,9 @@ class Optout(models.Model):
 # the location where the email message body is to be inserted.
 COURSE_EMAIL_MESSAGE_BODY_TAG = '{{message_body}}'
 
+# Keys of the email context whose values differ between recipients of a course email.
+COURSE_EMAIL_RECIPIENT_KEYS = ('name', 'email', 'user_id')
+
 
 class CourseEmailTemplate(models.Model):
     """
@@ -310,6 +315,24 @@ class CourseEmailTemplate(models.Model):
         # finally, return the result, after wrapping long lines and without converting to an encoded byte array.
         return wrap_message(result)
 
+    def prerender_plaintext(self, plaintext, context):
+        """
+        Create a PrerenderedCourseEmail for a plain text message.
+
+        Renders the stored plain template and plain text body (`plaintext`)
+        once with the `context` dict shared by all recipients.
+        """
+        return PrerenderedCourseEmail(self.plain_template, plaintext, context)
+
+    def prerender_htmltext(self, htmltext, context):
+        """
+        Create a PrerenderedCourseEmail for an HTML message.
+
+        Renders the stored HTML template and HTML body (`htmltext`) once
+        with the `context` dict shared by all recipients.
+        """
+        return PrerenderedCourseEmail(self.html_template, htmltext, context, escape_html=True)
+
     def render_plaintext(self, plaintext, context):
         """
         Create plain text message.
@@ -333,6 +356,129 @@ class CourseEmailTemplate(models.Model):
         return CourseEmailTemplate._render(self.html_template, htmltext, context)
 
 
+class PrerenderedCourseEmail(object):
+    """
+    An email message rendered from a course email template once with the
+    context shared by all recipients, from which each recipient's message
+    is made by filling in just that recipient's values.
+
+    Messages are the same as those rendered by CourseEmailTemplate with the
+    combined context.  Templates that format recipient values with a
+    conversion or format spec (e.g. "{name!r}") are rendered in full for
+    each recipient instead.
+    """
+    # Placeholders for recipient values and the message body, using Unicode
+    # noncharacters that can't appear in templates or course emails.
+    PLACEHOLDER = u'\ufdd0{}\ufdd1'
+    MESSAGE_BODY_PLACEHOLDER = PLACEHOLDER.format('message_body')
+
+    def __init__(self, format_string, message_body, context, escape_html=False):
+        self.format_string = format_string
+        self.message_body = message_body
+        self.escape_html = escape_html
+        self.context = self._escape(context)
+        # Lines of the rendered message, each paired with whether it still
+        # contains placeholders to be filled in for each recipient.
+        # None if the message has to be rendered in full for each recipient.
+        self.lines = None
+        if self._can_prerender():
+            try:
+                self.lines = self._prerender()
+            except (KeyError, IndexError, AttributeError, ValueError):
+                # Rendering fails in the same way for every recipient.
+                pass
+
+    def _escape(self, context):
+        """
+        Return a copy of context, with string values HTML-escaped if the
+        message is HTML.
+        """
+        if not self.escape_html:
+            return dict(context)
+        return {
+            key: markupsafe.escape(value) if isinstance(value, basestring) else value
+            for key, value in context.iteritems()
+        }
+
+    def _can_prerender(self):
+        """
+        Return whether the template only formats recipient values as they are.
+        """
+        try:
+            fields = list(Formatter().parse(self.format_string))
+        except ValueError:
+            return False
+        for __, field_name, format_spec, conversion in fields:
+            if field_name is None:
+                continue
+            if format_spec and '{' in format_spec:
+                return False
+            key = re.split(r'[.\[]', field_name, 1)[0]
+            if key in COURSE_EMAIL_RECIPIENT_KEYS and (key != field_name or format_spec or conversion):
+                return False
+        return True
+
+    def _prerender(self):
+        """
+        Render the message with placeholders for recipient values, and for the
+        message body if it has keywords to substitute, and wrap the lines
+        without placeholders.
+        """
+        context = dict(self.context)
+        for key in COURSE_EMAIL_RECIPIENT_KEYS:
+            context[key] = self.PLACEHOLDER.format(key)
+        result = self.format_string.format(**context)
+
+        message_body = self.MESSAGE_BODY_PLACEHOLDER if '%%' in self.message_body else self.message_body
+        result = result.replace(COURSE_EMAIL_MESSAGE_BODY_TAG.format(), message_body, 1)
+
+        lines = []
+        for line in result.split('\n'):
+            if u'\ufdd0' in line:
+                lines.append((line, True))
+            else:
+                lines.append((wrap_message(line), False))
+        return lines
+
+    def render(self, recipient_context):
+        """
+        Return the message for the recipient with the given `recipient_context`
+        dict, holding the 'name', 'email' and 'user_id' of the recipient.
+        """
+        recipient_context = self._escape(recipient_context)
+        if self.lines is None or not all(key in recipient_context for key in COURSE_EMAIL_RECIPIENT_KEYS):
+            context = dict(self.context)
+            context.update(recipient_context)
+            return CourseEmailTemplate._render(self.format_string, self.message_body, context)
+
+        replacements = [
+            (self.PLACEHOLDER.format(key), unicode(recipient_context[key])) for key in COURSE_EMAIL_RECIPIENT_KEYS
+        ]
+        message_body = None
+        lines = []
+        for line, has_placeholders in self.lines:
+            if has_placeholders:
+                for placeholder, value in replacements:
+                    line = line.replace(placeholder, value)
+                if self.MESSAGE_BODY_PLACEHOLDER in line:
+                    if message_body is None:
+                        message_body = self._render_message_body(recipient_context)
+                    line = line.replace(self.MESSAGE_BODY_PLACEHOLDER, message_body, 1)
+                line = wrap_message(line)
+            lines.append(line)
+        return u'\n'.join(lines)
+
+    def _render_message_body(self, recipient_context):
+        """
+        Return the message body with its %%-encoded keywords substituted for the recipient.
+        """
+        context = dict(self.context)
+        context.update(recipient_context)
+        if 'user_id' in context and 'course_id' in context:
+            return substitute_keywords_with_data(self.message_body, context)
+        return self.message_body
+
+
 class CourseAuthorization(models.Model):
     """
     Enable the course email feature on a course-by-course basis.
@@ -6,8 +6,10 @@ to a course.
 from collections import Counter
 import json
 import logging
+from Queue import Queue
 import random
 import re
+import threading
 from time import sleep
 
 import dogstats_wrapper as dog_stats_api
@@ -442,9 +444,7 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
     parent_task_id = InstructorTask.objects.get(pk=entry_id).task_id
     task_id = subtask_status.task_id
     total_recipients = len(to_list)
-    recipient_num = 0
-    total_recipients_successful = 0
-    total_recipients_failed = 0
+    recipient_outcomes = Counter()
     recipients_info = Counter()
 
     log.info(
@@ -484,47 +484,39 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
 
     # use the CourseEmailTemplate that was associated with the CourseEmail
     course_email_template = course_email.get_template()
+    connections = []
     try:
-        connection = get_connection()
-        connection.open()
-
-        # Define context values to use in all course emails:
-        email_context = {'name': '', 'email': ''}
-        email_context.update(global_email_context)
-
-        while to_list:
-            # Update context with user-specific values from the user at the end of the list.
-            # At the end of processing this user, they will be popped off of the to_list.
-            # That way, the to_list will always contain the recipients remaining to be emailed.
-            # This is convenient for retries, which will need to send to those who haven't
-            # yet been emailed, but not send to those who have already been sent to.
-            recipient_num += 1
-            current_recipient = to_list[-1]
+        # Define context values to use in all course emails, and render the parts of
+        # the messages that are the same for every recipient:
+        email_context = dict(global_email_context)
+        email_context['course_id'] = course_email.course_id
+        plaintext_email = course_email_template.prerender_plaintext(course_email.text_message, email_context)
+        html_email = course_email_template.prerender_htmltext(course_email.html_message, email_context)
+
+        # Open as many connections as will be used to send in parallel:
+        for __ in xrange(max(1, min(settings.BULK_EMAIL_SMTP_CONNECTIONS, len(to_list)))):
+            connection = get_connection()
+            connections.append(connection)
+            connection.open()
+
+        # Indexes in the to_list of the recipients that have been processed:
+        processed = set()
+        status_lock = threading.Lock()
+
+        def send_message(connection, index, recipient_num, current_recipient, email_msg):
+            """
+            Sends a message to a single recipient through the given connection, and records the outcome.
+
+            Errors that should cause the task to be retried or to fail are raised.
+            """
             email = current_recipient['email']
-            email_context['email'] = email
-            email_context['name'] = current_recipient['profile__name']
-            email_context['user_id'] = current_recipient['pk']
-            email_context['course_id'] = course_email.course_id
-
-            # Construct message content using templates and context:
-            plaintext_msg = course_email_template.render_plaintext(course_email.text_message, email_context)
-            html_msg = course_email_template.render_htmltext(course_email.html_message, email_context)
-
-            # Create email:
-            email_msg = EmailMultiAlternatives(
-                course_email.subject,
-                plaintext_msg,
-                from_addr,
-                [email],
-                connection=connection
-            )
-            email_msg.attach_alternative(html_msg, 'text/html')
 
             # Throttle if we have gotten the rate limiter.  This is not very high-tech,
             # but if a task has been retried for rate-limiting reasons, then we sleep
-            # for a period of time between all emails within this task.  Choice of
-            # the value depends on the number of workers that might be sending email in
-            # parallel, and what the SES throttle rate is.
+            # for a period of time between all emails sent on each connection within
+            # this task.  Choice of the value depends on the number of workers and
+            # connections that might be sending email in parallel, and what the SES
+            # throttle rate is.
             if subtask_status.retried_nomax > 0:
                 sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
 
@@ -545,7 +537,8 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
 
             except SMTPDataError as exc:
                 # According to SMTP spec, we'll retry error codes in the 4xx range.  5xx range indicates hard failure.
-                total_recipients_failed += 1
+                with status_lock:
+                    recipient_outcomes['failed'] += 1
                 log.error(
                     "BulkEmail ==> Status: Failed(SMTPDataError), Task: %s, SubTask: %s, EmailId: %s, \
                     Recipient num: %s/%s, Email address: %s",
@@ -573,11 +566,11 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
                         exc.smtp_error
                     )
                     dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
-                    subtask_status.increment(failed=1)
+                    with status_lock:
+                        subtask_status.increment(failed=1)
 
             except SINGLE_EMAIL_FAILURE_ERRORS as exc:
                 # This will fall through and not retry the message.
-                total_recipients_failed += 1
                 log.error(
                     "BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: %s, SubTask: %s, \
                     EmailId: %s, Recipient num: %s/%s, Email address: %s, Exception: %s",
@@ -590,10 +583,11 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
                     exc
                 )
                 dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
-                subtask_status.increment(failed=1)
+                with status_lock:
+                    recipient_outcomes['failed'] += 1
+                    subtask_status.increment(failed=1)
 
             else:
-                total_recipients_successful += 1
                 log.info(
                     "BulkEmail ==> Status: Success, Task: %s, SubTask: %s, EmailId: %s, \
                     Recipient num: %s/%s, Email address: %s,",
@@ -609,13 +603,56 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
                     log.info('Email with id %s sent to %s', email_id, email)
                 else:
                     log.debug('Email with id %s sent to %s', email_id, email)
-                subtask_status.increment(succeeded=1)
+                with status_lock:
+                    recipient_outcomes['successful'] += 1
+                    subtask_status.increment(succeeded=1)
 
-            # Pop the user that was emailed off the end of the list only once they have
+            # Mark the user that was emailed as processed only once they have
             # successfully been processed.  (That way, if there were a failure that
             # needed to be retried, the user is still on the list.)
-            recipients_info[email] += 1
-            to_list.pop()
+            with status_lock:
+                recipients_info[email] += 1
+                processed.add(index)
+
+        sending_pool = _EmailSendingPool(connections, send_message)
+        try:
+            # Work through the to_list from the end, rendering each recipient's message
+            # and handing it to the next free connection.  Processed recipients are then
+            # removed from the to_list, so that it will always contain the recipients
+            # remaining to be emailed.  This is convenient for retries, which will need
+            # to send to those who haven't yet been emailed, but not send to those who
+            # have already been sent to.
+            num_to_send = len(to_list)
+            for index in reversed(xrange(num_to_send)):
+                current_recipient = to_list[index]
+                email = current_recipient['email']
+                recipient_context = {
+                    'name': current_recipient['profile__name'],
+                    'email': email,
+                    'user_id': current_recipient['pk'],
+                }
+
+                # Construct message content using templates and context:
+                plaintext_msg = plaintext_email.render(recipient_context)
+                html_msg = html_email.render(recipient_context)
+
+                # Create email:
+                email_msg = EmailMultiAlternatives(
+                    course_email.subject,
+                    plaintext_msg,
+                    from_addr,
+                    [email],
+                )
+                email_msg.attach_alternative(html_msg, 'text/html')
+
+                if not sending_pool.submit(index, num_to_send - index, current_recipient, email_msg):
+                    break
+        finally:
+            sending_pool.join()
+            to_list = [recipient for index, recipient in enumerate(to_list) if index not in processed]
+
+        if sending_pool.error is not None:
+            raise sending_pool.error  # pylint: disable=raising-bad-type
 
         log.info(
             "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Total Successful Recipients: %s/%s, \
@@ -623,9 +660,9 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
             parent_task_id,
             task_id,
             email_id,
-            total_recipients_successful,
+            recipient_outcomes['successful'],
             total_recipients,
-            total_recipients_failed,
+            recipient_outcomes['failed'],
             total_recipients
         )
         duplicate_recipients = ["{0} ({1})".format(email, repetition)
@@ -696,7 +733,76 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         return subtask_status, None
     finally:
         # Clean up at the end.
-        connection.close()
+        for connection in connections:
+            connection.close()
+
+
+class _EmailSendingPool(object):
+    """
+    Sends email messages through a pool of open connections, each used by its
+    own thread, holding a bounded number of messages waiting to be sent.
+    With a single connection, messages are sent in the submitting thread as
+    they are submitted.
+
+    `send_message` is called with a connection followed by the arguments
+    passed to `submit`.  The first exception it raises in a thread stops the
+    sending of further messages, and is kept in `error`.
+    """
+    def __init__(self, connections, send_message):
+        self.connections = connections
+        self.send_message = send_message
+        self.error = None
+        self._lock = threading.Lock()
+        self._queue = Queue(maxsize=2 * len(connections))
+        self._threads = []
+        if len(connections) > 1:
+            for connection in connections:
+                thread = threading.Thread(target=self._send_queued_messages, args=(connection,))
+                thread.daemon = True
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, *args):
+        """
+        Sends a message, or queues it to be sent by the next free connection.
+
+        Returns False if sending has been stopped by an error.
+        """
+        if not self._threads:
+            self.send_message(self.connections[0], *args)
+            return True
+        if self.error is not None:
+            return False
+        self._queue.put(args)
+        return True
+
+    def join(self):
+        """
+        Waits for the messages that have been queued to be sent, or skipped
+        if sending has been stopped, and for the threads to finish.
+        """
+        for __ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _send_queued_messages(self, connection):
+        """
+        Sends queued messages through the given connection until told to stop.
+        """
+        while True:
+            args = self._queue.get()
+            if args is None:
+                return
+            if self.error is not None:
+                continue
+            try:
+                self.send_message(connection, *args)
+            except Exception as exc:  # pylint: disable=broad-except
+                with self._lock:
+                    if self.error is None:
+                        self.error = exc
 
 
 def _get_current_task():
@@ -190,6 +190,43 @@ class CourseEmailTemplateTest(TestCase):
         self.assertIn(context['course_title'], message)
         self.assertIn(context['name'], message)
 
+    def test_prerendered_messages_match_rendered(self):
+        template = CourseEmailTemplate.get_template()
+        shared_context = self._get_sample_html_context()
+        del shared_context['email']
+        shared_context['course_title'] = "<script>alert('Course Title!');</alert>"
+        shared_context['course_id'] = "course-v1:edx+100+1"
+        message = "Dear %%USER_FULLNAME%%, thanks for enrolling in %%COURSE_DISPLAY_NAME%%. " + "x" * 1000
+        plaintext_email = template.prerender_plaintext(message, shared_context)
+        html_email = template.prerender_htmltext(message, shared_context)
+        self.assertIsNotNone(plaintext_email.lines)
+        self.assertIsNotNone(html_email.lines)
+
+        for name, email, user_id in [("<b>Jo</b>", "jo@test.com", 1), ("Sam", "sam@test.com", 2)]:
+            recipient_context = {'name': name, 'email': email, 'user_id': user_id}
+            context = dict(shared_context, **recipient_context)
+            self.assertEqual(
+                plaintext_email.render(recipient_context), template.render_plaintext(message, dict(context))
+            )
+            self.assertEqual(html_email.render(recipient_context), template.render_htmltext(message, dict(context)))
+
+    def test_prerendered_template_with_format_spec(self):
+        template = CourseEmailTemplate(plain_template="{name!r} {course_title:>10}\n{{message_body}}")
+        context = {'course_title': 'Course', 'course_id': 'course-v1:edx+100+1'}
+        plaintext_email = template.prerender_plaintext("My new plain text.", context)
+        self.assertIsNone(plaintext_email.lines)
+        recipient_context = {'name': u'Jo', 'email': 'jo@test.com', 'user_id': 1}
+        self.assertEqual(
+            plaintext_email.render(recipient_context),
+            template.render_plaintext("My new plain text.", dict(context, **recipient_context))
+        )
+
+    def test_prerendered_template_without_context(self):
+        template = CourseEmailTemplate.get_template()
+        plaintext_email = template.prerender_plaintext("My new plain text.", {'course_title': 'Course'})
+        with self.assertRaises(KeyError):
+            plaintext_email.render({'name': 'Jo', 'email': 'jo@test.com', 'user_id': 1})
+
 
 @attr('shard_1')
 class CourseAuthorizationTest(TestCase):
@@ -6,7 +6,10 @@ Runs tasks on answers to course problems to validate that code
 paths actually work.
 
 """
+import asyncore
 import json
+import smtpd
+import threading
 from uuid import uuid4
 from itertools import cycle, chain, repeat
 from mock import patch, Mock
@@ -29,6 +32,7 @@ from celery.states import SUCCESS, FAILURE  # pylint: disable=no-name-in-module,
 
 from django.conf import settings
 from django.core.management import call_command
+from django.test.utils import override_settings
 
 from xmodule.modulestore.tests.factories import CourseFactory
 
@@ -42,6 +46,28 @@ from instructor_task.tests.factories import InstructorTaskFactory
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
 
+class RecordingSMTPServer(smtpd.SMTPServer):
+    """
+    Local SMTP server that records the recipients of the messages it receives.
+    """
+    def __init__(self):
+        smtpd.SMTPServer.__init__(self, ('127.0.0.1', 0), None)
+        self.port = self.socket.getsockname()[1]
+        self.recipients = []
+
+    def process_message(self, peer, mailfrom, rcpttos, data):
+        self.recipients.extend(rcpttos)
+
+    def serve_in_thread(self):
+        """
+        Serves connections in a daemon thread until the server is closed.
+        """
+        thread = threading.Thread(target=asyncore.loop, kwargs={'timeout': 0.1, 'map': self._map})
+        thread.daemon = True
+        thread.start()
+        return thread
+
+
 class TestTaskFailure(Exception):
     """Dummy exception used for unit tests."""
     pass
@@ -216,6 +242,57 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
         self.assertEquals(parent_status.get('succeeded'), num_emails)
         self.assertEquals(parent_status.get('failed'), 0)
 
+    @override_settings(BULK_EMAIL_SMTP_CONNECTIONS=3)
+    def test_successful_with_connection_pool(self):
+        # Select number of emails to fit into a single subtask.
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        # We also send email to the instructor:
+        self._create_students(num_emails - 1)
+        connections = [Mock(), Mock(), Mock()]
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.side_effect = connections
+            self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+
+        for connection in connections:
+            connection.open.assert_called_once_with()
+            connection.close.assert_called_once_with()
+        sent_messages = [
+            call[0][0][0] for connection in connections for call in connection.send_messages.call_args_list
+        ]
+        self.assertEquals(len(sent_messages), num_emails)
+        self.assertEquals(len(set(message.to[0] for message in sent_messages)), num_emails)
+
+    @override_settings(BULK_EMAIL_SMTP_CONNECTIONS=3)
+    def test_failure_with_connection_pool(self):
+        num_emails = 10
+        # We also send email to the instructor:
+        self._create_students(num_emails - 1)
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.return_value.send_messages.side_effect = cycle([SMTPAuthenticationError(403, "Bad password")])
+            self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, 0, failed=num_emails)
+
+    @override_settings(
+        BULK_EMAIL_SMTP_CONNECTIONS=3,
+        EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+        EMAIL_HOST='127.0.0.1',
+        EMAIL_USE_TLS=False,
+    )
+    def test_send_through_local_smtp_server(self):
+        num_emails = 20
+        # We also send email to the instructor:
+        students = self._create_students(num_emails - 1)
+        server = RecordingSMTPServer()
+        thread = server.serve_in_thread()
+        try:
+            with override_settings(EMAIL_PORT=server.port):
+                self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+        finally:
+            server.close()
+            thread.join(5)
+        self.assertItemsEqual(
+            server.recipients, [self.instructor.email] + [student.email for student in students]
+        )
+
     def test_unactivated_user(self):
         # Select number of emails to fit into a single subtask.
         num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
@@ -4,8 +4,13 @@ by the individual custom courses feature.
 """
 import json
 import logging
+import threading
+from uuid import uuid4
 
+from django.core.cache import cache
+from django.core.signals import request_finished
 from django.db import transaction
+from django.dispatch import receiver
 
 import request_cache
 
@@ -85,30 +90,112 @@ def get_override_for_ccx(ccx, block, name, default=None):
     overridden for the given ccx, returns `default`.
     """
     overrides = _get_overrides_for_ccx(ccx)
-
-    if isinstance(block.location, CCXBlockUsageLocator):
-        non_ccx_key = block.location.to_block_locator()
-    else:
-        non_ccx_key = block.location
-
+    non_ccx_key = _non_ccx_location(block)
     block_overrides = overrides.get(non_ccx_key, {})
     if name in block_overrides:
         try:
-            return block.fields[name].from_json(block_overrides[name])
+            field = block.fields[name]
         except KeyError:
             return block_overrides[name]
+        if getattr(field, 'MUTABLE', True):
+            return field.from_json(block_overrides[name])
+
+        # Values of immutable fields are decoded once per request.
+        values_cache = request_cache.get_cache('ccx-override-values')
+        key = (ccx, non_ccx_key, name)
+        if key not in values_cache:
+            values_cache[key] = field.from_json(block_overrides[name])
+        return values_cache[key]
     else:
         return default
 
 
+def _non_ccx_location(block):
+    """
+    Returns the location of `block` in the course the ccx is based on.
+    """
+    if isinstance(block.location, CCXBlockUsageLocator):
+        return block.location.to_block_locator()
+    return block.location
+
+
+def _overrides_cache_key(ccx):
+    """
+    Returns the key of the overrides map of the `ccx` in the django cache.
+    """
+    return u'ccx.overrides.{}'.format(ccx.id)
+
+
+def _overrides_version_cache_key(ccx):
+    """
+    Returns the key of the version of the overrides of the `ccx` in the django cache.
+    """
+    return u'ccx.overrides.version.{}'.format(ccx.id)
+
+
+class _PendingVersionBumps(threading.local):
+    """
+    The ccxs whose overrides were changed by the current thread inside a
+    transaction, whose versions are to be bumped again once it's committed.
+    """
+    def __init__(self):
+        super(_PendingVersionBumps, self).__init__()
+        self.ccxs = set()
+
+
+_PENDING_VERSION_BUMPS = _PendingVersionBumps()
+
+
+def _bump_overrides_version(ccx):
+    """
+    Marks the overrides map of the `ccx` which is in the django cache as
+    outdated, for every process.
+
+    Until a transaction changing the overrides is committed, other processes
+    still load the old overrides and may store them under the bumped
+    version.  So when inside a transaction, the version is bumped again once
+    the request has finished, by which time the transaction is committed.
+    """
+    cache.set(_overrides_version_cache_key(ccx), uuid4().hex)
+    if transaction.get_connection().in_atomic_block:
+        _PENDING_VERSION_BUMPS.ccxs.add(ccx)
+
+
+@receiver(request_finished)
+def _bump_pending_overrides_versions(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Bumps the versions of the overrides changed inside transactions during
+    the request, now that they are committed.
+    """
+    ccxs, _PENDING_VERSION_BUMPS.ccxs = _PENDING_VERSION_BUMPS.ccxs, set()
+    for ccx in ccxs:
+        cache.set(_overrides_version_cache_key(ccx), uuid4().hex)
+
+
 def _get_overrides_for_ccx(ccx):
     """
     Returns a dictionary mapping field name to overriden value for any
     overrides set on this block for this CCX.
+
+    The map is shared across requests through the django cache along with
+    the version of the overrides it was loaded for, and is reloaded from the
+    database once the version is bumped by a change to the overrides.
     """
     overrides_cache = request_cache.get_cache('ccx-overrides')
 
     if ccx not in overrides_cache:
+        # Read the version before the overrides, so that a map loaded
+        # concurrently with a change is stored with an outdated version.
+        version = cache.get(_overrides_version_cache_key(ccx))
+        cached = cache.get(_overrides_cache_key(ccx))
+        if version is not None and cached is not None and cached['version'] == version:
+            overrides_cache[ccx] = cached['overrides']
+            return overrides_cache[ccx]
+
+        if version is None:
+            version = uuid4().hex
+            cache.set(_overrides_version_cache_key(ccx), version)
+
         overrides = {}
         query = CcxFieldOverride.objects.filter(
             ccx=ccx,
@@ -118,47 +205,61 @@ def _get_overrides_for_ccx(ccx):
             block_overrides = overrides.setdefault(override.location, {})
             block_overrides[override.field] = json.loads(override.value)
             block_overrides[override.field + "_id"] = override.id
-            block_overrides[override.field + "_instance"] = override
 
+        cache.set(_overrides_cache_key(ccx), {'version': version, 'overrides': overrides})
         overrides_cache[ccx] = overrides
 
     return overrides_cache[ccx]
 
 
-@transaction.atomic
 def override_field_for_ccx(ccx, block, name, value):
     """
     Overrides a field for the `ccx`.  `block` and `name` specify the block
     and the name of the field on that block to override.  `value` is the
     value to set for the given field.
     """
+    if _override_field_for_ccx(ccx, block, name, value):
+        _bump_overrides_version(ccx)
+
+
+@transaction.atomic
+def _override_field_for_ccx(ccx, block, name, value):
+    """
+    Overrides a field for the `ccx` in the database and in the overrides map
+    of the request.  Returns whether the database was changed.
+    """
     field = block.fields[name]
     value_json = field.to_json(value)
     serialized_value = json.dumps(value_json)
     override_has_changes = False
 
-    override = get_override_for_ccx(ccx, block, name + "_instance")
-    if override:
-        override_has_changes = serialized_value != override.value
+    override_id = get_override_for_ccx(ccx, block, name + "_id")
+    if override_id:
+        current_value_json = _get_overrides_for_ccx(ccx).get(block.location, {}).get(name)
+        override_has_changes = json.loads(serialized_value) != current_value_json
+        if override_has_changes and not CcxFieldOverride.objects.filter(id=override_id).update(value=serialized_value):
+            # The override was deleted since the overrides map was loaded,
+            # so the map is outdated whether or not it's saved again below.
+            override_id = None
 
-    if not override:
+    if not override_id:
         override, created = CcxFieldOverride.objects.get_or_create(
             ccx=ccx,
             location=block.location,
             field=name,
             defaults={'value': serialized_value},
         )
+        _get_overrides_for_ccx(ccx).setdefault(block.location, {})[name + "_id"] = override.id
         if created:
-            _get_overrides_for_ccx(ccx).setdefault(block.location, {})[name + "_id"] = override.id
-        else:
-            override_has_changes = serialized_value != override.value
-
-    if override_has_changes:
-        override.value = serialized_value
-        override.save()
+            override_has_changes = True
+        elif serialized_value != override.value:
+            override.value = serialized_value
+            override.save()
+            override_has_changes = True
 
     _get_overrides_for_ccx(ccx).setdefault(block.location, {})[name] = value_json
-    _get_overrides_for_ccx(ccx).setdefault(block.location, {})[name + "_instance"] = override
+    request_cache.get_cache('ccx-override-values').pop((ccx, _non_ccx_location(block), name), None)
+    return override_has_changes
 
 
 def clear_override_for_ccx(ccx, block, name):
@@ -175,6 +276,7 @@ def clear_override_for_ccx(ccx, block, name):
             field=name).delete()
 
         clear_ccx_field_info_from_ccx_map(ccx, block, name)
+        _bump_overrides_version(ccx)
 
     except CcxFieldOverride.DoesNotExist:
         pass
@@ -188,9 +290,9 @@ def clear_ccx_field_info_from_ccx_map(ccx, block, name):  # pylint: disable=inva
         ccx_override_map = _get_overrides_for_ccx(ccx).setdefault(block.location, {})
         ccx_override_map.pop(name)
         ccx_override_map.pop(name + "_id")
-        ccx_override_map.pop(name + "_instance")
     except KeyError:
         pass
+    request_cache.get_cache('ccx-override-values').pop((ccx, _non_ccx_location(block), name), None)
 
 
 def bulk_delete_ccx_override_fields(ccx, ids):
@@ -201,3 +303,4 @@ def bulk_delete_ccx_override_fields(ccx, ids):
     ids = list(set(ids))
     if ids:
         CcxFieldOverride.objects.filter(ccx=ccx, id__in=ids).delete()
+        _bump_overrides_version(ccx)
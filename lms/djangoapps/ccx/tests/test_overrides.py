@@ -8,6 +8,8 @@ import pytz
 from nose.plugins.attrib import attr
 
 from courseware.field_overrides import OverrideFieldData
+from django.core.cache import cache
+from django.db import transaction
 from django.test.utils import override_settings
 from lms.djangoapps.courseware.tests.test_field_overrides import inject_field_overrides
 from request_cache.middleware import RequestCache
@@ -17,8 +19,15 @@ from xmodule.modulestore.tests.django_utils import (
     TEST_DATA_SPLIT_MODULESTORE)
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 
-from lms.djangoapps.ccx.models import CustomCourseForEdX
-from lms.djangoapps.ccx.overrides import override_field_for_ccx
+from lms.djangoapps.ccx.models import CcxFieldOverride, CustomCourseForEdX
+from lms.djangoapps.ccx.overrides import (
+    _bump_pending_overrides_versions,
+    _overrides_cache_key,
+    _overrides_version_cache_key,
+    clear_override_for_ccx,
+    get_override_for_ccx,
+    override_field_for_ccx,
+)
 
 from lms.djangoapps.ccx.tests.utils import flatten, iter_blocks
 
@@ -165,3 +174,83 @@ class TestFieldOverrides(SharedModuleStoreTestCase):
         override_field_for_ccx(self.ccx, chapter, 'due', ccx_due)
         vertical = chapter.get_children()[0].get_children()[0]
         self.assertEqual(vertical.due, ccx_due)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_overrides_map_cached_across_requests(self):
+        """
+        Test that the overrides map is loaded from the cache in later requests,
+        and reloaded after the overrides change.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        new_ccx_start = datetime.datetime(2015, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapter = self.ccx.course.get_children()[0]
+        override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
+
+        RequestCache.clear_request_cache()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_override_for_ccx(self.ccx, chapter, 'start'), ccx_start)
+        RequestCache.clear_request_cache()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_override_for_ccx(self.ccx, chapter, 'start'), ccx_start)
+
+        override_field_for_ccx(self.ccx, chapter, 'start', new_ccx_start)
+        RequestCache.clear_request_cache()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_override_for_ccx(self.ccx, chapter, 'start'), new_ccx_start)
+
+        clear_override_for_ccx(self.ccx, chapter, 'start')
+        RequestCache.clear_request_cache()
+        self.assertIsNone(get_override_for_ccx(self.ccx, chapter, 'start'))
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_overrides_version_bumped_after_transaction(self):
+        """
+        Test that the version of overrides changed inside a transaction is
+        bumped again once the request has finished, so that a map loaded
+        before the transaction was committed isn't used.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapter = self.ccx.course.get_children()[0]
+        with transaction.atomic():
+            override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
+
+            # Another process loads the overrides before the transaction is
+            # committed, and stores them under the bumped version.
+            version = cache.get(_overrides_version_cache_key(self.ccx))
+            cache.set(_overrides_cache_key(self.ccx), {'version': version, 'overrides': {}})
+
+        # Sending request_finished would also close the database connection of the test.
+        _bump_pending_overrides_versions(sender=None)
+        self.assertNotEqual(cache.get(_overrides_version_cache_key(self.ccx)), version)
+        RequestCache.clear_request_cache()
+        self.assertEqual(get_override_for_ccx(self.ccx, chapter, 'start'), ccx_start)
+
+    def test_override_deleted_concurrently(self):
+        """
+        Test that an override deleted since the overrides map was loaded is saved again.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        new_ccx_start = datetime.datetime(2015, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapter = self.ccx.course.get_children()[0]
+        override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
+
+        # Another process deletes the override, whose id stays in the overrides map.
+        CcxFieldOverride.objects.filter(ccx=self.ccx, field='start').delete()
+        override_field_for_ccx(self.ccx, chapter, 'start', new_ccx_start)
+
+        self.assertTrue(CcxFieldOverride.objects.filter(ccx=self.ccx, field='start').exists())
+        RequestCache.clear_request_cache()
+        self.assertEqual(get_override_for_ccx(self.ccx, chapter, 'start'), new_ccx_start)
+
+    def test_override_decoded_once_per_request(self):
+        """
+        Test that the value of an overridden immutable field is decoded only once per request.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapter = self.ccx.course.get_children()[0]
+        override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
+        RequestCache.clear_request_cache()
+        with mock.patch.object(chapter.fields['start'], 'from_json', return_value=ccx_start) as from_json:
+            self.assertEqual(get_override_for_ccx(self.ccx, chapter, 'start'), ccx_start)
+            self.assertEqual(get_override_for_ccx(self.ccx, chapter, 'start'), ccx_start)
+        self.assertEqual(from_json.call_count, 1)
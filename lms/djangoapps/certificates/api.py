@@ -170,6 +170,54 @@ def generate_user_certificates(student, course_key, course=None, insecure=False,
     return cert.status
 
 
+def generate_user_certificates_in_bulk(students, course_key, course=None, insecure=False, generation_mode='batch',
+                                       forced_grade=None):
+    """
+    Adds the add-cert requests of many students into the xqueue, as
+    generate_user_certificates does for each of them, but with their data
+    fetched and their grades computed in bulk and the requests sent
+    concurrently.
+
+    Args:
+        students (list of User)
+        course_key (CourseKey)
+
+    Keyword Arguments:
+        course (Course): Optionally provide the course object; if not provided
+            it will be loaded.
+        insecure - (Boolean)
+        generation_mode - who has requested certificate generation.
+        forced_grade - a string indicating to replace grade parameter. if present grading
+                       will be skipped.
+
+    Returns a list of (student, status) tuples in the order of `students`,
+    where status is None for the students whose certificate was left unchanged.
+    """
+    xqueue = XQueueCertInterface()
+    if insecure:
+        xqueue.use_https = False
+    generate_pdf = not has_html_certificates_enabled(course_key, course)
+    certs = xqueue.add_certs(
+        students,
+        course_key,
+        course=course,
+        generate_pdf=generate_pdf,
+        forced_grade=forced_grade
+    )
+    statuses = []
+    for student, cert in certs:
+        if cert is not None and CertificateStatuses.is_passing_status(cert.status):
+            emit_certificate_event('created', student, course_key, course, {
+                'user_id': student.id,
+                'course_id': unicode(course_key),
+                'certificate_id': cert.verify_uuid,
+                'enrollment_mode': cert.mode,
+                'generation_mode': generation_mode
+            })
+        statuses.append((student, cert.status if cert is not None else None))
+    return statuses
+
+
 def regenerate_user_certificates(student, course_key, course=None,
                                  forced_grade=None, template_file=None, insecure=False):
     """
@@ -2,8 +2,10 @@
 import json
 import random
 import logging
+import threading
 import lxml.html
 from lxml.etree import XMLSyntaxError, ParserError
+from multiprocessing.pool import ThreadPool
 from uuid import uuid4
 
 from django.test.client import RequestFactory
@@ -22,6 +24,7 @@ from lms.djangoapps.verify_student.models import SoftwareSecurePhotoVerification
 from certificates.models import (
     CertificateStatuses,
     GeneratedCertificate,
+    certificate_status,
     certificate_status_for_student,
     CertificateStatuses as status,
     CertificateWhitelist,
@@ -81,28 +84,26 @@ class XQueueCertInterface(object):
 
     """
 
-    def __init__(self, request=None):
-
-        # Get basic auth (username/password) for
-        # xqueue connection if it's in the settings
-
-        if settings.XQUEUE_INTERFACE.get('basic_auth') is not None:
-            requests_auth = HTTPBasicAuth(
-                *settings.XQUEUE_INTERFACE['basic_auth'])
-        else:
-            requests_auth = None
+    ADD_CERT_VALID_STATUSES = [
+        status.generating,
+        status.unavailable,
+        status.deleted,
+        status.error,
+        status.notpassing,
+        status.downloadable,
+        status.auditing,
+        status.audit_passing,
+        status.audit_notpassing,
+    ]
 
+    def __init__(self, request=None):
         if request is None:
             factory = RequestFactory()
             self.request = factory.get('/')
         else:
             self.request = request
 
-        self.xqueue_interface = XQueueInterface(
-            settings.XQUEUE_INTERFACE['url'],
-            settings.XQUEUE_INTERFACE['django_auth'],
-            requests_auth,
-        )
+        self.xqueue_interface = self._create_xqueue_interface()
         self.whitelist = CertificateWhitelist.objects.all()
         self.restricted = UserProfile.objects.filter(allow_certificate=False)
         self.use_https = True
@@ -183,7 +184,6 @@ class XQueueCertInterface(object):
 
         raise NotImplementedError
 
-    # pylint: disable=too-many-statements
     def add_cert(self, student, course_id, course=None, forced_grade=None, template_file=None, generate_pdf=True):
         """
         Request a new certificate for a student.
@@ -213,34 +213,8 @@ class XQueueCertInterface(object):
 
         Returns the newly created certificate instance
         """
-
-        valid_statuses = [
-            status.generating,
-            status.unavailable,
-            status.deleted,
-            status.error,
-            status.notpassing,
-            status.downloadable,
-            status.auditing,
-            status.audit_passing,
-            status.audit_notpassing,
-        ]
-
         cert_status = certificate_status_for_student(student, course_id)['status']
-        cert = None
-
-        if cert_status not in valid_statuses:
-            LOGGER.warning(
-                (
-                    u"Cannot create certificate generation task for user %s "
-                    u"in the course '%s'; "
-                    u"the certificate status '%s' is not one of %s."
-                ),
-                student.id,
-                unicode(course_id),
-                cert_status,
-                unicode(valid_statuses)
-            )
+        if not self._can_add_cert(student, course_id, cert_status):
             return None
 
         # The caller can optionally pass a course in to avoid
@@ -250,7 +224,6 @@ class XQueueCertInterface(object):
             course = modulestore().get_course(course_id, depth=0)
 
         profile = UserProfile.objects.get(user=student)
-        profile_name = profile.name
 
         # Needed for access control in grading.
         self.request.user = student
@@ -259,8 +232,209 @@ class XQueueCertInterface(object):
         is_whitelisted = self.whitelist.filter(user=student, course_id=course_id, whitelist=True).exists()
         grade = grades.grade(student, self.request, course)
         enrollment_mode, __ = CourseEnrollment.enrollment_mode_for_user(student, course_id)
-        mode_is_verified = enrollment_mode in GeneratedCertificate.VERIFIED_CERTS_MODES
         user_is_verified = SoftwareSecurePhotoVerification.user_is_verified(student)
+
+        cert, submission = self._update_cert(
+            student,
+            course_id,
+            course,
+            profile.name,
+            is_whitelisted,
+            grade,
+            enrollment_mode,
+            user_is_verified,
+            is_restricted=lambda: self.restricted.filter(user=student).exists(),
+            course_has_honor_mode=lambda: bool(CourseMode.mode_for_course(course_id, CourseMode.HONOR)),
+            get_cert=lambda: GeneratedCertificate.objects.get_or_create(  # pylint: disable=no-member
+                user=student, course_id=course_id
+            )[0],
+            forced_grade=forced_grade,
+            template_file=template_file,
+            generate_pdf=generate_pdf,
+        )
+        if submission is not None:
+            self._submit_cert(cert, student, submission)
+        return cert
+
+    def add_certs(self, students, course_id, course=None, forced_grade=None, template_file=None, generate_pdf=True,
+                  pool_size=None):
+        """
+        Request new certificates for many students of a course, as add_cert
+        does for each of them.
+
+        Rather than querying for each student, the whitelist, profile,
+        enrollment mode, verification and existing certificate rows of all of
+        the students are fetched with one query each. The students are graded
+        with iterate_grades_for, which shares the course's grading data among
+        them, and the certificate requests are sent to the XQueue concurrently
+        by a pool of `pool_size` threads, each with its own connection.
+
+        Students whose certificate status doesn't allow a new certificate, or
+        who can't be graded, are left unchanged.
+
+        Returns a list of (student, certificate) tuples in the order of
+        `students`, where certificate is None for the students left unchanged.
+        """
+        students = list(students)
+        if course is None:
+            course = modulestore().get_course(course_id, depth=0)
+        if pool_size is None:
+            pool_size = settings.CERTIFICATE_XQUEUE_POOL_SIZE
+
+        existing_certs = {
+            cert.user_id: cert
+            for cert in GeneratedCertificate.objects.filter(  # pylint: disable=no-member
+                course_id=course_id, user__in=students
+            )
+        }
+        course_modes = CourseMode.modes_for_course(course_id)
+        eligible_students = [
+            student for student in students
+            if self._can_add_cert(
+                student, course_id, certificate_status(existing_certs.get(student.id), modes=course_modes)['status']
+            )
+        ]
+
+        profiles = {profile.user_id: profile for profile in UserProfile.objects.filter(user__in=eligible_students)}
+        whitelisted_ids = set(
+            self.whitelist.filter(
+                user__in=eligible_students, course_id=course_id, whitelist=True
+            ).values_list('user_id', flat=True)
+        )
+        enrollment_modes = dict(
+            CourseEnrollment.objects.filter(
+                user__in=eligible_students, course_id=course_id
+            ).values_list('user_id', 'mode')
+        )
+        verified_ids = SoftwareSecurePhotoVerification.verified_user_ids(eligible_students)
+        course_has_honor_mode = bool(CourseMode.mode_for_course(course_id, CourseMode.HONOR, modes=course_modes))
+
+        certs = {}
+        queued_certs = []
+        for student, grade, err_msg in grades.iterate_grades_for(course, eligible_students, batched=True):
+            if err_msg:
+                LOGGER.warning(
+                    u"Could not grade student %s in the course '%s', so no certificate was requested: %s",
+                    student.id,
+                    unicode(course_id),
+                    err_msg
+                )
+                continue
+
+            profile = profiles.get(student.id)
+            if profile is None:
+                LOGGER.warning(
+                    u"Student %s has no profile, so no certificate was requested in the course '%s'.",
+                    student.id,
+                    unicode(course_id)
+                )
+                continue
+
+            cert, submission = self._update_cert(
+                student,
+                course_id,
+                course,
+                profile.name,
+                student.id in whitelisted_ids,
+                grade,
+                enrollment_modes.get(student.id),
+                student.id in verified_ids,
+                is_restricted=lambda: not profile.allow_certificate,  # pylint: disable=cell-var-from-loop
+                course_has_honor_mode=lambda: course_has_honor_mode,
+                get_cert=lambda: (  # pylint: disable=cell-var-from-loop
+                    existing_certs.get(student.id) or
+                    # Another run may have created it since existing_certs was read.
+                    GeneratedCertificate.objects.get_or_create(  # pylint: disable=no-member
+                        user=student, course_id=course_id
+                    )[0]
+                ),
+                forced_grade=forced_grade,
+                template_file=template_file,
+                generate_pdf=generate_pdf,
+            )
+            certs[student.id] = cert
+            if submission is not None:
+                queued_certs.append((cert, student, submission))
+
+        if queued_certs:
+            pool = ThreadPool(min(pool_size, len(queued_certs)))
+            try:
+                interfaces = threading.local()
+
+                def submit(queued_cert):
+                    """
+                    Submits the certificate request with this thread's connection to the XQueue.
+                    """
+                    if not hasattr(interfaces, 'xqueue_interface'):
+                        interfaces.xqueue_interface = self._create_xqueue_interface()
+                    return self._submit_cert(*queued_cert, xqueue_interface=interfaces.xqueue_interface, save=False)
+
+                for cert in pool.imap_unordered(submit, queued_certs):
+                    if cert.status == ExampleCertificate.STATUS_ERROR:
+                        cert.save()
+            finally:
+                pool.close()
+                pool.join()
+
+        return [(student, certs.get(student.id)) for student in students]
+
+    def _create_xqueue_interface(self):
+        """
+        Returns a new connection to the XQueue.
+        """
+        # Get basic auth (username/password) for
+        # xqueue connection if it's in the settings
+        if settings.XQUEUE_INTERFACE.get('basic_auth') is not None:
+            requests_auth = HTTPBasicAuth(
+                *settings.XQUEUE_INTERFACE['basic_auth'])
+        else:
+            requests_auth = None
+
+        return XQueueInterface(
+            settings.XQUEUE_INTERFACE['url'],
+            settings.XQUEUE_INTERFACE['django_auth'],
+            requests_auth,
+        )
+
+    def _can_add_cert(self, student, course_id, cert_status):
+        """
+        Returns whether a new certificate can be requested for a student
+        whose certificate for the course has the given status.
+        """
+        if cert_status not in self.ADD_CERT_VALID_STATUSES:
+            LOGGER.warning(
+                (
+                    u"Cannot create certificate generation task for user %s "
+                    u"in the course '%s'; "
+                    u"the certificate status '%s' is not one of %s."
+                ),
+                student.id,
+                unicode(course_id),
+                cert_status,
+                unicode(self.ADD_CERT_VALID_STATUSES)
+            )
+            return False
+        return True
+
+    # pylint: disable=too-many-statements
+    def _update_cert(self, student, course_id, course, profile_name, is_whitelisted, grade, enrollment_mode,
+                     user_is_verified, is_restricted, course_has_honor_mode, get_cert, forced_grade=None,
+                     template_file=None, generate_pdf=True):
+        """
+        Updates the certificate of a student, given the student's data for
+        the course, as described in add_cert.
+
+        The checks that are only needed for some students are passed in as
+        functions, so that they are only evaluated when needed:
+          is_restricted - returns whether the student is on the restricted list
+          course_has_honor_mode - returns whether the course has an honor mode
+          get_cert - returns the student's certificate, creating it if needed
+
+        Returns a (certificate, submission) tuple, where submission is the
+        request to send to the XQueue with _submit_cert, or None if there is
+        nothing to send.
+        """
+        mode_is_verified = enrollment_mode in GeneratedCertificate.VERIFIED_CERTS_MODES
         cert_mode = enrollment_mode
         is_eligible_for_certificate = is_whitelisted or CourseMode.is_eligible_for_certificate(enrollment_mode)
         unverified = False
@@ -274,7 +448,7 @@ class XQueueCertInterface(object):
             template_pdf = "certificate-template-{id.org}-{id.course}-verified.pdf".format(id=course_id)
         elif mode_is_verified and not user_is_verified:
             template_pdf = "certificate-template-{id.org}-{id.course}.pdf".format(id=course_id)
-            if CourseMode.mode_for_course(course_id, CourseMode.HONOR):
+            if course_has_honor_mode():
                 cert_mode = GeneratedCertificate.MODES.honor
             else:
                 unverified = True
@@ -299,7 +473,7 @@ class XQueueCertInterface(object):
             mode_is_verified
         )
 
-        cert, created = GeneratedCertificate.objects.get_or_create(user=student, course_id=course_id)  # pylint: disable=no-member
+        cert = get_cert()
 
         cert.mode = cert_mode
         cert.user = student
@@ -353,7 +527,7 @@ class XQueueCertInterface(object):
                 student.id,
                 enrollment_mode
             )
-            return cert
+            return cert, None
         # If they are not passing, short-circuit and don't generate cert
         elif not passing:
             cert.status = status.notpassing
@@ -369,12 +543,12 @@ class XQueueCertInterface(object):
                 unicode(course_id),
                 cert.status
             )
-            return cert
+            return cert, None
 
         # Check to see whether the student is on the the embargoed
         # country restricted list. If so, they should not receive a
         # certificate -- set their status to restricted and log it.
-        if self.restricted.filter(user=student).exists():
+        if is_restricted():
             cert.status = status.restricted
             cert.save()
 
@@ -389,7 +563,7 @@ class XQueueCertInterface(object):
                 cert.status,
                 unicode(course_id)
             )
-            return cert
+            return cert, None
 
         if unverified:
             cert.status = status.unverified
@@ -403,15 +577,16 @@ class XQueueCertInterface(object):
                 student.id,
                 unicode(course_id),
             )
-            return cert
+            return cert, None
 
-        # Finally, generate the certificate and send it off.
-        return self._generate_cert(cert, course, student, grade_contents, template_pdf, generate_pdf)
+        # Finally, generate the certificate.
+        return cert, self._generate_cert(cert, course, student, grade_contents, template_pdf, generate_pdf)
 
     def _generate_cert(self, cert, course, student, grade_contents, template_pdf, generate_pdf):
         """
         Generate a certificate for the student. If `generate_pdf` is True,
-        sends a request to XQueue.
+        returns the (contents, key) of the request to send to the XQueue
+        with _submit_cert, otherwise returns None.
         """
         course_id = unicode(course.id)
 
@@ -434,31 +609,42 @@ class XQueueCertInterface(object):
 
         cert.save()
 
-        if generate_pdf:
-            try:
-                self._send_to_xqueue(contents, key)
-            except XQueueAddToQueueError as exc:
-                cert.status = ExampleCertificate.STATUS_ERROR
-                cert.error_reason = unicode(exc)
+        return (contents, key) if generate_pdf else None
+
+    def _submit_cert(self, cert, student, submission, xqueue_interface=None, save=True):
+        """
+        Sends the (contents, key) `submission` for the certificate to the
+        XQueue. If it can't be added, the certificate status is set to
+        'error', and the certificate is saved unless `save` is False.
+
+        Returns the certificate.
+        """
+        contents, key = submission
+        try:
+            self._send_to_xqueue(contents, key, xqueue_interface=xqueue_interface)
+        except XQueueAddToQueueError as exc:
+            cert.status = ExampleCertificate.STATUS_ERROR
+            cert.error_reason = unicode(exc)
+            if save:
                 cert.save()
-                LOGGER.critical(
-                    (
-                        u"Could not add certificate task to XQueue.  "
-                        u"The course was '%s' and the student was '%s'."
-                        u"The certificate task status has been marked as 'error' "
-                        u"and can be re-submitted with a management command."
-                    ), course_id, student.id
-                )
-            else:
-                LOGGER.info(
-                    (
-                        u"The certificate status has been set to '%s'.  "
-                        u"Sent a certificate grading task to the XQueue "
-                        u"with the key '%s'. "
-                    ),
-                    cert.status,
-                    key
-                )
+            LOGGER.critical(
+                (
+                    u"Could not add certificate task to XQueue.  "
+                    u"The course was '%s' and the student was '%s'."
+                    u"The certificate task status has been marked as 'error' "
+                    u"and can be re-submitted with a management command."
+                ), contents['course_id'], student.id
+            )
+        else:
+            LOGGER.info(
+                (
+                    u"The certificate status has been set to '%s'.  "
+                    u"Sent a certificate grading task to the XQueue "
+                    u"with the key '%s'. "
+                ),
+                cert.status,
+                key
+            )
         return cert
 
     def add_example_cert(self, example_cert):
@@ -523,7 +709,8 @@ class XQueueCertInterface(object):
                 ), example_cert.uuid, unicode(exc)
             )
 
-    def _send_to_xqueue(self, contents, key, task_identifier=None, callback_url_path='/update_certificate'):
+    def _send_to_xqueue(self, contents, key, task_identifier=None, callback_url_path='/update_certificate',
+                        xqueue_interface=None):
         """Create a new task on the XQueue.
 
         Arguments:
@@ -537,6 +724,8 @@ class XQueueCertInterface(object):
             callback_url_path (str): The path of the callback URL.
                 If not provided, use the default end-point for student-generated
                 certificates.
+            xqueue_interface (XQueueInterface): The connection to send the task
+                with, if not this interface's own connection.
 
         """
         callback_url = u'{protocol}://{base_url}{path}'.format(
@@ -566,7 +755,7 @@ class XQueueCertInterface(object):
 
         xheader = make_xheader(callback_url, key, settings.CERT_QUEUE)
 
-        (error, msg) = self.xqueue_interface.send_to_queue(
+        (error, msg) = (xqueue_interface or self.xqueue_interface).send_to_queue(
             header=xheader, body=json.dumps(contents))
         if error:
             exc = XQueueAddToQueueError(error, msg)
@@ -132,6 +132,92 @@ class XQueueCertInterfaceAddCertificateTest(ModuleStoreTestCase):
         self.assertIsNotNone(certificate)
         self.assertEqual(certificate.mode, 'audit')
 
+    def test_add_certs(self):
+        """
+        Test that certificates requested in bulk are updated the same way as
+        when they are requested one student at a time.
+        """
+        CourseEnrollmentFactory(user=self.user_2, course_id=self.course.id, is_active=True, mode='verified')
+        restricted_user = UserFactory.create()
+        restricted_user.profile.allow_certificate = False
+        restricted_user.profile.save()
+        CourseEnrollmentFactory(user=restricted_user, course_id=self.course.id, is_active=True, mode='honor')
+        deleting_user = UserFactory.create()
+        CourseEnrollmentFactory(user=deleting_user, course_id=self.course.id, is_active=True, mode='honor')
+        GeneratedCertificateFactory(
+            user=deleting_user, course_id=self.course.id, status=CertificateStatuses.deleting, mode='honor'
+        )
+        students = [self.user, self.user_2, restricted_user, deleting_user]
+
+        with self.mock_iterate_grades_for({'grade': 'Pass', 'percent': 0.75}):
+            with patch.object(XQueueInterface, 'send_to_queue') as mock_send:
+                mock_send.return_value = (0, None)
+                certs = self.xqueue.add_certs(students, self.course.id, pool_size=2)
+
+        self.assertEqual([student for student, __ in certs], students)
+        self.assertEqual(
+            [cert.status if cert else None for __, cert in certs],
+            [CertificateStatuses.generating, CertificateStatuses.generating, CertificateStatuses.restricted, None]
+        )
+        self.assertEqual(mock_send.call_count, 2)
+        template_names = sorted(json.loads(kwargs['body'])['template_pdf'] for __, kwargs in mock_send.call_args_list)
+        self.assertEqual(template_names, [
+            'certificate-template-{id.org}-{id.course}-verified.pdf'.format(id=self.course.id),
+            'certificate-template-{id.org}-{id.course}.pdf'.format(id=self.course.id),
+        ])
+        certificate = GeneratedCertificate.eligible_certificates.get(user=self.user_2, course_id=self.course.id)
+        self.assertEqual(certificate.mode, 'verified')
+        self.assertEqual(certificate.status, CertificateStatuses.generating)
+
+    def test_add_certs_xqueue_error(self):
+        """
+        Test that the certificates whose requests could not be added to the
+        queue are saved with the error status.
+        """
+        with self.mock_iterate_grades_for({'grade': 'Pass', 'percent': 0.75}):
+            with patch.object(XQueueInterface, 'send_to_queue') as mock_send:
+                mock_send.return_value = (1, 'error')
+                self.xqueue.add_certs([self.user], self.course.id)
+
+        certificate = GeneratedCertificate.eligible_certificates.get(user=self.user, course_id=self.course.id)
+        self.assertEqual(certificate.status, CertificateStatuses.error)
+        self.assertIn('error', certificate.error_reason)
+
+    def test_add_certs_created_concurrently(self):
+        """
+        Test that a certificate created by another run after the existing
+        certificates were read is updated rather than created again.
+        """
+        modes_for_course = CourseMode.modes_for_course
+
+        def create_cert_then_get_modes(course_id):
+            """
+            Creates the certificate as a concurrent run would.
+            """
+            GeneratedCertificateFactory(user=self.user, course_id=course_id, status=CertificateStatuses.unavailable)
+            return modes_for_course(course_id)
+
+        with self.mock_iterate_grades_for({'grade': 'Pass', 'percent': 0.75}):
+            with patch.object(XQueueInterface, 'send_to_queue') as mock_send:
+                mock_send.return_value = (0, None)
+                with patch('certificates.queue.CourseMode.modes_for_course', side_effect=create_cert_then_get_modes):
+                    certs = self.xqueue.add_certs([self.user], self.course.id)
+
+        self.assertEqual(certs[0][1].status, CertificateStatuses.generating)
+        certificate = GeneratedCertificate.objects.get(user=self.user, course_id=self.course.id)
+        self.assertEqual(certificate.status, CertificateStatuses.generating)
+
+    @contextmanager
+    def mock_iterate_grades_for(self, grade):
+        """
+        Grades every student of iterate_grades_for with the given grade.
+        """
+        with patch(
+            'courseware.grades.iterate_grades_for',
+            Mock(side_effect=lambda course, students, **kwargs: [(student, dict(grade), '') for student in students])
+        ):
+            yield
+
     def add_cert_to_queue(self, mode):
         """
         Dry method for course enrollment and adding request to
@@ -5,18 +5,25 @@ from util.json_request import JsonResponse
 import json
 
 from courseware import models
-from django.db.models import Count
+from django.core.cache import cache
+from django.db.models import Count, Sum
 from django.utils.translation import ugettext as _
 
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.inheritance import own_metadata
 from instructor_analytics.csvs import create_csv_response
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 
+from class_dashboard.models import ProblemGradeCount, SequentialOpenCount, aggregates_enabled
 from opaque_keys.edx.locations import Location
 
 # Used to limit the length of list displayed to the screen.
 MAX_SCREEN_LIST_LENGTH = 250
 
+# The course layout is cached under a key that changes whenever the course is published.
+COURSE_LAYOUT_CACHE_KEY = u'class_dashboard.course_layout.{course_id}.{version}'
+COURSE_LAYOUT_CACHE_TIMEOUT = 24 * 60 * 60
+
 
 def get_problem_grade_distribution(course_id):
     """
@@ -32,12 +39,16 @@ def get_problem_grade_distribution(course_id):
         attempting the problem
     """
 
-    # Aggregate query on studentmodule table for grade data for all problems in course
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        grade__isnull=False,
-        module_type__exact="problem",
-    ).values('module_state_key', 'grade', 'max_grade').annotate(count_grade=Count('grade'))
+    if aggregates_enabled():
+        # Query on the counts kept up to date as students are graded
+        db_query = ProblemGradeCount.grade_counts(course_id)
+    else:
+        # Aggregate query on studentmodule table for grade data for all problems in course
+        db_query = models.StudentModule.objects.filter(
+            course_id__exact=course_id,
+            grade__isnull=False,
+            module_type__exact="problem",
+        ).values('module_state_key', 'grade', 'max_grade').annotate(count_grade=Count('grade'))
 
     prob_grade_distrib = {}
     total_student_count = {}
@@ -75,11 +86,18 @@ def get_sequential_open_distrib(course_id):
     Outputs a dict mapping the 'module_id' to the number of students that have opened that subsection/sequential.
     """
 
-    # Aggregate query on studentmodule table for "opening a subsection" data
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        module_type__exact="sequential",
-    ).values('module_state_key').annotate(count_sequential=Count('module_state_key'))
+    if aggregates_enabled():
+        # Query on the counts kept up to date as students open subsections
+        db_query = SequentialOpenCount.objects.filter(
+            course_id__exact=course_id,
+            count__gt=0,
+        ).values('module_state_key').annotate(count_sequential=Sum('count'))
+    else:
+        # Aggregate query on studentmodule table for "opening a subsection" data
+        db_query = models.StudentModule.objects.filter(
+            course_id__exact=course_id,
+            module_type__exact="sequential",
+        ).values('module_state_key').annotate(count_sequential=Count('module_state_key'))
 
     # Build set of "opened" data for each subsection that has "opened" data
     sequential_open_distrib = {}
@@ -105,17 +123,21 @@ def get_problem_set_grade_distrib(course_id, problem_set):
       'grade_distrib' - array of tuples (`grade`,`count`) ordered by `grade`
     """
 
-    # Aggregate query on studentmodule table for grade data for set of problems in course
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        grade__isnull=False,
-        module_type__exact="problem",
-        module_state_key__in=problem_set,
-    ).values(
-        'module_state_key',
-        'grade',
-        'max_grade',
-    ).annotate(count_grade=Count('grade')).order_by('module_state_key', 'grade')
+    if aggregates_enabled():
+        # Query on the counts kept up to date as students are graded
+        db_query = ProblemGradeCount.grade_counts(course_id, module_state_key__in=problem_set)
+    else:
+        # Aggregate query on studentmodule table for grade data for set of problems in course
+        db_query = models.StudentModule.objects.filter(
+            course_id__exact=course_id,
+            grade__isnull=False,
+            module_type__exact="problem",
+            module_state_key__in=problem_set,
+        ).values(
+            'module_state_key',
+            'grade',
+            'max_grade',
+        ).annotate(count_grade=Count('grade')).order_by('module_state_key', 'grade')
 
     prob_grade_distrib = {}
 
@@ -137,31 +159,56 @@ def get_problem_set_grade_distrib(course_id, problem_set):
     return prob_grade_distrib
 
 
-def get_d3_problem_grade_distrib(course_id):
+def get_course_layout(course_id):
     """
-    Returns problem grade distribution information for each section, data already in format for d3 function.
-
-    `course_id` the course ID for the course interested in
-
-    Returns an array of dicts in the order of the sections. Each dict has:
+    Returns the layout of the course shown in the metrics, as an array in the order of the sections. Each dict has:
       'display_name' - display name for the section
-      'data' - data for the d3_stacked_bar_graph function of the grade distribution for that problem
+      'subsections' - array of dicts for the subsections of the section, with:
+        'location' - the subsection's UsageKey
+        'display_name' - display name for the subsection
+      'problems' - array of dicts for the problems of the section, with:
+        'location' - the problem's UsageKey
+        'label' - "P<subsection>.<unit>.<problem>", numbering the problem within the section
+        'display_name' - display name for the problem
+
+    When ENABLE_CLASS_DASHBOARD_AGGREGATES is on, the layout is cached until
+    the course is next published, as recorded by its course overview, which
+    is replaced on each publish.
     """
+    if not aggregates_enabled():
+        return _build_course_layout(course_id)
 
-    prob_grade_distrib, total_student_count = get_problem_grade_distribution(course_id)
-    d3_data = []
+    cache_key = COURSE_LAYOUT_CACHE_KEY.format(
+        course_id=course_id,
+        version=CourseOverview.get_from_id(course_id).modified.strftime('%Y%m%d%H%M%S%f'),
+    )
+    layout = cache.get(cache_key)
+    if layout is None:
+        layout = _build_course_layout(course_id)
+        cache.set(cache_key, layout, COURSE_LAYOUT_CACHE_TIMEOUT)
+    return layout
+
+
+def _build_course_layout(course_id):
+    """
+    Walks the course down to its problems to build the layout returned by get_course_layout.
+    """
+    layout = []
 
     # Retrieve course object down to problems
     course = modulestore().get_course(course_id, depth=4)
 
     # Iterate through sections, subsections, units, problems
     for section in course.get_children():
-        curr_section = {}
-        curr_section['display_name'] = own_metadata(section).get('display_name', '')
-        data = []
+        subsections = []
+        problems = []
         c_subsection = 0
         for subsection in section.get_children():
             c_subsection += 1
+            subsections.append({
+                'location': subsection.location,
+                'display_name': own_metadata(subsection).get('display_name', ''),
+            })
             c_unit = 0
             for unit in subsection.get_children():
                 c_unit += 1
@@ -171,57 +218,86 @@ def get_d3_problem_grade_distrib(course_id):
                     # Student data is at the problem level
                     if child.location.category == 'problem':
                         c_problem += 1
-                        stack_data = []
-
-                        # Construct label to display for this problem
-                        label = "P{0}.{1}.{2}".format(c_subsection, c_unit, c_problem)
-
-                        # Only problems in prob_grade_distrib have had a student submission.
-                        if child.location in prob_grade_distrib:
-
-                            # Get max_grade, grade_distribution for this problem
-                            problem_info = prob_grade_distrib[child.location]
-
-                            # Get problem_name for tooltip
-                            problem_name = own_metadata(child).get('display_name', '')
-
-                            # Compute percent of this grade over max_grade
-                            max_grade = float(problem_info['max_grade'])
-                            for (grade, count_grade) in problem_info['grade_distrib']:
-                                percent = 0.0
-                                if max_grade > 0:
-                                    percent = round((grade * 100.0) / max_grade, 1)
-
-                                # Compute percent of students with this grade
-                                student_count_percent = 0
-                                if total_student_count.get(child.location, 0) > 0:
-                                    student_count_percent = count_grade * 100 / total_student_count[child.location]
-
-                                # Tooltip parameters for problem in grade distribution view
-                                tooltip = {
-                                    'type': 'problem',
-                                    'label': label,
-                                    'problem_name': problem_name,
-                                    'count_grade': count_grade,
-                                    'percent': percent,
-                                    'grade': grade,
-                                    'max_grade': max_grade,
-                                    'student_count_percent': student_count_percent,
-                                }
-
-                                # Construct data to be sent to d3
-                                stack_data.append({
-                                    'color': percent,
-                                    'value': count_grade,
-                                    'tooltip': tooltip,
-                                    'module_url': child.location.to_deprecated_string(),
-                                })
-
-                        problem = {
-                            'xValue': label,
-                            'stackData': stack_data,
-                        }
-                        data.append(problem)
+                        problems.append({
+                            'location': child.location,
+                            'label': "P{0}.{1}.{2}".format(c_subsection, c_unit, c_problem),
+                            'display_name': own_metadata(child).get('display_name', ''),
+                        })
+
+        layout.append({
+            'display_name': own_metadata(section).get('display_name', ''),
+            'subsections': subsections,
+            'problems': problems,
+        })
+
+    return layout
+
+
+def get_d3_problem_grade_distrib(course_id):
+    """
+    Returns problem grade distribution information for each section, data already in format for d3 function.
+
+    `course_id` the course ID for the course interested in
+
+    Returns an array of dicts in the order of the sections. Each dict has:
+      'display_name' - display name for the section
+      'data' - data for the d3_stacked_bar_graph function of the grade distribution for that problem
+    """
+
+    prob_grade_distrib, total_student_count = get_problem_grade_distribution(course_id)
+    d3_data = []
+
+    # Iterate through sections and their problems
+    for section in get_course_layout(course_id):
+        curr_section = {}
+        curr_section['display_name'] = section['display_name']
+        data = []
+        for problem in section['problems']:
+            location = problem['location']
+            stack_data = []
+
+            # Only problems in prob_grade_distrib have had a student submission.
+            if location in prob_grade_distrib:
+
+                # Get max_grade, grade_distribution for this problem
+                problem_info = prob_grade_distrib[location]
+
+                # Compute percent of this grade over max_grade
+                max_grade = float(problem_info['max_grade'])
+                for (grade, count_grade) in problem_info['grade_distrib']:
+                    percent = 0.0
+                    if max_grade > 0:
+                        percent = round((grade * 100.0) / max_grade, 1)
+
+                    # Compute percent of students with this grade
+                    student_count_percent = 0
+                    if total_student_count.get(location, 0) > 0:
+                        student_count_percent = count_grade * 100 / total_student_count[location]
+
+                    # Tooltip parameters for problem in grade distribution view
+                    tooltip = {
+                        'type': 'problem',
+                        'label': problem['label'],
+                        'problem_name': problem['display_name'],
+                        'count_grade': count_grade,
+                        'percent': percent,
+                        'grade': grade,
+                        'max_grade': max_grade,
+                        'student_count_percent': student_count_percent,
+                    }
+
+                    # Construct data to be sent to d3
+                    stack_data.append({
+                        'color': percent,
+                        'value': count_grade,
+                        'tooltip': tooltip,
+                        'module_url': location.to_deprecated_string(),
+                    })
+
+            data.append({
+                'xValue': problem['label'],
+                'stackData': stack_data,
+            })
         curr_section['data'] = data
 
         d3_data.append(curr_section)
@@ -243,24 +319,20 @@ def get_d3_sequential_open_distrib(course_id):
 
     d3_data = []
 
-    # Retrieve course object down to subsection
-    course = modulestore().get_course(course_id, depth=2)
-
     # Iterate through sections, subsections
-    for section in course.get_children():
+    for section in get_course_layout(course_id):
         curr_section = {}
-        curr_section['display_name'] = own_metadata(section).get('display_name', '')
+        curr_section['display_name'] = section['display_name']
         data = []
         c_subsection = 0
 
         # Construct data for each subsection to be sent to d3
-        for subsection in section.get_children():
+        for subsection in section['subsections']:
             c_subsection += 1
-            subsection_name = own_metadata(subsection).get('display_name', '')
 
             num_students = 0
-            if subsection.location in sequential_open_distrib:
-                num_students = sequential_open_distrib[subsection.location]
+            if subsection['location'] in sequential_open_distrib:
+                num_students = sequential_open_distrib[subsection['location']]
 
             stack_data = []
 
@@ -269,14 +341,14 @@ def get_d3_sequential_open_distrib(course_id):
                 'type': 'subsection',
                 'num_students': num_students,
                 'subsection_num': c_subsection,
-                'subsection_name': subsection_name
+                'subsection_name': subsection['display_name']
             }
 
             stack_data.append({
                 'color': 0,
                 'value': num_students,
                 'tooltip': tooltip,
-                'module_url': subsection.location.to_deprecated_string(),
+                'module_url': subsection['location'].to_deprecated_string(),
             })
             subsection = {
                 'xValue': "SS {0}".format(c_subsection),
@@ -312,41 +384,21 @@ def get_d3_section_grade_distrib(course_id, section):
         'value' - Maps to the height of the bar, along the y-axis
         'tooltip' - (Optional) Text to display on mouse hover
     """
-
-    # Retrieve course object down to problems
-    course = modulestore().get_course(course_id, depth=4)
-
-    problem_set = []
-    problem_info = {}
-    c_subsection = 0
-    for subsection in course.get_children()[section].get_children():
-        c_subsection += 1
-        c_unit = 0
-        for unit in subsection.get_children():
-            c_unit += 1
-            c_problem = 0
-            for child in unit.get_children():
-                if child.location.category == 'problem':
-                    c_problem += 1
-                    problem_set.append(child.location)
-                    problem_info[child.location] = {
-                        'id': child.location.to_deprecated_string(),
-                        'x_value': "P{0}.{1}.{2}".format(c_subsection, c_unit, c_problem),
-                        'display_name': own_metadata(child).get('display_name', ''),
-                    }
+    problems = get_course_layout(course_id)[section]['problems']
 
     # Retrieve grade distribution for these problems
-    grade_distrib = get_problem_set_grade_distrib(course_id, problem_set)
+    grade_distrib = get_problem_set_grade_distrib(course_id, [problem['location'] for problem in problems])
 
     d3_data = []
 
     # Construct data for each problem to be sent to d3
-    for problem in problem_set:
+    for problem in problems:
         stack_data = []
 
-        if problem in grade_distrib:  # Some problems have no data because students have not tried them yet.
-            max_grade = float(grade_distrib[problem]['max_grade'])
-            for (grade, count_grade) in grade_distrib[problem]['grade_distrib']:
+        # Some problems have no data because students have not tried them yet.
+        if problem['location'] in grade_distrib:
+            max_grade = float(grade_distrib[problem['location']]['max_grade'])
+            for (grade, count_grade) in grade_distrib[problem['location']]['grade_distrib']:
                 percent = 0.0
                 if max_grade > 0:
                     percent = round((grade * 100.0) / max_grade, 1)
@@ -354,10 +406,10 @@ def get_d3_section_grade_distrib(course_id, section):
                 # Construct tooltip for problem in grade distibution view
                 tooltip = {
                     'type': 'problem',
-                    'problem_info_x': problem_info[problem]['x_value'],
+                    'problem_info_x': problem['label'],
                     'count_grade': count_grade,
                     'percent': percent,
-                    'problem_info_n': problem_info[problem]['display_name'],
+                    'problem_info_n': problem['display_name'],
                     'grade': grade,
                     'max_grade': max_grade,
                 }
@@ -369,7 +421,7 @@ def get_d3_section_grade_distrib(course_id, section):
                 })
 
         d3_data.append({
-            'xValue': problem_info[problem]['x_value'],
+            'xValue': problem['label'],
             'stackData': stack_data,
         })
 
@@ -384,16 +436,7 @@ def get_section_display_name(course_id):
 
     The ith string in the array is the display name of the ith section in the course.
     """
-
-    course = modulestore().get_course(course_id, depth=4)
-
-    section_display_name = [""] * len(course.get_children())
-    i = 0
-    for section in course.get_children():
-        section_display_name[i] = own_metadata(section).get('display_name', '')
-        i += 1
-
-    return section_display_name
+    return [section['display_name'] for section in get_course_layout(course_id)]
 
 
 def get_array_section_has_problem(course_id):
@@ -404,26 +447,7 @@ def get_array_section_has_problem(course_id):
 
     The ith value in the array is true if the ith section in the course contains problems and false otherwise.
     """
-
-    course = modulestore().get_course(course_id, depth=4)
-
-    b_section_has_problem = [False] * len(course.get_children())
-    i = 0
-    for section in course.get_children():
-        for subsection in section.get_children():
-            for unit in subsection.get_children():
-                for child in unit.get_children():
-                    if child.location.category == 'problem':
-                        b_section_has_problem[i] = True
-                        break  # out of child loop
-                if b_section_has_problem[i]:
-                    break  # out of unit loop
-            if b_section_has_problem[i]:
-                break  # out of subsection loop
-
-        i += 1
-
-    return b_section_has_problem
+    return [bool(section['problems']) for section in get_course_layout(course_id)]
 
 
 def get_students_opened_subsection(request, csv=False):
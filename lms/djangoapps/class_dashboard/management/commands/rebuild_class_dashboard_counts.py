@@ -0,0 +1,66 @@
+"""
+Command to rebuild the counts behind the Metrics tab of the Instructor Dashboard.
+"""
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+from xmodule.modulestore.django import modulestore
+
+from class_dashboard.models import ProblemGradeCount, SequentialOpenCount
+
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the problem grade and subsection open counts of the given
+    courses from their student state.  Run it for all courses before turning
+    on ENABLE_CLASS_DASHBOARD_AGGREGATES.
+
+    Example usage:
+        $ ./manage.py lms rebuild_class_dashboard_counts --all --settings=devstack
+        $ ./manage.py lms rebuild_class_dashboard_counts 'edX/DemoX/Demo_Course' --settings=devstack
+    """
+    args = '<course_id course_id ...>'
+    help = 'Rebuilds the Metrics tab counts of one or more courses from their student state.'
+
+    def add_arguments(self, parser):
+        """
+        Entry point for subclassed commands to add custom arguments.
+        """
+        parser.add_argument(
+            '--all',
+            help='Rebuild the counts of all courses.',
+            action='store_true',
+            default=False,
+        )
+
+    def handle(self, *args, **options):
+
+        if options.get('all'):
+            course_keys = [course.id for course in modulestore().get_course_summaries()]
+        else:
+            if len(args) < 1:
+                raise CommandError('At least one course or --all must be specified.')
+            try:
+                course_keys = [CourseKey.from_string(arg) for arg in args]
+            except InvalidKeyError:
+                raise CommandError('Invalid key specified.')
+
+        log.info('Rebuilding class dashboard counts for %d courses.', len(course_keys))
+
+        for course_key in course_keys:
+            try:
+                ProblemGradeCount.rebuild(course_key)
+                SequentialOpenCount.rebuild(course_key)
+            except Exception as ex:  # pylint: disable=broad-except
+                log.exception(
+                    'An error occurred while rebuilding class dashboard counts for %s: %s',
+                    unicode(course_key),
+                    ex.message,
+                )
+
+        log.info('Finished rebuilding class dashboard counts.')
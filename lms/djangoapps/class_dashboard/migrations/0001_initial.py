@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import xmodule_django.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProblemGradeCount',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('course_id', xmodule_django.models.CourseKeyField(max_length=255, db_index=True)),
+                ('module_state_key', xmodule_django.models.UsageKeyField(max_length=255)),
+                ('count', models.IntegerField(default=0)),
+                ('grade', models.FloatField()),
+                ('max_grade', models.FloatField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SequentialOpenCount',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('course_id', xmodule_django.models.CourseKeyField(max_length=255, db_index=True)),
+                ('module_state_key', xmodule_django.models.UsageKeyField(max_length=255)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='sequentialopencount',
+            unique_together=set([('course_id', 'module_state_key')]),
+        ),
+        migrations.AlterUniqueTogether(
+            name='problemgradecount',
+            unique_together=set([('course_id', 'module_state_key', 'grade', 'max_grade')]),
+        ),
+    ]
@@ -0,0 +1,162 @@
+"""
+Materialized aggregates of StudentModule rows for the Metrics tab of the Instructor Dashboard.
+
+The counts are kept up to date as StudentModule rows are saved and deleted
+(see class_dashboard.signals), so that the Metrics tab does not have to
+aggregate over every learner's state in the course on each view.  They are
+only maintained and read while the ENABLE_CLASS_DASHBOARD_AGGREGATES feature
+is on.  Use the rebuild_class_dashboard_counts management command to
+populate them for existing courses before turning it on.
+"""
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Sum
+
+from courseware.models import StudentModule
+from xmodule_django.models import CourseKeyField, UsageKeyField
+
+
+def aggregates_enabled():
+    """
+    Returns whether the class dashboard aggregates are maintained and used.
+    """
+    return settings.FEATURES.get('ENABLE_CLASS_DASHBOARD_AGGREGATES', False)
+
+
+class AggregateCount(models.Model):
+    """
+    Base class for the number of StudentModule rows matching a key.
+    """
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    module_state_key = UsageKeyField(max_length=255)
+    count = models.IntegerField(default=0)
+
+    class Meta(object):
+        app_label = 'class_dashboard'
+        abstract = True
+
+    @classmethod
+    def adjust(cls, delta, **key):
+        """
+        Adds `delta` to the count of the row matching `key`, creating the row
+        if there is none yet.
+        """
+        if cls.objects.filter(**key).update(count=F('count') + delta) or delta < 0:
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(count=delta, **key)
+        except IntegrityError:
+            # Another request created the row in the meantime.
+            cls.objects.filter(**key).update(count=F('count') + delta)
+
+    @classmethod
+    def rebuild(cls, course_id):
+        """
+        Replaces the counts for the course with ones computed from its StudentModule rows.
+
+        Changes to StudentModule rows of the course made while the counts are
+        being rebuilt may be missed.
+        """
+        with transaction.atomic():
+            cls.objects.filter(course_id=course_id).delete()
+            cls.objects.bulk_create(cls._counted_rows(course_id))
+
+    @classmethod
+    def _counted_rows(cls, course_id):
+        """
+        Returns unsaved instances holding the counts for the course, computed from its StudentModule rows.
+        """
+        raise NotImplementedError
+
+
+class ProblemGradeCount(AggregateCount):
+    """
+    Number of learners with each grade out of each max grade on a problem.
+
+    Only StudentModule rows of problems with a grade are counted.
+    """
+    # MySQL doesn't consider NULLs equal in unique keys, so a missing max
+    # grade is stored as this instead.
+    NO_MAX_GRADE = -1.0
+
+    grade = models.FloatField()
+    max_grade = models.FloatField()
+
+    class Meta(object):
+        app_label = 'class_dashboard'
+        unique_together = (('course_id', 'module_state_key', 'grade', 'max_grade'),)
+
+    @classmethod
+    def adjust_grade(cls, delta, course_id, module_state_key, grade, max_grade):
+        """
+        Adds `delta` to the number of learners with `grade` out of `max_grade` on the problem.
+        """
+        cls.adjust(
+            delta,
+            course_id=course_id,
+            module_state_key=module_state_key,
+            grade=grade,
+            max_grade=cls.NO_MAX_GRADE if max_grade is None else max_grade,
+        )
+
+    @classmethod
+    def grade_counts(cls, course_id, **filters):
+        """
+        Yields a dict for each grade out of each max grade on the problems
+        of the course, with the 'module_state_key', 'grade', 'max_grade' and
+        'count_grade' of the learners with it, ordered by problem and grade.
+
+        `filters` are further lookups to filter the counts with.
+        """
+        rows = cls.objects.filter(
+            course_id__exact=course_id,
+            count__gt=0,
+            **filters
+        ).values(
+            'module_state_key',
+            'grade',
+            'max_grade',
+        ).annotate(count_grade=Sum('count')).order_by('module_state_key', 'grade')
+        for row in rows:
+            if row['max_grade'] == cls.NO_MAX_GRADE:
+                row['max_grade'] = None
+            yield row
+
+    @classmethod
+    def _counted_rows(cls, course_id):
+        rows = StudentModule.objects.filter(
+            course_id__exact=course_id,
+            grade__isnull=False,
+            module_type__exact='problem',
+        ).values('module_state_key', 'grade', 'max_grade').annotate(count_grade=Count('grade'))
+        return [
+            cls(
+                course_id=course_id,
+                module_state_key=row['module_state_key'],
+                grade=row['grade'],
+                max_grade=cls.NO_MAX_GRADE if row['max_grade'] is None else row['max_grade'],
+                count=row['count_grade'],
+            )
+            for row in rows
+        ]
+
+
+class SequentialOpenCount(AggregateCount):
+    """
+    Number of learners that opened a subsection.
+    """
+    class Meta(object):
+        app_label = 'class_dashboard'
+        unique_together = (('course_id', 'module_state_key'),)
+
+    @classmethod
+    def _counted_rows(cls, course_id):
+        rows = StudentModule.objects.filter(
+            course_id__exact=course_id,
+            module_type__exact='sequential',
+        ).values('module_state_key').annotate(count_sequential=Count('module_state_key'))
+        return [
+            cls(course_id=course_id, module_state_key=row['module_state_key'], count=row['count_sequential'])
+            for row in rows
+        ]
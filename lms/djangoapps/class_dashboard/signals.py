@@ -0,0 +1,83 @@
+"""
+Signal handlers that keep the class dashboard aggregates up to date with StudentModule rows.
+"""
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from class_dashboard.models import ProblemGradeCount, SequentialOpenCount, aggregates_enabled
+from courseware.models import StudentModule
+
+
+def _grade_key(student_module):
+    """
+    Returns the (grade, max_grade) the StudentModule row is counted under, or
+    None if it isn't counted in the problem grade distribution.
+    """
+    if student_module.module_type == 'problem' and student_module.grade is not None:
+        return student_module.grade, student_module.max_grade
+    return None
+
+
+def _adjust_grade_count(student_module, grade_key, delta):
+    """
+    Adds `delta` to the number of learners with the grade of `grade_key` on the StudentModule's problem.
+    """
+    grade, max_grade = grade_key
+    ProblemGradeCount.adjust_grade(
+        delta,
+        course_id=student_module.course_id,
+        module_state_key=student_module.module_state_key,
+        grade=grade,
+        max_grade=max_grade,
+    )
+
+
+@receiver(post_init, sender=StudentModule)
+def _remember_grade_key(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Remembers the grade the StudentModule row is counted under when it is loaded.
+    """
+    if aggregates_enabled():
+        instance._class_dashboard_grade_key = _grade_key(instance)  # pylint: disable=protected-access
+
+
+@receiver(post_save, sender=StudentModule)
+def _count_saved_student_module(sender, instance, created, raw=False, **kwargs):  # pylint: disable=unused-argument
+    """
+    Counts a newly opened subsection, and moves the count of a problem's
+    grade when the grade of its StudentModule row changes.
+    """
+    if raw or not aggregates_enabled():
+        return
+
+    if created and instance.module_type == 'sequential':
+        SequentialOpenCount.adjust(
+            1, course_id=instance.course_id, module_state_key=instance.module_state_key
+        )
+
+    previous_key = None if created else getattr(instance, '_class_dashboard_grade_key', None)
+    current_key = _grade_key(instance)
+    if previous_key != current_key:
+        if previous_key is not None:
+            _adjust_grade_count(instance, previous_key, -1)
+        if current_key is not None:
+            _adjust_grade_count(instance, current_key, 1)
+    instance._class_dashboard_grade_key = current_key  # pylint: disable=protected-access
+
+
+@receiver(post_delete, sender=StudentModule)
+def _uncount_deleted_student_module(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Removes a deleted StudentModule row from the counts.
+    """
+    if not aggregates_enabled():
+        return
+
+    if instance.module_type == 'sequential':
+        SequentialOpenCount.adjust(
+            -1, course_id=instance.course_id, module_state_key=instance.module_state_key
+        )
+
+    grade_key = getattr(instance, '_class_dashboard_grade_key', _grade_key(instance))
+    if grade_key is not None:
+        _adjust_grade_count(instance, grade_key, -1)
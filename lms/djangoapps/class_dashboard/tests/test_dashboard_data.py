@@ -4,17 +4,23 @@ Tests for class dashboard (Metrics tab in instructor dashboard)
 
 import json
 
+from django.conf import settings
+from django.core.management import call_command
 from django.core.urlresolvers import reverse
 from django.test.client import RequestFactory
+from django.test.utils import override_settings
 from mock import patch
 from nose.plugins.attrib import attr
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
 from capa.tests.response_xml_factory import StringResponseXMLFactory
+from courseware.models import StudentModule
 from courseware.tests.factories import StudentModuleFactory
 from student.tests.factories import UserFactory, CourseEnrollmentFactory, AdminFactory
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 
+from class_dashboard import dashboard_data
 from class_dashboard.dashboard_data import (
     get_problem_grade_distribution, get_sequential_open_distrib,
     get_problem_set_grade_distrib, get_d3_problem_grade_distrib,
@@ -22,6 +28,7 @@ from class_dashboard.dashboard_data import (
     get_section_display_name, get_array_section_has_problem,
     get_students_opened_subsection, get_students_problem_grades,
 )
+from class_dashboard.models import ProblemGradeCount, SequentialOpenCount
 from class_dashboard.views import has_instructor_access_for_class
 
 USER_COUNT = 11
@@ -323,3 +330,87 @@ class TestGetProblemGradeDistribution(SharedModuleStoreTestCase):
         """
         ret_val = bool(has_instructor_access_for_class(self.instructor, self.course.id))
         self.assertEquals(ret_val, True)
+
+
+@attr('shard_1')
+class TestGetProblemGradeDistributionAggregates(TestGetProblemGradeDistribution):
+    """
+    Runs the class_dashboard/dashboard_data.py tests on the counts kept up to date as student state changes.
+    """
+    def setUp(self):
+        patcher = patch.dict(settings.FEATURES, {'ENABLE_CLASS_DASHBOARD_AGGREGATES': True})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super(TestGetProblemGradeDistributionAggregates, self).setUp()
+
+    def get_item_grade_distrib(self):
+        """
+        Returns the grade distribution of the last problem.
+        """
+        return get_problem_set_grade_distrib(self.course.id, [self.item.location])[self.item.location]['grade_distrib']
+
+    def test_counts_follow_grade_changes(self):
+        self.assertEquals([(0, USER_COUNT - 1), (1, 1)], self.get_item_grade_distrib())
+
+        student_module = StudentModule.objects.get(student=self.users[0], module_state_key=self.item.location)
+        student_module.grade = 1
+        student_module.max_grade = 1
+        student_module.save()
+        self.assertEquals([(0, USER_COUNT - 2), (1, 2)], self.get_item_grade_distrib())
+
+        # Saving state without changing the grade leaves the counts as they are
+        student_module = StudentModule.objects.get(pk=student_module.pk)
+        student_module.state = json.dumps({'attempts': self.attempts + 1})
+        student_module.save()
+        self.assertEquals([(0, USER_COUNT - 2), (1, 2)], self.get_item_grade_distrib())
+
+        student_module.delete()
+        self.assertEquals([(0, USER_COUNT - 2), (1, 1)], self.get_item_grade_distrib())
+
+    def test_counts_keyed_by_course_and_missing_max_grade(self):
+        # Old Mongo usage keys don't include the run, so runs of a course share them
+        usage_key = self.course.id.make_usage_key('problem', 'no_max_grade')
+        other_course_id = SlashSeparatedCourseKey(self.course.id.org, self.course.id.course, 'other_run')
+        for course_id in (self.course.id, self.course.id, other_course_id):
+            StudentModuleFactory.create(course_id=course_id, module_state_key=usage_key, grade=1, max_grade=None)
+
+        # Each course has a single row for the missing max grade
+        self.assertEquals(2, ProblemGradeCount.objects.get(course_id=self.course.id, module_state_key=usage_key).count)
+        self.assertEquals(1, ProblemGradeCount.objects.get(course_id=other_course_id, module_state_key=usage_key).count)
+
+        prob_grade_distrib, total_student_count = get_problem_grade_distribution(self.course.id)
+        self.assertEquals({'max_grade': None, 'grade_distrib': [(1, 2)]}, prob_grade_distrib[usage_key])
+        self.assertEquals(2, total_student_count[usage_key])
+
+    def test_counts_follow_opened_subsections(self):
+        StudentModuleFactory.create(
+            course_id=self.course.id,
+            module_type='sequential',
+            module_state_key=self.sub_section.location,
+        )
+        self.assertEquals(1, get_sequential_open_distrib(self.course.id)[self.sub_section.location])
+
+        StudentModule.objects.filter(module_state_key=self.sub_section.location).delete()
+        self.assertNotIn(self.sub_section.location, get_sequential_open_distrib(self.course.id))
+
+    def test_rebuild_counts(self):
+        prob_grade_distrib = get_problem_grade_distribution(self.course.id)
+        sequential_open_distrib = get_sequential_open_distrib(self.course.id)
+
+        ProblemGradeCount.objects.all().delete()
+        SequentialOpenCount.objects.all().delete()
+        self.assertEquals(({}, {}), get_problem_grade_distribution(self.course.id))
+
+        call_command('rebuild_class_dashboard_counts', unicode(self.course.id))
+        self.assertEquals(prob_grade_distrib, get_problem_grade_distribution(self.course.id))
+        self.assertEquals(sequential_open_distrib, get_sequential_open_distrib(self.course.id))
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_course_layout_cached(self):
+        layout = dashboard_data.get_course_layout(self.course.id)
+        with patch('class_dashboard.dashboard_data._build_course_layout') as build_course_layout:
+            self.assertEquals(layout, dashboard_data.get_course_layout(self.course.id))
+            self.assertEquals(
+                [u"test factory section omega \u03a9"], get_section_display_name(self.course.id)
+            )
+        self.assertFalse(build_course_layout.called)
@@ -23,6 +23,7 @@ class BlocksAPITransformer(BlockStructureTransformer):
     """
 
     VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
     STUDENT_VIEW_DATA = 'student_view_data'
     STUDENT_VIEW_MULTI_DEVICE = 'student_view_multi_device'
 
@@ -53,6 +54,21 @@ class BlocksAPITransformer(BlockStructureTransformer):
 
         # TODO support olx_data by calling export_to_xml(?)
 
+    @classmethod
+    def collect_incremental(cls, block_structure, changed_block_keys):
+        """
+        Re-collects the data of the containing transformers for only
+        the changed blocks.
+        """
+        # collect basic xblock fields
+        block_structure.request_xblock_fields('graded', 'format', 'display_name', 'category')
+
+        # collect data from containing transformers
+        StudentViewTransformer.collect_incremental(block_structure, changed_block_keys)
+        BlockCountsTransformer.collect(block_structure)
+        BlockDepthTransformer.collect(block_structure)
+        BlockNavigationTransformer.collect(block_structure)
+
     def transform(self, usage_info, block_structure):
         """
         Mutates block_structure based on the given usage_info.
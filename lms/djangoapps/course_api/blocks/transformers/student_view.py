@@ -9,6 +9,7 @@ class StudentViewTransformer(BlockStructureTransformer):
     Only show information that is appropriate for a learner
     """
     VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
     STUDENT_VIEW_DATA = 'student_view_data'
     STUDENT_VIEW_MULTI_DEVICE = 'student_view_multi_device'
 
@@ -26,8 +27,23 @@ class StudentViewTransformer(BlockStructureTransformer):
         """
         # collect basic xblock fields
         block_structure.request_xblock_fields('category')
+        cls._collect_student_view_values(block_structure, block_structure.topological_traversal())
 
-        for block_key in block_structure.topological_traversal():
+    @classmethod
+    def collect_incremental(cls, block_structure, changed_block_keys):
+        """
+        Collect student_view_multi_device and student_view_data values for only the changed blocks
+        """
+        # collect basic xblock fields
+        block_structure.request_xblock_fields('category')
+        cls._collect_student_view_values(block_structure, changed_block_keys)
+
+    @classmethod
+    def _collect_student_view_values(cls, block_structure, block_keys):
+        """
+        Collect student_view_multi_device and student_view_data values for the given blocks
+        """
+        for block_key in block_keys:
             block = block_structure.get_xblock(block_key)
 
             # We're iterating through descriptors (not bound to a user) that are
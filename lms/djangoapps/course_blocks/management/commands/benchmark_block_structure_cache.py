@@ -0,0 +1,165 @@
+"""
+Command to benchmark the serialization of block structures to the cache.
+"""
+# pylint: disable=protected-access
+from datetime import datetime
+import logging
+import timeit
+
+from django.core.management.base import BaseCommand
+from opaque_keys.edx.locator import CourseLocator
+from pytz import UTC
+
+from openedx.core.lib.block_structure import serialization
+from openedx.core.lib.block_structure.block_structure import BlockStructureModulestoreData
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+
+
+log = logging.getLogger(__name__)
+
+
+# Block types of each level of the generated course, from the top.
+LEVEL_BLOCK_TYPES = ['course', 'chapter', 'sequential', 'vertical', 'problem']
+
+
+class Command(BaseCommand):
+    """
+    Compares the size, encode time and decode time of the block
+    structure serialization format against the legacy zpickle format,
+    for a generated course.
+
+    Example usage:
+        $ ./manage.py lms benchmark_block_structure_cache --settings=devstack
+        $ ./manage.py lms benchmark_block_structure_cache --blocks 50000 --repeat 5 --settings=devstack
+    """
+    help = 'Benchmarks the serialization of block structures to the cache.'
+
+    def add_arguments(self, parser):
+        """
+        Entry point for subclassed commands to add custom arguments.
+        """
+        parser.add_argument(
+            '--blocks',
+            help='Approximate number of blocks in the generated course.',
+            type=int,
+            default=10000,
+        )
+        parser.add_argument(
+            '--repeat',
+            help='Number of times to repeat each measurement.',
+            type=int,
+            default=3,
+        )
+        parser.add_argument(
+            '--transformers',
+            help='Number of mock transformers with collected block data.',
+            type=int,
+            default=8,
+        )
+
+    def handle(self, *args, **options):
+        block_structure = generate_block_structure(options['blocks'], options['transformers'])
+        root_key = block_structure.root_block_usage_key
+        repeat = options['repeat']
+
+        def zpickle_encode():
+            """
+            Encodes the block structure using the legacy format.
+            """
+            return zpickle((
+                block_structure._block_relations,
+                block_structure._transformer_data,
+                block_structure._block_data_map,
+            ))
+
+        def serialization_encode():
+            """
+            Encodes the block structure using the serialization format.
+            """
+            return serialization.serialize(block_structure)
+
+        zpickled = zpickle_encode()
+        serialized = serialization_encode()
+
+        def serialization_decode_one():
+            """
+            Decodes the block structure along with the block data of a
+            single transformer, as needed by a typical request.
+            """
+            decoded = serialization.deserialize(root_key, serialized)
+            decoded._decode_segment(serialization.TRANSFORMER_SEGMENT_PREFIX + 'transformer_0')
+            return decoded
+
+        def serialization_decode_all():
+            """
+            Decodes the block structure along with all of its block data.
+            """
+            decoded = serialization.deserialize(root_key, serialized)
+            decoded._decode_all_segments()
+            return decoded
+
+        results = [
+            ('zpickle', len(zpickled), zpickle_encode, lambda: zunpickle(zpickled)),
+            ('sections (1 transformer)', len(serialized), serialization_encode, serialization_decode_one),
+            ('sections (all data)', len(serialized), serialization_encode, serialization_decode_all),
+        ]
+
+        self.stdout.write('Blocks: {}, transformers: {}'.format(
+            len(list(block_structure.get_block_keys())), options['transformers'],
+        ))
+        self.stdout.write('{:<26} {:>12} {:>12} {:>12}'.format('format', 'bytes', 'encode ms', 'decode ms'))
+        for name, size, encode, decode in results:
+            self.stdout.write('{:<26} {:>12} {:>12.1f} {:>12.1f}'.format(
+                name, size, _best_time_in_ms(encode, repeat), _best_time_in_ms(decode, repeat),
+            ))
+
+
+def generate_block_structure(num_blocks, num_transformers):
+    """
+    Returns a collected block structure for a generated course with
+    approximately num_blocks blocks, with mock collected data for the
+    given number of transformers.
+    """
+    course_key = CourseLocator('edX', 'Benchmark', 'Course')
+    root_key = course_key.make_usage_key('course', 'course')
+    block_structure = BlockStructureModulestoreData(root_key)
+
+    # Use a fixed branching factor per level that yields roughly the
+    # requested number of leaf blocks.
+    branching_factor = max(2, int(round(num_blocks ** (1.0 / (len(LEVEL_BLOCK_TYPES) - 1)))))
+    parents = [root_key]
+    for block_type in LEVEL_BLOCK_TYPES[1:]:
+        children = []
+        for parent_key in parents:
+            for _ in range(branching_factor):
+                child_key = course_key.make_usage_key(block_type, 'block_{}'.format(len(children)))
+                block_structure._add_relation(parent_key, child_key)
+                children.append(child_key)
+        parents = children
+
+    start = datetime(2016, 1, 1, tzinfo=UTC)
+    for block_key in block_structure.get_block_keys():
+        xblock_fields = block_structure._block_data_map[block_key].xblock_fields
+        xblock_fields['display_name'] = u'Block {}'.format(block_key.block_id)
+        xblock_fields['category'] = block_key.block_type
+        xblock_fields['start'] = start
+        xblock_fields['graded'] = block_key.block_type == 'problem'
+        xblock_fields['format'] = None
+
+    for transformer_index in range(num_transformers):
+        transformer_name = 'transformer_{}'.format(transformer_index)
+        block_structure._transformer_data[transformer_name]['_version'] = 1
+        for block_key in block_structure.get_block_keys():
+            block_structure._block_data_map[block_key].transformer_data[transformer_name] = {
+                'merged_start_date': start,
+                'merged_visible_to_staff_only': False,
+            }
+    return block_structure
+
+
+def _best_time_in_ms(func, repeat):
+    """
+    Returns the best time of the given number of calls to func, in
+    milliseconds.
+    """
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
@@ -25,6 +25,7 @@ class StartDateTransformer(BlockStructureTransformer):
     Staff users are exempted from visibility rules.
     """
     VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
     MERGED_START_DATE = 'merged_start_date'
 
     @classmethod
@@ -52,8 +53,29 @@ class StartDateTransformer(BlockStructureTransformer):
         transformer's transform method.
         """
         block_structure.request_xblock_fields('days_early_for_beta')
+        cls._collect_merged_start_dates(block_structure, block_structure.topological_traversal())
 
-        for block_key in block_structure.topological_traversal():
+    @classmethod
+    def collect_incremental(cls, block_structure, changed_block_keys):
+        """
+        Re-collects the merged start dates of only the changed blocks.
+        """
+        block_structure.request_xblock_fields('days_early_for_beta')
+        cls._collect_merged_start_dates(
+            block_structure,
+            block_structure.topological_traversal(
+                filter_func=lambda block_key: block_key in changed_block_keys,
+                yield_descendants_of_unyielded=True,
+            ),
+        )
+
+    @classmethod
+    def _collect_merged_start_dates(cls, block_structure, block_keys):
+        """
+        Computes and stores the merged start date of each of the given
+        blocks, which must be in topological order.
+        """
+        for block_key in block_keys:
 
             # compute merged value of start date from all parents
             parents = block_structure.get_parents(block_key)
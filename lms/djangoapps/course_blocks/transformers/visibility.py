@@ -18,6 +18,7 @@ class VisibilityTransformer(BlockStructureTransformer):
     Staff users are exempted from visibility rules.
     """
     VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
 
     MERGED_VISIBLE_TO_STAFF_ONLY = 'merged_visible_to_staff_only'
 
@@ -46,7 +47,29 @@ class VisibilityTransformer(BlockStructureTransformer):
         Collects any information that's necessary to execute this
         transformer's transform method.
         """
-        for block_key in block_structure.topological_traversal():
+        cls._collect_merged_visible_to_staff_only(block_structure, block_structure.topological_traversal())
+
+    @classmethod
+    def collect_incremental(cls, block_structure, changed_block_keys):
+        """
+        Re-collects the merged visible_to_staff_only values of only the
+        changed blocks.
+        """
+        cls._collect_merged_visible_to_staff_only(
+            block_structure,
+            block_structure.topological_traversal(
+                filter_func=lambda block_key: block_key in changed_block_keys,
+                yield_descendants_of_unyielded=True,
+            ),
+        )
+
+    @classmethod
+    def _collect_merged_visible_to_staff_only(cls, block_structure, block_keys):
+        """
+        Computes and stores the merged visible_to_staff_only value of
+        each of the given blocks, which must be in topological order.
+        """
+        for block_key in block_keys:
 
             # compute merged value of visible_to_staff_only from all parents
             parents = block_structure.get_parents(block_key)
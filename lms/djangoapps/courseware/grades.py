@@ -6,13 +6,16 @@ import logging
 import random
 from collections import defaultdict
 from functools import partial
+from itertools import chain, islice, izip
+from multiprocessing import Pool
 
 import dogstats_wrapper as dog_stats_api
 from django.conf import settings
 from django.core.cache import cache
+from django.db import connections
 from django.test.client import RequestFactory
 from opaque_keys import InvalidKeyError
-from opaque_keys.edx.keys import CourseKey
+from opaque_keys.edx.keys import CourseKey, UsageKey
 from opaque_keys.edx.locator import BlockUsageLocator
 
 from openedx.core.lib.gating import api as gating_api
@@ -20,14 +23,14 @@ from courseware import courses
 from courseware.access import has_access
 from courseware.model_data import FieldDataCache, ScoresClient
 from openedx.core.djangoapps.signals.signals import GRADES_UPDATED
+from openedx.core.lib.spilling_counter import DEFAULT_MAX_KEYS, SpillingCounter
 from student.models import anonymous_id_for_user
 from util.db import outer_atomic
 from util.module_utils import yield_dynamic_descriptor_descendants
 from xmodule import graders
 from xmodule.graders import Score
 from xmodule.modulestore.django import modulestore
-from xmodule.modulestore.exceptions import ItemNotFoundError
-from .models import StudentModule
+from .models import StudentModule, chunks
 from .module_render import get_module_for_descriptor
 
 log = logging.getLogger("edx.courseware")
@@ -230,69 +233,136 @@ def answer_distributions(course_key):
     generate the report.
 
     This method will try to use a read-replica database if one is available.
+
+    The whole distribution is held in memory; use iter_answer_distributions
+    to go through the distribution of a large course.
     """
-    # dict: { module.module_state_key : (url_name, display_name) }
-    state_keys_to_problem_info = {}  # For caching, used by url_and_display_name
+    answer_counts = defaultdict(lambda: defaultdict(int))
+    for url, display_name, problem_part_id, answer, count in iter_answer_distributions(course_key):
+        answer_counts[(url, display_name, problem_part_id)][answer] = count
+    return answer_counts
 
-    def url_and_display_name(usage_key):
-        """
-        For a given usage_key, return the problem's url and display_name.
-        Handle modulestore access and caching. This method ignores permissions.
 
-        Raises:
-            InvalidKeyError: if the usage_key does not parse
-            ItemNotFoundError: if there is no content that corresponds
-                to this usage_key.
+def iter_answer_distributions(course_key, batch_size=1000, max_answers=DEFAULT_MAX_KEYS, processes=None):
+    """
+    Yields a (problem url_name, problem display_name, problem_id, answer, count)
+    tuple for each answer given to each problem part of the course, counted
+    as described in answer_distributions, in sorted order.
+
+    Memory use is bounded, regardless of the size of the course:
+
+    - The submitted problems are read `batch_size` at a time.
+    - The url_name and display_name of all of the course's problems are
+      looked up from the modulestore at once, up front.
+    - The counts of at most `max_answers` different answers are held in
+      memory; beyond that, they are spilled to temporary files.
+
+    If `processes` is given, the state of each batch of submitted problems is
+    decoded by a pool of that many processes.
+    """
+    problem_info = {
+        (problem.location.block_type, problem.location.block_id): (
+            problem.url_name, problem.display_name_with_default_escaped
+        )
+        for problem in modulestore().get_items(course_key, qualifiers={'category': 'problem'})
+    }
+    # dict: { module_state_key string : (url_name, display_name) or None if there is no such problem }
+    state_keys_to_problem_info = {}
+
+    def url_and_display_name(module_state_key):
+        """
+        For a module_state_key as stored in the database, return the problem's
+        url and display_name, or None if the problem can't be found.
         """
-        problem_store = modulestore()
-        if usage_key not in state_keys_to_problem_info:
-            problem = problem_store.get_item(usage_key)
-            problem_info = (problem.url_name, problem.display_name_with_default_escaped)
-            state_keys_to_problem_info[usage_key] = problem_info
+        if module_state_key not in state_keys_to_problem_info:
+            try:
+                usage_key = UsageKey.from_string(module_state_key)
+                info = problem_info.get((usage_key.block_type, usage_key.block_id))
+            except InvalidKeyError:
+                info = None
+            state_keys_to_problem_info[module_state_key] = info
+
+        return state_keys_to_problem_info[module_state_key]
+
+    pool = None
+    if processes:
+        # The forked processes must not share the database connections of
+        # this one, so close them; they are reopened as needed.  Connections
+        # can't be closed in the middle of a transaction, though.
+        if not any(connection.in_atomic_block for connection in connections.all()):
+            connections.close_all()
+        pool = Pool(processes)
+    try:
+        with SpillingCounter(max_keys=max_answers) as answer_counts:
+            for batch in StudentModule.submitted_problem_states_read_only(course_key, batch_size=batch_size):
+                states = [state for __, __, __, state in batch]
+                if pool:
+                    answers = list(chain.from_iterable(
+                        pool.map(_decode_student_answers, chunks(states, len(states) // processes + 1))
+                    ))
+                else:
+                    answers = _decode_student_answers(states)
+
+                for (module_id, student_id, module_state_key, __), raw_answers in izip(batch, answers):
+                    if raw_answers is None:
+                        log.error(
+                            u"Answer Distribution: Could not parse module state for StudentModule id=%s, course=%s",
+                            module_id,
+                            course_key,
+                        )
+                        continue
 
-        return state_keys_to_problem_info[usage_key]
+                    info = url_and_display_name(module_state_key)
+                    if info is None:
+                        msg = (
+                            "Answer Distribution: Item {} referenced in StudentModule {} " +
+                            "for user {} in course {} not found; " +
+                            "This can happen if a student answered a question that " +
+                            "was later deleted from the course. This answer will be " +
+                            "omitted from the answer distribution CSV."
+                        ).format(
+                            module_state_key, module_id, student_id, course_key
+                        )
+                        log.warning(msg)
+                        continue
 
-    # Iterate through all problems submitted for this course in no particular
-    # order, and build up our answer_counts dict that we will eventually return
-    answer_counts = defaultdict(lambda: defaultdict(int))
-    for module in StudentModule.all_submitted_problems_read_only(course_key):
+                    # Each problem part has an ID that is derived from the
+                    # module.module_state_key (with some suffix appended)
+                    for problem_part_id, answer in raw_answers.iteritems():
+                        answer_counts.add(info + (problem_part_id, answer))
+
+            for answer_key, count in answer_counts.iteritems():
+                yield answer_key + (count,)
+    finally:
+        if pool:
+            pool.terminate()
+
+
+def _decode_student_answers(states):
+    """
+    Returns, for each of the given StudentModule states, the student's
+    answers as a dict of problem part id -> answer, or None if the state
+    can't be parsed.
+
+    Convert whatever raw answers we have (numbers, unicode, None, etc.) to be
+    unicode values. Note that if we get a string, it's always unicode and not
+    str -- state comes from the json decoder, and that always returns unicode
+    for strings.
+
+    This is module-level so that it can be run by a process pool.
+    """
+    answers = []
+    for state in states:
         try:
-            state_dict = json.loads(module.state) if module.state else {}
+            state_dict = json.loads(state) if state else {}
             raw_answers = state_dict.get("student_answers", {})
         except ValueError:
-            log.error(
-                u"Answer Distribution: Could not parse module state for StudentModule id=%s, course=%s",
-                module.id,
-                course_key,
-            )
+            answers.append(None)
             continue
-
-        try:
-            url, display_name = url_and_display_name(module.module_state_key.map_into_course(course_key))
-            # Each problem part has an ID that is derived from the
-            # module.module_state_key (with some suffix appended)
-            for problem_part_id, raw_answer in raw_answers.items():
-                # Convert whatever raw answers we have (numbers, unicode, None, etc.)
-                # to be unicode values. Note that if we get a string, it's always
-                # unicode and not str -- state comes from the json decoder, and that
-                # always returns unicode for strings.
-                answer = unicode(raw_answer)
-                answer_counts[(url, display_name, problem_part_id)][answer] += 1
-
-        except (ItemNotFoundError, InvalidKeyError):
-            msg = (
-                "Answer Distribution: Item {} referenced in StudentModule {} " +
-                "for user {} in course {} not found; " +
-                "This can happen if a student answered a question that " +
-                "was later deleted from the course. This answer will be " +
-                "omitted from the answer distribution CSV."
-            ).format(
-                module.module_state_key, module.id, module.student_id, course_key
-            )
-            log.warning(msg)
-            continue
-
-    return answer_counts
+        answers.append({
+            problem_part_id: unicode(raw_answer) for problem_part_id, raw_answer in raw_answers.items()
+        })
+    return answers
 
 
 def grade(student, request, course, keep_raw_scores=False, field_data_cache=None, scores_client=None):
@@ -302,6 +372,14 @@ def grade(student, request, course, keep_raw_scores=False, field_data_cache=None
     Also sends a signal to update the minimum grade requirement status.
     """
     grade_summary = _grade(student, request, course, keep_raw_scores, field_data_cache, scores_client)
+    _send_grades_updated(student, course, grade_summary)
+    return grade_summary
+
+
+def _send_grades_updated(student, course, grade_summary):
+    """
+    Sends the GRADES_UPDATED signal for the given grade summary of the student.
+    """
     responses = GRADES_UPDATED.send_robust(
         sender=None,
         username=student.username,
@@ -313,8 +391,6 @@ def grade(student, request, course, keep_raw_scores=False, field_data_cache=None
     for receiver, response in responses:
         log.info('Signal fired when student grade is calculated. Receiver: %s. Response: %s', receiver, response)
 
-    return grade_summary
-
 
 def _grade(student, request, course, keep_raw_scores, field_data_cache, scores_client):
     """
@@ -433,26 +509,7 @@ def _grade(student, request, course, keep_raw_scores, field_data_cache, scores_c
                         if correct is None and total is None:
                             continue
 
-                        if settings.GENERATE_PROFILE_SCORES:    # for debugging!
-                            if total > 1:
-                                correct = random.randrange(max(total - 2, 1), total + 1)
-                            else:
-                                correct = total
-
-                        graded = module_descriptor.graded
-                        if not total > 0:
-                            # We simply cannot grade a problem that is 12/0, because we might need it as a percentage
-                            graded = False
-
-                        scores.append(
-                            Score(
-                                correct,
-                                total,
-                                graded,
-                                module_descriptor.display_name_with_default_escaped,
-                                module_descriptor.location
-                            )
-                        )
+                        scores.append(_create_score(correct, total, module_descriptor))
 
                     __, graded_total = graders.aggregate_scores(scores, section_name)
                     if keep_raw_scores:
@@ -460,39 +517,79 @@ def _grade(student, request, course, keep_raw_scores, field_data_cache, scores_c
                 else:
                     graded_total = Score(0.0, 1.0, True, section_name, None)
 
-                #Add the graded total to totaled_scores
-                if graded_total.possible > 0:
-                    format_scores.append(graded_total)
-                else:
-                    log.info(
-                        "Unable to grade a section with a total possible score of zero. " +
-                        str(section_descriptor.location)
-                    )
+                _add_graded_total(format_scores, graded_total, section_descriptor)
 
         totaled_scores[section_format] = format_scores
 
     with outer_atomic():
-        # Grading policy might be overriden by a CCX, need to reset it
-        course.set_grading_policy(course.grading_policy)
-        grade_summary = course.grader.grade(totaled_scores, generate_random_scores=settings.GENERATE_PROFILE_SCORES)
-
-        # We round the grade here, to make sure that the grade is an whole percentage and
-        # doesn't get displayed differently than it gets grades
-        grade_summary['percent'] = round(grade_summary['percent'] * 100 + 0.05) / 100
-
-        letter_grade = grade_for_percentage(course.grade_cutoffs, grade_summary['percent'])
-        grade_summary['grade'] = letter_grade
-        grade_summary['totaled_scores'] = totaled_scores   # make this available, eg for instructor download & debugging
-        if keep_raw_scores:
-            # way to get all RAW scores out to instructor
-            # so grader can be double-checked
-            grade_summary['raw_scores'] = raw_scores
-
+        grade_summary = _summarize_grade(course, totaled_scores, raw_scores, keep_raw_scores)
         max_scores_cache.push_to_remote()
 
     return grade_summary
 
 
+def _create_score(correct, total, module_descriptor):
+    """
+    Returns the Score of the given module for the given (correct, total)
+    weighted score.
+    """
+    if settings.GENERATE_PROFILE_SCORES:    # for debugging!
+        if total > 1:
+            correct = random.randrange(max(total - 2, 1), total + 1)
+        else:
+            correct = total
+
+    graded = module_descriptor.graded
+    if not total > 0:
+        # We simply cannot grade a problem that is 12/0, because we might need it as a percentage
+        graded = False
+
+    return Score(
+        correct,
+        total,
+        graded,
+        module_descriptor.display_name_with_default_escaped,
+        module_descriptor.location
+    )
+
+
+def _add_graded_total(format_scores, graded_total, section_descriptor):
+    """
+    Adds the graded total of a section to the scores of its format, if it
+    can be graded.
+    """
+    if graded_total.possible > 0:
+        format_scores.append(graded_total)
+    else:
+        log.info(
+            "Unable to grade a section with a total possible score of zero. " +
+            str(section_descriptor.location)
+        )
+
+
+def _summarize_grade(course, totaled_scores, raw_scores, keep_raw_scores):
+    """
+    Returns the output of the course grader for the given totaled scores,
+    augmented with the final letter grade. See _grade for the format.
+    """
+    # Grading policy might be overriden by a CCX, need to reset it
+    course.set_grading_policy(course.grading_policy)
+    grade_summary = course.grader.grade(totaled_scores, generate_random_scores=settings.GENERATE_PROFILE_SCORES)
+
+    # We round the grade here, to make sure that the grade is an whole percentage and
+    # doesn't get displayed differently than it gets grades
+    grade_summary['percent'] = round(grade_summary['percent'] * 100 + 0.05) / 100
+
+    letter_grade = grade_for_percentage(course.grade_cutoffs, grade_summary['percent'])
+    grade_summary['grade'] = letter_grade
+    grade_summary['totaled_scores'] = totaled_scores   # make this available, eg for instructor download & debugging
+    if keep_raw_scores:
+        # way to get all RAW scores out to instructor
+        # so grader can be double-checked
+        grade_summary['raw_scores'] = raw_scores
+    return grade_summary
+
+
 def grade_for_percentage(grade_cutoffs, percentage):
     """
     Returns a letter grade as defined in grading_policy (e.g. 'A' 'B' 'C' for 6.002x) or None.
@@ -757,7 +854,7 @@ def get_score(user, problem_descriptor, module_creator, scores_client, submissio
     return weighted_score(correct, total, problem_descriptor.weight)
 
 
-def iterate_grades_for(course_or_id, students, keep_raw_scores=False):
+def iterate_grades_for(course_or_id, students, keep_raw_scores=False, batched=None):
     """Given a course_id and an iterable of students (User), yield a tuple of:
 
     (student, gradeset, err_msg) for every student enrolled in the course.
@@ -774,22 +871,77 @@ def iterate_grades_for(course_or_id, students, keep_raw_scores=False):
     - grade_breakdown : A breakdown of the major components that
         make up the final grade. (For display)
     - raw_scores: contains scores for every graded module
+
+    If batched is True, students are graded in batches of
+    settings.GRADES_BATCH_SIZE using a BatchGradingContext, whenever the
+    course supports it. If batched is None, the ENABLE_BATCHED_GRADING
+    feature flag decides.
     """
     if isinstance(course_or_id, (basestring, CourseKey)):
         course = courses.get_course_by_id(course_or_id)
     else:
         course = course_or_id
 
+    if batched is None:
+        batched = settings.FEATURES.get('ENABLE_BATCHED_GRADING', False)
+
+    if batched:
+        grading_context = BatchGradingContext(course)
+        if grading_context.supports_batching:
+            for result in _iterate_batched_grades_for(grading_context, students, keep_raw_scores):
+                yield result
+            return
+        log.info(
+            'Grading students of course %s one at a time, since the course does not support batched grading.',
+            course.id,
+        )
+
+    for result in _iterate_gradesets(course, students, partial(_grade_student, course, keep_raw_scores)):
+        yield result
+
+
+def _iterate_batched_grades_for(grading_context, students, keep_raw_scores):
+    """
+    Yields the (student, gradeset, err_msg) tuples of iterate_grades_for,
+    grading the students in batches with the given BatchGradingContext.
+
+    If the data of a batch cannot be loaded, the students of that batch are
+    graded one at a time instead.
+    """
+    course = grading_context.course
+    batch_size = getattr(settings, 'GRADES_BATCH_SIZE', 100)
+    students = iter(students)
+    while True:
+        students_batch = list(islice(students, batch_size))
+        if not students_batch:
+            break
+
+        try:
+            with dog_stats_api.timer('lms.grades.iterate_grades_for.load_batch', tags=[u'action:{}'.format(course.id)]):
+                grade_student = grading_context.load_batch(students_batch, keep_raw_scores)
+        except Exception:  # pylint: disable=broad-except
+            log.exception(
+                'Cannot load grading data for a batch of %d students in course %s; grading them one at a time.',
+                len(students_batch),
+                course.id,
+            )
+            grade_student = partial(_grade_student, course, keep_raw_scores)
+
+        for result in _iterate_gradesets(course, students_batch, grade_student):
+            yield result
+
+        grading_context.push_max_scores()
+
+
+def _iterate_gradesets(course, students, grade_student):
+    """
+    Yields the (student, gradeset, err_msg) tuples of iterate_grades_for,
+    using the given function to grade each student.
+    """
     for student in students:
         with dog_stats_api.timer('lms.grades.iterate_grades_for', tags=[u'action:{}'.format(course.id)]):
             try:
-                request = _get_mock_request(student)
-                # Grading calls problem rendering, which calls masquerading,
-                # which checks session vars -- thus the empty session dict below.
-                # It's not pretty, but untangling that is currently beyond the
-                # scope of this feature.
-                request.session = {}
-                gradeset = grade(student, request, course, keep_raw_scores)
+                gradeset = grade_student(student)
                 yield student, gradeset, ""
             except Exception as exc:  # pylint: disable=broad-except
                 # Keep marching on even if this student couldn't be graded for
@@ -804,6 +956,259 @@ def iterate_grades_for(course_or_id, students, keep_raw_scores=False):
                 yield student, {}, exc.message
 
 
+def _grade_student(course, keep_raw_scores, student):
+    """
+    Returns the grade of the given student, computed on its own.
+    """
+    request = _get_mock_request(student)
+    # Grading calls problem rendering, which calls masquerading,
+    # which checks session vars -- thus the empty session dict below.
+    # It's not pretty, but untangling that is currently beyond the
+    # scope of this feature.
+    request.session = {}
+    return grade(student, request, course, keep_raw_scores)
+
+
+class BatchGradingContext(object):
+    """
+    Grades many students of a course from data that is shared by, or loaded
+    in bulk for, all of them.
+
+    The graded sections, their descendants and the max scores of problems are
+    loaded once for the course. For each batch of students, their StudentModule
+    scores and their submissions API scores are fetched with a single query
+    each. Each student is then graded the same way as by grade(), but without
+    instantiating any XModules, except to find the max score of a problem that
+    is not in the MaxScoresCache yet. As with the MaxScoresCache, the max
+    score found for one student is used for all students who have not been
+    scored on that problem.
+
+    Courses with blocks whose children or scores can only be determined by
+    instantiating them for each student (e.g. randomized content, or blocks
+    that always recalculate their grades) do not support batching, and
+    should be graded with grade().
+    """
+    def __init__(self, course):
+        self.course = course
+        self.supports_batching = True
+
+        # List of (section_format, [_SectionGradingData]) tuples.
+        self._graded_sections = []
+        with modulestore().bulk_operations(course.id):
+            for section_format, sections in course.grading_context['graded_sections'].iteritems():
+                sections_data = []
+                for section in sections:
+                    section_data = _SectionGradingData(section)
+                    if not section_data.supports_batching:
+                        self.supports_batching = False
+                        return
+                    sections_data.append(section_data)
+                self._graded_sections.append((section_format, sections_data))
+
+            self._scorable_locations = _scorable_locations_for_grading(course)
+
+        self._max_scores_cache = MaxScoresCache.create_for_course(course)
+        self._max_scores_cache.fetch_from_remote(self._scorable_locations)
+
+    def load_batch(self, students, keep_raw_scores=False):
+        """
+        Fetches the scores of the given students and returns a function that
+        returns the grade of any of them, as grade() would.
+        """
+        with outer_atomic():
+            scores_clients = ScoresClient.create_for_users(
+                self.course.id, [student.id for student in students], self._scorable_locations
+            )
+            submissions_scores = _submissions_scores_for_students(self.course, students)
+
+        def grade_student(student):
+            """
+            Returns the grade of the given student of the batch.
+            """
+            grade_summary = self._grade(
+                student, scores_clients[student.id], submissions_scores[student.id], keep_raw_scores
+            )
+            _send_grades_updated(student, self.course, grade_summary)
+            return grade_summary
+        return grade_student
+
+    def push_max_scores(self):
+        """
+        Updates the remote MaxScoresCache with the max scores found so far.
+        """
+        self._max_scores_cache.push_to_remote()
+
+    def _grade(self, student, scores_client, submissions_scores, keep_raw_scores):
+        """
+        Returns the grade of the given student from the given preloaded
+        scores. See _grade for the format.
+        """
+        raw_scores = []
+        totaled_scores = {}
+        with outer_atomic():
+            for section_format, sections in self._graded_sections:
+                format_scores = []
+                for section in sections:
+                    if section.should_grade(scores_client, submissions_scores):
+                        scores = []
+                        for module_descriptor, location_url in section.descendants:
+                            if location_url not in submissions_scores and not module_descriptor.has_score:
+                                # get_score would not return a score for it
+                                continue
+                            course_key = module_descriptor.location.course_key
+                            if not has_access(student, 'load', module_descriptor, course_key):
+                                continue
+
+                            (correct, total) = self._get_score(
+                                student, module_descriptor, location_url, scores_client, submissions_scores
+                            )
+                            if correct is None and total is None:
+                                continue
+                            scores.append(_create_score(correct, total, module_descriptor))
+
+                        __, graded_total = graders.aggregate_scores(scores, section.name)
+                        if keep_raw_scores:
+                            raw_scores += scores
+                    else:
+                        graded_total = Score(0.0, 1.0, True, section.name, None)
+
+                    _add_graded_total(format_scores, graded_total, section.descriptor)
+
+                totaled_scores[section_format] = format_scores
+
+            return _summarize_grade(self.course, totaled_scores, raw_scores, keep_raw_scores)
+
+    def _get_score(self, student, problem_descriptor, location_url, scores_client, submissions_scores):
+        """
+        Returns the (correct, total) score of the student on the problem, as
+        get_score would.
+        """
+        if location_url in submissions_scores:
+            return submissions_scores[location_url]
+
+        score = scores_client.get(problem_descriptor.location)
+        if score and score.total is not None:
+            correct = score.correct if score.correct is not None else 0.0
+            total = score.total
+        else:
+            correct = 0.0
+            total = self._get_max_score(student, problem_descriptor)
+            if total is None:
+                return (None, None)
+
+        return weighted_score(correct, total, problem_descriptor.weight)
+
+    def _get_max_score(self, student, problem_descriptor):
+        """
+        Returns the max score of the problem, instantiating it for the given
+        student if it is not cached yet, or if the MaxScoresCache is disabled.
+        """
+        max_score = None
+        if settings.FEATURES.get("ENABLE_MAX_SCORE_CACHE"):
+            max_score = self._max_scores_cache.get(problem_descriptor.location)
+        if max_score is None:
+            field_data_cache = FieldDataCache([problem_descriptor], self.course.id, student)
+            request = _get_mock_request(student)
+            request.session = {}
+            problem = get_module_for_descriptor(
+                student, request, problem_descriptor, field_data_cache, self.course.id, course=self.course
+            )
+            if problem is None:
+                return None
+
+            # Problem may be an error module (if something in the problem builder failed)
+            # In which case max_score might be None
+            max_score = problem.max_score()
+            if max_score is not None:
+                self._max_scores_cache.set(problem_descriptor.location, max_score)
+        return max_score
+
+
+class _SectionGradingData(object):
+    """
+    The data of a graded section of a course that is shared by all students
+    graded with a BatchGradingContext.
+    """
+    def __init__(self, section):
+        """
+        Arguments:
+            section (dict): A graded section of the course's grading_context.
+        """
+        self.descriptor = section['section_descriptor']
+        self.name = self.descriptor.display_name_with_default_escaped
+        self.supports_batching = not any(
+            descriptor.always_recalculate_grades for descriptor in section['xmoduledescriptors']
+        )
+        self._scored_locations = [
+            (descriptor.location, descriptor.location.to_deprecated_string())
+            for descriptor in section['xmoduledescriptors']
+        ]
+
+        # List of (descriptor, location url) tuples of the descendants of the
+        # section, in the order in which _grade scores them.
+        self.descendants = []
+        for descriptor in yield_dynamic_descriptor_descendants(self.descriptor, None):
+            if descriptor.has_dynamic_children() or descriptor.always_recalculate_grades:
+                self.supports_batching = False
+                break
+            self.descendants.append((descriptor, descriptor.location.to_deprecated_string()))
+
+    def should_grade(self, scores_client, submissions_scores):
+        """
+        Returns whether a student with the given scores has interacted with
+        the section, so it must be graded. Otherwise, the student earned 0%.
+        """
+        return any(
+            location_url in submissions_scores or location in scores_client
+            for location, location_url in self._scored_locations
+        )
+
+
+def _scorable_locations_for_grading(course):
+    """
+    Returns the locations of all blocks of the course for which
+    field_data_cache_for_grading fetches scores.
+    """
+    locations = set()
+    block_types_affecting_grading = course.block_types_affecting_grading
+    stack = [course]
+    while stack:
+        descriptor = stack.pop()
+        if descriptor.has_score and descriptor_affects_grading(block_types_affecting_grading, descriptor):
+            locations.add(descriptor.location)
+        stack.extend(descriptor.get_children() + descriptor.get_required_module_descriptors())
+    return locations
+
+
+def _submissions_scores_for_students(course, students):
+    """
+    Returns a dict mapping the id of each of the given students to the dict of
+    location urls to (earned, possible) scores that the submissions API's
+    get_scores returns for the student, fetched with a single query.
+    """
+    # We need to import this here to avoid a circular dependency of the form:
+    # XBlock --> submissions --> Django Rest Framework error strings -->
+    # Django translation --> ... --> courseware --> submissions
+    from submissions.models import ScoreSummary  # installed from the edx-submissions repository
+
+    student_ids_by_anonymous_id = {
+        anonymous_id_for_user(student, course.id, save=False): student.id
+        for student in students
+    }
+    scores = {student.id: {} for student in students}
+    score_summaries = ScoreSummary.objects.filter(
+        student_item__course_id=course.id.to_deprecated_string(),
+        student_item__student_id__in=student_ids_by_anonymous_id.keys(),
+    ).select_related('latest', 'student_item')
+    for summary in score_summaries:
+        if not summary.latest.is_hidden():
+            student_scores = scores[student_ids_by_anonymous_id[summary.student_item.student_id]]
+            student_scores[summary.student_item.item_id] = (
+                summary.latest.points_earned, summary.latest.points_possible
+            )
+    return scores
+
+
 def _get_mock_request(student):
     """
     Make a fake request because grading code expects to be able to look at
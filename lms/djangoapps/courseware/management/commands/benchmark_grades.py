@@ -0,0 +1,83 @@
+"""
+Command to benchmark the grading of the enrolled students of a course.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from courseware.courses import get_course_by_id
+from courseware.grades import iterate_grades_for
+from student.models import CourseEnrollment
+
+
+class Command(BaseCommand):
+    """
+    Grades enrolled students of a course one at a time and in batches,
+    reporting the number of students graded per second by each, along
+    with the number of students whose grades differ between the two.
+
+    Example usage:
+        $ ./manage.py lms benchmark_grades course-v1:edX+DemoX+Demo_Course --settings=devstack
+        $ ./manage.py lms benchmark_grades course-v1:edX+DemoX+Demo_Course --students 1000 --settings=devstack
+    """
+    help = 'Benchmarks the grading of the enrolled students of a course.'
+
+    def add_arguments(self, parser):
+        """
+        Entry point for subclassed commands to add custom arguments.
+        """
+        parser.add_argument('course_id', help='ID of the course to grade.')
+        parser.add_argument(
+            '--students',
+            help='Maximum number of enrolled students to grade.',
+            type=int,
+            default=200,
+        )
+
+    def handle(self, *args, **options):
+        try:
+            course_key = CourseKey.from_string(options['course_id'])
+        except InvalidKeyError:
+            raise CommandError('Invalid course_id: {}'.format(options['course_id']))
+
+        course = get_course_by_id(course_key)
+        students = list(CourseEnrollment.objects.users_enrolled_in(course_key)[:options['students']])
+        if not students:
+            raise CommandError('No students are enrolled in {}.'.format(course_key))
+
+        gradesets_by_mode = {}
+        self.stdout.write('Students: {}'.format(len(students)))
+        self.stdout.write('{:<12} {:>12} {:>14} {:>8}'.format('mode', 'seconds', 'students/sec', 'errors'))
+        for mode, batched in [('one-by-one', False), ('batched', True)]:
+            start = time.time()
+            results = list(iterate_grades_for(course, students, keep_raw_scores=True, batched=batched))
+            duration = time.time() - start
+
+            gradesets_by_mode[mode] = {student.id: gradeset for student, gradeset, __ in results}
+            errors = sum(1 for __, __, err_msg in results if err_msg)
+            self.stdout.write('{:<12} {:>12.2f} {:>14.1f} {:>8}'.format(
+                mode, duration, len(students) / duration if duration else 0, errors,
+            ))
+
+        mismatches = [
+            student.id for student in students
+            if _comparable(gradesets_by_mode['one-by-one'][student.id]) !=
+            _comparable(gradesets_by_mode['batched'][student.id])
+        ]
+        self.stdout.write('Students with different grades: {}'.format(len(mismatches)))
+        if mismatches:
+            self.stdout.write('User ids: {}'.format(', '.join(str(user_id) for user_id in mismatches[:20])))
+
+
+def _comparable(gradeset):
+    """
+    Returns the parts of the given gradeset that grading computes
+    deterministically, for comparison.
+    """
+    return (
+        gradeset.get('percent'),
+        gradeset.get('grade'),
+        [(score.earned, score.possible, unicode(score.module_id)) for score in gradeset.get('raw_scores', [])],
+    )
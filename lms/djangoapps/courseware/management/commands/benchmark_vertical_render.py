@@ -0,0 +1,161 @@
+"""
+Command to benchmark the rendering of a vertical containing many HTML blocks.
+"""
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.urlresolvers import reverse
+from django.test import RequestFactory
+from opaque_keys.edx.keys import CourseKey
+
+from courseware.model_data import FieldDataCache
+from courseware.module_render import get_module_for_descriptor
+from request_cache.middleware import RequestCache
+from static_replace import (
+    clear_staticfiles_lookup_cache,
+    replace_all_urls,
+    replace_course_urls,
+    replace_jump_to_id_urls,
+    replace_static_urls,
+)
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+from xmodule.x_module import STUDENT_VIEW
+
+BENCHMARK_COURSE_KEY = CourseKey.from_string('course-v1:edX+VerticalRenderBenchmark+2016')
+
+HTML_BLOCK_DATA = u"""
+<p>Block {index}: see <a href="/course/info">the course info</a>,
+<a href="/jump_to_id/block_{next_index}">the next block</a>
+and <a href="/static/handouts/handout_{index}.pdf">the handout</a>.</p>
+<img src="/static/images/figure_{index}.png" alt="Figure {index}"/>
+<script type="text/javascript" src="/static/js/vendor/jquery.min.js"></script>
+"""
+
+
+def _three_pass(text, course_key, jump_to_id_base_url):
+    """
+    Rewrites the urls in text with a separate pass for each kind of url.
+    """
+    text = replace_static_urls(text, None, course_key)
+    text = replace_course_urls(text, course_key)
+    return replace_jump_to_id_urls(text, course_key, jump_to_id_base_url)
+
+
+def _single_pass(text, course_key, jump_to_id_base_url):
+    """
+    Rewrites the urls in text with a single pass over it.
+    """
+    return replace_all_urls(text, None, course_key, jump_to_id_base_url=jump_to_id_base_url)
+
+
+class Command(BaseCommand):
+    """
+    Creates a course with a vertical containing many HTML blocks that link
+    to static assets, course pages and other blocks.  Times rewriting the
+    urls in the content of every block with a separate pass for each kind
+    of url and then with a single pass, each as a fresh request with empty
+    in-process caches and as later requests.  Then times rendering the
+    whole vertical for the given user.
+
+    The course is deleted from the modulestore afterwards.
+
+    Example usage:
+        $ ./manage.py lms benchmark_vertical_render staff --settings=devstack
+        $ ./manage.py lms benchmark_vertical_render staff --blocks 500 --renders 5 --settings=devstack
+    """
+    help = 'Benchmarks the rendering of a vertical containing many HTML blocks.'
+
+    def add_arguments(self, parser):
+        """
+        Entry point for subclassed commands to add custom arguments.
+        """
+        parser.add_argument('username', help='Username of the user to render the vertical for.')
+        parser.add_argument(
+            '--blocks',
+            help='Number of HTML blocks in the vertical.',
+            type=int,
+            default=300,
+        )
+        parser.add_argument(
+            '--renders',
+            help='Number of times to rewrite and render the vertical.',
+            type=int,
+            default=10,
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError('Unknown user: {}'.format(options['username']))
+
+        store = modulestore()
+        user_id = ModuleStoreEnum.UserID.mgmt_command
+        with store.default_store(ModuleStoreEnum.Type.split):
+            course = store.create_course(
+                BENCHMARK_COURSE_KEY.org, BENCHMARK_COURSE_KEY.course, BENCHMARK_COURSE_KEY.run, user_id
+            )
+        try:
+            contents = []
+            with store.bulk_operations(course.id):
+                vertical = store.create_child(user_id, course.location, 'vertical')
+                for index in xrange(options['blocks']):
+                    data = HTML_BLOCK_DATA.format(index=index, next_index=index + 1)
+                    store.create_child(user_id, vertical.location, 'html', fields={'data': data})
+                    contents.append(data)
+                store.publish(vertical.location, user_id)
+
+            jump_to_id_base_url = reverse(
+                'jump_to_id', kwargs={'course_id': course.id.to_deprecated_string(), 'module_id': ''}
+            )
+            self.stdout.write('HTML blocks: {}, renders: {}'.format(options['blocks'], options['renders']))
+            self.stdout.write('{:<14} {:>14} {:>14}'.format('rewrite', 'first ms', 'median ms'))
+            for mode, rewrite in [('three-pass', _three_pass), ('single-pass', _single_pass)]:
+                clear_staticfiles_lookup_cache()
+                latencies = [
+                    _time_rewrite(rewrite, contents, course.id, jump_to_id_base_url)
+                    for __ in xrange(options['renders'])
+                ]
+                self.stdout.write('{:<14} {:>14.1f} {:>14.1f}'.format(
+                    mode, latencies[0] * 1000, sorted(latencies)[len(latencies) // 2] * 1000,
+                ))
+
+            latencies = sorted(
+                _time_render(user, store.get_item(vertical.location, depth=None), course.id)
+                for __ in xrange(options['renders'])
+            )
+            self.stdout.write('Vertical render: median {:.1f} ms, max {:.1f} ms'.format(
+                latencies[len(latencies) // 2] * 1000, latencies[-1] * 1000,
+            ))
+        finally:
+            store.delete_course(course.id, user_id)
+
+
+def _time_rewrite(rewrite, contents, course_key, jump_to_id_base_url):
+    """
+    Returns the time taken to rewrite the urls of all of the given contents
+    with the given function, as a single request.
+    """
+    RequestCache.clear_request_cache()
+    start = time.time()
+    for content in contents:
+        rewrite(content, course_key, jump_to_id_base_url)
+    return time.time() - start
+
+
+def _time_render(user, vertical, course_key):
+    """
+    Returns the time taken to render the student view of the given vertical
+    for the given user, as a single request.
+    """
+    RequestCache.clear_request_cache()
+    request = RequestFactory().get('/')
+    request.user = user
+    request.session = {}
+    start = time.time()
+    field_data_cache = FieldDataCache.cache_for_descriptor_descendents(course_key, user, vertical, depth=None)
+    module = get_module_for_descriptor(user, request, vertical, field_data_cache, course_key)
+    module.render(STUDENT_VIEW)
+    return time.time() - start
@@ -0,0 +1,74 @@
+"""
+A Django command that writes the answer distributions of a course as CSV.
+
+There is one row for each answer given to each problem part of the course,
+with the problem's url_name and display name, the problem part's id, the
+answer and the number of students who gave it.  The rows are written as
+they are computed, so the memory used stays bounded for large courses.
+"""
+import sys
+from textwrap import dedent
+
+import unicodecsv
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from courseware.grades import iter_answer_distributions
+
+HEADER = ['url_name', 'display name', 'answer id', 'answer', 'count']
+
+
+class Command(BaseCommand):
+    """
+    Write the answer distributions of a course as CSV.
+
+    Example usage:
+        $ ./manage.py lms dump_answer_distributions 'edX/DemoX/Demo_Course' --settings=devstack
+        $ ./manage.py lms dump_answer_distributions 'edX/DemoX/Demo_Course' --output answers.csv --processes 4
+    """
+    help = dedent(__doc__).strip()
+
+    def add_arguments(self, parser):
+        """
+        Entry point for subclassed commands to add custom arguments.
+        """
+        parser.add_argument('course_id', help='Course to write the answer distributions of.')
+        parser.add_argument(
+            '--output',
+            help='File to write the CSV to, instead of stdout.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            help='Number of submitted problems to read at a time.',
+            type=int,
+            default=1000,
+        )
+        parser.add_argument(
+            '--processes',
+            help='Number of processes to decode the state of submitted problems with.',
+            type=int,
+            default=None,
+        )
+
+    def handle(self, *args, **options):
+        try:
+            course_key = CourseKey.from_string(options['course_id'])
+        except InvalidKeyError:
+            raise CommandError('Invalid course_id: {}'.format(options['course_id']))
+
+        if options['output']:
+            with open(options['output'], 'wb') as output:
+                self._write_csv(course_key, output, options)
+        else:
+            self._write_csv(course_key, sys.stdout, options)
+
+    def _write_csv(self, course_key, output, options):
+        """
+        Writes the answer distributions of the course as CSV to the given file.
+        """
+        writer = unicodecsv.writer(output, encoding='utf-8')
+        writer.writerow(HEADER)
+        writer.writerows(iter_answer_distributions(
+            course_key, batch_size=options['batch_size'], processes=options['processes']
+        ))
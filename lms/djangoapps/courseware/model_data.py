@@ -44,6 +44,7 @@ from xblock.fields import Scope, UserScope
 from xmodule.modulestore.django import modulestore
 from xblock.core import XBlockAside
 from courseware.user_state_client import DjangoXBlockUserStateClient
+from openedx.core.lib.xblock_utils import update_problem_grade_counts
 
 
 log = logging.getLogger(__name__)
@@ -71,6 +72,16 @@ def _all_usage_keys(descriptors, aside_types):
     return usage_ids
 
 
+# The key that identifies the data a descriptor needs from each scope's backing table.
+# A descriptor whose key has already been loaded for a scope doesn't need that scope queried again.
+PREFETCH_KEYS = {
+    Scope.user_state: lambda descriptor: descriptor.scope_ids.usage_id,
+    Scope.user_state_summary: lambda descriptor: descriptor.scope_ids.usage_id,
+    Scope.preferences: lambda descriptor: descriptor.scope_ids.block_type,
+    Scope.user_info: lambda descriptor: descriptor.scope_ids.block_type,
+}
+
+
 def _all_block_types(descriptors, aside_types):
     """
     Return a set of all block_types for the supplied `descriptors` and for
@@ -725,19 +736,22 @@ class FieldDataCache(object):
             ),
         }
         self.scorable_locations = set()
+        self._prefetched_keys = defaultdict(set)
         self.add_descriptors_to_cache(descriptors)
 
     def add_descriptors_to_cache(self, descriptors):
         """
         Add all `descriptors` to this FieldDataCache.
+
+        Each scope's backing table is queried once, for only the descriptors whose
+        data for that scope hasn't been loaded by an earlier call, so adding the
+        descendants of a block that was already cached doesn't read its rows again.
         """
         if self.user.is_authenticated():
             self.scorable_locations.update(desc.location for desc in descriptors if desc.has_score)
-            for scope, fields in self._fields_to_cache(descriptors).items():
-                if scope not in self.cache:
-                    continue
-
-                self.cache[scope].cache_fields(fields, descriptors, self.asides)
+            for scope, scope_descriptors in self._plan_prefetch(descriptors).items():
+                fields = self._fields_to_cache(scope_descriptors)[scope]
+                self.cache[scope].cache_fields(fields, scope_descriptors, self.asides)
 
     def add_descriptor_descendents(self, descriptor, depth=None, descriptor_filter=lambda descriptor: True):
         """
@@ -797,6 +811,27 @@ class FieldDataCache(object):
         cache.add_descriptor_descendents(descriptor, depth, descriptor_filter)
         return cache
 
+    def _plan_prefetch(self, descriptors):
+        """
+        Returns a map of the cached scopes with fields on `descriptors` to the
+        descriptors that the scope still needs to be queried for, and records
+        those descriptors as loaded.
+        """
+        plan = {}
+        for scope in self._fields_to_cache(descriptors):
+            if scope not in self.cache:
+                continue
+
+            prefetch_key = PREFETCH_KEYS[scope]
+            prefetched_keys = self._prefetched_keys[scope]
+            scope_descriptors = [
+                descriptor for descriptor in descriptors if prefetch_key(descriptor) not in prefetched_keys
+            ]
+            if scope_descriptors:
+                plan[scope] = scope_descriptors
+                prefetched_keys.update(prefetch_key(descriptor) for descriptor in scope_descriptors)
+        return plan
+
     def _fields_to_cache(self, descriptors):
         """
         Returns a map of scopes to fields in that scope that should be cached
@@ -989,6 +1024,35 @@ class ScoresClient(object):
         client.fetch_scores(fd_cache.scorable_locations)
         return client
 
+    @classmethod
+    def create_for_users(cls, course_key, user_ids, locations):
+        """
+        Create a fetched ScoresClient for each of the given users, grabbing the
+        scores of all of them with a single query.
+
+        Returns a dict mapping each user_id to its ScoresClient.
+        """
+        clients = {user_id: cls(course_key, user_id) for user_id in user_ids}
+        scores_qset = StudentModule.objects.filter(
+            student_id__in=clients.keys(),
+            course_id=course_key,
+            module_state_key__in=set(locations),
+        )
+        # Each location is parsed (and mapped into the course, as in
+        # fetch_scores) only once, rather than once per user.
+        usage_keys = {}
+        for user_id, location, correct, total in scores_qset.values_list(
+                'student_id', 'module_state_key', 'grade', 'max_grade'
+        ):
+            usage_key = usage_keys.get(location)
+            if usage_key is None:
+                usage_key = usage_keys[location] = UsageKey.from_string(location).map_into_course(course_key)
+            clients[user_id]._locations_to_scores[usage_key] = cls.Score(correct, total)  # pylint: disable=protected-access
+
+        for client in clients.itervalues():
+            client._has_fetched = True  # pylint: disable=protected-access
+        return clients
+
 
 # @contract(user_id=int, usage_key=UsageKey, score="number|None", max_score="number|None")
 def set_score(user_id, usage_key, score, max_score):
@@ -1004,7 +1068,9 @@ def set_score(user_id, usage_key, score, max_score):
             'max_grade': max_score,
         }
     )
+    previous_grade = student_module.grade
     if not created:
         student_module.grade = score
         student_module.max_grade = max_score
         student_module.save()
+    update_problem_grade_counts(usage_key, score, previous_grade, created)
@@ -133,6 +133,29 @@ class StudentModule(models.Model):
         else:
             return queryset
 
+    @classmethod
+    def submitted_problem_states_read_only(cls, course_id, batch_size=1000):
+        """
+        Yields the submitted problems of the course, as given by
+        all_submitted_problems_read_only, in lists of up to `batch_size`
+        (id, student_id, module_state_key, state) tuples in order of id.
+
+        Each list is queried separately, so that only one is held in memory
+        at a time.  The module_state_key is given as the string stored in
+        the database.
+        """
+        queryset = cls.all_submitted_problems_read_only(course_id).order_by('id').values_list(
+            'id', 'student_id', 'module_state_key', 'state'
+        )
+        last_id = 0
+        while True:
+            rows = list(queryset.filter(id__gt=last_id)[:batch_size])
+            if rows:
+                yield rows
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1][0]
+
     def __repr__(self):
         return 'StudentModule<%r>' % ({
             'course_id': self.course_id,
@@ -4,6 +4,7 @@ Test grade calculation.
 from django.http import Http404
 from django.test import TestCase
 from django.test.client import RequestFactory
+from django.test.utils import override_settings
 
 from mock import patch, MagicMock
 from nose.plugins.attrib import attr
@@ -11,6 +12,7 @@ from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from opaque_keys.edx.locator import CourseLocator, BlockUsageLocator
 
 from courseware.grades import (
+    BatchGradingContext,
     field_data_cache_for_grading,
     grade,
     iterate_grades_for,
@@ -19,7 +21,7 @@ from courseware.grades import (
     get_module_score
 )
 from courseware.module_render import get_module
-from courseware.model_data import FieldDataCache, set_score
+from courseware.model_data import FieldDataCache, ScoresClient, set_score
 from courseware.tests.helpers import (
     LoginEnrollmentTestCase,
     get_request_for_user
@@ -553,3 +555,99 @@ def answer_problem(course, request, problem, score=1):
         field_data_cache,
     )._xmodule
     module.system.publish(problem, 'grade', grade_dict)
+
+
+@attr('shard_1')
+class TestBatchedGradeIteration(SharedModuleStoreTestCase):
+    """
+    Test that grading students in batches yields the same gradesets as
+    grading them one at a time.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(TestBatchedGradeIteration, cls).setUpClass()
+        cls.course = CourseFactory.create()
+        chapter = ItemFactory.create(parent=cls.course, category='chapter')
+        problem_xml = MultipleChoiceResponseXMLFactory().build_xml(
+            question_text='The correct answer is Choice 3',
+            choices=[False, False, True, False],
+            choice_names=['choice_0', 'choice_1', 'choice_2', 'choice_3']
+        )
+        cls.problems = []
+        for section_index in xrange(2):
+            sequential = ItemFactory.create(
+                parent=chapter,
+                category='sequential',
+                display_name='Test Sequential {}'.format(section_index),
+                graded=True,
+                format='Homework',
+            )
+            vertical = ItemFactory.create(parent=sequential, category='vertical')
+            ItemFactory.create(parent=vertical, category='html')
+            for __ in xrange(2):
+                cls.problems.append(ItemFactory.create(parent=vertical, category='problem', data=problem_xml))
+
+    def setUp(self):
+        super(TestBatchedGradeIteration, self).setUp()
+        self.students = [UserFactory.create() for __ in xrange(5)]
+        for student in self.students:
+            CourseEnrollment.enroll(student, self.course.id)
+
+    def _gradesets(self, batched):
+        """
+        Returns a dict mapping each student to their gradeset.
+        """
+        results = list(iterate_grades_for(self.course.id, self.students, keep_raw_scores=True, batched=batched))
+        self.assertEqual([err_msg for __, __, err_msg in results], [''] * len(self.students))
+        return {student: gradeset for student, gradeset, __ in results}
+
+    def test_batched_matches_one_by_one(self):
+        # A mix of unattempted problems, full and partial scores and an
+        # attempted problem without a recorded score.
+        set_score(self.students[0].id, self.problems[0].location, 1, 1)
+        set_score(self.students[1].id, self.problems[0].location, 0, 1)
+        set_score(self.students[1].id, self.problems[3].location, 1, 1)
+        set_score(self.students[2].id, self.problems[1].location, None, None)
+        for problem in self.problems:
+            set_score(self.students[3].id, problem.location, 1, 1)
+
+        with override_settings(GRADES_BATCH_SIZE=2):
+            batched_gradesets = self._gradesets(batched=True)
+        self.assertEqual(batched_gradesets, self._gradesets(batched=False))
+        self.assertEqual(batched_gradesets[self.students[3]]['percent'], 1.0)
+        self.assertEqual(batched_gradesets[self.students[4]]['percent'], 0.0)
+
+    def test_batching_supported(self):
+        self.assertTrue(BatchGradingContext(self.course).supports_batching)
+
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_MAX_SCORE_CACHE': False})
+    def test_max_scores_cache_disabled(self):
+        # pylint: disable=protected-access
+        context = BatchGradingContext(self.course)
+        context._max_scores_cache.set(self.problems[0].location, 10)
+        # The stale max score is not used, the problem is worth 1 point.
+        self.assertEqual(context._get_max_score(self.students[0], self.problems[0]), 1)
+
+    def test_batching_not_supported_with_dynamic_children(self):
+        course = CourseFactory.create()
+        chapter = ItemFactory.create(parent=course, category='chapter')
+        sequential = ItemFactory.create(parent=chapter, category='sequential', graded=True)
+        randomize = ItemFactory.create(parent=sequential, category='randomize')
+        ItemFactory.create(parent=randomize, category='problem')
+        course = self.store.get_course(course.id)
+
+        self.assertFalse(BatchGradingContext(course).supports_batching)
+        results = list(iterate_grades_for(course, self.students, batched=True))
+        self.assertEqual([err_msg for __, __, err_msg in results], [''] * len(self.students))
+
+    def test_scores_clients_for_users(self):
+        set_score(self.students[0].id, self.problems[0].location, 1, 2)
+        locations = [problem.location for problem in self.problems]
+        with self.assertNumQueries(1):
+            scores_clients = ScoresClient.create_for_users(
+                self.course.id, [student.id for student in self.students], locations
+            )
+
+        self.assertEqual(scores_clients[self.students[0].id].get(locations[0]), ScoresClient.Score(1, 2))
+        self.assertIsNone(scores_clients[self.students[0].id].get(locations[1]))
+        self.assertIsNone(scores_clients[self.students[1].id].get(locations[0]))
@@ -426,3 +426,68 @@ class TestStudentInfoStorage(OtherUserFailureTestMixin, StorageTestBase, TestCas
     storage_class = XModuleStudentInfoField
     other_key_factory = partial(DjangoKeyValueStore.Key, Scope.user_info, 2, 'mock_problem')  # user_id=2, not 1
     existing_field_name = "existing_field"
+
+
+@attr('shard_1')
+class TestFieldDataCachePrefetch(TestCase):
+    """
+    Tests that adding the descendants of an already cached block to a FieldDataCache
+    queries each backing table once, for only the data that isn't loaded yet.
+    """
+    SCOPES = (Scope.user_state, Scope.user_state_summary, Scope.preferences, Scope.user_info)
+
+    def setUp(self):
+        super(TestFieldDataCachePrefetch, self).setUp()
+        self.user = UserFactory.create()
+        self.section = self.block_descriptor('sequential', 'section')
+        self.course_descriptors = [
+            self.block_descriptor('course', 'course'),
+            self.block_descriptor('chapter', 'chapter'),
+            self.section,
+        ]
+        # A section nested several levels deep, with the same block types repeated at each level
+        self.section_descriptors = [self.section]
+        for depth in range(5):
+            self.section_descriptors.append(self.block_descriptor('vertical', 'vertical_{}'.format(depth)))
+            for index in range(4):
+                self.section_descriptors.append(
+                    self.block_descriptor('problem', 'problem_{}_{}'.format(depth, index))
+                )
+
+    def block_descriptor(self, block_type, block_id):
+        """
+        Returns a mock descriptor of the given type with a field in each of the cached scopes.
+        """
+        descriptor = mock_descriptor([mock_field(scope, 'a_field') for scope in self.SCOPES])
+        descriptor.scope_ids = ScopeIds('user1', block_type, location(block_id), location(block_id))
+        return descriptor
+
+    def test_deep_section_prefetch(self):
+        with self.assertNumQueries(4):
+            field_data_cache = FieldDataCache(self.course_descriptors, course_id, self.user)
+
+        # One query per backing table for the section's descendants
+        StudentModuleFactory(
+            student=self.user, module_state_key=location('problem_4_3'), state=json.dumps({'a_field': 'a_value'})
+        )
+        with self.assertNumQueries(4):
+            field_data_cache.add_descriptors_to_cache(self.section_descriptors)
+
+        kvs = DjangoKeyValueStore(field_data_cache)
+        with self.assertNumQueries(0):
+            self.assertEquals(
+                'a_value',
+                kvs.get(DjangoKeyValueStore.Key(Scope.user_state, self.user.id, location('problem_4_3'), 'a_field'))
+            )
+
+        # Everything has been loaded already
+        with self.assertNumQueries(0):
+            field_data_cache.add_descriptors_to_cache(self.section_descriptors)
+
+    def test_prefetch_known_block_types(self):
+        field_data_cache = FieldDataCache(self.section_descriptors[:3], course_id, self.user)
+
+        # Preferences and user info are loaded by block type, so only the
+        # per-block user state tables are queried for the new blocks
+        with self.assertNumQueries(2):
+            field_data_cache.add_descriptors_to_cache(self.section_descriptors)
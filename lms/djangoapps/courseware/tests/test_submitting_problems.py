@@ -4,6 +4,7 @@ Integration tests for submitting problem responses and getting grades.
 """
 import json
 import os
+from multiprocessing.pool import ThreadPool
 from textwrap import dedent
 
 from django.conf import settings
@@ -1172,6 +1173,29 @@ class TestAnswerDistributions(TestSubmittingProblems):
                 }
             )
 
+    def test_iter_answer_distributions(self):
+        self.submit_question_answer('p1', {'2_1': u'Correct'})
+        self.submit_question_answer('p2', {'2_1': u'Incorrect'})
+        self.submit_question_answer('p3', {'2_1': u'Correct'})
+        expected = [
+            ('p1', 'p1', '{}_2_1'.format(self.p1_html_id), 'Correct', 1),
+            ('p2', 'p2', '{}_2_1'.format(self.p2_html_id), 'Incorrect', 1),
+            ('p3', 'p3', '{}_2_1'.format(self.p3_html_id), 'Correct', 1),
+        ]
+
+        # Read the submissions one at a time and spill each answer to disk
+        self.assertEqual(
+            list(grades.iter_answer_distributions(self.course.id, batch_size=1, max_answers=1)),
+            expected,
+        )
+        # Forked processes would share the test's database connection, so
+        # decode with a pool of threads instead.
+        with patch('courseware.grades.Pool', ThreadPool):
+            self.assertEqual(
+                list(grades.iter_answer_distributions(self.course.id, batch_size=2, processes=2)),
+                expected,
+            )
+
 
 @attr('shard_1')
 class TestConditionalContent(TestSubmittingProblems):
@@ -352,7 +352,8 @@ class CoursewareIndex(View):
         Prefetches all descendant data for the requested section and
         sets up the runtime, which binds the request user to the section.
         """
-        # Pre-fetch all descendant data
+        # Pre-fetch all descendant data. The section itself was already cached along
+        # with the course, so only its descendants' data is read here.
         self.section = modulestore().get_item(self.section.location, depth=None)
         self.field_data_cache.add_descriptor_descendents(self.section, depth=None)
 
@@ -3356,11 +3356,13 @@ class TestEntranceExamInstructorAPIRegradeTask(SharedModuleStoreTestCase, LoginE
         StudentModule.objects.create(
             student_id=1,
             grade=100,
+            course_id=course.id,
             module_state_key=usage_key
         )
         StudentModule.objects.create(
             student_id=2,
             grade=50,
+            course_id=course.id,
             module_state_key=usage_key
         )
 
@@ -19,6 +19,8 @@ import csv
 import json
 import hashlib
 import os.path
+import re
+import tempfile
 import urllib
 
 from boto.s3.connection import S3Connection
@@ -35,6 +37,13 @@ from xmodule_django.models import CourseKeyField
 QUEUING = 'QUEUING'
 PROGRESS = 'PROGRESS'
 
+# matches the names that ReportStore.partial_filename() generates
+PARTIAL_FILENAME_RE = re.compile(r'\.part\d{5}$')
+
+# size of the parts in which S3ReportStore uploads files that are larger than
+# one part; S3 requires all parts but the last to be at least 5 MB
+S3_MULTIPART_CHUNK_SIZE = 50 * 1024 * 1024
+
 
 class InstructorTask(models.Model):
     """
@@ -182,9 +191,9 @@ class InstructorTask(models.Model):
 class ReportStore(object):
     """
     Simple abstraction layer that can fetch and store CSV files for reports
-    download. Should probably refactor later to create a ReportFile object that
-    can simply be appended to for the sake of memory efficiency, rather than
-    passing in the whole dataset. Doing that for now just because it's simpler.
+    download. Rows are written out as they are read from the iterable passed to
+    `store_rows()`, so generators can be used to store large reports without
+    holding them in memory.
     """
     @classmethod
     def from_config(cls, config_name):
@@ -198,15 +207,39 @@ class ReportStore(object):
         elif storage_type.lower() == "localfs":
             return LocalFSReportStore.from_config(config_name)
 
+    @classmethod
+    def partial_filename(cls, filename, part_index):
+        """
+        Return the name under which part number `part_index` of the report
+        named `filename` is stored, until the parts are merged into the
+        report. Partial reports are not listed by `links_for()`.
+        """
+        return u"{}.part{:05d}".format(filename, part_index)
+
+    @classmethod
+    def is_partial_filename(cls, filename):
+        """Return whether `filename` is the name of a partial report."""
+        return PARTIAL_FILENAME_RE.search(filename) is not None
+
     def _get_utf8_encoded_rows(self, rows):
         """
-        Given a list of `rows` containing unicode strings, return a
-        new list of rows with those strings encoded as utf-8 for CSV
+        Given an iterable of `rows` containing unicode strings, yield
+        the rows with those strings encoded as utf-8 for CSV
         compatibility.
         """
         for row in rows:
             yield [unicode(item).encode('utf-8') for item in row]
 
+    def _get_unicode_rows(self, csv_file):
+        """
+        Given a file containing a utf-8 encoded CSV, yield its rows with
+        their strings decoded to unicode, closing the file once all rows
+        are read.
+        """
+        with csv_file:
+            for row in csv.reader(csv_file):
+                yield [item.decode('utf-8') for item in row]
+
 
 class S3ReportStore(ReportStore):
     """
@@ -277,44 +310,94 @@ class S3ReportStore(ReportStore):
         """
         key = self.key_for(course_id, filename)
 
+        data = buff.getvalue()
+        headers = self._headers_for(key, config)
+        key.size = len(data)
+        headers["Content-Length"] = len(data)
+
+        # Just setting the content encoding and type above should work
+        # according to the docs, but when experimenting, this was necessary for
+        # it to actually take.
+        key.set_contents_from_string(data, headers=headers)
+
+    def store_file(self, course_id, filename, file_obj, config=None):
+        """
+        Store the contents of the seekable `file_obj`, like `store()` does
+        for a buffer, without reading all of it into memory. Files larger
+        than S3_MULTIPART_CHUNK_SIZE are uploaded in parts of that size.
+        """
+        key = self.key_for(course_id, filename)
+        headers = self._headers_for(key, config)
+        file_obj.seek(0, os.SEEK_END)
+        size = file_obj.tell()
+
+        if size <= S3_MULTIPART_CHUNK_SIZE:
+            key.size = size
+            key.set_contents_from_file(file_obj, headers=headers, rewind=True)
+            return
+
+        multipart_upload = self.bucket.initiate_multipart_upload(key.key, headers=headers)
+        try:
+            for part_num, offset in enumerate(xrange(0, size, S3_MULTIPART_CHUNK_SIZE), start=1):
+                file_obj.seek(offset)
+                multipart_upload.upload_part_from_file(
+                    file_obj, part_num, size=min(S3_MULTIPART_CHUNK_SIZE, size - offset)
+                )
+            multipart_upload.complete_upload()
+        except Exception:
+            multipart_upload.cancel_upload()
+            raise
+
+    def _headers_for(self, key, config):
+        """
+        Set the content encoding and type given in `config` on `key`, and
+        return the headers to upload its contents with.
+        """
         _config = config if config else {}
 
         content_type = _config.get('content_type', 'text/csv')
         content_encoding = _config.get('content_encoding', 'gzip')
 
-        data = buff.getvalue()
-        key.size = len(data)
         key.content_encoding = content_encoding
         key.content_type = content_type
-
-        # Just setting the content encoding and type above should work
-        # according to the docs, but when experimenting, this was necessary for
-        # it to actually take.
-        key.set_contents_from_string(
-            data,
-            headers={
-                "Content-Encoding": content_encoding,
-                "Content-Length": len(data),
-                "Content-Type": content_type,
-            }
-        )
+        return {
+            "Content-Encoding": content_encoding,
+            "Content-Type": content_type,
+        }
 
     def store_rows(self, course_id, filename, rows):
         """
         Given a `course_id`, `filename`, and `rows` (each row is an iterable of
-        strings), create a buffer that is a gzip'd csv file, and then `store()`
-        that buffer.
+        strings), write a gzip'd csv file to a temporary file as the rows are
+        read, and then `store_file()` that file.
 
         Even though we store it in gzip format, browsers will transparently
         download and decompress it. Filenames should end in `.csv`, not `.gz`.
         """
-        output_buffer = StringIO()
-        gzip_file = GzipFile(fileobj=output_buffer, mode="wb")
-        csvwriter = csv.writer(gzip_file)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-        gzip_file.close()
+        with tempfile.TemporaryFile() as temp_file:
+            gzip_file = GzipFile(fileobj=temp_file, mode="wb")
+            csvwriter = csv.writer(gzip_file)
+            csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+            gzip_file.close()
 
-        self.store(course_id, filename, output_buffer)
+            self.store_file(course_id, filename, temp_file)
+
+    def read_rows(self, course_id, filename):
+        """
+        Return an iterator over the rows of the CSV file that `store_rows()`
+        stored under `filename` for `course_id`, or None if there is no such
+        file.
+        """
+        key = self.bucket.get_key(self.key_for(course_id, filename).key)
+        if key is None:
+            return None
+        return self._get_unicode_rows(GzipFile(fileobj=StringIO(key.get_contents_as_string()), mode="rb"))
+
+    def delete(self, course_id, filename):
+        """
+        Delete the file stored under `filename` for `course_id`, if any.
+        """
+        self.bucket.delete_key(self.key_for(course_id, filename).key)
 
     def links_for(self, course_id):
         """
@@ -325,6 +408,7 @@ class S3ReportStore(ReportStore):
         return [
             (key.key.split("/")[-1], key.generate_url(expires_in=300))
             for key in sorted(self.bucket.list(prefix=course_dir.key), reverse=True, key=lambda k: k.last_modified)
+            if not self.is_partial_filename(key.key)
         ]
 
 
@@ -383,13 +467,45 @@ class LocalFSReportStore(ReportStore):
     def store_rows(self, course_id, filename, rows):
         """
         Given a course_id, filename, and rows (each row is an iterable of strings),
-        write this data out.
+        write this data out as the rows are read. The rows are written to a
+        temporary file that replaces the file only once all rows are written, so
+        incomplete files are never listed by `links_for()`.
         """
-        output_buffer = StringIO()
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+        full_path = self.path_to(course_id, filename)
+        directory = os.path.dirname(full_path)
+        if not os.path.exists(directory):
+            os.mkdir(directory)
+
+        # The temporary file is created outside of the course's directory, but
+        # on the same filesystem so that it can be renamed into place.
+        temp_fd, temp_path = tempfile.mkstemp(dir=self.root_path)
+        try:
+            with os.fdopen(temp_fd, "wb") as temp_file:
+                csvwriter = csv.writer(temp_file)
+                csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+            os.rename(temp_path, full_path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+    def read_rows(self, course_id, filename):
+        """
+        Return an iterator over the rows of the CSV file that `store_rows()`
+        stored under `filename` for `course_id`, or None if there is no such
+        file.
+        """
+        full_path = self.path_to(course_id, filename)
+        if not os.path.exists(full_path):
+            return None
+        return self._get_unicode_rows(open(full_path, "rb"))
 
-        self.store(course_id, filename, output_buffer)
+    def delete(self, course_id, filename):
+        """
+        Delete the file stored under `filename` for `course_id`, if any.
+        """
+        full_path = self.path_to(course_id, filename)
+        if os.path.exists(full_path):
+            os.remove(full_path)
 
     def links_for(self, course_id):
         """
@@ -402,7 +518,11 @@ class LocalFSReportStore(ReportStore):
         course_dir = self.path_to(course_id, '')
         if not os.path.exists(course_dir):
             return []
-        files = [(filename, os.path.join(course_dir, filename)) for filename in os.listdir(course_dir)]
+        files = [
+            (filename, os.path.join(course_dir, filename))
+            for filename in os.listdir(course_dir)
+            if not self.is_partial_filename(filename)
+        ]
         files.sort(key=lambda (filename, full_path): os.path.getmtime(full_path), reverse=True)
 
         return [
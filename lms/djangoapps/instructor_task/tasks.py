@@ -37,6 +37,11 @@ from instructor_task.tasks_helper import (
     upload_problem_responses_csv,
     upload_grades_csv,
     upload_problem_grade_report,
+    delegate_grade_report_shards,
+    run_grade_report_shard,
+    run_grade_report_merge,
+    GRADE_REPORT_NAME,
+    PROBLEM_GRADE_REPORT_NAME,
     upload_students_csv,
     cohort_students_and_upload,
     upload_enrollment_report,
@@ -172,7 +177,10 @@ def calculate_grades_csv(entry_id, xmodule_instance_args):
         xmodule_instance_args.get('task_id'), entry_id, action_name
     )
 
-    task_fn = partial(upload_grades_csv, xmodule_instance_args)
+    if settings.FEATURES.get('ENABLE_SHARDED_GRADE_REPORTS', False):
+        task_fn = partial(delegate_grade_report_shards, GRADE_REPORT_NAME, xmodule_instance_args)
+    else:
+        task_fn = partial(upload_grades_csv, xmodule_instance_args)
     return run_main_task(entry_id, task_fn, action_name)
 
 
@@ -189,10 +197,38 @@ def calculate_problem_grade_report(entry_id, xmodule_instance_args):
         xmodule_instance_args.get('task_id'), entry_id, action_name
     )
 
-    task_fn = partial(upload_problem_grade_report, xmodule_instance_args)
+    if settings.FEATURES.get('ENABLE_SHARDED_GRADE_REPORTS', False):
+        task_fn = partial(delegate_grade_report_shards, PROBLEM_GRADE_REPORT_NAME, xmodule_instance_args)
+    else:
+        task_fn = partial(upload_problem_grade_report, xmodule_instance_args)
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def calculate_grade_report_shard(
+    entry_id, report_name, shard_index, user_ids, timestamp, subtask_status_dict, merge_subtask_id
+):  # pylint: disable=bad-continuation
+    """
+    Grade a shard of the students of a grade report, storing their rows as
+    partial reports.
+
+    `entry_id` is the id value of the InstructorTask entry that corresponds to
+    the report, whose progress is updated with the shard's status.
+    """
+    return run_grade_report_shard(
+        entry_id, report_name, shard_index, user_ids, timestamp, subtask_status_dict, merge_subtask_id
+    )
+
+
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def merge_grade_report_shards(entry_id, report_name, timestamp, subtask_status_dict):
+    """
+    Merge the partial reports stored by the shards of a grade report into
+    the report, once all shards are done.
+    """
+    return run_grade_report_merge(entry_id, report_name, timestamp, subtask_status_dict)
+
+
 @task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
 def calculate_students_features_csv(entry_id, xmodule_instance_args):
     """
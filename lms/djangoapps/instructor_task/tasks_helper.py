@@ -9,8 +9,9 @@ from collections import OrderedDict
 from datetime import datetime
 from django.conf import settings
 from eventtracking import tracker
-from itertools import chain
+from itertools import chain, count, islice
 from time import time
+from uuid import uuid4
 import unicodecsv
 import logging
 
@@ -44,7 +45,7 @@ from certificates.models import (
     CertificateStatuses,
     GeneratedCertificate
 )
-from certificates.api import generate_user_certificates
+from certificates.api import generate_user_certificates, generate_user_certificates_in_bulk
 from courseware.courses import get_course_by_id, get_problems_in_section
 from courseware.grades import iterate_grades_for
 from courseware.models import StudentModule
@@ -59,6 +60,12 @@ from instructor_analytics.basic import (
 from instructor_analytics.csvs import format_dictlist
 from openassessment.data import OraAggregateData
 from instructor_task.models import ReportStore, InstructorTask, PROGRESS
+from instructor_task.subtasks import (
+    SubtaskStatus,
+    check_subtask_is_valid,
+    queue_subtasks_for_query,
+    update_subtask_status,
+)
 from lms.djangoapps.lms_xblock.runtime import LmsPartitionService
 from openedx.core.djangoapps.course_groups.cohorts import get_cohort
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
@@ -83,6 +90,13 @@ UPDATE_STATUS_SKIPPED = 'skipped'
 # The setting name used for events when "settings" (account settings, preferences, profile information) change.
 REPORT_REQUESTED_EVENT_NAME = u'edx.instructor.report.requested'
 
+# Names of the grade reports, which can be generated in shards.
+GRADE_REPORT_NAME = 'grade_report'
+PROBLEM_GRADE_REPORT_NAME = 'problem_grade_report'
+
+# Format of the report timestamp passed to the shards of a report.
+REPORT_TIMESTAMP_FORMAT = "%Y-%m-%d-%H%M"
+
 
 class BaseInstructorTask(Task):
     """
@@ -606,7 +620,8 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
 
     Arguments:
         rows: CSV data in the following format (first column may be a
-            header):
+            header), as a list or any other iterable, such as a generator,
+            whose rows are written out as they are produced:
             [
                 [row1_colum1, row1_colum2, ...],
                 ...
@@ -615,18 +630,22 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
         course_id: ID of the course
     """
     report_store = ReportStore.from_config(config_name)
-    report_store.store_rows(
-        course_id,
-        u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
-            course_prefix=course_filename_prefix_generator(course_id),
-            csv_name=csv_name,
-            timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
-        ),
-        rows
-    )
+    report_store.store_rows(course_id, _report_csv_filename(csv_name, course_id, timestamp), rows)
     tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": csv_name, })
 
 
+def _report_csv_filename(csv_name, course_id, timestamp):
+    """
+    Return the filename of the CSV named `csv_name` that is generated for
+    `course_id` at `timestamp`.
+    """
+    return u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
+        course_prefix=course_filename_prefix_generator(course_id),
+        csv_name=csv_name,
+        timestamp_str=timestamp.strftime(REPORT_TIMESTAMP_FORMAT)
+    )
+
+
 def upload_exec_summary_to_store(data_dict, report_name, course_id, generated_at, config_name='FINANCIAL_REPORTS'):
     """
     Upload Executive Summary Html file using ReportStore.
@@ -657,22 +676,18 @@ def upload_exec_summary_to_store(data_dict, report_name, course_id, generated_at
     tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": report_name})
 
 
-def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):  # pylint: disable=too-many-statements
+def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
     """
     For a given `course_id`, generate a grades CSV file for all students that
     are enrolled, and store using a `ReportStore`. Once created, the files can
     be accessed by instantiating another `ReportStore` (via
-    `ReportStore.from_config()`) and calling `link_for()` on it. Writes are
-    buffered, so we'll never write part of a CSV file to S3 -- i.e. any files
-    that are visible in ReportStore will be complete ones.
-
-    As we start to add more CSV downloads, it will probably be worthwhile to
-    make a more general CSVDoc class instead of building out the rows like we
-    do here.
+    `ReportStore.from_config()`) and calling `link_for()` on it. Rows are
+    written to a temporary file as the students are graded, and the file is
+    stored once complete, so we'll never write part of a CSV file to S3 --
+    i.e. any files that are visible in ReportStore will be complete ones.
     """
     start_time = time()
     start_date = datetime.now(UTC)
-    status_interval = 100
     enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
     task_progress = TaskProgress(action_name, enrolled_students.count(), start_time)
 
@@ -685,6 +700,37 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     )
     TASK_LOG.info(u'%s, Task type: %s, Starting task execution', task_info_string, action_name)
 
+    # Grade the students as their rows are written out, collecting the rows
+    # of the students that could not be graded along the way.
+    err_rows = []
+    rows = _grade_report_rows(course_id, enrolled_students, task_progress, task_info_string, err_rows)
+    upload_csv_to_report_store(rows, GRADE_REPORT_NAME, course_id, start_date)
+
+    current_step = {'step': 'Uploading CSVs'}
+    task_progress.update_task_state(extra_meta=current_step)
+    TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
+
+    # If there are any error rows (don't count the header), write them out as well
+    if len(err_rows) > 1:
+        upload_csv_to_report_store(err_rows, GRADE_REPORT_NAME + '_err', course_id, start_date)
+
+    # One last update before we close out...
+    TASK_LOG.info(u'%s, Task type: %s, Finalizing grade task', task_info_string, action_name)
+    return task_progress.update_task_state(extra_meta=current_step)
+
+
+def _grade_report_rows(course_id, students, task_progress, task_info_string, err_rows):  # pylint: disable=too-many-statements
+    """
+    Grade the given `students` and yield the rows of the grade report for
+    them, starting with a header if any student was graded successfully.
+
+    As the rows are consumed, a header and the rows of the students that
+    could not be graded are appended to `err_rows`, and the counts of
+    `task_progress` are updated.
+    """
+    status_interval = 100
+    action_name = task_progress.action_name
+
     course = get_course_by_id(course_id)
     course_is_cohorted = is_course_cohorted(course.id)
     teams_enabled = course.teams_enabled
@@ -698,13 +744,12 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     certificate_whitelist = CertificateWhitelist.objects.filter(course_id=course_id, whitelist=True)
     whitelisted_user_ids = [entry.user_id for entry in certificate_whitelist]
 
-    # Loop over all our students and build our CSV lists in memory
+    # Loop over all our students and yield their rows
     header = None
-    rows = []
-    err_rows = [["id", "username", "error_msg"]]
+    err_rows.append(["id", "username", "error_msg"])
     current_step = {'step': 'Calculating Grades'}
 
-    total_enrolled_students = enrolled_students.count()
+    total_enrolled_students = task_progress.total
     student_counter = 0
     TASK_LOG.info(
         u'%s, Task type: %s, Current step: %s, Starting grade calculation for total students: %s',
@@ -714,7 +759,7 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
 
         total_enrolled_students
     )
-    for student, gradeset, err_msg in iterate_grades_for(course_id, enrolled_students):
+    for student, gradeset, err_msg in iterate_grades_for(course_id, students):
         # Periodically update task status (this is a cache write)
         if task_progress.attempted % status_interval == 0:
             task_progress.update_task_state(extra_meta=current_step)
@@ -737,7 +782,7 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
             task_progress.succeeded += 1
             if not header:
                 header = [section['label'] for section in gradeset[u'section_breakdown']]
-                rows.append(
+                yield (
                     ["id", "email", "username", "grade"] + header + cohorts_header +
                     group_configs_header + teams_header +
                     ['Enrollment Track', 'Verification Status'] + certificate_info_header
@@ -787,7 +832,7 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
             # possible for a student to have a 0.0 show up in their row but
             # still have 100% for the course.
             row_percents = [percents.get(label, 0.0) for label in header]
-            rows.append(
+            yield (
                 [student.id, student.email, student.username, gradeset['percent']] +
                 row_percents + cohorts_group_name + group_configs_group_names + team_name +
                 [enrollment_mode] + [verification_status] + certificate_info
@@ -806,22 +851,6 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
         total_enrolled_students
     )
 
-    # By this point, we've got the rows we're going to stuff into our CSV files.
-    current_step = {'step': 'Uploading CSVs'}
-    task_progress.update_task_state(extra_meta=current_step)
-    TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
-
-    # Perform the actual upload
-    upload_csv_to_report_store(rows, 'grade_report', course_id, start_date)
-
-    # If there are any error rows (don't count the header), write them out as well
-    if len(err_rows) > 1:
-        upload_csv_to_report_store(err_rows, 'grade_report_err', course_id, start_date)
-
-    # One last update before we close out...
-    TASK_LOG.info(u'%s, Task type: %s, Finalizing grade task', task_info_string, action_name)
-    return task_progress.update_task_state(extra_meta=current_step)
-
 
 def _order_problems(blocks):
     """
@@ -914,30 +943,58 @@ def upload_problem_grade_report(_xmodule_instance_args, _entry_id, course_id, _t
     """
     start_time = time()
     start_date = datetime.now(UTC)
-    status_interval = 100
     enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
     task_progress = TaskProgress(action_name, enrolled_students.count(), start_time)
 
-    # This struct encapsulates both the display names of each static item in the
-    # header row as values as well as the django User field names of those items
-    # as the keys.  It is structured in this way to keep the values related.
-    header_row = OrderedDict([('id', 'Student ID'), ('email', 'Email'), ('username', 'Username')])
-
+    error_rows = []
+    rows = _problem_grade_report_rows(course_id, enrolled_students, task_progress, None, error_rows)
     try:
-        course_structure = CourseStructure.objects.get(course_id=course_id)
-        blocks = course_structure.ordered_blocks
-        problems = _order_problems(blocks)
+        # Grade students until one is graded successfully, if any.
+        first_rows = list(islice(rows, 2))
     except CourseStructure.DoesNotExist:
         return task_progress.update_task_state(
             extra_meta={'step': 'Generating course structure. Please refresh and try again.'}
         )
 
+    # Perform the upload if any students have been successfully graded
+    if len(first_rows) > 1:
+        upload_csv_to_report_store(chain(first_rows, rows), PROBLEM_GRADE_REPORT_NAME, course_id, start_date)
+    # If there are any error rows, write them out as well
+    if len(error_rows) > 1:
+        upload_csv_to_report_store(error_rows, PROBLEM_GRADE_REPORT_NAME + '_err', course_id, start_date)
+
+    return task_progress.update_task_state(extra_meta={'step': 'Uploading CSV'})
+
+
+def _problem_grade_report_rows(course_id, students, task_progress, task_info_string, error_rows):  # pylint: disable=unused-argument
+    """
+    Grade the given `students` and yield the rows of the problem grade
+    report for them, starting with a header.
+
+    As the rows are consumed, a header and the rows of the students that
+    could not be graded are appended to `error_rows`, and the counts of
+    `task_progress` are updated.
+
+    Raises CourseStructure.DoesNotExist when the first row is consumed, if
+    the course structure has not been generated yet.
+    """
+    status_interval = 100
+
+    # This struct encapsulates both the display names of each static item in the
+    # header row as values as well as the django User field names of those items
+    # as the keys.  It is structured in this way to keep the values related.
+    header_row = OrderedDict([('id', 'Student ID'), ('email', 'Email'), ('username', 'Username')])
+
+    course_structure = CourseStructure.objects.get(course_id=course_id)
+    blocks = course_structure.ordered_blocks
+    problems = _order_problems(blocks)
+
     # Just generate the static fields for now.
-    rows = [list(header_row.values()) + ['Final Grade'] + list(chain.from_iterable(problems.values()))]
-    error_rows = [list(header_row.values()) + ['error_msg']]
+    error_rows.append(list(header_row.values()) + ['error_msg'])
+    yield list(header_row.values()) + ['Final Grade'] + list(chain.from_iterable(problems.values()))
     current_step = {'step': 'Calculating Grades'}
 
-    for student, gradeset, err_msg in iterate_grades_for(course_id, enrolled_students, keep_raw_scores=True):
+    for student, gradeset, err_msg in iterate_grades_for(course_id, students, keep_raw_scores=True):
         student_fields = [getattr(student, field_name) for field_name in header_row]
         task_progress.attempted += 1
 
@@ -965,20 +1022,230 @@ def upload_problem_grade_report(_xmodule_instance_args, _entry_id, course_id, _t
                 # the case that the student does not have access to it (e.g. A/B
                 # test or cohorted courseware).
                 earned_possible_values.append(['N/A', 'N/A'])
-        rows.append(student_fields + [final_grade] + list(chain.from_iterable(earned_possible_values)))
-
         task_progress.succeeded += 1
         if task_progress.attempted % status_interval == 0:
             task_progress.update_task_state(extra_meta=current_step)
 
-    # Perform the upload if any students have been successfully graded
-    if len(rows) > 1:
-        upload_csv_to_report_store(rows, 'problem_grade_report', course_id, start_date)
-    # If there are any error rows, write them out as well
-    if len(error_rows) > 1:
-        upload_csv_to_report_store(error_rows, 'problem_grade_report_err', course_id, start_date)
+        yield student_fields + [final_grade] + list(chain.from_iterable(earned_possible_values))
 
-    return task_progress.update_task_state(extra_meta={'step': 'Uploading CSV'})
+
+def delegate_grade_report_shards(report_name, xmodule_instance_args, entry_id, course_id, task_input, action_name):
+    """
+    Generate the grade report named `report_name` for a given `course_id` by
+    splitting the enrolled students into shards of no more than
+    settings.GRADE_REPORT_STUDENTS_PER_SHARD students, and queueing a subtask
+    to grade each shard. Each subtask stores a partial report; the subtask
+    that completes last queues a final subtask that merges the partial
+    reports, in order, into the report.
+
+    The subtasks are tracked in the InstructorTask like the subtasks of bulk
+    emails, so the task's progress aggregates the counts of all shards, and
+    the task succeeds once the partial reports are merged.
+    """
+    # We need to import this here to avoid a circular dependency, since the
+    # tasks module imports this one.
+    from instructor_task.tasks import calculate_grade_report_shard
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    # Check to see if the shards have already been defined, which happens if
+    # this task is queued again after a loss of connection to the broker.
+    if len(entry.subtasks) > 0 and len(entry.task_output) > 0:
+        TASK_LOG.warning(u"Task %s has already been processed for %s!", entry.task_id, report_name)
+        return json.loads(entry.task_output)
+
+    # Don't queue any subtasks if the report could not be generated anyway.
+    if report_name == PROBLEM_GRADE_REPORT_NAME and not CourseStructure.objects.filter(course_id=course_id).exists():
+        return TaskProgress(action_name, 0, time()).update_task_state(
+            extra_meta={'step': 'Generating course structure. Please refresh and try again.'}
+        )
+
+    enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id).order_by('id')
+    total_num_students = enrolled_students.count()
+    if total_num_students == 0:
+        # Empty subtasks would never complete, so generate the report at once.
+        upload_report = SHARDED_REPORT_UPLOAD_FCNS[report_name]
+        return upload_report(xmodule_instance_args, entry_id, course_id, task_input, action_name)
+
+    timestamp = datetime.now(UTC).strftime(REPORT_TIMESTAMP_FORMAT)
+    merge_subtask_id = str(uuid4())
+    shard_indices = count()
+
+    def _create_shard_subtask(students, initial_subtask_status):
+        """Creates a subtask to grade the next shard of students."""
+        return calculate_grade_report_shard.subtask(
+            (
+                entry_id,
+                report_name,
+                next(shard_indices),
+                [student['pk'] for student in students],
+                timestamp,
+                initial_subtask_status.to_dict(),
+                merge_subtask_id,
+            ),
+            task_id=initial_subtask_status.task_id,
+            routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+        )
+
+    return queue_subtasks_for_query(
+        entry,
+        action_name,
+        _create_shard_subtask,
+        [enrolled_students],
+        [],
+        settings.GRADE_REPORT_STUDENTS_PER_SHARD,
+        total_num_students,
+        final_subtask_id=merge_subtask_id,
+    )
+
+
+def run_grade_report_shard(
+    entry_id, report_name, shard_index, user_ids, timestamp, subtask_status_dict, merge_subtask_id
+):  # pylint: disable=bad-continuation
+    """
+    Grade one shard of the students of a grade report queued by
+    `delegate_grade_report_shards`, and store their rows as partial reports.
+
+    Updates the InstructorTask with the counts of the shard, and queues the
+    merge subtask if this is the last shard to complete.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    TASK_LOG.info(
+        u"Preparing to grade %d students for shard %d of %s as subtask %s for instructor task %d",
+        len(user_ids), shard_index, report_name, current_task_id, entry_id
+    )
+
+    # Raises a DuplicateTaskException if this subtask should not run.
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    try:
+        entry = InstructorTask.objects.get(pk=entry_id)
+        course_id = entry.course_id
+        students = User.objects.filter(id__in=user_ids).order_by('id')
+        task_progress = TaskProgress(json.loads(entry.task_output)['action_name'], len(user_ids), time())
+        task_info_string = (
+            u'Task: {task_id}, InstructorTask ID: {entry_id}, Course: {course_id}, Shard: {index}'
+        ).format(task_id=current_task_id, entry_id=entry_id, course_id=course_id, index=shard_index)
+
+        err_rows = []
+        rows = SHARDED_REPORT_ROWS_FCNS[report_name](course_id, students, task_progress, task_info_string, err_rows)
+
+        report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+        report_date = datetime.strptime(timestamp, REPORT_TIMESTAMP_FORMAT)
+        with dog_stats_api.timer('instructor_tasks.time.shard', tags=[u'report:{}'.format(report_name)]):
+            # The error rows are complete once the rows have been stored.
+            for csv_name, csv_rows in [(report_name, rows), (report_name + '_err', err_rows)]:
+                report_store.store_rows(
+                    course_id,
+                    report_store.partial_filename(_report_csv_filename(csv_name, course_id, report_date), shard_index),
+                    csv_rows
+                )
+    except Exception:
+        # Since we don't know how far the shard got, count all of its
+        # students as having failed, to keep the counts consistent.
+        TASK_LOG.exception(u"Grade report shard %d of instructor task %d failed unexpectedly!", shard_index, entry_id)
+        subtask_status.increment(failed=len(user_ids), state=FAILURE)
+        _complete_grade_report_shard(entry_id, subtask_status, report_name, timestamp, merge_subtask_id)
+        raise
+
+    subtask_status.increment(succeeded=task_progress.succeeded, failed=task_progress.failed, state=SUCCESS)
+    _complete_grade_report_shard(entry_id, subtask_status, report_name, timestamp, merge_subtask_id)
+    return subtask_status.to_dict()
+
+
+def _complete_grade_report_shard(entry_id, subtask_status, report_name, timestamp, merge_subtask_id):
+    """
+    Record the final status of a grade report shard in the InstructorTask,
+    and queue the merge subtask if it is the only subtask left.
+    """
+    # We need to import this here to avoid a circular dependency, since the
+    # tasks module imports this one.
+    from instructor_task.tasks import merge_grade_report_shards
+
+    num_remaining = update_subtask_status(entry_id, subtask_status.task_id, subtask_status)
+    if num_remaining == 1:
+        TASK_LOG.info(u"Queueing the merge of the %s shards of instructor task %d", report_name, entry_id)
+        merge_grade_report_shards.apply_async(
+            (entry_id, report_name, timestamp, SubtaskStatus.create(merge_subtask_id).to_dict()),
+            task_id=merge_subtask_id,
+            routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+        )
+
+
+def run_grade_report_merge(entry_id, report_name, timestamp, subtask_status_dict):
+    """
+    Merge the partial reports stored by the shards of a grade report, in
+    order, into the report, and delete them.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+
+    # Raises a DuplicateTaskException if this subtask should not run.
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    try:
+        entry = InstructorTask.objects.get(pk=entry_id)
+        # All subtasks but this one are shards.
+        num_shards = json.loads(entry.subtasks)['total'] - 1
+        report_date = datetime.strptime(timestamp, REPORT_TIMESTAMP_FORMAT)
+        for csv_name in [report_name, report_name + '_err']:
+            _merge_partial_reports(entry.course_id, csv_name, report_date, num_shards)
+    except Exception:
+        TASK_LOG.exception(u"Merging the %s shards of instructor task %d failed unexpectedly!", report_name, entry_id)
+        subtask_status.increment(state=FAILURE)
+        update_subtask_status(entry_id, current_task_id, subtask_status)
+        raise
+
+    subtask_status.increment(state=SUCCESS)
+    update_subtask_status(entry_id, current_task_id, subtask_status)
+    return subtask_status.to_dict()
+
+
+def _merge_partial_reports(course_id, csv_name, timestamp, num_shards):
+    """
+    Store the CSV named `csv_name` made of the rows of its `num_shards`
+    partial reports, keeping the header of the first one only, if there are
+    any rows besides the header. The partial reports are then deleted.
+    """
+    report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+    filename = _report_csv_filename(csv_name, course_id, timestamp)
+    partial_filenames = [report_store.partial_filename(filename, index) for index in range(num_shards)]
+
+    def _merged_rows():
+        """Yield the header, then the other rows, of all partial reports."""
+        header_stored = False
+        for partial_filename in partial_filenames:
+            partial_rows = report_store.read_rows(course_id, partial_filename)
+            if partial_rows is None:
+                TASK_LOG.warning(u"Partial report %s of course %s is missing.", partial_filename, course_id)
+                continue
+            header = next(partial_rows, None)
+            if header is not None and not header_stored:
+                header_stored = True
+                yield header
+            for row in partial_rows:
+                yield row
+
+    rows = _merged_rows()
+    header = next(rows, None)
+    first_row = next(rows, None)
+    if first_row is not None:
+        upload_csv_to_report_store(chain([header, first_row], rows), csv_name, course_id, timestamp)
+
+    for partial_filename in partial_filenames:
+        report_store.delete(course_id, partial_filename)
+
+
+# Functions that generate the grade reports in a single task, and that compute
+# the rows of a shard of the grade reports, keyed by report name.
+SHARDED_REPORT_UPLOAD_FCNS = {
+    GRADE_REPORT_NAME: upload_grades_csv,
+    PROBLEM_GRADE_REPORT_NAME: upload_problem_grade_report,
+}
+SHARDED_REPORT_ROWS_FCNS = {
+    GRADE_REPORT_NAME: _grade_report_rows,
+    PROBLEM_GRADE_REPORT_NAME: _problem_grade_report_rows,
+}
 
 
 def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
@@ -1459,6 +1726,10 @@ def generate_students_certificates(
     task_progress.update_task_state(extra_meta=current_step)
 
     course = modulestore().get_course(course_id, depth=0)
+    if settings.FEATURES.get('ENABLE_BULK_CERTIFICATE_GENERATION', False):
+        _generate_certificates_in_batches(task_progress, students_require_certs, course, current_step)
+        return task_progress.update_task_state(extra_meta=current_step)
+
     # Generate certificate for each student
     for student in students_require_certs:
         task_progress.attempted += 1
@@ -1476,6 +1747,42 @@ def generate_students_certificates(
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+def _generate_certificates_in_batches(task_progress, students, course, current_step):
+    """
+    Generates the certificates of the given students in batches of
+    settings.CERTIFICATE_GENERATION_BATCH_SIZE, fetching the data of each
+    batch in bulk, and updates the task state after each batch with the
+    throughput of the batch.
+    """
+    students = iter(students)
+    batch_number = 0
+    while True:
+        students_batch = list(islice(students, settings.CERTIFICATE_GENERATION_BATCH_SIZE))
+        if not students_batch:
+            break
+
+        batch_number += 1
+        batch_start_time = time()
+        statuses = generate_user_certificates_in_bulk(students_batch, course.id, course=course)
+        batch_duration = time() - batch_start_time
+
+        for __, status in statuses:
+            task_progress.attempted += 1
+            if CertificateStatuses.is_passing_status(status):
+                task_progress.succeeded += 1
+            else:
+                task_progress.failed += 1
+
+        batch_meta = {
+            'batch': batch_number,
+            'batch_students': len(students_batch),
+            'batch_duration_ms': int(batch_duration * 1000),
+            'batch_students_per_second': round(len(students_batch) / batch_duration, 2) if batch_duration else None,
+        }
+        batch_meta.update(current_step)
+        task_progress.update_task_state(extra_meta=batch_meta)
+
+
 def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
     """
     Within a given course, cohort students in bulk, then upload the results
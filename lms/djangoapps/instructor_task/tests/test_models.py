@@ -4,6 +4,7 @@ Tests for instructor_task/models.py.
 
 from cStringIO import StringIO
 import mock
+import os
 import time
 from datetime import datetime
 from unittest import TestCase
@@ -25,6 +26,10 @@ class MockKey(object):
         """ Expected method on a Key object. """
         self.bucket.store_key(self)
 
+    def set_contents_from_file(self, file_obj, headers, rewind):  # pylint: disable=unused-argument
+        """ Expected method on a Key object. """
+        self.bucket.store_key(self)
+
     def generate_url(self, expires_in):  # pylint: disable=unused-argument
         """ Expected method on a Key object. """
         return "http://fake-edx-s3.edx.org/"
@@ -93,6 +98,60 @@ class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, TestCase
         """ Create and return a LocalFSReportStore. """
         return LocalFSReportStore.from_config(config_name='GRADES_DOWNLOAD')
 
+    def test_partial_reports(self):
+        """
+        Test that partial reports can be read back and deleted, and are
+        not listed as downloadable.
+        """
+        report_store = self.create_report_store()
+        partial_filename = report_store.partial_filename('report.csv', 3)
+        self.assertEqual(partial_filename, 'report.csv.part00003')
+        rows = [[u'username', u'grade'], [u'ni\xf1o', u'0.5']]
+        report_store.store_rows(self.course_id, partial_filename, rows)
+        report_store.store_rows(self.course_id, 'report.csv', rows[:1])
+
+        self.assertEqual([link[0] for link in report_store.links_for(self.course_id)], ['report.csv'])
+        self.assertEqual(list(report_store.read_rows(self.course_id, partial_filename)), rows)
+
+        report_store.delete(self.course_id, partial_filename)
+        self.assertIsNone(report_store.read_rows(self.course_id, partial_filename))
+
+    def test_store_rows_from_generator(self):
+        """
+        Test that rows can be stored from a generator, and that no
+        temporary files are left behind.
+        """
+        report_store = self.create_report_store()
+        report_store.store_rows(self.course_id, 'report.csv', ([u'row{}'.format(index)] for index in range(3)))
+
+        self.assertEqual(
+            list(report_store.read_rows(self.course_id, 'report.csv')),
+            [[u'row0'], [u'row1'], [u'row2']]
+        )
+        self.assertEqual(
+            os.listdir(report_store.root_path),
+            [os.path.basename(os.path.dirname(report_store.path_to(self.course_id, 'report.csv')))]
+        )
+
+    def test_store_rows_failure(self):
+        """
+        Test that no file is stored when generating the rows fails.
+        """
+        def failing_rows():
+            """ Yield a row, then fail. """
+            yield [u'row0']
+            raise ValueError
+
+        report_store = self.create_report_store()
+        with self.assertRaises(ValueError):
+            report_store.store_rows(self.course_id, 'report.csv', failing_rows())
+
+        self.assertEqual(report_store.links_for(self.course_id), [])
+        self.assertEqual(
+            os.listdir(report_store.root_path),
+            [os.path.basename(os.path.dirname(report_store.path_to(self.course_id, 'report.csv')))]
+        )
+
 
 @mock.patch('instructor_task.models.S3Connection', new=MockS3Connection)
 @mock.patch('instructor_task.models.Key', new=MockKey)
@@ -105,3 +164,27 @@ class S3ReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, TestCase):
     def create_report_store(self):
         """ Create and return a S3ReportStore. """
         return S3ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+
+    def test_store_rows(self):
+        """
+        Test that small reports are uploaded in one request.
+        """
+        report_store = self.create_report_store()
+        report_store.store_rows(self.course_id, 'report.csv', ([u'row{}'.format(index)] for index in range(3)))
+        self.assertEqual([link[0] for link in report_store.links_for(self.course_id)], ['report.csv'])
+
+    @mock.patch('instructor_task.models.S3_MULTIPART_CHUNK_SIZE', 10)
+    def test_store_rows_multipart(self):
+        """
+        Test that large reports are uploaded in parts.
+        """
+        report_store = self.create_report_store()
+        report_store.bucket = mock.Mock()
+        multipart_upload = report_store.bucket.initiate_multipart_upload.return_value
+        report_store.store_rows(self.course_id, 'report.csv', ([u'row{}'.format(index)] for index in range(100)))
+
+        calls = multipart_upload.upload_part_from_file.call_args_list
+        self.assertGreater(len(calls), 1)
+        self.assertEqual([call[0][1] for call in calls], range(1, len(calls) + 1))
+        self.assertTrue(all(call[1]['size'] <= 10 for call in calls))
+        multipart_upload.complete_upload.assert_called_once_with()
@@ -8,11 +8,14 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 
 """
 
+import json
 import os
 import shutil
 from datetime import datetime
 import urllib
+from uuid import uuid4
 
+from celery.states import SUCCESS
 import ddt
 from freezegun import freeze_time
 from mock import Mock, patch
@@ -45,10 +48,12 @@ from student.models import CourseEnrollment, CourseEnrollmentAllowed, ManualEnro
 from lms.djangoapps.verify_student.tests.factories import SoftwareSecurePhotoVerificationFactory
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.partitions.partitions import Group, UserPartition
-from instructor_task.models import ReportStore
+from instructor_task.models import InstructorTask, ReportStore
+from instructor_task.tests.factories import InstructorTaskFactory
 from survey.models import SurveyForm, SurveyAnswer
 from instructor_task.tasks_helper import (
     cohort_students_and_upload,
+    delegate_grade_report_shards,
     upload_problem_responses_csv,
     upload_grades_csv,
     upload_problem_grade_report,
@@ -61,6 +66,7 @@ from instructor_task.tasks_helper import (
     upload_ora2_data,
     UPDATE_STATUS_FAILED,
     UPDATE_STATUS_SUCCEEDED,
+    GRADE_REPORT_NAME,
 )
 from instructor_analytics.basic import UNAVAILABLE
 from openedx.core.djangoapps.util.testing import ContentGroupTestCase, TestConditionalContent
@@ -343,6 +349,74 @@ class TestTeamGradeReport(InstructorGradeReportTestCase):
         self._verify_cell_data_for_user(self.student2.username, self.course.id, 'Team Name', team2.name)
 
 
+@patch.dict(settings.FEATURES, {'ENABLE_SHARDED_GRADE_REPORTS': True})
+@override_settings(GRADE_REPORT_STUDENTS_PER_SHARD=2)
+class TestShardedGradeReport(InstructorGradeReportTestCase):
+    """
+    Tests that grade reports generated in shards match the reports
+    generated by a single task.
+    """
+    def setUp(self):
+        super(TestShardedGradeReport, self).setUp()
+        self.course = CourseFactory.create()
+        self.students = [
+            self.create_student(u'student{}'.format(index), u'student{}@example.com'.format(index))
+            for index in range(5)
+        ]
+        self.entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_type='grade_course',
+            task_id=str(uuid4()),
+        )
+
+    def _delegate_shards(self):
+        """
+        Generates the grade report in shards, which are run eagerly in tests.
+        """
+        with patch('instructor_task.tasks_helper._get_current_task'):
+            return delegate_grade_report_shards(
+                GRADE_REPORT_NAME, None, self.entry.id, self.course.id, {}, 'graded'
+            )
+
+    def _get_report_rows(self):
+        """
+        Returns the rows of the only grade report listed for the course.
+        """
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        links = report_store.links_for(self.course.id)
+        self.assertEqual(len(links), 1)
+        with open(report_store.path_to(self.course.id, links[0][0])) as csv_file:
+            return list(unicodecsv.DictReader(csv_file))
+
+    def test_shards_are_merged(self):
+        self._delegate_shards()
+        rows = self._get_report_rows()
+        self.assertEqual(
+            [row['username'] for row in rows],
+            [student.username for student in self.students],
+        )
+
+    def test_progress_is_aggregated(self):
+        self._delegate_shards()
+        entry = InstructorTask.objects.get(pk=self.entry.id)
+        self.assertEqual(entry.task_state, SUCCESS)
+        self.assertDictContainsSubset(
+            {'attempted': 5, 'succeeded': 5, 'failed': 0},
+            json.loads(entry.task_output),
+        )
+        # One subtask for each of the three shards, and one for the merge.
+        self.assertEqual(json.loads(entry.subtasks)['total'], 4)
+
+    def test_matches_single_task_report(self):
+        self._delegate_shards()
+        sharded_rows = self._get_report_rows()
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        report_store.delete(self.course.id, report_store.links_for(self.course.id)[0][0])
+        with patch('instructor_task.tasks_helper._get_current_task'):
+            upload_grades_csv(None, None, self.course.id, None, 'graded')
+        self.assertEqual(sharded_rows, self._get_report_rows())
+
+
 class TestProblemResponsesReport(TestReportMixin, InstructorTaskCourseTestCase):
     """
     Tests that generation of CSV files listing student answers to a
@@ -1723,6 +1797,51 @@ class TestCertificateGeneration(InstructorTaskModuleTestCase):
         with self.assertNumQueries(214):
             self.assertCertificatesGenerated(task_input, expected_results)
 
+    @patch.dict(settings.FEATURES, {'ENABLE_BULK_CERTIFICATE_GENERATION': True})
+    @override_settings(CERTIFICATE_GENERATION_BATCH_SIZE=3)
+    def test_bulk_certificate_generation_for_students(self):
+        """
+        Verify that certificates generated in batches are the same as when generated
+        one student at a time, and that the throughput of each batch is reported.
+        """
+        students = self._create_students(10)
+        for student in students[:2]:
+            GeneratedCertificateFactory.create(
+                user=student,
+                course_id=self.course.id,
+                status=CertificateStatuses.downloadable,
+                mode='honor'
+            )
+        for student in students[2:7]:
+            CertificateWhitelistFactory.create(user=student, course_id=self.course.id, whitelist=True)
+
+        task_input = {'student_set': None}
+        expected_results = {
+            'action_name': 'certificates generated',
+            'total': 10,
+            'attempted': 8,
+            'succeeded': 5,
+            'failed': 3,
+            'skipped': 2
+        }
+        current_task = self.assertCertificatesGenerated(task_input, expected_results)
+
+        batch_metas = [
+            kwargs['meta'] for __, kwargs in current_task.update_state.call_args_list if 'batch' in kwargs['meta']
+        ]
+        self.assertEqual([meta['batch'] for meta in batch_metas], [1, 2, 3])
+        self.assertEqual([meta['batch_students'] for meta in batch_metas], [3, 3, 2])
+        for meta in batch_metas:
+            self.assertEqual(meta['step'], 'Generating Certificates')
+            self.assertIn('batch_duration_ms', meta)
+            self.assertIn('batch_students_per_second', meta)
+        self.assertEqual(
+            GeneratedCertificate.objects.filter(  # pylint: disable=no-member
+                course_id=self.course.id, status=CertificateStatuses.generating
+            ).count(),
+            5
+        )
+
     @ddt.data(
         CertificateStatuses.downloadable,
         CertificateStatuses.generating,
@@ -2212,6 +2331,7 @@ class TestCertificateGeneration(InstructorTaskModuleTestCase):
             expected_results,
             result
         )
+        return current_task
 
     def _create_students(self, number_of_students):
         """
@@ -249,6 +249,7 @@ BULK_EMAIL_MAX_RETRIES = ENV_TOKENS.get('BULK_EMAIL_MAX_RETRIES', BULK_EMAIL_MAX
 BULK_EMAIL_INFINITE_RETRY_CAP = ENV_TOKENS.get('BULK_EMAIL_INFINITE_RETRY_CAP', BULK_EMAIL_INFINITE_RETRY_CAP)
 BULK_EMAIL_LOG_SENT_EMAILS = ENV_TOKENS.get('BULK_EMAIL_LOG_SENT_EMAILS', BULK_EMAIL_LOG_SENT_EMAILS)
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = ENV_TOKENS.get('BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS', BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
+BULK_EMAIL_SMTP_CONNECTIONS = ENV_TOKENS.get('BULK_EMAIL_SMTP_CONNECTIONS', BULK_EMAIL_SMTP_CONNECTIONS)
 # We want Bulk Email running on the high-priority queue, so we define the
 # routing key that points to it. At the moment, the name is the same.
 # We have to reset the value here, since we have changed the value of the queue name.
@@ -297,6 +298,13 @@ VIRTUAL_UNIVERSITIES = ENV_TOKENS.get('VIRTUAL_UNIVERSITIES', [])
 META_UNIVERSITIES = ENV_TOKENS.get('META_UNIVERSITIES', {})
 COMMENTS_SERVICE_URL = ENV_TOKENS.get("COMMENTS_SERVICE_URL", '')
 COMMENTS_SERVICE_KEY = ENV_TOKENS.get("COMMENTS_SERVICE_KEY", '')
+COMMENTS_SERVICE_CONNECTION_POOL_SIZE = ENV_TOKENS.get(
+    "COMMENTS_SERVICE_CONNECTION_POOL_SIZE", COMMENTS_SERVICE_CONNECTION_POOL_SIZE
+)
+COMMENTS_SERVICE_CONCURRENT_REQUESTS = ENV_TOKENS.get(
+    "COMMENTS_SERVICE_CONCURRENT_REQUESTS", COMMENTS_SERVICE_CONCURRENT_REQUESTS
+)
+GRADE_HISTOGRAMS_CACHE_TIMEOUT = ENV_TOKENS.get("GRADE_HISTOGRAMS_CACHE_TIMEOUT", GRADE_HISTOGRAMS_CACHE_TIMEOUT)
 CERT_QUEUE = ENV_TOKENS.get("CERT_QUEUE", 'test-pull')
 ZENDESK_URL = ENV_TOKENS.get("ZENDESK_URL")
 FEEDBACK_SUBMISSION_EMAIL = ENV_TOKENS.get("FEEDBACK_SUBMISSION_EMAIL")
@@ -566,6 +574,7 @@ VERIFY_STUDENT = AUTH_TOKENS.get("VERIFY_STUDENT", VERIFY_STUDENT)
 GRADES_DOWNLOAD_ROUTING_KEY = HIGH_MEM_QUEUE
 
 GRADES_DOWNLOAD = ENV_TOKENS.get("GRADES_DOWNLOAD", GRADES_DOWNLOAD)
+GRADE_REPORT_STUDENTS_PER_SHARD = ENV_TOKENS.get('GRADE_REPORT_STUDENTS_PER_SHARD', GRADE_REPORT_STUDENTS_PER_SHARD)
 
 # financial reports
 FINANCIAL_REPORTS = ENV_TOKENS.get("FINANCIAL_REPORTS", FINANCIAL_REPORTS)
@@ -684,6 +693,22 @@ COURSE_ABOUT_VISIBILITY_PERMISSION = ENV_TOKENS.get(
 # Enrollment API Cache Timeout
 ENROLLMENT_COURSE_DETAILS_CACHE_TIMEOUT = ENV_TOKENS.get('ENROLLMENT_COURSE_DETAILS_CACHE_TIMEOUT', 60)
 
+# Block Structures local cache size
+BLOCK_STRUCTURES_LOCAL_CACHE_SIZE = ENV_TOKENS.get(
+    'BLOCK_STRUCTURES_LOCAL_CACHE_SIZE',
+    BLOCK_STRUCTURES_LOCAL_CACHE_SIZE
+)
+
+# Batched grading
+GRADES_BATCH_SIZE = ENV_TOKENS.get('GRADES_BATCH_SIZE', GRADES_BATCH_SIZE)
+
+# Bulk certificate generation
+CERTIFICATE_GENERATION_BATCH_SIZE = ENV_TOKENS.get(
+    'CERTIFICATE_GENERATION_BATCH_SIZE',
+    CERTIFICATE_GENERATION_BATCH_SIZE
+)
+CERTIFICATE_XQUEUE_POOL_SIZE = ENV_TOKENS.get('CERTIFICATE_XQUEUE_POOL_SIZE', CERTIFICATE_XQUEUE_POOL_SIZE)
+
 # PDF RECEIPT/INVOICE OVERRIDES
 PDF_RECEIPT_TAX_ID = ENV_TOKENS.get('PDF_RECEIPT_TAX_ID', PDF_RECEIPT_TAX_ID)
 PDF_RECEIPT_FOOTER_TEXT = ENV_TOKENS.get('PDF_RECEIPT_FOOTER_TEXT', PDF_RECEIPT_FOOTER_TEXT)
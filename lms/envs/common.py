@@ -60,6 +60,14 @@ DISCUSSION_SETTINGS = {
     'MAX_COMMENT_DEPTH': 2,
 }
 
+# Number of connections to the comments service kept alive for reuse by each
+# process. 0 = new connection per request.
+COMMENTS_SERVICE_CONNECTION_POOL_SIZE = 10
+
+# Number of independent requests to the comments service a view may make at
+# the same time. 0 = one after the other.
+COMMENTS_SERVICE_CONCURRENT_REQUESTS = 4
+
 
 # Features
 FEATURES = {
@@ -363,8 +371,38 @@ FEATURES = {
     # lives in the Extended table, saving the frontend from
     # making multiple queries.
     'ENABLE_READING_FROM_MULTIPLE_HISTORY_TABLES': True,
+
+    # Upon course publish, update the collected course block structures
+    # incrementally, re-collecting only the changed blocks, instead of
+    # clearing and fully re-collecting them.
+    'ENABLE_INCREMENTAL_BLOCK_STRUCTURE_COLLECT': False,
+
+    # Grade the students of course grade reports in batches, bulk-fetching
+    # their scores, instead of one student at a time.
+    'ENABLE_BATCHED_GRADING': False,
+
+    # Generate grade reports by grading shards of the enrolled students in
+    # parallel subtasks, whose partial reports are then merged.
+    'ENABLE_SHARDED_GRADE_REPORTS': False,
+
+    # Generate certificates in instructor tasks for batches of students,
+    # fetching their data in bulk and sending their certificate requests
+    # to the XQueue concurrently, instead of one student at a time.
+    'ENABLE_BULK_CERTIFICATE_GENERATION': False,
+
+    # Read the problem grade and subsection open distributions of the
+    # Metrics tab from counts kept up to date as student state changes,
+    # and cache the course layout it shows, instead of aggregating over
+    # all student state and walking the course on each view.  Run the
+    # rebuild_class_dashboard_counts command before turning this on.
+    'ENABLE_CLASS_DASHBOARD_AGGREGATES': False,
 }
 
+# Seconds for which the grade counts of the problems of a course, used for the
+# histograms shown to staff when DISPLAY_HISTOGRAMS_TO_STAFF is enabled, are
+# cached before being queried again.
+GRADE_HISTOGRAMS_CACHE_TIMEOUT = 15 * 60
+
 # Ignore static asset files on import which match this pattern
 ASSET_IGNORE_REGEX = r"(^\._.*$)|(^\.DS_Store$)|(^.*~$)"
 
@@ -1805,6 +1843,11 @@ BULK_EMAIL_LOG_SENT_EMAILS = False
 # parallel, and what the SES rate is.
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = 0.02
 
+# Number of SMTP connections that each bulk email task opens to send its
+# messages in parallel, one thread per connection.  The delay above applies
+# between the messages sent on each connection.
+BULK_EMAIL_SMTP_CONNECTIONS = 4
+
 ############################# Email Opt In ####################################
 
 # Minimum age for organization-wide email opt in
@@ -2051,6 +2094,9 @@ INSTALLED_APPS = (
     # Gating of course content
     'gating.apps.GatingConfig',
 
+    # Metrics tab of the Instructor dashboard, shown with FEATURES['CLASS_DASHBOARD']
+    'class_dashboard.apps.ClassDashboardConfig',
+
     # Static i18n support
     'statici18n',
 
@@ -2258,8 +2304,6 @@ VERIFY_STUDENT = {
 
 ### This enables the Metrics tab for the Instructor dashboard ###########
 FEATURES['CLASS_DASHBOARD'] = False
-if FEATURES.get('CLASS_DASHBOARD'):
-    INSTALLED_APPS += ('class_dashboard',)
 
 ################ Enable credit eligibility feature ####################
 ENABLE_CREDIT_ELIGIBILITY = True
@@ -2344,6 +2388,10 @@ FINANCIAL_REPORTS = {
     'ROOT_PATH': '/tmp/edx-s3/financial_reports',
 }
 
+# Number of students graded by each subtask of grade reports that are
+# generated with ENABLE_SHARDED_GRADE_REPORTS.
+GRADE_REPORT_STUDENTS_PER_SHARD = 1000
+
 #### PASSWORD POLICY SETTINGS #####
 PASSWORD_MIN_LENGTH = 8
 PASSWORD_MAX_LENGTH = None
@@ -2638,6 +2686,20 @@ COURSE_ABOUT_VISIBILITY_PERMISSION = 'see_exists'
 # Enrollment API Cache Timeout
 ENROLLMENT_COURSE_DETAILS_CACHE_TIMEOUT = 60
 
+# Maximum size, in bytes, of the process-local cache of collected course
+# block structures kept in front of the django cache.  Set to 0 to disable.
+BLOCK_STRUCTURES_LOCAL_CACHE_SIZE = 64 * 1024 * 1024
+
+# Number of students whose scores are fetched together when grading
+# with ENABLE_BATCHED_GRADING.
+GRADES_BATCH_SIZE = 100
+
+# Number of students whose certificates are generated together with
+# ENABLE_BULK_CERTIFICATE_GENERATION, and number of concurrent
+# connections their certificate requests are sent to the XQueue with.
+CERTIFICATE_GENERATION_BATCH_SIZE = 100
+CERTIFICATE_XQUEUE_POOL_SIZE = 8
+
 
 OAUTH_ID_TOKEN_EXPIRATION = 60 * 60
 
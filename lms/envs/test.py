@@ -60,6 +60,15 @@ FEATURES['DISABLE_START_DATES'] = True
 # the one in cms/envs/test.py
 FEATURES['ENABLE_DISCUSSION_SERVICE'] = False
 
+# Tests mock requests.request and check the order of the requests made to the
+# comments service, so make them without a session, one after the other.
+COMMENTS_SERVICE_CONNECTION_POOL_SIZE = 0
+COMMENTS_SERVICE_CONCURRENT_REQUESTS = 0
+
+# Tests mock the email connection and check the order of the messages sent
+# by bulk email tasks, so send them from a single connection.
+BULK_EMAIL_SMTP_CONNECTIONS = 1
+
 FEATURES['ENABLE_SERVICE_STATUS'] = True
 
 FEATURES['ENABLE_SHOPPING_CART'] = True
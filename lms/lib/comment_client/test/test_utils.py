@@ -0,0 +1,123 @@
+"""
+Tests for the comment client utilities.
+"""
+from httplib import HTTPMessage
+from StringIO import StringIO
+from threading import current_thread
+
+import requests
+from django.test import TestCase
+from django.test.utils import override_settings
+from mock import Mock, patch
+from requests.cookies import MockRequest, MockResponse
+
+from django_comment_common.models import ForumsConfig
+from lms.lib.comment_client import utils
+from request_cache.middleware import RequestCache
+
+
+def make_response(data):
+    """
+    Return a mock comments service response with the given JSON data.
+    """
+    return Mock(status_code=200, text='', json=Mock(return_value=data))
+
+
+class PerformRequestTestCase(TestCase):
+    """
+    Tests for perform_request's reuse of connections and configuration.
+    """
+    def setUp(self):
+        super(PerformRequestTestCase, self).setUp()
+        RequestCache.clear_request_cache()
+        self.addCleanup(RequestCache.clear_request_cache)
+
+    @override_settings(COMMENTS_SERVICE_CONNECTION_POOL_SIZE=2)
+    @patch('requests.request')
+    @patch('requests.Session.request')
+    def test_session_is_reused(self, mock_session_request, mock_request):
+        mock_session_request.return_value = make_response({'id': 'dummy'})
+
+        self.assertEqual(utils.perform_request('get', 'http://localhost/one'), {'id': 'dummy'})
+        self.assertEqual(utils.perform_request('get', 'http://localhost/two'), {'id': 'dummy'})
+        self.assertEqual(mock_session_request.call_count, 2)
+        self.assertFalse(mock_request.called)
+        self.assertIs(utils.get_session(), utils.get_session())
+
+    @override_settings(COMMENTS_SERVICE_CONNECTION_POOL_SIZE=2)
+    def test_session_keeps_no_cookies(self):
+        session = utils.get_session()
+        request = requests.Request('get', 'http://localhost/one').prepare()
+        response = MockResponse(HTTPMessage(StringIO('Set-Cookie: stickiness=server1\r\n\r\n')))
+
+        session.cookies.extract_cookies(response, MockRequest(request))
+        self.assertEqual(len(session.cookies), 0)
+
+    @override_settings(COMMENTS_SERVICE_CONNECTION_POOL_SIZE=0)
+    @patch('requests.request')
+    def test_no_session(self, mock_request):
+        mock_request.return_value = make_response({})
+
+        self.assertIsNone(utils.get_session())
+        utils.perform_request('get', 'http://localhost/one')
+        self.assertEqual(mock_request.call_count, 1)
+
+    @override_settings(COMMENTS_SERVICE_CONNECTION_POOL_SIZE=0)
+    @patch('requests.request')
+    @patch.object(ForumsConfig, 'current')
+    def test_forums_config_read_once_per_request(self, mock_current, mock_request):
+        mock_request.return_value = make_response({})
+        mock_current.return_value = ForumsConfig(connection_timeout=7.0)
+
+        utils.perform_request('get', 'http://localhost/one')
+        utils.perform_request('get', 'http://localhost/two')
+        self.assertEqual(mock_current.call_count, 1)
+        for call in mock_request.call_args_list:
+            self.assertEqual(call[1]['timeout'], 7.0)
+
+        # The configuration is read again for the next request.
+        RequestCache.clear_request_cache()
+        utils.perform_request('get', 'http://localhost/three')
+        self.assertEqual(mock_current.call_count, 2)
+
+
+@override_settings(COMMENTS_SERVICE_CONCURRENT_REQUESTS=2)
+class PerformConcurrentlyTestCase(TestCase):
+    """
+    Tests for perform_concurrently.
+    """
+    def test_results_in_order(self):
+        results = utils.perform_concurrently(
+            lambda: 1,
+            lambda: 2,
+            lambda: 3,
+        )
+        self.assertEqual(results, [1, 2, 3])
+
+    def test_first_function_in_current_thread(self):
+        threads = utils.perform_concurrently(current_thread, current_thread)
+        self.assertIs(threads[0], current_thread())
+        self.assertIsNot(threads[1], current_thread())
+
+    def test_exception_is_raised(self):
+        def fail():
+            """
+            Raise an error from a pool thread.
+            """
+            raise utils.CommentClientRequestError('Not found', 404)
+
+        with self.assertRaises(utils.CommentClientRequestError) as context:
+            utils.perform_concurrently(lambda: 1, fail)
+        self.assertEqual(context.exception.status_code, 404)
+
+    def test_nested_calls_are_serial(self):
+        results = utils.perform_concurrently(
+            lambda: 1,
+            lambda: utils.perform_concurrently(current_thread, current_thread),
+        )
+        self.assertIs(results[1][0], results[1][1])
+
+    @override_settings(COMMENTS_SERVICE_CONCURRENT_REQUESTS=0)
+    def test_serial_without_thread_pool(self):
+        threads = utils.perform_concurrently(current_thread, current_thread)
+        self.assertEqual(threads, [current_thread(), current_thread()])
@@ -1,15 +1,37 @@
 """" Common utilities for comment client wrapper """
 from contextlib import contextmanager
+from cookielib import DefaultCookiePolicy
 import dogstats_wrapper as dog_stats_api
+from functools import partial
 import logging
+from multiprocessing.pool import ThreadPool
+import os
 import requests
+from requests.adapters import HTTPAdapter
 from django.conf import settings
+from django.db import close_old_connections
+from threading import Lock, local
 from time import time
 from uuid import uuid4
+from django.utils import translation
 from django.utils.translation import get_language
 
+import request_cache
+from request_cache.middleware import RequestCache
+
 log = logging.getLogger(__name__)
 
+FORUMS_CONFIG_CACHE_NAME = 'comment_client.forums_config'
+
+# The process-wide session and thread pool, along with the id of the process
+# that created them, so that forked processes create their own.
+_SESSION = {}
+_THREAD_POOL = {}
+_LOCK = Lock()
+
+# Marks the threads of the thread pool.
+_THREAD_STATE = local()
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
@@ -51,11 +73,115 @@ def request_timer(request_id, method, url, tags=None):
     )
 
 
-def perform_request(method, url, data_or_params=None, raw=False,
-                    metric_action=None, metric_tags=None, paged_results=False):
+def _get_for_process(instances, create):
+    """
+    Return the instance stored in `instances` for the current process,
+    replacing it with the result of `create()` if it was created by another
+    process (e.g. before the current process was forked).
+    """
+    pid = os.getpid()
+    if instances.get('pid') != pid:
+        with _LOCK:
+            if instances.get('pid') != pid:
+                instances['instance'] = create()
+                instances['pid'] = pid
+    return instances['instance']
+
+
+def _create_session():
+    """
+    Return a session that keeps up to COMMENTS_SERVICE_CONNECTION_POOL_SIZE
+    connections to the comments service alive, for reuse by later requests.
+
+    The session is shared by the requests made for all users, so it rejects
+    any cookies set by the comments service (or a load balancer in front of
+    it), which would otherwise be sent along with every later request.
+    """
+    pool_size = settings.COMMENTS_SERVICE_CONNECTION_POOL_SIZE
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session():
+    """
+    Return the process-wide session used to make requests to the comments
+    service, or None if COMMENTS_SERVICE_CONNECTION_POOL_SIZE is 0, in which
+    case each request is made on a new connection.
+    """
+    if not getattr(settings, 'COMMENTS_SERVICE_CONNECTION_POOL_SIZE', 0):
+        return None
+    return _get_for_process(_SESSION, _create_session)
+
+
+def get_forums_config():
+    """
+    Return the current ForumsConfig, which is read once per request.
+    """
     # To avoid dependency conflict
     from django_comment_common.models import ForumsConfig
 
+    forums_config_cache = request_cache.get_cache(FORUMS_CONFIG_CACHE_NAME)
+    if 'config' not in forums_config_cache:
+        forums_config_cache['config'] = ForumsConfig.current()
+    return forums_config_cache['config']
+
+
+def _get_thread_pool():
+    """
+    Return the process-wide pool of threads used to make concurrent requests
+    to the comments service, or None if COMMENTS_SERVICE_CONCURRENT_REQUESTS
+    is 0.
+    """
+    num_threads = getattr(settings, 'COMMENTS_SERVICE_CONCURRENT_REQUESTS', 0)
+    if not num_threads:
+        return None
+    return _get_for_process(_THREAD_POOL, partial(ThreadPool, num_threads))
+
+
+def _call_in_pool_thread(language, forums_config, function):
+    """
+    Call `function` in a thread of the thread pool, with the given language
+    activated and ForumsConfig cached as in the thread that queued it.
+    """
+    _THREAD_STATE.in_pool = True
+    request_cache.get_cache(FORUMS_CONFIG_CACHE_NAME)['config'] = forums_config
+    try:
+        with translation.override(language):
+            return function()
+    finally:
+        RequestCache.clear_request_cache()
+        close_old_connections()
+
+
+def perform_concurrently(*functions):
+    """
+    Call the given functions, which make independent requests to the comments
+    service, concurrently, and return the list of their results.
+
+    The first function is called in the current thread, so it may use the
+    database or other per-thread state. The others are called on the
+    process-wide thread pool, and should only make requests to the comments
+    service. If any function raises an exception, it is re-raised here.
+
+    The functions are called one after the other if there is no thread pool,
+    or if called from a thread of the pool.
+    """
+    thread_pool = _get_thread_pool()
+    if thread_pool is None or len(functions) < 2 or getattr(_THREAD_STATE, 'in_pool', False):
+        return [function() for function in functions]
+
+    call = partial(_call_in_pool_thread, get_language(), get_forums_config())
+    async_results = [thread_pool.apply_async(call, (function,)) for function in functions[1:]]
+    first_result = functions[0]()
+    return [first_result] + [async_result.get() for async_result in async_results]
+
+
+def perform_request(method, url, data_or_params=None, raw=False,
+                    metric_action=None, metric_tags=None, paged_results=False):
     if metric_tags is None:
         metric_tags = []
 
@@ -79,8 +205,9 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = merge_dict(data_or_params, request_id_dict)
     with request_timer(request_id, method, url, metric_tags):
-        config = ForumsConfig.current()
-        response = requests.request(
+        config = get_forums_config()
+        session = get_session()
+        response = (session or requests).request(
             method,
             url,
             data=data,
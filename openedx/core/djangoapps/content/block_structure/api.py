@@ -1,11 +1,18 @@
 """
 Higher order functions built on the BlockStructureManager to interact with a django cache.
 """
+from django.conf import settings
 from django.core.cache import cache
+from openedx.core.lib.block_structure.local_cache import BlockStructureLocalCache
 from openedx.core.lib.block_structure.manager import BlockStructureManager
 from xmodule.modulestore.django import modulestore
 
 
+# Process-local cache tier in front of the Block Structures in the
+# django cache, created upon first use.
+_LOCAL_CACHE = None
+
+
 def get_course_in_cache(course_key):
     """
     A higher order function implemented on top of the
@@ -19,13 +26,24 @@ def get_course_in_cache(course_key):
     return get_block_structure_manager(course_key).get_collected()
 
 
-def update_course_in_cache(course_key):
+def update_course_in_cache(course_key, incremental=False):
     """
     A higher order function implemented on top of the
     block_structure.updated_collected function that updates the block
     structure in the cache for the given course_key.
+
+    If incremental, only the data of the blocks that changed since the
+    block structure was last collected is re-collected.
+    """
+    return get_block_structure_manager(course_key).update_collected(incremental=incremental)
+
+
+def is_incremental_collect_enabled():
     """
-    return get_block_structure_manager(course_key).update_collected()
+    Returns whether block structures are to be updated incrementally
+    when courses are published.
+    """
+    return settings.FEATURES.get('ENABLE_INCREMENTAL_BLOCK_STRUCTURE_COLLECT', False)
 
 
 def clear_course_from_cache(course_key):
@@ -48,7 +66,7 @@ def get_block_structure_manager(course_key):
     """
     store = modulestore()
     course_usage_key = store.make_course_usage_key(course_key)
-    return BlockStructureManager(course_usage_key, store, get_cache())
+    return BlockStructureManager(course_usage_key, store, get_cache(), get_local_cache())
 
 
 def get_cache():
@@ -56,3 +74,20 @@ def get_cache():
     Returns the storage for caching Block Structures.
     """
     return cache
+
+
+def get_local_cache():
+    """
+    Returns the process-local cache tier for Block Structures, or None
+    if it is disabled by a BLOCK_STRUCTURES_LOCAL_CACHE_SIZE of 0.
+
+    The returned cache's hits, misses and evictions attributes can be
+    used to monitor its effectiveness.
+    """
+    global _LOCAL_CACHE  # pylint: disable=global-statement
+    max_size_in_bytes = getattr(settings, 'BLOCK_STRUCTURES_LOCAL_CACHE_SIZE', 0)
+    if not max_size_in_bytes:
+        return None
+    if _LOCAL_CACHE is None:
+        _LOCAL_CACHE = BlockStructureLocalCache(max_size_in_bytes)
+    return _LOCAL_CACHE
@@ -5,7 +5,7 @@ from django.dispatch.dispatcher import receiver
 
 from xmodule.modulestore.django import SignalHandler
 
-from .api import clear_course_from_cache
+from .api import clear_course_from_cache, is_incremental_collect_enabled
 from .tasks import update_course_in_cache
 
 
@@ -14,12 +14,22 @@ def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable
     """
     Catches the signal that a course has been published in the module
     store and creates/updates the corresponding cache entry.
+
+    Clearing the course from the cache also evicts it from this
+    process' local cache tier.  Other processes detect the update
+    through the changed collected-version stamp in the shared cache.
+
+    When incremental collects are enabled, the cache entry is not
+    cleared, since the update diffs against the previously collected
+    data.  It is replaced once the update completes.
     """
-    clear_course_from_cache(course_key)
+    incremental = is_incremental_collect_enabled()
+    if not incremental:
+        clear_course_from_cache(course_key)
 
     # The countdown=0 kwarg ensures the call occurs after the signal emitter
     # has finished all operations.
-    update_course_in_cache.apply_async([unicode(course_key)], countdown=0)
+    update_course_in_cache.apply_async([unicode(course_key)], {'incremental': incremental}, countdown=0)
 
 
 @receiver(SignalHandler.course_deleted)
@@ -11,9 +11,10 @@ log = logging.getLogger('edx.celery.task')
 
 
 @task
-def update_course_in_cache(course_key):
+def update_course_in_cache(course_key, incremental=False):
     """
     Updates the course blocks (in the database) for the specified course.
+    If incremental, only the changed blocks are re-collected.
     """
     course_key = CourseKey.from_string(course_key)
-    api.update_course_in_cache(course_key)
+    api.update_course_in_cache(course_key, incremental=incremental)
@@ -1,6 +1,9 @@
 """
 Unit tests for the Course Blocks signals
 """
+import ddt
+from django.conf import settings
+from mock import patch
 
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
@@ -10,6 +13,7 @@ from ..api import get_block_structure_manager
 from .helpers import is_course_in_block_structure_cache, EnableTransformerRegistryMixin
 
 
+@ddt.ddt
 class CourseBlocksSignalTest(EnableTransformerRegistryMixin, ModuleStoreTestCase):
     """
     Tests for the Course Blocks signal
@@ -21,7 +25,8 @@ class CourseBlocksSignalTest(EnableTransformerRegistryMixin, ModuleStoreTestCase
         self.course = CourseFactory.create()
         self.course_usage_key = self.store.make_course_usage_key(self.course.id)
 
-    def test_course_update(self):
+    @ddt.data(True, False)
+    def test_course_update(self, incremental):
         test_display_name = "Lightsabers 101"
 
         # Course exists in cache initially
@@ -34,7 +39,8 @@ class CourseBlocksSignalTest(EnableTransformerRegistryMixin, ModuleStoreTestCase
         )
 
         self.course.display_name = test_display_name
-        self.store.update_item(self.course, self.user.id)
+        with patch.dict(settings.FEATURES, {'ENABLE_INCREMENTAL_BLOCK_STRUCTURE_COLLECT': incremental}):
+            self.store.update_item(self.course, self.user.id)
 
         # Cached version of course has been updated
         updated_block_structure = bs_manager.get_collected()
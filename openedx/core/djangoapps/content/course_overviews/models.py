@@ -276,6 +276,37 @@ class CourseOverview(TimeStampedModel):
 
         return course_overview or cls.load_from_module_store(course_id)
 
+    @classmethod
+    def get_from_ids_if_exists(cls, course_ids):
+        """
+        Load the up-to-date CourseOverview objects for the given course IDs
+        with a single query.
+
+        Unlike get_from_id, this does not load courses from the module
+        store, delete outdated CourseOverviews or generate missing thumbnail
+        images, so the CourseOverviews of some of the courses may be
+        missing from the result.  Callers should fall back to get_from_id
+        for those.  CourseOverviews that are missing their thumbnail images
+        while thumbnails are enabled are left out as well, so that
+        get_from_id can generate them.
+
+        Arguments:
+            course_ids (iterable[CourseKey]): the IDs of the course overviews
+                to be loaded.
+
+        Returns:
+            dict: mapping of course IDs to their CourseOverview.
+        """
+        thumbnails_enabled = CourseOverviewImageConfig.current().enabled
+        return {
+            course_overview.id: course_overview
+            for course_overview in cls.objects.select_related('image_set').filter(
+                id__in=list(course_ids),
+                version__gte=cls.VERSION,
+            )
+            if hasattr(course_overview, 'image_set') or not thumbnails_enabled
+        }
+
     def clean_id(self, padding_char='='):
         """
         Returns a unique deterministic base32-encoded ID for the course.
@@ -459,6 +459,15 @@ class CourseOverviewTestCase(ModuleStoreTestCase):
             set(select_course_ids),
         )
 
+    def test_get_from_ids_if_exists(self):
+        course_ids = [CourseFactory.create(emit_signals=True).id for __ in range(3)]
+        CourseOverview.objects.filter(id=course_ids[0]).update(version=CourseOverview.VERSION - 1)
+        CourseOverview.objects.filter(id=course_ids[1]).delete()
+
+        course_overviews = CourseOverview.get_from_ids_if_exists(course_ids)
+        self.assertEqual(course_overviews.keys(), [course_ids[2]])
+        self.assertEqual(course_overviews[course_ids[2]].id, course_ids[2])
+
     def test_get_all_courses(self):
         course_ids = [CourseFactory.create(emit_signals=True).id for __ in range(3)]
         self.assertEqual(
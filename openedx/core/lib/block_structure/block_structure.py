@@ -22,6 +22,17 @@ logger = getLogger(__name__)  # pylint: disable=invalid-name
 # A dictionary key value for storing a transformer's version number.
 TRANSFORMER_VERSION_KEY = '_version'
 
+# Name of the xBlock attribute with the version of the block's content
+# in the modulestore.  It is collected for each block so a later collect
+# can determine which blocks changed in the meantime.  Split modulestore
+# sets it to the id of the structure in which the block last changed.
+BLOCK_VERSION_FIELD = 'update_version'
+
+# Prefixes of the names of serialized block data segments, one for each
+# transformer and one for each xBlock field.
+TRANSFORMER_SEGMENT_PREFIX = 'transformer.'
+XBLOCK_FIELD_SEGMENT_PREFIX = 'field.'
+
 
 class _BlockRelations(object):
     """
@@ -299,6 +310,12 @@ class BlockStructureBlockData(BlockStructure):
         # defaultdict {string: dict}
         self._transformer_data = defaultdict(dict)
 
+        # Map of the name of a serialized block data segment that is yet
+        # to be decoded into _block_data_map to its decoder function.
+        # Segments are decoded lazily, upon first access of their data.
+        # dict {string: function(BlockStructureBlockData)}
+        self._pending_segments = {}
+
     def get_xblock_field(self, usage_key, field_name, default=None):
         """
         Returns the collected value of the xBlock field for the
@@ -315,6 +332,7 @@ class BlockStructureBlockData(BlockStructure):
             default (any type) - The value to return if a field value is
                 not found.
         """
+        self._decode_segment(XBLOCK_FIELD_SEGMENT_PREFIX + field_name)
         block_data = self._block_data_map.get(usage_key)
         return block_data.xblock_fields.get(field_name, default) if block_data else default
 
@@ -388,6 +406,7 @@ class BlockStructureBlockData(BlockStructure):
                 given key for the given transformer's data for the
                 requested block.
         """
+        self._decode_segment(TRANSFORMER_SEGMENT_PREFIX + transformer.name())
         self._block_data_map[usage_key].transformer_data[transformer.name()][key] = value
 
     def get_transformer_block_data(self, usage_key, transformer):
@@ -406,6 +425,7 @@ class BlockStructureBlockData(BlockStructure):
             key (string) - A dictionary key to the transformer's data
                 that is requested.
         """
+        self._decode_segment(TRANSFORMER_SEGMENT_PREFIX + transformer.name())
         default = {}
         block_data = self._block_data_map.get(usage_key)
         if not block_data:
@@ -527,6 +547,40 @@ class BlockStructureBlockData(BlockStructure):
             raise TransformerException('VERSION attribute is not set on transformer {0}.', transformer.name())
         self.set_transformer_data(transformer, TRANSFORMER_VERSION_KEY, transformer.VERSION)
 
+    def _decode_segment(self, segment_name):
+        """
+        Decodes the serialized block data segment with the given name
+        into this block structure, if it is still pending.
+
+        Arguments:
+            segment_name (string) - The name of the segment, as
+                assigned by the serialization module.
+        """
+        if self._pending_segments:
+            decoder = self._pending_segments.pop(segment_name, None)
+            if decoder:
+                decoder(self)
+
+    def _decode_transformer_segments(self, transformers):
+        """
+        Decodes the pending block data segments of the given
+        transformers into this block structure.
+
+        Arguments:
+            transformers ([BlockStructureTransformer]) - The
+                transformers whose block data is to be decoded.
+        """
+        for transformer in transformers:
+            self._decode_segment(TRANSFORMER_SEGMENT_PREFIX + transformer.name())
+
+    def _decode_all_segments(self):
+        """
+        Decodes all pending serialized block data segments into this
+        block structure.
+        """
+        for segment_name in self._pending_segments.keys():
+            self._decode_segment(segment_name)
+
 
 class BlockStructureModulestoreData(BlockStructureBlockData):
     """
@@ -594,18 +648,101 @@ class BlockStructureModulestoreData(BlockStructureBlockData):
         """
         self._xblock_map[usage_key] = xblock
 
-    def _collect_requested_xblock_fields(self):
+    def _collect_requested_xblock_fields(self, block_keys=None):
         """
         Iterates through all instantiated xBlocks that were added and
         collects all xBlock fields that were requested.
+
+        Arguments:
+            block_keys (set(UsageKey)) - If given, fields are collected
+                for only the xBlocks of these blocks.
         """
         if not self._requested_xblock_fields:
             return
 
         for xblock_usage_key, xblock in self._xblock_map.iteritems():
+            if block_keys is not None and xblock_usage_key not in block_keys:
+                continue
             for field_name in self._requested_xblock_fields:
                 self._set_xblock_field(xblock_usage_key, xblock, field_name)
 
+    def _get_changed_block_keys(self, previous_block_structure):
+        """
+        Returns the usage keys of the blocks in this block structure
+        whose collected data may differ from that in the given
+        previously collected block structure.
+
+        A block is considered changed if it is new, if its version (see
+        BLOCK_VERSION_FIELD) differs or if its children differ.  All
+        ancestors and descendants of such blocks are considered
+        changed as well.
+
+        Returns:
+            set(UsageKey) - The keys of the changed blocks.
+
+            NoneType - If the versions of the blocks are not available,
+                so changes cannot be determined.
+        """
+        changed_block_keys = set()
+        for block_key, xblock in self._xblock_map.iteritems():
+            version = getattr(xblock, BLOCK_VERSION_FIELD, None)
+            if version is None:
+                return None
+            if (
+                    block_key not in previous_block_structure or
+                    previous_block_structure.get_xblock_field(block_key, BLOCK_VERSION_FIELD) != version or
+                    previous_block_structure.get_children(block_key) != self.get_children(block_key)
+            ):
+                changed_block_keys.add(block_key)
+
+        # Expand the changed blocks to include their descendants and
+        # ancestors.
+        for get_relatives in (self.get_children, self.get_parents):
+            blocks_to_visit = list(changed_block_keys)
+            visited = set(changed_block_keys)
+            while blocks_to_visit:
+                for relative_key in get_relatives(blocks_to_visit.pop()):
+                    if relative_key not in visited:
+                        visited.add(relative_key)
+                        blocks_to_visit.append(relative_key)
+            changed_block_keys |= visited
+
+        return changed_block_keys
+
+    def _copy_collected_data(self, previous_block_structure, block_keys, excluded_transformers):
+        """
+        Copies the collected xBlock fields and transformer data of the
+        given blocks, along with the non-block-specific transformer
+        data, from the given previously collected block structure into
+        this block structure.
+
+        Arguments:
+            previous_block_structure (BlockStructureBlockData) - The
+                block structure to copy from.
+
+            block_keys (iterable(UsageKey)) - The usage keys of the
+                blocks whose data is to be copied.
+
+            excluded_transformers ([BlockStructureTransformer]) - The
+                transformers whose data is not to be copied.
+        """
+        previous_block_structure._decode_all_segments()
+        excluded_transformer_names = {transformer.name() for transformer in excluded_transformers}
+
+        for transformer_name, transformer_data in previous_block_structure._transformer_data.iteritems():
+            if transformer_name not in excluded_transformer_names:
+                self._transformer_data[transformer_name].update(transformer_data)
+
+        for block_key in block_keys:
+            previous_block_data = previous_block_structure._block_data_map.get(block_key)
+            if not previous_block_data:
+                continue
+            block_data = self._block_data_map[block_key]
+            block_data.xblock_fields.update(previous_block_data.xblock_fields)
+            for transformer_name, transformer_block_data in previous_block_data.transformer_data.iteritems():
+                if transformer_name not in excluded_transformer_names:
+                    block_data.transformer_data[transformer_name] = dict(transformer_block_data)
+
     def _set_xblock_field(self, usage_key, xblock, field_name):
         """
         Updates the given block's xBlock fields data with the xBlock
@@ -2,10 +2,12 @@
 Module for the Cache class for BlockStructure objects.
 """
 # pylint: disable=protected-access
+from hashlib import md5
 from logging import getLogger
 
-from openedx.core.lib.cache_utils import zpickle, zunpickle
+from openedx.core.lib.cache_utils import zunpickle
 
+from . import serialization
 from .block_structure import BlockStructureModulestoreData
 
 
@@ -16,48 +18,58 @@ class BlockStructureCache(object):
     """
     Cache for BlockStructure objects.
     """
-    def __init__(self, cache):
+    def __init__(self, cache, local_cache=None):
         """
         Arguments:
             cache (django.core.cache.backends.base.BaseCache) - The
                 cache into which cacheable data of the block structure
                 is to be serialized.
+
+            local_cache (BlockStructureLocalCache) - An optional
+                process-local cache to consult before the given cache.
+                Only the small collected-version stamp of the block
+                structure is read from the given cache when the local
+                cache has the block structure for that stamp.
         """
         self._cache = cache
+        self._local_cache = local_cache
 
     def add(self, block_structure):
         """
-        Store a compressed and pickled serialization of the given
-        block structure into the given cache.
+        Store a compact serialization of the given block structure
+        into the given cache.
 
         The key in the cache is 'root.key.<root_block_usage_key>'.
         The data stored in the cache includes the structure's
-        block relations, transformer data, and block data.
+        block relations, transformer data, and block data, as
+        separately decodable segments.  See the serialization module
+        for details on the format.
+
+        A stamp identifying this version of the collected data is
+        stored alongside, with the key 'root.version.<root_block_usage_key>'.
 
         Arguments:
             block_structure (BlockStructure) - The block structure
                 that is to be serialized to the given cache.
         """
-        data_to_cache = (
-            block_structure._block_relations,
-            block_structure._transformer_data,
-            block_structure._block_data_map,
-        )
-        zp_data_to_cache = zpickle(data_to_cache)
+        data_to_cache = serialization.serialize(block_structure)
+        root_block_usage_key = block_structure.root_block_usage_key
 
         # Set the timeout value for the cache to 1 day as a fail-safe
         # in case the signal to invalidate the cache doesn't come through.
         timeout_in_seconds = 60 * 60 * 24
-        self._cache.set(
-            self._encode_root_cache_key(block_structure.root_block_usage_key),
-            zp_data_to_cache,
+        self._cache.set_many(
+            {
+                self._encode_root_cache_key(root_block_usage_key): data_to_cache,
+                self._encode_version_cache_key(root_block_usage_key): self._get_stamp(data_to_cache),
+            },
             timeout=timeout_in_seconds,
         )
 
         logger.info(
             "Wrote BlockStructure %s to cache, size: %s",
-            block_structure.root_block_usage_key,
-            len(zp_data_to_cache),
+            root_block_usage_key,
+            len(data_to_cache),
         )
 
     def get(self, root_block_usage_key):
@@ -79,10 +91,14 @@ class BlockStructureCache(object):
 
             NoneType - If the root_block_usage_key is not found in the cache.
         """
+        if self._local_cache is not None:
+            block_structure = self._get_from_local_cache(root_block_usage_key)
+            if block_structure is not None:
+                return block_structure
 
         # Find root_block_usage_key in the cache.
-        zp_data_from_cache = self._cache.get(self._encode_root_cache_key(root_block_usage_key))
-        if not zp_data_from_cache:
+        data_from_cache = self._cache.get(self._encode_root_cache_key(root_block_usage_key))
+        if not data_from_cache:
             logger.info(
                 "Did not find BlockStructure %r in the cache.",
                 root_block_usage_key,
@@ -92,11 +108,24 @@ class BlockStructureCache(object):
             logger.info(
                 "Read BlockStructure %r from cache, size: %s",
                 root_block_usage_key,
-                len(zp_data_from_cache),
+                len(data_from_cache),
             )
 
         # Deserialize and construct the block structure.
-        block_relations, transformer_data, block_data_map = zunpickle(zp_data_from_cache)
+        if serialization.is_serialized(data_from_cache):
+            try:
+                if self._local_cache is not None:
+                    return self._add_to_local_cache(root_block_usage_key, data_from_cache)
+                return serialization.deserialize(root_block_usage_key, data_from_cache)
+            except serialization.UnsupportedFormat:
+                logger.info(
+                    "Ignoring BlockStructure %r in the cache with an unsupported format.",
+                    root_block_usage_key,
+                )
+                return None
+
+        # Fall back to values cached in the legacy zpickle format.
+        block_relations, transformer_data, block_data_map = zunpickle(data_from_cache)
         block_structure = BlockStructureModulestoreData(root_block_usage_key)
         block_structure._block_relations = block_relations
         block_structure._transformer_data = transformer_data
@@ -107,19 +136,65 @@ class BlockStructureCache(object):
     def delete(self, root_block_usage_key):
         """
         Deletes the block structure for the given root_block_usage_key
-        from the given cache.
+        from the given cache and from this process' local cache.
 
         Arguments:
             root_block_usage_key (UsageKey) - The usage_key for the root
                 of the block structure that is to be removed from
                 the cache.
         """
-        self._cache.delete(self._encode_root_cache_key(root_block_usage_key))
+        self._cache.delete_many([
+            self._encode_root_cache_key(root_block_usage_key),
+            self._encode_version_cache_key(root_block_usage_key),
+        ])
+        if self._local_cache is not None:
+            self._local_cache.delete(root_block_usage_key)
         logger.info(
             "Deleted BlockStructure %r from the cache.",
             root_block_usage_key,
         )
 
+    def _get_from_local_cache(self, root_block_usage_key):
+        """
+        Returns the block structure for the given root_block_usage_key
+        from the local cache, if it's found there for the stamp
+        currently in the given cache; returns None otherwise.
+        """
+        stamp = self._cache.get(self._encode_version_cache_key(root_block_usage_key))
+        if not stamp:
+            return None
+        segments = self._local_cache.get(root_block_usage_key, stamp)
+        if segments is None:
+            return None
+        return serialization.deserialize_decompressed_segments(root_block_usage_key, segments)
+
+    def _add_to_local_cache(self, root_block_usage_key, data_from_cache):
+        """
+        Decompresses the given serialized block structure into the
+        local cache and returns the block structure deserialized from
+        it.
+
+        The stamp is computed from the data itself, rather than read
+        from the given cache, so the local cache never associates the
+        data with the stamp of a different version.
+        """
+        segments = serialization.decompress_segments(data_from_cache)
+        self._local_cache.set(
+            root_block_usage_key,
+            self._get_stamp(data_from_cache),
+            segments,
+            sum(len(segment) for segment in segments.itervalues()),
+        )
+        return serialization.deserialize_decompressed_segments(root_block_usage_key, segments)
+
+    @classmethod
+    def _get_stamp(cls, data):
+        """
+        Returns the collected-version stamp for the given serialized
+        block structure.
+        """
+        return md5(data).hexdigest()
+
     @classmethod
     def _encode_root_cache_key(cls, root_block_usage_key):
         """
@@ -127,3 +202,11 @@ class BlockStructureCache(object):
         for the given root_block_usage_key.
         """
         return "root.key." + unicode(root_block_usage_key)
+
+    @classmethod
+    def _encode_version_cache_key(cls, root_block_usage_key):
+        """
+        Returns the cache key to use for storing the collected-version
+        stamp of the block structure for the given root_block_usage_key.
+        """
+        return "root.version." + unicode(root_block_usage_key)
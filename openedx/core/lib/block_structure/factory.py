@@ -58,7 +58,7 @@ class BlockStructureFactory(object):
         return block_structure
 
     @classmethod
-    def create_from_cache(cls, root_block_usage_key, block_structure_cache):
+    def create_from_cache(cls, root_block_usage_key, block_structure_cache, transformers=None):
         """
         Deserializes and returns the block structure starting at
         root_block_usage_key from the given cache, if it's found in the cache.
@@ -75,10 +75,19 @@ class BlockStructureFactory(object):
                 cache from which the block structure is to be
                 deserialized.
 
+            transformers ([BlockStructureTransformer]) - The
+                transformers whose block data is to be decoded
+                upfront.  The block data of any other transformers and
+                the collected xBlock fields are decoded lazily, upon
+                first access.
+
         Returns:
             BlockStructure - The deserialized block structure starting
             at root_block_usage_key, if found in the cache.
 
             NoneType - If the root_block_usage_key is not found in the cache.
         """
-        return block_structure_cache.get(root_block_usage_key)
+        block_structure = block_structure_cache.get(root_block_usage_key)
+        if block_structure is not None and transformers:
+            block_structure._decode_transformer_segments(transformers)  # pylint: disable=protected-access
+        return block_structure
@@ -0,0 +1,143 @@
+"""
+Module for the process-local LRU tier in front of the BlockStructureCache.
+"""
+from collections import OrderedDict
+from logging import getLogger
+from threading import Lock
+
+
+logger = getLogger(__name__)  # pylint: disable=C0103
+
+
+class BlockStructureLocalCache(object):
+    """
+    In-process least-recently-used cache of decompressed block structure
+    segments, bounded by a byte budget.
+
+    Entries are keyed by the root block usage key of the block structure
+    and are associated with the collected-version stamp of the
+    serialized block structure they were decompressed from.  A lookup
+    with any other stamp is a miss, so an entry is never used once a
+    newer version of the block structure is stored in the shared cache,
+    even if this process was not notified of the change.
+
+    Counters of hits, misses and evictions are kept for monitoring.
+    """
+    def __init__(self, max_size_in_bytes):
+        """
+        Arguments:
+            max_size_in_bytes (int) - The maximum combined size of the
+                cached values.  Least recently used entries are evicted
+                to stay within this budget.
+        """
+        self.max_size_in_bytes = max_size_in_bytes
+
+        # Map of a root block usage key to a tuple of the stamp, value
+        # and size of its entry, ordered from least to most recently
+        # used.
+        # OrderedDict {UsageKey: (string, any type, int)}
+        self._entries = OrderedDict()
+        self._size_in_bytes = 0
+        self._lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size_in_bytes(self):
+        """
+        Returns the combined size of the cached values.
+        """
+        return self._size_in_bytes
+
+    def get(self, root_block_usage_key, stamp):
+        """
+        Returns the value cached for the given root_block_usage_key and
+        stamp; returns None if not found.
+
+        Arguments:
+            root_block_usage_key (UsageKey) - The usage_key for the root
+                of the block structure.
+
+            stamp (string) - The collected-version stamp of the block
+                structure.
+        """
+        with self._lock:
+            entry = self._entries.get(root_block_usage_key)
+            if entry is None or entry[0] != stamp:
+                self.misses += 1
+                return None
+
+            # Mark the entry as most recently used.
+            del self._entries[root_block_usage_key]
+            self._entries[root_block_usage_key] = entry
+            self.hits += 1
+            return entry[1]
+
+    def set(self, root_block_usage_key, stamp, value, size_in_bytes):
+        """
+        Caches the given value for the given root_block_usage_key and
+        stamp, replacing any value previously cached for the
+        root_block_usage_key.
+
+        Values larger than the byte budget are not cached.
+
+        Arguments:
+            root_block_usage_key (UsageKey) - The usage_key for the root
+                of the block structure.
+
+            stamp (string) - The collected-version stamp of the block
+                structure.
+
+            value (any type) - The value to cache.
+
+            size_in_bytes (int) - The size of the value, counted
+                against the byte budget.
+        """
+        with self._lock:
+            self._pop(root_block_usage_key)
+            if size_in_bytes > self.max_size_in_bytes:
+                logger.info(
+                    "BlockStructure %r of size %s exceeds the local cache budget of %s.",
+                    root_block_usage_key,
+                    size_in_bytes,
+                    self.max_size_in_bytes,
+                )
+                return
+
+            while self._size_in_bytes + size_in_bytes > self.max_size_in_bytes:
+                evicted_key, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._size_in_bytes -= evicted_size
+                self.evictions += 1
+                logger.debug("Evicted BlockStructure %r from the local cache.", evicted_key)
+
+            self._entries[root_block_usage_key] = (stamp, value, size_in_bytes)
+            self._size_in_bytes += size_in_bytes
+
+    def delete(self, root_block_usage_key):
+        """
+        Removes any value cached for the given root_block_usage_key.
+        """
+        with self._lock:
+            self._pop(root_block_usage_key)
+
+    def clear(self):
+        """
+        Removes all cached values.  The counters are left intact.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size_in_bytes = 0
+
+    def _pop(self, root_block_usage_key):
+        """
+        Removes the entry for the given root_block_usage_key, if any.
+        Must be called with the lock held.
+        """
+        entry = self._entries.pop(root_block_usage_key, None)
+        if entry is not None:
+            self._size_in_bytes -= entry[2]
@@ -13,7 +13,7 @@ class BlockStructureManager(object):
     Top-level class for managing Block Structures.
     """
 
-    def __init__(self, root_block_usage_key, modulestore, cache):
+    def __init__(self, root_block_usage_key, modulestore, cache, local_cache=None):
         """
         Arguments:
             root_block_usage_key (UsageKey) - The usage_key for the root
@@ -26,10 +26,13 @@ class BlockStructureManager(object):
             cache (django.core.cache.backends.base.BaseCache) - The
                 cache to use for storing/retrieving the block structure's
                 collected data.
+
+            local_cache (BlockStructureLocalCache) - An optional
+                process-local cache to consult before the given cache.
         """
         self.root_block_usage_key = root_block_usage_key
         self.modulestore = modulestore
-        self.block_structure_cache = BlockStructureCache(cache)
+        self.block_structure_cache = BlockStructureCache(cache, local_cache)
 
     def get_transformed(self, transformers, starting_block_usage_key=None):
         """
@@ -52,7 +55,7 @@ class BlockStructureManager(object):
             BlockStructureBlockData - A transformed block structure,
                 starting at starting_block_usage_key.
         """
-        block_structure = self.get_collected()
+        block_structure = self.get_collected(transformers)
         if starting_block_usage_key:
             # Override the root_block_usage_key so traversals start at the
             # requested location.  The rest of the structure will be pruned
@@ -67,7 +70,7 @@ class BlockStructureManager(object):
         transformers.transform(block_structure)
         return block_structure
 
-    def get_collected(self):
+    def get_collected(self, transformers=None):
         """
         Returns the collected Block Structure for the root_block_usage_key,
         getting block data from the cache and modulestore, as needed.
@@ -76,6 +79,12 @@ class BlockStructureManager(object):
         the modulestore is accessed if needed (at cache miss), and the
         transformers data is collected if needed.
 
+        Arguments:
+            transformers (BlockStructureTransformers) - Collection of
+                transformers whose collected data is decoded upfront
+                when read from the cache.  All other collected data is
+                decoded lazily, upon first access.
+
         Returns:
             BlockStructureBlockData - A collected block structure,
                 starting at root_block_usage_key, with collected data
@@ -83,7 +92,8 @@ class BlockStructureManager(object):
         """
         block_structure = BlockStructureFactory.create_from_cache(
             self.root_block_usage_key,
-            self.block_structure_cache
+            self.block_structure_cache,
+            transformers,
         )
         cache_miss = block_structure is None
         if cache_miss or BlockStructureTransformers.is_collected_outdated(block_structure):
@@ -95,15 +105,44 @@ class BlockStructureManager(object):
             self.block_structure_cache.add(block_structure)
         return block_structure
 
-    def update_collected(self):
+    def update_collected(self, incremental=False):
         """
         Updates the collected Block Structure for the root_block_usage_key.
 
         Details: The cache is cleared and updated by collecting transformers
         data from the modulestore.
+
+        Arguments:
+            incremental (bool) - If True, the collected Block Structure
+                in the cache is not cleared.  Instead, only the data of
+                the blocks that changed since it was collected is
+                re-collected, for transformers that support it.  See
+                BlockStructureTransformers.collect_incremental.
+
+        Returns:
+            BlockStructureBlockData - The updated collected block
+                structure.
         """
-        self.clear()
-        self.get_collected()
+        if not incremental:
+            self.clear()
+            return self.get_collected()
+
+        block_structure = BlockStructureFactory.create_from_modulestore(
+            self.root_block_usage_key,
+            self.modulestore
+        )
+        previous_block_structure = BlockStructureFactory.create_from_cache(
+            self.root_block_usage_key,
+            self.block_structure_cache,
+        )
+        if previous_block_structure is None or BlockStructureTransformers.is_collected_outdated(
+                previous_block_structure
+        ):
+            BlockStructureTransformers.collect(block_structure)
+        else:
+            BlockStructureTransformers.collect_incremental(block_structure, previous_block_structure)
+        self.block_structure_cache.add(block_structure)
+        return block_structure
 
     def clear(self):
         """
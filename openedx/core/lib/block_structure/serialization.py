@@ -0,0 +1,336 @@
+"""
+Module for the compact, section-based serialization format used to
+store BlockStructure objects in the cache.
+
+The serialized value is laid out as follows:
+
+    header - A fixed-size struct with a magic string, the format
+        version and the length of the index.
+
+    index - A compressed list of (segment name, segment length) tuples,
+        in the order in which the segments follow the index.
+
+    segments - The concatenated, individually compressed segments:
+        'relations' - The block keys along with an array-backed
+            (compressed sparse row) encoding of their children.
+        'transformer_data' - The non-block-specific data of all
+            transformers, including their collected versions.
+        'transformer.<name>' - One segment per transformer with that
+            transformer's block-specific data.
+        'field.<name>' - One segment per collected xBlock field.
+
+Since each segment is compressed on its own, a deserialized block
+structure only eagerly decodes its relations and transformer versions.
+All other segments are decoded lazily, when first accessed.
+
+The segments can also be decompressed upfront, so they can be kept in a
+process-local cache and deserialized repeatedly without decompression.
+"""
+# pylint: disable=protected-access
+from array import array
+from collections import defaultdict
+import cPickle as pickle
+from itertools import izip
+from logging import getLogger
+import struct
+import zlib
+
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+
+from .block_structure import (
+    _BlockData,
+    _BlockRelations,
+    BlockStructureModulestoreData,
+    TRANSFORMER_SEGMENT_PREFIX,
+    XBLOCK_FIELD_SEGMENT_PREFIX,
+)
+
+
+logger = getLogger(__name__)  # pylint: disable=C0103
+
+
+# Magic string that prefixes all values serialized by this module.  It
+# distinguishes them from the legacy zpickled values, which always start
+# with a zlib header.
+MAGIC = 'BSTC'
+
+# Version of the serialization format.  Increment this whenever the
+# layout of the header, index or segments changes.  Values with any
+# other version are treated as cache misses.
+FORMAT_VERSION = 1
+
+# Struct layout of the header: magic, format version, index length.
+_HEADER = struct.Struct('!4sHI')
+
+# Type code for the arrays used in the relations segment.
+_ARRAY_TYPECODE = 'L'
+
+RELATIONS_SEGMENT = 'relations'
+TRANSFORMER_DATA_SEGMENT = 'transformer_data'
+
+
+class UnsupportedFormat(Exception):
+    """
+    Exception for when a serialized value is not in a supported format.
+    """
+    pass
+
+
+def is_serialized(data):
+    """
+    Returns whether the given value was serialized by this module, as
+    opposed to the legacy zpickle format.
+    """
+    return data[:len(MAGIC)] == MAGIC
+
+
+def serialize(block_structure):
+    """
+    Returns the serialization of the given block structure's relations,
+    transformer data and block data.
+
+    Arguments:
+        block_structure (BlockStructureBlockData) - The block structure
+            that is to be serialized.
+
+    Returns:
+        str - The serialized value.
+    """
+    block_structure._decode_all_segments()
+
+    block_keys = list(block_structure._block_relations)
+    block_indices = {block_key: index for index, block_key in enumerate(block_keys)}
+
+    segments = [
+        (RELATIONS_SEGMENT, _encode_relations(block_structure, block_keys, block_indices)),
+        (TRANSFORMER_DATA_SEGMENT, zpickle(dict(block_structure._transformer_data))),
+    ]
+
+    # Regroup the per-block data by transformer and by xBlock field.
+    transformers_block_data = defaultdict(dict)
+    xblock_fields_block_data = defaultdict(dict)
+    for block_key, block_data in block_structure._block_data_map.iteritems():
+        index = block_indices.get(block_key)
+        if index is None:
+            continue
+        for transformer_name, transformer_block_data in block_data.transformer_data.iteritems():
+            transformers_block_data[transformer_name][index] = transformer_block_data
+        for field_name, value in block_data.xblock_fields.iteritems():
+            xblock_fields_block_data[field_name][index] = value
+
+    segments.extend(
+        (TRANSFORMER_SEGMENT_PREFIX + transformer_name, zpickle(block_data))
+        for transformer_name, block_data in transformers_block_data.iteritems()
+    )
+    segments.extend(
+        (XBLOCK_FIELD_SEGMENT_PREFIX + field_name, zpickle(block_data))
+        for field_name, block_data in xblock_fields_block_data.iteritems()
+    )
+
+    index = zpickle([(name, len(segment)) for name, segment in segments])
+    return ''.join(
+        [_HEADER.pack(MAGIC, FORMAT_VERSION, len(index)), index] +
+        [segment for _, segment in segments]
+    )
+
+
+def deserialize(root_block_usage_key, data):
+    """
+    Returns the block structure deserialized from the given value.
+
+    Only the structure's relations and transformer data are decoded
+    here.  The block data segments are registered with the structure
+    and decompressed and decoded on first access.
+
+    Arguments:
+        root_block_usage_key (UsageKey) - The usage_key for the root
+            of the serialized block structure.
+
+        data (str) - A value previously returned by serialize.
+
+    Returns:
+        BlockStructureModulestoreData - The deserialized block structure.
+
+    Raises:
+        UnsupportedFormat - if the value is not in the current format.
+    """
+    return _deserialize_segments(root_block_usage_key, _split_segments(data), zunpickle)
+
+
+def decompress_segments(data):
+    """
+    Returns the decompressed segments of the given serialized value.
+
+    Arguments:
+        data (str) - A value previously returned by serialize.
+
+    Returns:
+        dict {string: str} - Map of segment name to the segment's
+            decompressed data, to be passed to
+            deserialize_decompressed_segments.
+
+    Raises:
+        UnsupportedFormat - if the value is not in the current format.
+    """
+    return {name: zlib.decompress(segment) for name, segment in _split_segments(data).iteritems()}
+
+
+def deserialize_decompressed_segments(root_block_usage_key, segments):
+    """
+    Returns the block structure deserialized from the given decompressed
+    segments.  The given segments are not modified, so they can be
+    deserialized again.
+
+    Arguments:
+        root_block_usage_key (UsageKey) - The usage_key for the root
+            of the serialized block structure.
+
+        segments (dict {string: str}) - A value previously returned by
+            decompress_segments.
+
+    Returns:
+        BlockStructureModulestoreData - The deserialized block structure.
+    """
+    return _deserialize_segments(root_block_usage_key, dict(segments), pickle.loads)
+
+
+def _split_segments(data):
+    """
+    Returns a map of segment name to the compressed segment for the
+    given serialized value.
+
+    Raises:
+        UnsupportedFormat - if the value is not in the current format.
+    """
+    if len(data) < _HEADER.size:
+        raise UnsupportedFormat('Serialized block structure is truncated.')
+    magic, format_version, index_length = _HEADER.unpack_from(data)
+    if magic != MAGIC or format_version != FORMAT_VERSION:
+        raise UnsupportedFormat(
+            'Unsupported block structure format: {!r}, version {}.'.format(magic, format_version)
+        )
+
+    offset = _HEADER.size + index_length
+    segments = {}
+    for name, length in zunpickle(data[_HEADER.size:offset]):
+        segments[name] = data[offset:offset + length]
+        offset += length
+    return segments
+
+
+def _deserialize_segments(root_block_usage_key, segments, loads):
+    """
+    Returns the block structure deserialized from the given map of
+    segment name to segment data, using the given function to load
+    each segment's data.
+    """
+    block_structure = BlockStructureModulestoreData(root_block_usage_key)
+    block_keys = _decode_relations(block_structure, loads(segments.pop(RELATIONS_SEGMENT)))
+    block_data = _create_block_data(block_structure, block_keys)
+    block_structure._transformer_data.update(loads(segments.pop(TRANSFORMER_DATA_SEGMENT)))
+
+    for name, segment in segments.iteritems():
+        if name.startswith(TRANSFORMER_SEGMENT_PREFIX):
+            decoder = _transformer_segment_decoder(
+                name[len(TRANSFORMER_SEGMENT_PREFIX):], segment, block_data, loads
+            )
+        elif name.startswith(XBLOCK_FIELD_SEGMENT_PREFIX):
+            decoder = _xblock_field_segment_decoder(
+                name[len(XBLOCK_FIELD_SEGMENT_PREFIX):], segment, block_data, loads
+            )
+        else:
+            logger.warning("Ignoring unknown BlockStructure segment %r.", name)
+            continue
+        block_structure._pending_segments[name] = decoder
+
+    return block_structure
+
+
+def _encode_relations(block_structure, block_keys, block_indices):
+    """
+    Returns the compressed relations segment for the given block
+    structure.
+
+    The children of the block at index i are the blocks whose indices
+    are stored in child_indices[child_offsets[i]:child_offsets[i + 1]].
+    Parents are not stored since they can be derived from the children.
+    """
+    child_offsets = array(_ARRAY_TYPECODE, [0])
+    child_indices = array(_ARRAY_TYPECODE)
+    for block_key in block_keys:
+        child_indices.extend(
+            block_indices[child_key] for child_key in block_structure._block_relations[block_key].children
+        )
+        child_offsets.append(len(child_indices))
+    return zpickle((block_keys, child_offsets.tostring(), child_indices.tostring()))
+
+
+def _decode_relations(block_structure, relations_data):
+    """
+    Populates the relations of the given block structure from the given
+    loaded relations segment.
+
+    Returns:
+        [UsageKey] - The block keys, indexed as in the serialized value.
+    """
+    block_keys, child_offsets_string, child_indices_string = relations_data
+    child_offsets = array(_ARRAY_TYPECODE)
+    child_offsets.fromstring(child_offsets_string)
+    child_indices = array(_ARRAY_TYPECODE)
+    child_indices.fromstring(child_indices_string)
+
+    # Build the relations by index, so usage keys are hashed only once
+    # when inserted into the structure's map.
+    relations = [_BlockRelations() for _ in block_keys]
+    for index, block_key in enumerate(block_keys):
+        children = relations[index].children
+        for child_index in child_indices[child_offsets[index]:child_offsets[index + 1]]:
+            children.append(block_keys[child_index])
+            relations[child_index].parents.append(block_key)
+    block_structure._block_relations.update(izip(block_keys, relations))
+    return block_keys
+
+
+def _create_block_data(block_structure, block_keys):
+    """
+    Adds empty block data for each of the given block keys to the given
+    block structure.
+
+    Returns:
+        [_BlockData] - The block data, indexed as in the serialized value.
+    """
+    block_data = [_BlockData() for _ in block_keys]
+    block_structure._block_data_map.update(izip(block_keys, block_data))
+    return block_data
+
+
+def _transformer_segment_decoder(transformer_name, segment, block_data, loads):
+    """
+    Returns a function that decodes the given transformer's block data
+    segment into a block structure.
+
+    Note: Blocks that were removed from the block structure since it
+    was deserialized are no longer in its block data map, so setting
+    their data here has no effect on the structure.
+    """
+    def decode(block_structure):  # pylint: disable=unused-argument
+        """
+        Sets the transformer's data for each block.
+        """
+        for index, transformer_block_data in loads(segment).iteritems():
+            block_data[index].transformer_data[transformer_name] = transformer_block_data
+    return decode
+
+
+def _xblock_field_segment_decoder(field_name, segment, block_data, loads):
+    """
+    Returns a function that decodes the given xBlock field's data
+    segment into a block structure.
+    """
+    def decode(block_structure):  # pylint: disable=unused-argument
+        """
+        Sets the field's value for each block.
+        """
+        for index, value in loads(segment).iteritems():
+            block_data[index].xblock_fields[field_name] = value
+    return decode
@@ -1,10 +1,12 @@
 """
 Tests for block_structure/cache.py
 """
+# pylint: disable=protected-access
 from nose.plugins.attrib import attr
 from unittest import TestCase
 
 from ..cache import BlockStructureCache
+from ..local_cache import BlockStructureLocalCache
 from .helpers import ChildrenMapTestMixin, MockCache, MockTransformer
 
 
@@ -54,3 +56,45 @@ class TestBlockStructureCache(ChildrenMapTestMixin, TestCase):
         self.assertIsNone(
             self.block_structure_cache.get(self.block_structure.root_block_usage_key)
         )
+
+
+@attr('shard_2')
+class TestBlockStructureCacheWithLocalCache(ChildrenMapTestMixin, TestCase):
+    """
+    Tests for BlockStructureCache with a process-local cache tier.
+    """
+    def setUp(self):
+        super(TestBlockStructureCacheWithLocalCache, self).setUp()
+        self.children_map = self.SIMPLE_CHILDREN_MAP
+        self.block_structure = self.create_block_structure(self.children_map)
+        self.mock_cache = MockCache()
+        self.local_cache = BlockStructureLocalCache(max_size_in_bytes=1024 * 1024)
+        self.block_structure_cache = BlockStructureCache(self.mock_cache, self.local_cache)
+        self.root_key = self.block_structure.root_block_usage_key
+
+    def test_hit_skips_shared_cache_data(self):
+        self.block_structure_cache.add(self.block_structure)
+        self.assert_block_structure(self.block_structure_cache.get(self.root_key), self.children_map)
+        self.assertEquals(len(self.local_cache), 1)
+
+        # Remove only the data from the shared cache, keeping its stamp.
+        self.mock_cache.delete(self.block_structure_cache._encode_root_cache_key(self.root_key))
+        self.assert_block_structure(self.block_structure_cache.get(self.root_key), self.children_map)
+        self.assertEquals((self.local_cache.hits, self.local_cache.misses), (1, 1))
+
+    def test_new_version_in_shared_cache(self):
+        self.block_structure_cache.add(self.block_structure)
+        self.block_structure_cache.get(self.root_key)
+
+        # Store a new version from another process' BlockStructureCache.
+        updated_children_map = self.LINEAR_CHILDREN_MAP
+        BlockStructureCache(self.mock_cache).add(self.create_block_structure(updated_children_map))
+        self.assert_block_structure(self.block_structure_cache.get(self.root_key), updated_children_map)
+        self.assertEquals((self.local_cache.hits, self.local_cache.misses), (0, 2))
+
+    def test_delete(self):
+        self.block_structure_cache.add(self.block_structure)
+        self.block_structure_cache.get(self.root_key)
+        self.block_structure_cache.delete(self.root_key)
+        self.assertEquals(len(self.local_cache), 0)
+        self.assertIsNone(self.block_structure_cache.get(self.root_key))
@@ -0,0 +1,72 @@
+"""
+Tests for block_structure/local_cache.py
+"""
+from nose.plugins.attrib import attr
+from unittest import TestCase
+
+from ..local_cache import BlockStructureLocalCache
+
+
+@attr('shard_2')
+class TestBlockStructureLocalCache(TestCase):
+    """
+    Tests for BlockStructureLocalCache
+    """
+    def setUp(self):
+        super(TestBlockStructureLocalCache, self).setUp()
+        self.local_cache = BlockStructureLocalCache(max_size_in_bytes=10)
+
+    def assert_counters(self, hits, misses, evictions):
+        """
+        Verifies the counters of the local cache.
+        """
+        self.assertEquals(
+            (self.local_cache.hits, self.local_cache.misses, self.local_cache.evictions),
+            (hits, misses, evictions),
+        )
+
+    def test_get_and_set(self):
+        self.assertIsNone(self.local_cache.get('course1', 'stamp1'))
+        self.local_cache.set('course1', 'stamp1', 'value1', 4)
+        self.assertEquals(self.local_cache.get('course1', 'stamp1'), 'value1')
+        self.assertEquals(self.local_cache.size_in_bytes, 4)
+        self.assert_counters(hits=1, misses=1, evictions=0)
+
+    def test_stamp_mismatch(self):
+        self.local_cache.set('course1', 'stamp1', 'value1', 4)
+        self.assertIsNone(self.local_cache.get('course1', 'stamp2'))
+        self.local_cache.set('course1', 'stamp2', 'value2', 6)
+        self.assertEquals(self.local_cache.get('course1', 'stamp2'), 'value2')
+        self.assertEquals(len(self.local_cache), 1)
+        self.assertEquals(self.local_cache.size_in_bytes, 6)
+        self.assert_counters(hits=1, misses=1, evictions=0)
+
+    def test_evicts_least_recently_used(self):
+        self.local_cache.set('course1', 'stamp', 'value1', 4)
+        self.local_cache.set('course2', 'stamp', 'value2', 4)
+        self.local_cache.get('course1', 'stamp')
+        self.local_cache.set('course3', 'stamp', 'value3', 4)
+
+        self.assertIsNone(self.local_cache.get('course2', 'stamp'))
+        self.assertEquals(self.local_cache.get('course1', 'stamp'), 'value1')
+        self.assertEquals(self.local_cache.get('course3', 'stamp'), 'value3')
+        self.assertEquals(self.local_cache.size_in_bytes, 8)
+        self.assert_counters(hits=3, misses=1, evictions=1)
+
+    def test_value_over_budget(self):
+        self.local_cache.set('course1', 'stamp', 'value1', 4)
+        self.local_cache.set('course2', 'stamp', 'value2', 11)
+        self.assertIsNone(self.local_cache.get('course2', 'stamp'))
+        self.assertEquals(self.local_cache.get('course1', 'stamp'), 'value1')
+        self.assert_counters(hits=1, misses=1, evictions=0)
+
+    def test_delete_and_clear(self):
+        self.local_cache.set('course1', 'stamp', 'value1', 4)
+        self.local_cache.set('course2', 'stamp', 'value2', 4)
+        self.local_cache.delete('course1')
+        self.assertIsNone(self.local_cache.get('course1', 'stamp'))
+        self.assertEquals(self.local_cache.size_in_bytes, 4)
+
+        self.local_cache.clear()
+        self.assertIsNone(self.local_cache.get('course2', 'stamp'))
+        self.assertEquals(self.local_cache.size_in_bytes, 0)
@@ -159,3 +159,102 @@ class TestBlockStructureManager(TestCase, ChildrenMapTestMixin):
         self.bs_manager.clear()
         self.collect_and_verify(expect_modulestore_called=True, expect_cache_updated=True)
         self.assertEquals(TestTransformer1.collect_call_count, 2)
+
+
+class IncrementalTestTransformer(TestTransformer1):
+    """
+    Test Transformer class that supports incremental collection.
+    """
+    SUPPORTS_INCREMENTAL_COLLECT = True
+    collect_data_key = 't2.collect'
+    transform_data_key = 't2.transform'
+    collect_call_count = 0
+    changed_block_keys = None
+
+    @classmethod
+    def collect_incremental(cls, block_structure, changed_block_keys):
+        """
+        Collects block data for only the changed blocks.
+        """
+        cls.changed_block_keys = changed_block_keys
+        for block_key in changed_block_keys:
+            block_structure.set_transformer_block_field(
+                block_key, cls, cls.collect_data_key, cls._create_block_value(block_key, cls.collect_data_key)
+            )
+
+
+@attr('shard_2')
+class TestBlockStructureManagerIncrementalCollect(TestCase, ChildrenMapTestMixin):
+    """
+    Test class for BlockStructureManager.update_collected with incremental
+    collection.
+    """
+    def setUp(self):
+        super(TestBlockStructureManagerIncrementalCollect, self).setUp()
+        TestTransformer1.collect_call_count = 0
+        IncrementalTestTransformer.collect_call_count = 0
+        IncrementalTestTransformer.changed_block_keys = None
+        self.registered_transformers = [TestTransformer1, IncrementalTestTransformer]
+
+        self.children_map = self.SIMPLE_CHILDREN_MAP
+        self.modulestore = MockModulestoreFactory.create(self.children_map)
+        self.set_block_versions(range(len(self.children_map)), 'v1')
+        self.bs_manager = BlockStructureManager(
+            root_block_usage_key=0,
+            modulestore=self.modulestore,
+            cache=MockCache(),
+        )
+
+    def set_block_versions(self, block_keys, version):
+        """
+        Sets the given version on the mock xBlocks of the given blocks.
+        """
+        for block_key in block_keys:
+            self.modulestore.blocks[block_key].field_map['update_version'] = version
+
+    def update_collected_and_verify(self):
+        """
+        Calls the manager's update_collected method with incremental
+        collection and verifies its result.
+        """
+        with mock_registered_transformers(self.registered_transformers):
+            block_structure = self.bs_manager.update_collected(incremental=True)
+            from_cache = self.bs_manager.get_collected()
+        for collected_block_structure in (block_structure, from_cache):
+            self.assert_block_structure(collected_block_structure, self.children_map)
+            TestTransformer1.assert_collected(collected_block_structure)
+            IncrementalTestTransformer.assert_collected(collected_block_structure)
+
+    def test_incremental(self):
+        with mock_registered_transformers(self.registered_transformers):
+            self.bs_manager.get_collected()
+
+        self.set_block_versions([3], 'v2')
+        self.update_collected_and_verify()
+        self.assertEquals(IncrementalTestTransformer.changed_block_keys, {0, 1, 3})
+        self.assertEquals(IncrementalTestTransformer.collect_call_count, 1)
+        self.assertEquals(TestTransformer1.collect_call_count, 2)
+
+    def test_incremental_with_changed_children(self):
+        with mock_registered_transformers(self.registered_transformers):
+            self.bs_manager.get_collected()
+
+        self.children_map = [[1, 2], [3], [4], [], []]
+        self.modulestore.blocks[1].children = [3]
+        self.modulestore.blocks[2].children = [4]
+        self.update_collected_and_verify()
+        self.assertEquals(IncrementalTestTransformer.changed_block_keys, {0, 1, 2, 3, 4})
+
+    def test_no_previous_block_structure(self):
+        self.update_collected_and_verify()
+        self.assertIsNone(IncrementalTestTransformer.changed_block_keys)
+        self.assertEquals(IncrementalTestTransformer.collect_call_count, 1)
+
+    def test_no_block_versions(self):
+        with mock_registered_transformers(self.registered_transformers):
+            self.bs_manager.get_collected()
+
+        self.set_block_versions([3], None)
+        self.update_collected_and_verify()
+        self.assertIsNone(IncrementalTestTransformer.changed_block_keys)
+        self.assertEquals(IncrementalTestTransformer.collect_call_count, 2)
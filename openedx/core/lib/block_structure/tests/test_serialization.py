@@ -0,0 +1,148 @@
+"""
+Tests for block_structure/serialization.py
+"""
+# pylint: disable=protected-access
+import ddt
+from nose.plugins.attrib import attr
+from unittest import TestCase
+
+from openedx.core.lib.cache_utils import zpickle
+
+from .. import serialization
+from ..block_structure import BlockStructureModulestoreData
+from ..cache import BlockStructureCache
+from ..factory import BlockStructureFactory
+from .helpers import ChildrenMapTestMixin, MockCache, MockTransformer
+
+
+class OtherMockTransformer(MockTransformer):
+    """
+    A second mock transformer, for verifying per-transformer segments.
+    """
+    pass
+
+
+@attr('shard_2')
+@ddt.ddt
+class TestSerialization(ChildrenMapTestMixin, TestCase):
+    """
+    Tests for the block structure serialization format.
+    """
+    def create_collected_block_structure(self, children_map):
+        """
+        Returns a block structure for the given children_map with mock
+        collected transformer and xBlock field data.
+        """
+        block_structure = self.create_block_structure(children_map, BlockStructureModulestoreData)
+        for transformer in [MockTransformer, OtherMockTransformer]:
+            block_structure._add_transformer(transformer)
+            block_structure.set_transformer_data(transformer, 'course_data', transformer.name())
+            for block_key in block_structure:
+                block_structure.set_transformer_block_field(
+                    block_key, transformer, 'test', '{} {}'.format(transformer.name(), block_key)
+                )
+        for block_key in block_structure:
+            block_structure._block_data_map[block_key].xblock_fields['display_name'] = 'Block {}'.format(block_key)
+        return block_structure
+
+    def assert_collected_data(self, block_structure, children_map):
+        """
+        Verifies the data set by create_collected_block_structure.
+        """
+        for transformer in [MockTransformer, OtherMockTransformer]:
+            self.assertEquals(block_structure._get_transformer_data_version(transformer), transformer.VERSION)
+            self.assertEquals(block_structure.get_transformer_data(transformer, 'course_data'), transformer.name())
+            for block_key in range(len(children_map)):
+                self.assertEquals(
+                    block_structure.get_transformer_block_field(block_key, transformer, 'test'),
+                    '{} {}'.format(transformer.name(), block_key),
+                )
+        for block_key in range(len(children_map)):
+            self.assertEquals(
+                block_structure.get_xblock_field(block_key, 'display_name'),
+                'Block {}'.format(block_key),
+            )
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_round_trip(self, children_map):
+        block_structure = self.create_collected_block_structure(children_map)
+        serialized = serialization.serialize(block_structure)
+        self.assertTrue(serialization.is_serialized(serialized))
+
+        deserialized = serialization.deserialize(block_structure.root_block_usage_key, serialized)
+        self.assert_block_structure(deserialized, children_map)
+        self.assert_collected_data(deserialized, children_map)
+        self.assertEquals(deserialized._pending_segments, {})
+
+    def test_lazy_decoding(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        deserialized = serialization.deserialize(0, serialization.serialize(block_structure))
+        self.assertEquals(
+            set(deserialized._pending_segments),
+            {'transformer.MockTransformer', 'transformer.OtherMockTransformer', 'field.display_name'},
+        )
+
+        deserialized.get_transformer_block_field(1, MockTransformer, 'test')
+        deserialized.get_xblock_field(1, 'display_name')
+        self.assertEquals(set(deserialized._pending_segments), {'transformer.OtherMockTransformer'})
+
+    def test_decode_after_remove(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        deserialized = serialization.deserialize(0, serialization.serialize(block_structure))
+        deserialized.remove_block(1, keep_descendants=False)
+
+        self.assertIsNone(deserialized.get_xblock_field(1, 'display_name'))
+        self.assertEquals(deserialized.get_xblock_field(2, 'display_name'), 'Block 2')
+        self.assertNotIn(1, deserialized._block_data_map)
+
+    def test_set_before_decode(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        deserialized = serialization.deserialize(0, serialization.serialize(block_structure))
+        deserialized.set_transformer_block_field(2, MockTransformer, 'transformed', True)
+
+        self.assertTrue(deserialized.get_transformer_block_field(2, MockTransformer, 'transformed'))
+        self.assertEquals(deserialized.get_transformer_block_field(2, MockTransformer, 'test'), 'MockTransformer 2')
+
+    def test_unsupported_version(self):
+        serialized = serialization.serialize(self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP))
+        header = serialization._HEADER.unpack_from(serialized)
+        outdated = serialization._HEADER.pack(
+            header[0], serialization.FORMAT_VERSION + 1, header[2]
+        ) + serialized[serialization._HEADER.size:]
+        with self.assertRaises(serialization.UnsupportedFormat):
+            serialization.deserialize(0, outdated)
+
+    def test_cache_unsupported_version(self):
+        cache = BlockStructureCache(MockCache())
+        cache._cache.set(cache._encode_root_cache_key(0), serialization.MAGIC + 'garbage', timeout=0)
+        self.assertIsNone(cache.get(0))
+
+    def test_cache_legacy_format(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        cache = BlockStructureCache(MockCache())
+        cache._cache.set(
+            cache._encode_root_cache_key(0),
+            zpickle((
+                block_structure._block_relations,
+                block_structure._transformer_data,
+                block_structure._block_data_map,
+            )),
+            timeout=0,
+        )
+        from_cache = cache.get(0)
+        self.assert_block_structure(from_cache, self.SIMPLE_CHILDREN_MAP)
+        self.assert_collected_data(from_cache, self.SIMPLE_CHILDREN_MAP)
+
+    def test_factory_decodes_requested_transformers(self):
+        cache = BlockStructureCache(MockCache())
+        cache.add(self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP))
+        from_cache = BlockStructureFactory.create_from_cache(0, cache, [OtherMockTransformer])
+        self.assertEquals(
+            set(from_cache._pending_segments),
+            {'transformer.MockTransformer', 'field.display_name'},
+        )
+        self.assert_collected_data(from_cache, self.SIMPLE_CHILDREN_MAP)
@@ -28,6 +28,13 @@ class BlockStructureTransformer(object):
     #
     VERSION = 0
 
+    # Whether the transformer supports incrementally updating its
+    # collected data through its collect_incremental method, for only
+    # the blocks that changed since the data was last collected.
+    # Transformers that don't support it have their collect method
+    # called on the entire block structure instead.
+    SUPPORTS_INCREMENTAL_COLLECT = False
+
     @classmethod
     def name(cls):
         """
@@ -78,6 +85,37 @@ class BlockStructureTransformer(object):
         """
         pass
 
+    @classmethod
+    def collect_incremental(cls, block_structure, changed_block_keys):
+        """
+        Updates the transformer's previously collected data in the
+        block_structure for only the blocks identified by the given
+        changed_block_keys.  This method is only called for transformers
+        that set SUPPORTS_INCREMENTAL_COLLECT to True.
+
+        When this method is called, the given block_structure already
+        contains the transformer's previously collected data: its
+        non-block-specific data and the block data of all blocks that
+        are not in changed_block_keys.  The changed blocks include all
+        ancestors and descendants of any block that was added, updated
+        or moved, so data that is percolated down from ancestors or
+        aggregated up from descendants can be recomputed for only the
+        changed blocks.
+
+        The default implementation calls the collect method, which is
+        sufficient for transformers that only request xBlock fields,
+        since the framework collects requested fields incrementally.
+
+        Arguments:
+            block_structure (BlockStructureModulestoreData) - A mutable
+                block structure that is to be modified with collected
+                data to be cached for the transformer.
+
+            changed_block_keys (set(UsageKey)) - The usage keys of the
+                blocks whose data is to be re-collected.
+        """
+        cls.collect(block_structure)
+
     @abstractmethod
     def transform(self, usage_info, block_structure):
         """
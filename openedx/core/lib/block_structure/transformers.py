@@ -3,6 +3,7 @@ Module for a collection of BlockStructureTransformers.
 """
 from logging import getLogger
 
+from .block_structure import BLOCK_VERSION_FIELD
 from .exceptions import TransformerException
 from .transformer_registry import TransformerRegistry
 
@@ -64,11 +65,21 @@ class BlockStructureTransformers(object):
         self._transformers.extend(transformers)
         return self
 
+    def __iter__(self):
+        """
+        Iterates over the transformers in the collection, in the order
+        that they were added.
+        """
+        return iter(self._transformers)
+
     @classmethod
     def collect(cls, block_structure):
         """
         Collects data for each registered transformer.
         """
+        # Collect the versions of the blocks for later incremental collects.
+        block_structure.request_xblock_fields(BLOCK_VERSION_FIELD)
+
         for transformer in TransformerRegistry.get_registered_transformers():
             block_structure._add_transformer(transformer)  # pylint: disable=protected-access
             transformer.collect(block_structure)
@@ -76,6 +87,70 @@ class BlockStructureTransformers(object):
         # Collect all fields that were requested by the transformers.
         block_structure._collect_requested_xblock_fields()  # pylint: disable=protected-access
 
+    @classmethod
+    def collect_incremental(cls, block_structure, previous_block_structure):
+        """
+        Collects data for each registered transformer, reusing the data
+        in the given previously collected block structure for the blocks
+        that haven't changed since.
+
+        Transformers that support incremental collection only re-collect
+        data for the changed blocks; the others collect data for the
+        entire block structure.  If the changed blocks cannot be
+        determined, a full collect is done instead.
+
+        Arguments:
+            block_structure (BlockStructureModulestoreData) - The block
+                structure, freshly created from the modulestore, to
+                collect data for.
+
+            previous_block_structure (BlockStructureBlockData) - The
+                previously collected block structure, with data that is
+                up-to-date with all registered transformers.
+        """
+        # pylint: disable=protected-access
+        changed_block_keys = block_structure._get_changed_block_keys(previous_block_structure)
+        if changed_block_keys is None:
+            logger.info(
+                "Changed blocks are unknown for Block Structure %s, collecting all blocks.",
+                block_structure.root_block_usage_key,
+            )
+            cls.collect(block_structure)
+            return
+
+        registered_transformers = TransformerRegistry.get_registered_transformers()
+        unchanged_block_keys = [
+            block_key for block_key in block_structure.get_block_keys()
+            if block_key not in changed_block_keys
+        ]
+
+        # Reuse the previous data of the unchanged blocks, including the
+        # data of any transformers nested within registered ones, except
+        # for the transformers that collect data from scratch.
+        block_structure._copy_collected_data(
+            previous_block_structure,
+            unchanged_block_keys,
+            [transformer for transformer in registered_transformers if not transformer.SUPPORTS_INCREMENTAL_COLLECT],
+        )
+        logger.info(
+            "Incrementally collecting %d of %d blocks for Block Structure %s.",
+            len(changed_block_keys),
+            len(changed_block_keys) + len(unchanged_block_keys),
+            block_structure.root_block_usage_key,
+        )
+
+        block_structure.request_xblock_fields(BLOCK_VERSION_FIELD)
+        for transformer in registered_transformers:
+            block_structure._add_transformer(transformer)
+            if transformer.SUPPORTS_INCREMENTAL_COLLECT:
+                transformer.collect_incremental(block_structure, changed_block_keys)
+            else:
+                transformer.collect(block_structure)
+
+        # Collect all requested fields of the changed blocks; the fields
+        # of the unchanged blocks were copied above.
+        block_structure._collect_requested_xblock_fields(changed_block_keys)
+
     def transform(self, block_structure):
         """
         The given block structure is transformed by each transformer in the
@@ -0,0 +1,113 @@
+"""
+A counter that keeps memory use bounded by spilling its counts to disk.
+"""
+import cPickle as pickle
+import heapq
+import tempfile
+from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
+
+DEFAULT_MAX_KEYS = 100000
+
+# Number of temporary files after which they are merged into one, to keep
+# the number of open files bounded.
+MAX_RUNS = 64
+
+
+class SpillingCounter(object):
+    """
+    Counts occurrences of keys, holding the counts of at most `max_keys`
+    keys in memory.  Whenever that many keys are held, their counts are
+    written, sorted by key, to a temporary file and the counter starts
+    over in memory.  Reading the counts merges the files back together.
+    Once there are MAX_RUNS files, they are merged into a single file.
+
+    Keys must be picklable and sortable.  Use it as a context manager, or
+    call close, to remove the temporary files.
+    """
+    def __init__(self, max_keys=DEFAULT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._counts = defaultdict(int)
+        self._runs = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def add(self, key, count=1):
+        """
+        Adds `count` to the count of `key`.
+        """
+        self._counts[key] += count
+        if len(self._counts) >= self.max_keys:
+            self._spill()
+
+    def iteritems(self):
+        """
+        Yields a (key, count) tuple for each key counted, in sorted order of
+        the keys.  Only one iteration can be in progress at a time.
+        """
+        return _merge_runs(
+            [_read_run(run) for run in self._runs] + [iter(sorted(self._counts.iteritems()))]
+        )
+
+    def close(self):
+        """
+        Removes the temporary files the counts were spilled to.
+        """
+        for run in self._runs:
+            run.close()
+        self._runs = []
+        self._counts = defaultdict(int)
+
+    def _spill(self):
+        """
+        Writes the counts held in memory to a new temporary file.
+        """
+        self._runs.append(_write_run(sorted(self._counts.iteritems())))
+        self._counts = defaultdict(int)
+
+        if len(self._runs) >= MAX_RUNS:
+            merged = _write_run(_merge_runs([_read_run(run) for run in self._runs]))
+            for run in self._runs:
+                run.close()
+            self._runs = [merged]
+
+
+def _merge_runs(runs):
+    """
+    Yields a (key, count) tuple for each key in the given iterators of
+    (key, count) tuples sorted by key, summing the counts of each key.
+    """
+    for key, items in groupby(heapq.merge(*runs), key=itemgetter(0)):
+        yield key, sum(count for __, count in items)
+
+
+def _write_run(items):
+    """
+    Writes the given (key, count) tuples to a new temporary file and returns it.
+    """
+    run = tempfile.TemporaryFile()
+    pickler = pickle.Pickler(run, pickle.HIGHEST_PROTOCOL)
+    for item in items:
+        pickler.dump(item)
+        # The keys are written once each, so there's no need to remember
+        # them for back references.
+        pickler.clear_memo()
+    return run
+
+
+def _read_run(run):
+    """
+    Yields the (key, count) tuples written to the given file.
+    """
+    run.seek(0)
+    unpickler = pickle.Unpickler(run)
+    while True:
+        try:
+            yield unpickler.load()
+        except EOFError:
+            return
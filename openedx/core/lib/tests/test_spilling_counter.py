@@ -0,0 +1,46 @@
+"""
+Tests for spilling_counter.py
+"""
+from collections import Counter
+from unittest import TestCase
+
+import ddt
+from mock import patch
+
+from ..spilling_counter import SpillingCounter
+
+
+@ddt.ddt
+class TestSpillingCounter(TestCase):
+    """
+    Tests for SpillingCounter.
+    """
+    KEYS = [(u'p{}'.format(index % 7), u'answer {}'.format(index % 5)) for index in xrange(100)]
+
+    @ddt.data(1, 3, 35, 1000)
+    def test_counts(self, max_keys):
+        with SpillingCounter(max_keys=max_keys) as counter:
+            for key in self.KEYS:
+                counter.add(key)
+            expected = sorted(Counter(self.KEYS).items())
+            self.assertEqual(list(counter.iteritems()), expected)
+            # The counts can be read more than once
+            self.assertEqual(list(counter.iteritems()), expected)
+
+    def test_spilled_files_merged(self):
+        with patch('openedx.core.lib.spilling_counter.MAX_RUNS', 4):
+            with SpillingCounter(max_keys=2) as counter:
+                for key in self.KEYS:
+                    counter.add(key, 2)
+                self.assertLess(len(counter._runs), 4)  # pylint: disable=protected-access
+                self.assertEqual(
+                    list(counter.iteritems()),
+                    sorted((key, count * 2) for key, count in Counter(self.KEYS).items()),
+                )
+
+    def test_close(self):
+        counter = SpillingCounter(max_keys=1)
+        counter.add('a')
+        counter.add('b')
+        counter.close()
+        self.assertEqual(list(counter.iteritems()), [])
@@ -7,21 +7,32 @@ import ddt
 from nose.plugins.attrib import attr
 import uuid
 
+from django.core.cache import cache
 from django.test.client import RequestFactory
+from django.test.utils import override_settings
+from mock import patch
+from opaque_keys.edx.locator import CourseLocator
 
+from courseware.tests.factories import StudentModuleFactory
 from lms.djangoapps.lms_xblock.runtime import quote_slashes
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+from request_cache.middleware import RequestCache
 from xblock.fragment import Fragment
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 
 from openedx.core.lib.xblock_utils import (
+    GRADE_COUNTS_CACHE_KEY,
+    grade_histogram,
+    update_problem_grade_counts,
     wrap_fragment,
     request_token,
     wrap_xblock,
     replace_jump_to_id_urls,
     replace_course_urls,
     replace_static_urls,
+    replace_all_urls,
     sanitize_html_id
 )
 
@@ -173,6 +184,31 @@ class TestXblockUtils(SharedModuleStoreTestCase):
         self.assertIsInstance(test_replace, Fragment)
         self.assertEqual(test_replace.content, anchor_tag)
 
+    @ddt.data(
+        ('course_mongo', 'TestX/TS01/2015', '/c4x/TestX/TS01/asset/id'),
+        ('course_split', 'course-v1:TestX+TS02+2015', '/asset-v1:TestX+TS02+2015+type@asset+block/id')
+    )
+    @ddt.unpack
+    def test_replace_all_urls(self, course_id, course_url_id, asset_url):
+        """
+        Verify that the static, course and jump-to URLs have all been replaced.
+        """
+        course = getattr(self, course_id)
+        test_replace = replace_all_urls(
+            data_dir=None,
+            course_id=course.id,
+            jump_to_id_base_url='/base_url/',
+            block=course,
+            view='baseview',
+            frag=Fragment('<a href="/static/id"><a href="/course/id"><a href="/jump_to_id/id">'),
+            context=None
+        )
+        self.assertIsInstance(test_replace, Fragment)
+        self.assertEqual(
+            test_replace.content,
+            '<a href="{}"><a href="/courses/{}/id"><a href="/base_url/id">'.format(asset_url, course_url_id)
+        )
+
     def test_sanitize_html_id(self):
         """
         Verify that colons and dashes are replaced.
@@ -181,3 +217,84 @@ class TestXblockUtils(SharedModuleStoreTestCase):
         clean_string = sanitize_html_id(dirty_string)
 
         self.assertEqual(clean_string, 'I_have_un_allowed_characters')
+
+
+@attr('shard_2')
+@override_settings(GRADE_HISTOGRAMS_CACHE_TIMEOUT=60)
+@patch.dict('django.conf.settings.FEATURES', {'DISPLAY_HISTOGRAMS_TO_STAFF': True})
+class TestGradeHistogram(CacheIsolationTestCase):
+    """
+    Tests for the grade histograms shown in staff debug info.
+    """
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(TestGradeHistogram, self).setUp()
+        RequestCache.clear_request_cache()
+        self.addCleanup(RequestCache.clear_request_cache)
+
+        self.course_key = CourseLocator('TestX', 'TS01', '2015')
+        self.problems = [self.course_key.make_usage_key('problem', 'problem_{}'.format(i)) for i in range(3)]
+        for problem, grade in [(0, 1), (0, 1), (0, 0), (1, 1), (2, 1), (2, None)]:
+            StudentModuleFactory.create(
+                course_id=self.course_key,
+                module_state_key=self.problems[problem],
+                grade=grade,
+            )
+
+    def test_histograms_of_course_queried_once(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(grade_histogram(self.problems[0]), [(0.0, 1), (1.0, 2)])
+            self.assertEqual(grade_histogram(self.problems[1]), [(1.0, 1)])
+            # Students who have not been graded hide the histogram.
+            self.assertEqual(grade_histogram(self.problems[2]), [])
+            self.assertEqual(grade_histogram(self.course_key.make_usage_key('problem', 'unseen')), [])
+
+        # The grade counts are cached across requests.
+        RequestCache.clear_request_cache()
+        with self.assertNumQueries(0):
+            self.assertEqual(grade_histogram(self.problems[1]), [(1.0, 1)])
+
+    def test_grade_counts_cached_per_problem(self):
+        StudentModuleFactory.create(
+            course_id=self.course_key,
+            module_state_key=self.course_key.make_usage_key('sequential', 'sequential'),
+            module_type='sequential',
+        )
+        grade_histogram(self.problems[0])
+
+        self.assertEqual(
+            cache.get(GRADE_COUNTS_CACHE_KEY.format(self.problems[0].to_deprecated_string()))[1],
+            {0.0: 1, 1.0: 2}
+        )
+        # Only problems are counted.
+        sequential_id = self.course_key.make_usage_key('sequential', 'sequential').to_deprecated_string()
+        self.assertIsNone(cache.get(GRADE_COUNTS_CACHE_KEY.format(sequential_id)))
+
+        # A problem whose counts are missing from the cache is queried alone.
+        RequestCache.clear_request_cache()
+        cache.delete(GRADE_COUNTS_CACHE_KEY.format(self.problems[1].to_deprecated_string()))
+        with self.assertNumQueries(1):
+            self.assertEqual(grade_histogram(self.problems[1]), [(1.0, 1)])
+        with self.assertNumQueries(0):
+            self.assertEqual(grade_histogram(self.problems[1]), [(1.0, 1)])
+
+    def test_update_grade_counts(self):
+        grade_histogram(self.problems[0])
+
+        with self.assertNumQueries(0):
+            update_problem_grade_counts(self.problems[0], 1, previous_grade=0)
+            update_problem_grade_counts(self.problems[1], 0.5, created=True)
+            self.assertEqual(grade_histogram(self.problems[0]), [(1.0, 3)])
+            self.assertEqual(grade_histogram(self.problems[1]), [(0.5, 1), (1.0, 1)])
+
+    def test_update_uncached_grade_counts(self):
+        update_problem_grade_counts(self.problems[0], 1, previous_grade=0)
+        with self.assertNumQueries(1):
+            self.assertEqual(grade_histogram(self.problems[0]), [(0.0, 1), (1.0, 2)])
+
+    @patch.dict('django.conf.settings.FEATURES', {'DISPLAY_HISTOGRAMS_TO_STAFF': False})
+    def test_update_grade_counts_histograms_disabled(self):
+        grade_histogram(self.problems[0])
+        update_problem_grade_counts(self.problems[0], 1, previous_grade=0)
+        self.assertEqual(grade_histogram(self.problems[0]), [(0.0, 1), (1.0, 2)])
@@ -8,17 +8,20 @@ import logging
 import markupsafe
 import re
 import static_replace
+import time
 import uuid
 from lxml import html, etree
 from contracts import contract
 
 from django.conf import settings
 from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.utils.timezone import UTC
 from django.utils.html import escape
 from django.contrib.auth.models import User
 from edxmako.shortcuts import render_to_string
+import request_cache
 from xblock.core import XBlock
 from xblock.exceptions import InvalidScopeError
 from xblock.fragment import Fragment
@@ -31,6 +34,12 @@ from xmodule.modulestore.django import modulestore
 
 log = logging.getLogger(__name__)
 
+# Name of the request cache, and format of the cache keys, of the grade
+# counts of problems, and of the marker that those of a course were queried.
+GRADE_COUNTS_CACHE_NAME = 'openedx.core.lib.xblock_utils.grade_counts'
+GRADE_COUNTS_CACHE_KEY = u'openedx.core.lib.xblock_utils.grade_counts.{}'
+GRADE_COUNTS_COURSE_CACHE_KEY = u'openedx.core.lib.xblock_utils.course_grade_counts.{}'
+
 
 def wrap_fragment(fragment, new_content):
     """
@@ -253,31 +262,155 @@ def replace_static_urls(data_dir, block, view, frag, context, course_id=None, st
     ))
 
 
+def replace_all_urls(data_dir, course_id, jump_to_id_base_url, block, view, frag, context, static_asset_path=''):  # pylint: disable=unused-argument
+    """
+    Updates the supplied module with a new get_html function that wraps
+    the old get_html function and substitutes the urls rewritten by
+    replace_static_urls, replace_course_urls and replace_jump_to_id_urls,
+    scanning the content once rather than once for each kind of url.
+    """
+    return wrap_fragment(frag, static_replace.replace_all_urls(
+        frag.content,
+        data_dir,
+        course_id,
+        static_asset_path=static_asset_path,
+        jump_to_id_base_url=jump_to_id_base_url,
+    ))
+
+
 def grade_histogram(module_id):
     '''
     Print out a histogram of grades on a given problem in staff member debug info.
 
+    The histogram is read from the cached grade counts of the problem, see
+    problem_grade_counts.
+
     Warning: If a student has just looked at an xmodule and not attempted
     it, their grade is None. Since there will always be at least one such student
     this function almost always returns [].
     '''
+    grades = sorted(problem_grade_counts(module_id).iteritems())
+    if len(grades) >= 1 and grades[0][0] is None:
+        return []
+    return grades
+
+
+def problem_grade_counts(module_id):
+    '''
+    Returns the number of students with each grade on the given problem, as
+    a dict mapping grades to numbers of students.
+
+    The grade counts of each problem are cached under their own key for
+    GRADE_HISTOGRAMS_CACHE_TIMEOUT seconds.  The first time they are needed,
+    the grade counts of all the problems of the course are computed with a
+    single query and kept in the request cache, so that the histograms of all
+    the problems on a page are computed at once.  Afterwards, the grade counts
+    of a problem and whether those of its course are cached are read with a
+    single cache lookup.
+    '''
+    course_key = module_id.course_key
+    module_id_string = module_id.to_deprecated_string()
+    grade_counts_cache = request_cache.get_cache(GRADE_COUNTS_CACHE_NAME)
+    if module_id_string in grade_counts_cache:
+        return grade_counts_cache[module_id_string]
+    if course_key in grade_counts_cache:
+        # All the problems of the course with grade counts were queried.
+        return {}
+
+    course_cache_key = GRADE_COUNTS_COURSE_CACHE_KEY.format(course_key)
+    cache_key = GRADE_COUNTS_CACHE_KEY.format(module_id_string)
+    cached = cache.get_many([course_cache_key, cache_key])
+    if cache_key in cached:
+        grade_counts = cached[cache_key][1]
+    elif course_cache_key in cached:
+        # The problem had no grade counts when those of the course were
+        # queried, or they have been evicted since.
+        grade_counts = _query_grade_counts(course_key, module_id_string).get(module_id_string, {})
+        cache.set(cache_key, (time.time(), grade_counts), settings.GRADE_HISTOGRAMS_CACHE_TIMEOUT)
+    else:
+        computed = time.time()
+        course_grade_counts = _query_grade_counts(course_key)
+        cache.set_many(
+            {
+                GRADE_COUNTS_CACHE_KEY.format(problem_id): (computed, problem_counts)
+                for problem_id, problem_counts in course_grade_counts.iteritems()
+            },
+            settings.GRADE_HISTOGRAMS_CACHE_TIMEOUT
+        )
+        cache.set(course_cache_key, computed, settings.GRADE_HISTOGRAMS_CACHE_TIMEOUT)
+        grade_counts_cache.update(course_grade_counts)
+        grade_counts_cache[course_key] = True
+        grade_counts = course_grade_counts.get(module_id_string, {})
+
+    grade_counts_cache[module_id_string] = grade_counts
+    return grade_counts
+
+
+def update_problem_grade_counts(module_id, grade, previous_grade=None, created=False):
+    '''
+    Updates the cached grade counts of the given problem after a student's
+    grade on it changed from `previous_grade` to `grade`, or was first
+    recorded as `grade` if `created`.
+
+    The counts are left alone if they are not cached, as they are then
+    queried the next time they are used.  Updates made concurrently by
+    other processes to the same problem may be lost, so the cached counts
+    are still queried again once they are GRADE_HISTOGRAMS_CACHE_TIMEOUT
+    seconds old.
+    '''
+    if not settings.FEATURES.get('DISPLAY_HISTOGRAMS_TO_STAFF'):
+        return
+
+    module_id_string = module_id.to_deprecated_string()
+    grade_counts_cache = request_cache.get_cache(GRADE_COUNTS_CACHE_NAME)
+    grade_counts_cache.pop(module_id_string, None)
+    grade_counts_cache.pop(module_id.course_key, None)
+    cache_key = GRADE_COUNTS_CACHE_KEY.format(module_id_string)
+    cached = cache.get(cache_key)
+    if cached is None:
+        return
+    computed, grade_counts = cached
+    timeout = int(computed + settings.GRADE_HISTOGRAMS_CACHE_TIMEOUT - time.time())
+    if timeout <= 0:
+        return
+
+    if not created and grade_counts.get(previous_grade):
+        grade_counts[previous_grade] -= 1
+        if not grade_counts[previous_grade]:
+            del grade_counts[previous_grade]
+    grade_counts[grade] = grade_counts.get(grade, 0) + 1
+    cache.set(cache_key, (computed, grade_counts), timeout)
+
+
+def _query_grade_counts(course_key, module_id=None):
+    '''
+    Returns the grade counts of the problems of the given course, or only of
+    the given problem, from the database, as a dict mapping module ids to
+    grade counts as described in problem_grade_counts.
+    '''
     from django.db import connection
     cursor = connection.cursor()
 
     query = """\
-        SELECT courseware_studentmodule.grade,
+        SELECT courseware_studentmodule.module_id, courseware_studentmodule.grade,
         COUNT(courseware_studentmodule.student_id)
         FROM courseware_studentmodule
-        WHERE courseware_studentmodule.module_id=%s
-        GROUP BY courseware_studentmodule.grade"""
-    # Passing module_id this way prevents sql-injection.
-    cursor.execute(query, [module_id.to_deprecated_string()])
-
-    grades = list(cursor.fetchall())
-    grades.sort(key=lambda x: x[0])  # Add ORDER BY to sql query?
-    if len(grades) >= 1 and grades[0][0] is None:
-        return []
-    return grades
+        WHERE courseware_studentmodule.course_id=%s
+        AND courseware_studentmodule.module_type='problem'"""
+    params = [unicode(course_key)]
+    if module_id is not None:
+        query += """
+        AND courseware_studentmodule.module_id=%s"""
+        params.append(module_id)
+    query += """
+        GROUP BY courseware_studentmodule.module_id, courseware_studentmodule.grade"""
+    # Passing course_id and module_id this way prevents sql-injection.
+    cursor.execute(query, params)
+
+    grade_counts = {}
+    for problem_id, grade, count in cursor.fetchall():
+        grade_counts.setdefault(problem_id, {})[grade] = count
+    return grade_counts
 
 
 def sanitize_html_id(html_id):